@@ -2,7 +2,8 @@
 
 ################################################################################
 # ReaxFF Replicate Scaling Benchmark
-# Tests ReaxFF performance with different system sizes (3x3x3 to 6x6x6)
+# Tests ReaxFF performance with different system sizes (3x3x3 to 6x6x6);
+# MEMORY_SCALING=1 measures the memory footprint up to larger sizes instead
 ################################################################################
 
 echo "==========================================="
@@ -14,7 +15,51 @@ echo ""
 # Configuration
 BENCH_DIR="lammps_benchmarks"
 RESULT_FILE="reaxff_scaling_results.md"
-LAMMPS_REAXFF_URL="https://raw.githubusercontent.com/lammps/lammps/stable/examples/reaxff/HNS"
+
+# Benchmark inputs (scripts/input_cache.py): pinned to LAMMPS_TAG and verified by SHA-256 in a
+# content-addressed INPUT_CACHE that can be pre-filled once and shared read-only by all nodes;
+# OFFLINE=1 never touches the network (missing inputs are an error)
+LAMMPS_TAG="${LAMMPS_TAG:-stable_29Aug2024_update1}"
+INPUT_CACHE="${INPUT_CACHE:-$HOME/.cache/lammps_bench_inputs}"
+OFFLINE="${OFFLINE:-0}"
+
+# Result store (SQLite, one row per run) and the shared Python tools
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+TOOLS_DIR="${TOOLS_DIR:-$SCRIPT_DIR/../../../scripts}"
+RESULT_STORE="${RESULT_STORE:-$SCRIPT_DIR/../../results.db}"
+
+# Repeated trials: WARMUP untimed runs, then TRIALS measured runs per configuration
+# (the median trial is reported, every trial is recorded in the result store)
+TRIALS="${TRIALS:-1}"
+WARMUP="${WARMUP:-0}"
+
+# Adaptive run length (scripts/adaptive_run.py): ADAPTIVE=1 extends runs shorter than
+# MIN_TIME seconds and ends long runs once the per-step time is steady within STEADY_TOL
+ADAPTIVE="${ADAPTIVE:-0}"
+MIN_TIME="${MIN_TIME:-5}"
+STEADY_TOL="${STEADY_TOL:-0.02}"
+
+# Hardware telemetry (scripts/telemetry.py): TELEMETRY=1 samples core utilization, frequency,
+# context switches, rank RSS and NUMA placement every TELEMETRY_INTERVAL seconds of each trial
+TELEMETRY="${TELEMETRY:-1}"
+TELEMETRY_INTERVAL="${TELEMETRY_INTERVAL:-1}"
+
+# Binding policies (scripts/binding.py): every configuration runs once per policy in BINDINGS
+# (none core compact spread socket numa pcore); policies that do not fit the machine or the
+# decomposition are skipped, bound runs log to log.<name>.bind-<policy>
+BINDINGS="${BINDINGS:-none}"
+
+# Resumable sweeps (scripts/checkpoint.py): every point is checkpointed in CHECKPOINT as soon
+# as it finishes, so a restarted job reruns only missing or failed points (RESUME=0 starts over)
+RESUME="${RESUME:-1}"
+CHECKPOINT="${CHECKPOINT:-$PWD/.sweep_checkpoint.jsonl}"
+
+# Memory scaling (scripts/memory_model.py): MEMORY_SCALING=1 runs the MEMORY_REPLICATES sizes for
+# MEMORY_STEPS steps to record LAMMPS' per-rank memory and the peak RSS (suite "memory", logs
+# log.memory_reaxff_*); a configuration that fails (e.g. is OOM-killed) skips the larger sizes
+MEMORY_SCALING="${MEMORY_SCALING:-0}"
+MEMORY_REPLICATES="${MEMORY_REPLICATES:-3x3x3 4x4x4 6x6x6 8x8x8 10x10x10 12x12x12}"
+MEMORY_STEPS="${MEMORY_STEPS:-10}"
 
 # Base atoms in unit cell (304 atoms)
 BASE_ATOMS=304
@@ -23,6 +68,22 @@ BASE_ATOMS=304
 REPLICATES=("3 3 3" "4 4 4" "5 5 5" "6 6 6")
 REPLICATE_NAMES=("3x3x3" "4x4x4" "5x5x5" "6x6x6")
 
+# Suite, file names and run length of the selected mode
+SUITE=scaling
+RUN_PREFIX=reaxff
+RUN_STEPS=100
+if [ "$MEMORY_SCALING" = "1" ]; then
+    read -r -a REPLICATE_NAMES <<< "$MEMORY_REPLICATES"
+    REPLICATES=("${REPLICATE_NAMES[@]//x/ }")
+    SUITE=memory
+    RUN_PREFIX=memory_reaxff
+    RUN_STEPS=$MEMORY_STEPS
+    RESULT_FILE="reaxff_memory_results.md"
+fi
+
+# Configurations that failed at a size (memory scaling skips their larger sizes)
+declare -A FAILED_CONFIGS=()
+
 # Benchmark configurations
 # Format: "name|command"
 # Reference (no acceleration) as baseline, then KOKKOS GPU for comparison
@@ -36,31 +97,24 @@ declare -a BENCHMARK_CONFIGS=(
     "KOKKOS-GPU-MPI2|mpirun -np 2 lmp_kokkos -k on g 1 -sf kk -pk kokkos neigh half newton on -in"
 )
 
-# Download ReaxFF files
-download_files() {
-    echo "Downloading ReaxFF HNS files..."
-    mkdir -p "$BENCH_DIR"
+# Copy the pinned inputs of a suite from the input cache into BENCH_DIR (downloading
+# uncached ones unless OFFLINE=1); exits if any input is unavailable
+fetch_inputs() {
+    local suite=$1
+    local offline=()
+    [ "$OFFLINE" = "1" ] && offline=(--offline)
     
-    if ! pushd "$BENCH_DIR" > /dev/null 2>&1; then
-        echo "Error: Cannot change to $BENCH_DIR"
+    echo "LAMMPS inputs: $LAMMPS_TAG (cache: $INPUT_CACHE)"
+    if ! python3 "$TOOLS_DIR/input_cache.py" materialize "$BENCH_DIR" --suite "$suite" \
+            --tag "$LAMMPS_TAG" --cache "$INPUT_CACHE" "${offline[@]}"; then
         exit 1
     fi
-    
-    local files=("data.hns-equil" "ffield.reax.hns")
-    for file in "${files[@]}"; do
-        echo -n "  $file ... "
-        if [ -f "$file" ]; then
-            echo "✓ (exists)"
-        elif wget -q "${LAMMPS_REAXFF_URL}/${file}" -O "$file" 2>/dev/null; then
-            echo "✓"
-        else
-            echo "✗ (failed)"
-            popd > /dev/null 2>&1
-            exit 1
-        fi
-    done
-    
-    popd > /dev/null 2>&1
+}
+
+# Download ReaxFF files
+download_files() {
+    echo "Fetching ReaxFF HNS files..."
+    fetch_inputs scaling
     echo ""
 }
 
@@ -69,7 +123,7 @@ create_input_file() {
     local rep=$1  # e.g., "3 3 3"
     local name=$2 # e.g., "3x3x3"
     
-    cat > "$BENCH_DIR/in.reaxff_${name}" << EOF
+    cat > "$BENCH_DIR/in.${RUN_PREFIX}_${name}" << EOF
 # ReaxFF HNS Benchmark - Replicate ${name}
 units             real
 atom_style        charge
@@ -99,35 +153,88 @@ velocity          all create 300.0 41279 loop geom
 fix               1 all nve
 fix               2 all qeq/reaxff 1 0.0 10.0 1e-6 reaxff
 
-run               100
+run               ${RUN_STEPS}
 EOF
 }
 
-# Extract metrics from log
+# Extract performance metrics from LAMMPS trial logs (shared parser: scripts/lammps_log.py)
+# Extra arguments tag the run; every run block of every log is appended to the result store
 extract_metrics() {
-    local logfile=$1
-    
-    if [ ! -f "$logfile" ]; then
-        echo "ERROR"
-        return
-    fi
-    
-    if ! grep -q "Loop time of" "$logfile"; then
-        echo "ERROR"
+    if ! command -v python3 &> /dev/null || [ ! -f "$TOOLS_DIR/lammps_log.py" ]; then
+        echo "ERROR=python3 and $TOOLS_DIR/lammps_log.py are required"
         return
     fi
     
-    local loop_line=$(grep "Loop time of" "$logfile" | head -1)
-    local loop_time=$(echo "$loop_line" | awk '{print $4}')
-    local atoms=$(echo "$loop_line" | awk '{for(i=1;i<=NF;i++) if($i=="atoms") print $(i-1)}')
+    # Prints LOOP_TIME, TIMESTEPS, ATOMS, TIMESTEP_PER_SEC, NS_PER_DAY, HOURS_PER_NS,
+    # ATOM_STEPS_SEC and RUNS for the last completed run of the median trial, plus
+    # MEASURED_TRIALS, LOOP_TIME_MIN and LOOP_TIME_MAX, or ERROR=<reason>. For adaptive
+    # runs LOOP_TIME is extrapolated to the nominal length (STEPS_RUN, LOOP_TIME_MEASURED)
+    python3 "$TOOLS_DIR/lammps_log.py" metrics "$@" --store "$RESULT_STORE"
+}
+
+# Log of each trial: trial 0 writes <log>, trial N writes <log>.tN
+trial_logs() {
+    local logfile=$1
+    local n
+    echo "$logfile"
+    for ((n = 1; n < TRIALS; n++)); do
+        echo "$logfile.t$n"
+    done
+}
+
+# Look up a point in the sweep checkpoint: sets CHECKPOINT_KEY (its fingerprint) and, if it
+# finished in an earlier interrupted run, CHECKPOINT_DATA (its result line)
+# Usage: checkpoint_lookup <input_path> <config_name> <omp_threads> <command> [replicate] [binding]
+checkpoint_lookup() {
+    local adaptive=()
+    [ "$ADAPTIVE" = "1" ] && adaptive=(--adaptive)
+    CHECKPOINT_KEY=""
+    CHECKPOINT_DATA=""
+    eval "$(python3 "$TOOLS_DIR/checkpoint.py" lookup "$CHECKPOINT" --input "$1" --config "$2" \
+        --omp "$3" --command "$4" --replicate "${5:-}" --binding "${6:-none}" --trials "$TRIALS" \
+        --warmup "$WARMUP" "${adaptive[@]}" 2>/dev/null)"
+}
+
+# Record the outcome of the looked-up point right away
+# Usage: checkpoint_record <ok|failed> <label> [result line]
+checkpoint_record() {
+    [ -n "$CHECKPOINT_KEY" ] || return 0
+    python3 "$TOOLS_DIR/checkpoint.py" record "$CHECKPOINT" "$CHECKPOINT_KEY" --status "$1" \
+        --label "$2" --data "${3:-}"
+}
+
+# Check a binding policy against a configuration: sets BINDING_SKIP to the reason it cannot
+# be applied on this machine ('' if it can)
+# Usage: binding_check <policy> <omp_threads> <command>
+binding_check() {
+    BINDING_SKIP=""
+    [ "$1" = "none" ] && return 0
+    eval "$(python3 "$TOOLS_DIR/binding.py" check --policy "$1" --omp "$2" -- $3 2>/dev/null)"
+}
+
+# Run a command WARMUP times (log discarded), then once per trial (length-controlled
+# by adaptive_run.py when ADAPTIVE=1)
+# Usage: run_trials <log_path> <command...>
+run_trials() {
+    local log_path=$1
+    shift
+    local n rc trial_log
+    # Trials record their wall and launch time (startup_cost.py) for the setup vs loop split
+    local wrapper=(python3 "$TOOLS_DIR/startup_cost.py" run --)
+    [ "$ADAPTIVE" = "1" ] && wrapper+=(python3 "$TOOLS_DIR/adaptive_run.py" \
+        --min-time "$MIN_TIME" --tolerance "$STEADY_TOL" --)
+    [ "$TELEMETRY" = "1" ] && wrapper=(python3 "$TOOLS_DIR/telemetry.py" run \
+        --interval "$TELEMETRY_INTERVAL" -- "${wrapper[@]}")
     
-    local perf_line=$(grep "Performance:" "$logfile" | head -1)
-    local timesteps_sec="-"
-    if [ -n "$perf_line" ]; then
-        timesteps_sec=$(echo "$perf_line" | awk -F'[, ]+' '{for(i=1;i<=NF;i++) if($i~/timesteps/) print $(i-1)}')
-    fi
+    rm -f "$log_path".t[0-9]*
+    for ((n = 0; n < WARMUP; n++)); do
+        "$@" -log "$log_path.warmup" > /dev/null 2>&1 || { rc=$?; rm -f "$log_path.warmup"; return $rc; }
+    done
+    rm -f "$log_path.warmup"
     
-    echo "${loop_time}|${atoms}|${timesteps_sec}"
+    for trial_log in $(trial_logs "$log_path"); do
+        "${wrapper[@]}" "$@" -log "$trial_log" > /dev/null 2>&1 || return $?
+    done
 }
 
 # Run single benchmark
@@ -135,11 +242,40 @@ run_benchmark() {
     local rep_name=$1
     local config_name=$2
     local command=$3
-    local input_file="in.reaxff_${rep_name}"
+    local binding=${4:-none}
+    local input_file="in.${RUN_PREFIX}_${rep_name}"
+    
+    local logfile="log.${RUN_PREFIX}_${rep_name}_${config_name}"
+    local label=$config_name
+    local bound=()
+    if [ "$binding" != "none" ]; then
+        logfile+=".bind-$binding"
+        label+=" [$binding]"
+        bound=(python3 "$TOOLS_DIR/binding.py" run --policy "$binding" --omp 1 --)
+    fi
+    
+    echo -n "  $label ... "
+    
+    binding_check "$binding" 1 "$command"
+    if [ -n "$BINDING_SKIP" ]; then
+        echo "- (skipped: $BINDING_SKIP)"
+        return
+    fi
     
-    local logfile="log.reaxff_${rep_name}_${config_name}"
+    # Memory scaling: a configuration that failed at a smaller size would fail again
+    if [ -n "${FAILED_CONFIGS[$label]:-}" ]; then
+        echo "- (skipped: failed at ${FAILED_CONFIGS[$label]})"
+        echo "${rep_name}|${label}|-|-|-" >> .scaling_data.tmp
+        return
+    fi
     
-    echo -n "  $config_name ... "
+    # Finished in an earlier, interrupted run: reuse its result line
+    checkpoint_lookup "$BENCH_DIR/$input_file" "$config_name" 1 "$command" "$rep_name" "$binding"
+    if [ -n "$CHECKPOINT_DATA" ]; then
+        echo "✓ (checkpointed)"
+        echo "$CHECKPOINT_DATA" >> .scaling_data.tmp
+        return
+    fi
     
     if ! pushd "$BENCH_DIR" > /dev/null 2>&1; then
         echo "✗ (dir error)"
@@ -147,26 +283,38 @@ run_benchmark() {
     fi
     
     local exit_code=0
-    $command $input_file -log "../$logfile" > /dev/null 2>&1 || exit_code=$?
+    run_trials "../$logfile" "${bound[@]}" $command $input_file || exit_code=$?
     
     popd > /dev/null 2>&1
     
     if [ $exit_code -ne 0 ]; then
         echo "✗ (exit: $exit_code)"
-        echo "${rep_name}|${config_name}|-|-|-" >> .scaling_data.tmp
+        echo "${rep_name}|${label}|-|-|-" >> .scaling_data.tmp
+        [ "$MEMORY_SCALING" = "1" ] && FAILED_CONFIGS[$label]=$rep_name
+        checkpoint_record failed "$rep_name $label"
         return
     fi
     
-    local metrics=$(extract_metrics "$logfile")
-    if [ "$metrics" = "ERROR" ]; then
+    local metrics=$(extract_metrics $(trial_logs "$logfile") --suite "$SUITE" --benchmark reaxff \
+        --replicate "$rep_name" --config "$config_name" --omp 1 --command "$command" \
+        --binding "$binding")
+    if echo "$metrics" | grep -q "ERROR="; then
         echo "✗ (parse error)"
-        echo "${rep_name}|${config_name}|-|-|-" >> .scaling_data.tmp
+        echo "${rep_name}|${label}|-|-|-" >> .scaling_data.tmp
+        checkpoint_record failed "$rep_name $label"
         return
     fi
     
-    IFS='|' read -r loop_time atoms ts_sec <<< "$metrics"
-    echo "✓ (${loop_time}s, ${atoms} atoms)"
-    echo "${rep_name}|${config_name}|${loop_time}|${atoms}|${ts_sec}" >> .scaling_data.tmp
+    eval "$metrics"
+    if [ -n "$MEASURED_TRIALS" ] && [ "$MEASURED_TRIALS" -gt 1 ]; then
+        echo "✓ (${LOOP_TIME}s median of $MEASURED_TRIALS trials, ${ATOMS} atoms)"
+    else
+        echo "✓ (${LOOP_TIME}s, ${ATOMS} atoms)"
+    fi
+    local line="${rep_name}|${label}|${LOOP_TIME}|${ATOMS}|${TIMESTEP_PER_SEC}"
+    [ "$MEMORY_SCALING" = "1" ] && line+="|${MEMORY_MB}|${RANK_RSS_MB}"
+    echo "$line" >> .scaling_data.tmp
+    checkpoint_record ok "$rep_name $label" "$line"
 }
 
 # Initialize markdown
@@ -239,6 +387,27 @@ generate_results() {
     echo "" >> "$RESULT_FILE"
 }
 
+# Memory scaling report: LAMMPS' per-rank allocation and the peak RSS of the largest rank
+generate_memory_results() {
+    cat > "$RESULT_FILE" << EOF
+# ReaxFF Memory Scaling Benchmark
+
+- **System**: HNS (Hexanitrostilbene) energetic crystal, 304 atoms per unit cell
+- **Timesteps**: ${RUN_STEPS} (memory only; loop times are not comparable to the scaling suite)
+- **Date**: $(date)
+
+| Replicate | Config | Atoms | LAMMPS MB/rank (max) | Peak RSS MB/rank |
+|-----------|--------|-------|----------------------|------------------|
+EOF
+    while IFS='|' read -r rn cfg loop atoms ts memory rss; do
+        echo "| $rn | $cfg | $atoms | ${memory:--} | ${rss:--} |" >> "$RESULT_FILE"
+    done < .scaling_data.tmp
+    cat >> "$RESULT_FILE" << EOF
+
+Memory fit and largest system per node: \`python3 scripts/memory_model.py --store results.db --suite memory\`
+EOF
+}
+
 # Main
 main() {
     download_files
@@ -247,19 +416,23 @@ main() {
     echo "Creating input files..."
     for i in "${!REPLICATES[@]}"; do
         create_input_file "${REPLICATES[$i]}" "${REPLICATE_NAMES[$i]}"
-        echo "  in.reaxff_${REPLICATE_NAMES[$i]} ✓"
+        echo "  in.${RUN_PREFIX}_${REPLICATE_NAMES[$i]} ✓"
     done
     echo ""
     
     # Initialize
+    # Finished points of an interrupted run are re-emitted from the checkpoint (RESUME=0 discards it)
+    [ "$RESUME" = "1" ] || rm -f "$CHECKPOINT"
     rm -f .scaling_data.tmp
-    init_markdown
+    [ "$MEMORY_SCALING" = "1" ] || init_markdown
     
     # Run benchmarks
     echo "==========================================="
     echo "Running Benchmarks"
     echo "==========================================="
     echo ""
+    echo "Trials per configuration: $TRIALS (warm-up runs: $WARMUP)"
+    echo ""
     
     for i in "${!REPLICATES[@]}"; do
         local rep_name="${REPLICATE_NAMES[$i]}"
@@ -270,16 +443,23 @@ main() {
         
         for config in "${BENCHMARK_CONFIGS[@]}"; do
             IFS='|' read -r cfg_name command <<< "$config"
-            run_benchmark "$rep_name" "$cfg_name" "$command"
+            for binding in $BINDINGS; do
+                run_benchmark "$rep_name" "$cfg_name" "$command" "$binding"
+            done
         done
         echo ""
     done
     
     # Generate report
-    generate_results
+    if [ "$MEMORY_SCALING" = "1" ]; then
+        generate_memory_results
+    else
+        generate_results
+    fi
     
     # Cleanup
     rm -f .scaling_data.tmp
+    python3 "$TOOLS_DIR/checkpoint.py" finish "$CHECKPOINT"
     
     echo "==========================================="
     echo "✓ Results saved to: $RESULT_FILE"
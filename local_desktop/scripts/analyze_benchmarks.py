@@ -11,12 +11,30 @@ Groups results into 4 execution categories:
 All speedups are calculated relative to CPU-1 (Serial) baseline.
 """
 
-import re
+import sys
 import pandas as pd
-import matplotlib.pyplot as plt
 import numpy as np
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'scripts'))
+from accuracy import accuracy_points, accuracy_table, plot_pareto  # noqa: E402
+from analysis_cache import CACHE_DIR_NAME, AnalysisCache, source_digest  # noqa: E402
+from analyze import ingest_results, render_figures  # noqa: E402
+from binding import binding_comparison, binding_table  # noqa: E402
+from ensemble import ensemble_points, ensemble_table, plot_ensemble_bars  # noqa: E402
+from phase_breakdown import (FRACTION_COLUMNS, has_phases, phase_fractions,  # noqa: E402
+                             phase_table, plot_phase_bars)
+from result_store import load_runs, store_signature  # noqa: E402
+from size_scaling import SERIES_KINDS, plot_series, scaling_series, size_scaling_table  # noqa: E402
+from startup_cost import (STARTUP_COLUMNS, TIME_COLUMNS, has_startup, plot_startup_bars,  # noqa: E402
+                          startup_costs, startup_table)
+from telemetry import (RUN_TELEMETRY_COLUMNS, TELEMETRY_COLUMNS, has_telemetry,  # noqa: E402
+                       telemetry_summary, telemetry_table)
+from results_frame import (DERIVED_COLUMNS, ROW_KEYS, add_baseline, add_metrics,  # noqa: E402
+                           indexed, interval_errors, lookup)
+from trial_stats import (MIN_TRIALS, best_with_overlap, format_interval,  # noqa: E402
+                         latest_trials, nominal_loop_times, summarize_trials)
+
 
 # ============================================================================
 # Configuration Aliases and Commands
@@ -135,72 +153,105 @@ GROUP_COLORS = {
     "lmp_kokkos (KOKKOS)": "#27ae60" # Green
 }
 
+GROUP_ORDER = ["lmp_gpu (MPI)", "lmp_gpu (CUDA)", "lmp_kokkos (MPI)", "lmp_kokkos (KOKKOS)"]
+
+# LAMMPS binary used by each container image
+IMAGE_BINARIES = {
+    "cuda": "lmp_gpu",
+    "kokkos": "lmp_kokkos",
+}
+
+# Configuration drawn per group in the scaling execution-time plot
+SCALING_CONFIGS = {
+    "lmp_gpu (MPI)": "GPU-CPU-1",
+    "lmp_gpu (CUDA)": "GPU-CUDA-1",
+    "lmp_kokkos (MPI)": "KK-CPU-1",
+    "lmp_kokkos (KOKKOS)": "KK-GPU-1",
+}
+
+BENCHMARKS = ['LJ', 'EAM', 'CHAIN', 'RHODO', 'REAXFF']
+
+REPLICATES = ['3x3x3', '4x4x4', '5x5x5', '6x6x6']
+
+# Per-configuration trial summary columns (see trial_stats.summarize_trials)
+TRIAL_COLUMNS = ['loop_time', 'loop_time_q1', 'loop_time_q3', 'loop_time_ci_low',
+                 'loop_time_ci_high', 'trials', 'loop_time_trials']
+
+# Figure style (applied in every figure worker process)
+PLOT_STYLE = 'seaborn-v0_8-whitegrid'
+FONT_FAMILY = 'DejaVu Sans'
+
+# Cache entries are keyed on this analyzer and every shared script
+SOURCES = source_digest(Path(__file__))
+
 # ============================================================================
-# Parsing Functions
+# Loading Functions
 # ============================================================================
 
-def parse_markdown_table(content: str, start_pattern: str) -> list[dict]:
-    """Parse a markdown table following a specific pattern."""
-    lines = content.split('\n')
-    results = []
-    in_table = False
-    headers = []
-    
-    for i, line in enumerate(lines):
-        if start_pattern in line and '|' in line:
-            in_table = True
-            headers = [h.strip() for h in line.split('|') if h.strip()]
-            continue
-        
-        if in_table:
-            if '---' in line:
-                continue
-            if not line.strip() or '|' not in line:
-                break
-            
-            values = [v.strip() for v in line.split('|') if v.strip()]
-            if len(values) == len(headers):
-                row = dict(zip(headers, values))
-                results.append(row)
-    
-    return results
-
-
-def parse_benchmark_file(filepath: Path, image_type: str) -> dict:
-    """Parse benchmark results and normalize configuration names."""
-    content = filepath.read_text(encoding='utf-8')
-    
-    results = {}
-    benchmarks = ['LJ', 'EAM', 'CHAIN', 'RHODO', 'REAXFF']
-    
-    for bench in benchmarks:
-        pattern = rf'### {bench} Benchmark'
-        if pattern.lower().replace(' benchmark', '') in content.lower():
-            # Find table
-            match = re.search(rf'### {bench}[^\n]*\n\n\|', content, re.IGNORECASE)
-            if match:
-                section = content[match.start():match.start() + 2000]
-                table_data = parse_markdown_table(section, 'Configuration')
-                
-                if table_data:
-                    # Normalize configuration names
-                    normalized_data = []
-                    for row in table_data:
-                        config = row.get('Configuration', '')
-                        loop_time = float(row.get('Loop Time (s)', 0))
-                        
-                        # Map to unified config names
-                        unified_config = normalize_config(config, image_type)
-                        if unified_config:
-                            normalized_data.append({
-                                'config': unified_config,
-                                'loop_time': loop_time,
-                                'original': config
-                            })
-                    
-                    results[bench] = normalized_data
-    
-    return results
+def latest_runs(runs: pd.DataFrame, suite: str, image_type: str) -> pd.DataFrame:
+    """Select one suite and image, keeping the most recent trial set of each unbound configuration."""
+    # Runs under a binding policy (binding.py) are compared separately, see binding_records()
+    unbound = runs['binding'].isna() | (runs['binding'] == 'none')
+    image_runs = runs[(runs['suite'] == suite) & (runs['binary'] == IMAGE_BINARIES[image_type]) & unbound]
+    return latest_trials(nominal_loop_times(image_runs), ['benchmark', 'replicate', 'config'])
+
+
+def build_results(runs: pd.DataFrame) -> pd.DataFrame:
+    """Build the tidy results frame: one row per configuration of both images and suites.
+
+    Configuration names are unified across images. Rows carry the median
+    loop time over trials, phase fractions, launch / setup costs, run
+    telemetry, the CPU-1 run of the lmp_gpu image as baseline and the
+    derived speedup, efficiency and per-core throughput.
+    """
+    parts = []
+    for suite, normalize in [('official', normalize_config), ('scaling', normalize_scaling_config)]:
+        for image_type in IMAGE_BINARIES:
+            selected = latest_runs(runs, suite, image_type)
+            selected = selected.assign(
+                config=[normalize(c, image_type) for c in selected['config']]
+            ).dropna(subset=['config'])
+            summary = summarize_trials(selected, ROW_KEYS).drop(columns=[*TIME_COLUMNS, *RUN_TELEMETRY_COLUMNS])
+            summary = summary.merge(phase_fractions(selected, ROW_KEYS), on=ROW_KEYS, how='left')
+            summary = summary.merge(startup_costs(selected, ROW_KEYS), on=ROW_KEYS, how='left')
+            summary = summary.merge(telemetry_summary(selected, ROW_KEYS), on=ROW_KEYS, how='left')
+            parts.append(summary.assign(image=image_type))
+    results = pd.concat(parts, ignore_index=True).astype({key: str for key in ROW_KEYS})
+    
+    info = [COMMAND_ALIASES.get(config, {}) for config in results['config']]
+    results['group'] = [item.get('group', 'Unknown') for item in info]
+    results['alias'] = [item.get('alias', config) for item, config in zip(info, results['config'])]
+    results['cores'] = [item.get('cores', ranks) for item, ranks in zip(info, results['mpi_ranks'])]
+    results['group_rank'] = [GROUP_ORDER.index(group) if group in GROUP_ORDER else len(GROUP_ORDER)
+                             for group in results['group']]
+    
+    results = add_baseline(results, ['suite', 'benchmark', 'replicate'], results['config'] == 'GPU-CPU-1')
+    results = add_metrics(results)
+    
+    columns = [*ROW_KEYS, 'atoms', 'timesteps', 'image', 'group', 'alias', 'cores', 'group_rank',
+               *TRIAL_COLUMNS, *FRACTION_COLUMNS, *STARTUP_COLUMNS, *TELEMETRY_COLUMNS,
+               *DERIVED_COLUMNS]
+    return results[columns]
+
+
+def binding_records(runs: pd.DataFrame) -> list[dict]:
+    """Best binding of every (unified) configuration run under more than one binding policy."""
+    comparison = []
+    for suite, normalize in [('official', normalize_config), ('scaling', normalize_scaling_config)]:
+        for image_type in IMAGE_BINARIES:
+            selected = runs[(runs['suite'] == suite) & (runs['binary'] == IMAGE_BINARIES[image_type])]
+            selected = selected.assign(
+                config=[normalize(c, image_type) for c in selected['config']]
+            ).dropna(subset=['config'])
+            for item in binding_comparison(nominal_loop_times(selected), ['benchmark', 'replicate', 'config']):
+                comparison.append(dict(item, suite=suite))
+    return comparison
+
+
+def ordered(frame: pd.DataFrame) -> pd.DataFrame:
+    """Configurations with a command alias, by group order then core count."""
+    known = frame[frame['config'].isin(COMMAND_ALIASES)]
+    return known.sort_values(['group_rank', 'cores'], kind='stable')
 
 
 def normalize_config(config: str, image_type: str) -> str:
@@ -228,39 +279,6 @@ def normalize_config(config: str, image_type: str) -> str:
     return mapping.get(config)
 
 
-def parse_scaling_file(filepath: Path, image_type: str) -> pd.DataFrame:
-    """Parse scaling benchmark results."""
-    content = filepath.read_text(encoding='utf-8')
-    
-    all_data = []
-    replicates = ['3x3x3', '4x4x4', '5x5x5', '6x6x6']
-    atoms_map = {'3x3x3': 8208, '4x4x4': 19456, '5x5x5': 38000, '6x6x6': 65664}
-    
-    for rep in replicates:
-        pattern = rf'### Replicate {rep}'
-        match = re.search(pattern, content)
-        
-        if match:
-            section = content[match.start():match.start() + 1000]
-            table_data = parse_markdown_table(section, 'Config')
-            
-            for row in table_data:
-                config = row.get('Config', '')
-                loop_time = float(row.get('Loop Time (s)', 0))
-                
-                unified_config = normalize_scaling_config(config, image_type)
-                if unified_config:
-                    all_data.append({
-                        'replicate': rep,
-                        'atoms': atoms_map[rep],
-                        'config': unified_config,
-                        'loop_time': loop_time,
-                        'group': COMMAND_ALIASES.get(unified_config, {}).get('group', 'Unknown')
-                    })
-    
-    return pd.DataFrame(all_data)
-
-
 def normalize_scaling_config(config: str, image_type: str) -> str:
     """Map scaling config names to unified names."""
     if image_type == "cuda":
@@ -288,91 +306,51 @@ def normalize_scaling_config(config: str, image_type: str) -> str:
 # Plotting Functions
 # ============================================================================
 
-def plot_benchmark_speedup(cuda_data: dict, kokkos_data: dict, output_dir: Path):
+def plot_benchmark_speedup(official: pd.DataFrame, output_dir: Path):
     """Create speedup plot for official benchmarks + ReaxFF."""
-    
-    benchmarks = ['LJ', 'EAM', 'CHAIN', 'RHODO', 'REAXFF']
+    import matplotlib.pyplot as plt
     
     fig, axes = plt.subplots(2, 3, figsize=(16, 10))
     axes = axes.flatten()
+    by_bench = dict(tuple(official.groupby('benchmark', sort=False)))
     
-    for idx, bench in enumerate(benchmarks):
+    for idx, bench in enumerate(BENCHMARKS):
         ax = axes[idx]
-        
-        # Combine data from both images
-        cuda_bench = cuda_data.get(bench, [])
-        kokkos_bench = kokkos_data.get(bench, [])
-        
-        # Get CPU-1 baseline (from cuda image)
-        baseline = None
-        for item in cuda_bench:
-            if item['config'] == 'GPU-CPU-1':
-                baseline = item['loop_time']
-                break
-        
-        if baseline is None:
+    
+        # Speedups are relative to CPU-1 (cuda image)
+        bench_rows = by_bench.get(bench)
+        if bench_rows is None or bench_rows['baseline_time'].isna().all():
             ax.set_visible(False)
             continue
-        
-        # Organize by group
-        groups = {
-            "lmp_gpu (MPI)": [],
-            "lmp_gpu (CUDA)": [],
-            "lmp_kokkos (MPI)": [],
-            "lmp_kokkos (KOKKOS)": []
-        }
-        
-        for item in cuda_bench:
-            config_info = COMMAND_ALIASES.get(item['config'])
-            if config_info:
-                speedup = baseline / item['loop_time']
-                groups[config_info['group']].append({
-                    'alias': config_info['alias'],
-                    'speedup': speedup,
-                    'cores': config_info['cores']
-                })
-        
-        for item in kokkos_bench:
-            config_info = COMMAND_ALIASES.get(item['config'])
-            if config_info:
-                speedup = baseline / item['loop_time']
-                groups[config_info['group']].append({
-                    'alias': config_info['alias'],
-                    'speedup': speedup,
-                    'cores': config_info['cores']
-                })
-        
+    
         # Plot grouped bars
         x_pos = 0
         x_ticks = []
         x_labels = []
-        
-        for group_name, items in groups.items():
-            if not items:
-                continue
-            
-            # Sort by cores
-            items = sorted(items, key=lambda x: x['cores'])
-            
-            for item in items:
-                bar = ax.bar(x_pos, item['speedup'], 
+    
+        for group_name, items in ordered(bench_rows).groupby('group', sort=False):
+            for item in items.to_dict('records'):
+                error = (item['speedup'] - item['speedup_low'], item['speedup_high'] - item['speedup'])
+                yerr = [[error[0]], [error[1]]] if any(error) else None
+                bar = ax.bar(x_pos, item['speedup'],
                            color=GROUP_COLORS[group_name],
-                           edgecolor='black', linewidth=0.5, width=0.8)
-                
-                # Add value label
+                           edgecolor='black', linewidth=0.5, width=0.8,
+                           yerr=yerr, capsize=2, error_kw={'elinewidth': 0.8})
+    
+                # Add value label (above the error bar)
                 ax.annotate(f'{item["speedup"]:.1f}x',
-                           xy=(x_pos, item['speedup']),
+                           xy=(x_pos, item['speedup'] + error[1]),
                            xytext=(0, 3),
                            textcoords="offset points",
                            ha='center', va='bottom', fontsize=7,
                            fontweight='bold')
-                
+    
                 x_ticks.append(x_pos)
                 x_labels.append(item['alias'])
                 x_pos += 1
-            
+    
             x_pos += 0.5  # Gap between groups
-        
+    
         ax.set_xticks(x_ticks)
         ax.set_xticklabels(x_labels, rotation=45, ha='right', fontsize=8)
         ax.set_ylabel('Speedup (vs CPU-1 Serial)', fontsize=10)
@@ -387,57 +365,39 @@ def plot_benchmark_speedup(cuda_data: dict, kokkos_data: dict, output_dir: Path)
     # Add legend
     legend_elements = [plt.Rectangle((0,0),1,1, facecolor=color, label=name, edgecolor='black')
                       for name, color in GROUP_COLORS.items()]
-    fig.legend(handles=legend_elements, loc='lower right', 
+    fig.legend(handles=legend_elements, loc='lower right',
                bbox_to_anchor=(0.95, 0.12), fontsize=10)
     
-    plt.suptitle('Benchmark 1: Official LAMMPS + ReaxFF Performance\n(Speedup vs CPU-1 Serial, Higher is Better)', 
+    plt.suptitle('Benchmark 1: Official LAMMPS + ReaxFF Performance\n(Speedup vs CPU-1 Serial, Higher is Better)',
                  fontsize=14, fontweight='bold')
     plt.tight_layout(rect=[0, 0, 1, 0.96])
     
-    plt.savefig(output_dir / 'benchmark1_speedup.png', dpi=150, 
+    plt.savefig(output_dir / 'benchmark1_speedup.png', dpi=150,
                 bbox_inches='tight', facecolor='white')
     plt.close()
     print(f"Saved: benchmark1_speedup.png")
 
 
-def plot_scaling_speedup(cuda_scaling: pd.DataFrame, kokkos_scaling: pd.DataFrame, output_dir: Path):
+def plot_scaling_speedup(scaling: pd.DataFrame, output_dir: Path):
     """Create scaling speedup plot for ReaxFF."""
+    import matplotlib.pyplot as plt
     
     fig, axes = plt.subplots(1, 2, figsize=(14, 6))
+    index = indexed(scaling)
     
-    # Combine data
-    all_data = pd.concat([cuda_scaling, kokkos_scaling], ignore_index=True)
-    
-    replicates = ['3x3x3', '4x4x4', '5x5x5', '6x6x6']
     atoms = [8208, 19456, 38000, 65664]
     
     # Left plot: Execution time comparison
     ax1 = axes[0]
     
     for group_name, color in GROUP_COLORS.items():
-        group_data = all_data[all_data['group'] == group_name]
-        
-        # Get single-GPU or best config for this group
-        if 'CUDA' in group_name or 'KOKKOS' in group_name:
-            # GPU groups - use single GPU config
-            if 'CUDA' in group_name:
-                config_filter = 'GPU-CUDA-1'
-            else:
-                config_filter = 'KK-GPU-1'
-        else:
-            # CPU groups - use 1 core
-            if 'lmp_gpu' in group_name:
-                config_filter = 'GPU-CPU-1'
-            else:
-                config_filter = 'KK-CPU-1'
-        
-        filtered = group_data[group_data['config'] == config_filter]
-        if not filtered.empty:
-            times = [filtered[filtered['replicate'] == rep]['loop_time'].values[0] 
-                    if not filtered[filtered['replicate'] == rep].empty else np.nan 
-                    for rep in replicates]
-            ax1.plot(atoms, times, 'o-', color=color, linewidth=2, 
-                    markersize=8, label=group_name)
+        # GPU groups - single GPU config; CPU groups - 1 core
+        rows = [lookup(index, ('scaling', 'REAXFF', rep, SCALING_CONFIGS[group_name])) for rep in REPLICATES]
+        if any(rows):
+            times = [row['loop_time'] if row else np.nan for row in rows]
+            errors = interval_errors(rows, 'loop_time', 'loop_time_ci_low', 'loop_time_ci_high')
+            ax1.errorbar(atoms, times, yerr=errors if np.any(errors) else None, fmt='o-', color=color,
+                         linewidth=2, markersize=8, capsize=3, label=group_name)
     
     ax1.set_xlabel('Number of Atoms', fontsize=12)
     ax1.set_ylabel('Loop Time (s)', fontsize=12)
@@ -447,44 +407,29 @@ def plot_scaling_speedup(cuda_scaling: pd.DataFrame, kokkos_scaling: pd.DataFram
     ax1.set_xticks(atoms)
     ax1.set_xticklabels([f'{a//1000}k' for a in atoms])
     
-    # Right plot: Speedup vs CPU-1
+    # Right plot: Speedup vs CPU-1 for GPU configs only
     ax2 = axes[1]
     
-    # Get GPU-CPU-1 baseline for each replicate
-    baselines = {}
-    for rep in replicates:
-        cpu1_data = all_data[(all_data['replicate'] == rep) & 
-                             (all_data['config'] == 'GPU-CPU-1')]
-        if not cpu1_data.empty:
-            baselines[rep] = cpu1_data['loop_time'].values[0]
-    
-    # Plot speedup for GPU configs only
-    gpu_groups = ["lmp_gpu (CUDA)", "lmp_kokkos (KOKKOS)"]
     gpu_configs = {'lmp_gpu (CUDA)': 'GPU-CUDA-1', 'lmp_kokkos (KOKKOS)': 'KK-GPU-1'}
     
-    x = np.arange(len(replicates))
+    x = np.arange(len(REPLICATES))
     width = 0.35
     
     for i, (group_name, config) in enumerate(gpu_configs.items()):
-        speedups = []
-        for rep in replicates:
-            gpu_data = all_data[(all_data['replicate'] == rep) & 
-                               (all_data['config'] == config)]
-            if not gpu_data.empty and rep in baselines:
-                speedup = baselines[rep] / gpu_data['loop_time'].values[0]
-                speedups.append(speedup)
-            else:
-                speedups.append(0)
-        
-        bars = ax2.bar(x + (i - 0.5) * width, speedups, width, 
-                      label=group_name, color=GROUP_COLORS[group_name], edgecolor='black')
-        
-        # Add value labels
-        for bar, speedup in zip(bars, speedups):
+        rows = [lookup(index, ('scaling', 'REAXFF', rep, config)) for rep in REPLICATES]
+        rows = [row if row and isinstance(row['baseline_trials'], tuple) else None for row in rows]
+        speedups = [row['speedup'] if row else 0 for row in rows]
+        errors = interval_errors(rows, 'speedup', 'speedup_low', 'speedup_high')
+    
+        bars = ax2.bar(x + (i - 0.5) * width, speedups, width,
+                      label=group_name, color=GROUP_COLORS[group_name], edgecolor='black',
+                      yerr=errors if np.any(errors) else None, capsize=4)
+    
+        # Add value labels (above the error bar)
+        for bar, speedup, upper in zip(bars, speedups, errors[1]):
             if speedup > 0:
-                height = bar.get_height()
                 ax2.annotate(f'{speedup:.1f}x',
-                            xy=(bar.get_x() + bar.get_width() / 2, height),
+                            xy=(bar.get_x() + bar.get_width() / 2, speedup + upper),
                             xytext=(0, 3),
                             textcoords="offset points",
                             ha='center', va='bottom', fontsize=9, fontweight='bold')
@@ -493,21 +438,198 @@ def plot_scaling_speedup(cuda_scaling: pd.DataFrame, kokkos_scaling: pd.DataFram
     ax2.set_ylabel('Speedup (vs CPU-1 Serial)', fontsize=12)
     ax2.set_title('GPU Speedup by System Size', fontsize=12, fontweight='bold')
     ax2.set_xticks(x)
-    ax2.set_xticklabels([f'{rep}\n({a//1000}k atoms)' for rep, a in zip(replicates, atoms)])
+    ax2.set_xticklabels([f'{rep}\n({a//1000}k atoms)' for rep, a in zip(REPLICATES, atoms)])
     ax2.legend(fontsize=10)
     ax2.grid(axis='y', alpha=0.3)
     ax2.axhline(y=1.0, color='gray', linestyle='--', alpha=0.5)
     
-    plt.suptitle('Benchmark 2: ReaxFF Scaling Performance\n(Speedup vs CPU-1 Serial, Higher is Better)', 
+    plt.suptitle('Benchmark 2: ReaxFF Scaling Performance\n(Speedup vs CPU-1 Serial, Higher is Better)',
                  fontsize=14, fontweight='bold')
     plt.tight_layout(rect=[0, 0, 1, 0.95])
     
-    plt.savefig(output_dir / 'benchmark2_scaling.png', dpi=150, 
+    plt.savefig(output_dir / 'benchmark2_scaling.png', dpi=150,
                 bbox_inches='tight', facecolor='white')
     plt.close()
     print(f"Saved: benchmark2_scaling.png")
 
 
+def phase_records(official: pd.DataFrame, bench: str) -> list[dict]:
+    """Configurations of a benchmark with a timing breakdown, by group and increasing rank count."""
+    rows = ordered(official[official['benchmark'] == bench]).to_dict('records')
+    return [item for item in rows if has_phases(item)]
+
+
+def plot_phase_breakdown(official: pd.DataFrame, output_dir: Path):
+    """Create stacked-bar plot of timing breakdown phase fractions vs rank count."""
+    import matplotlib.pyplot as plt
+    
+    fig, axes = plt.subplots(2, 3, figsize=(16, 10))
+    axes = axes.flatten()
+    legend = True
+    
+    for idx, bench in enumerate(BENCHMARKS):
+        ax = axes[idx]
+        records = phase_records(official, bench)
+    
+        if not records:
+            ax.set_visible(False)
+            continue
+    
+        # Legend on the first visible subplot only
+        plot_phase_bars(ax, [item['config'] for item in records], records, legend=legend)
+        legend = False
+        ax.set_title(f'{bench}', fontsize=12, fontweight='bold')
+    
+    # Hide 6th subplot
+    axes[5].set_visible(False)
+    
+    plt.suptitle('Benchmark 1: Timing Breakdown by Configuration\n(Share of Loop Time per Phase, Comm/Modify-Dominated Marked)',
+                 fontsize=14, fontweight='bold')
+    plt.tight_layout(rect=[0, 0, 1, 0.96])
+    
+    plt.savefig(output_dir / 'benchmark1_phases.png', dpi=150,
+                bbox_inches='tight', facecolor='white')
+    plt.close()
+    print(f"Saved: benchmark1_phases.png")
+
+
+def startup_records(results: pd.DataFrame, suite: str, bench: str, replicate: str = '') -> list[dict]:
+    """Configurations of a benchmark with launch / setup costs, by group and increasing core count."""
+    selected = results[(results['suite'] == suite) & (results['benchmark'] == bench)
+                       & (results['replicate'] == replicate)]
+    return [item for item in ordered(selected).to_dict('records') if has_startup(item)]
+
+
+def telemetry_records(results: pd.DataFrame, suite: str, bench: str, replicate: str = '') -> list[dict]:
+    """Configurations of a benchmark with run telemetry, by group and increasing core count."""
+    selected = results[(results['suite'] == suite) & (results['benchmark'] == bench)
+                       & (results['replicate'] == replicate)]
+    return [item for item in ordered(selected).to_dict('records') if has_telemetry(item)]
+
+
+def startup_panels(results: pd.DataFrame) -> list[tuple]:
+    """(title, records) of each official benchmark and of the largest replicated ReaxFF system."""
+    panels = [(bench, startup_records(results, 'official', bench)) for bench in BENCHMARKS]
+    replicated = [(f'REAXFF {rep} (scaling)', startup_records(results, 'scaling', 'REAXFF', rep))
+                  for rep in REPLICATES]
+    panels.append(next((panel for panel in reversed(replicated) if panel[1]), ('REAXFF (scaling)', [])))
+    return panels
+
+
+def plot_startup_costs(results: pd.DataFrame, output_dir: Path):
+    """Create stacked-bar plot of launch, setup and loop time per configuration."""
+    import matplotlib.pyplot as plt
+    
+    fig, axes = plt.subplots(2, 3, figsize=(16, 10))
+    axes = axes.flatten()
+    legend = True
+    
+    for ax, (title, records) in zip(axes, startup_panels(results)):
+        if not records:
+            ax.set_visible(False)
+            continue
+    
+        # Legend on the first visible subplot only
+        plot_startup_bars(ax, [item['config'] for item in records], records, legend=legend)
+        legend = False
+        ax.set_title(title, fontsize=12, fontweight='bold')
+    
+    plt.suptitle('Startup Cost: Launch + Setup vs Loop Time\n(Median Wall Time per Run, High Fixed Overhead Marked)',
+                 fontsize=14, fontweight='bold')
+    plt.tight_layout(rect=[0, 0, 1, 0.96])
+    
+    plt.savefig(output_dir / 'benchmark_startup.png', dpi=150,
+                bbox_inches='tight', facecolor='white')
+    plt.close()
+    print(f"Saved: benchmark_startup.png")
+
+
+def plot_ensemble_throughput(ensemble: pd.DataFrame, output_dir: Path):
+    """Create aggregate-throughput plot of every ensemble packing against the best single job."""
+    import matplotlib.pyplot as plt
+    
+    fig, axes = plt.subplots(2, 3, figsize=(16, 10))
+    axes = axes.flatten()
+    legend = True
+    
+    for ax, bench in zip(axes, BENCHMARKS):
+        points = ensemble[ensemble['benchmark'] == bench]
+        if points.empty:
+            ax.set_visible(False)
+            continue
+        
+        # Legend on the first visible subplot only
+        plot_ensemble_bars(ax, points, legend=legend)
+        legend = False
+        ax.set_title(f'{bench}', fontsize=12, fontweight='bold')
+    axes[-1].set_visible(False)
+    
+    plt.suptitle('Ensemble Throughput: K Concurrent Copies vs One Wide Run\n'
+                 '(Median Aggregate Atom-Steps/s, Per-Job Loop Time on Bars)', fontsize=14, fontweight='bold')
+    plt.tight_layout(rect=[0, 0, 1, 0.96])
+    
+    plt.savefig(output_dir / 'benchmark1_ensemble.png', dpi=150, bbox_inches='tight', facecolor='white')
+    plt.close()
+    print(f"Saved: benchmark1_ensemble.png")
+
+
+def plot_accuracy_pareto(accuracy: pd.DataFrame, output_dir: Path):
+    """Create loop time vs thermo error plots against the reference run, with the Pareto front."""
+    import matplotlib.pyplot as plt
+    
+    fig, axes = plt.subplots(2, 3, figsize=(16, 10))
+    axes = axes.flatten()
+    legend = True
+    
+    for ax, bench in zip(axes, BENCHMARKS):
+        points = accuracy[accuracy['benchmark'] == bench]
+        if points.empty:
+            ax.set_visible(False)
+            continue
+        
+        # Legend on the first visible subplot only
+        plot_pareto(ax, points, legend=legend)
+        legend = False
+        ax.set_title(f"{bench} (reference: {points['reference'].iloc[0]})", fontsize=12, fontweight='bold')
+    axes[-1].set_visible(False)
+    
+    plt.suptitle('Speed vs Accuracy: GPU / KOKKOS Loop Time vs Deviation from the Reference Run\n'
+                 '(Largest Relative Energy Deviation or Energy Drift)', fontsize=14, fontweight='bold')
+    plt.tight_layout(rect=[0, 0, 1, 0.96])
+    
+    plt.savefig(output_dir / 'benchmark1_accuracy.png', dpi=150, bbox_inches='tight', facecolor='white')
+    plt.close()
+    print(f"Saved: benchmark1_accuracy.png")
+
+
+def plot_size_scaling(size_series: pd.DataFrame, output_dir: Path):
+    """Create strong, weak and system-size scaling plots of the scaled official benchmarks."""
+    import matplotlib.pyplot as plt
+    
+    benchmarks = [bench for bench in BENCHMARKS if bench in set(size_series['benchmark'])]
+    fig, axes = plt.subplots(len(SERIES_KINDS), len(benchmarks), figsize=(4.5 * len(benchmarks), 12),
+                             squeeze=False)
+    titles = {'strong': 'Strong Scaling', 'weak': 'Weak Scaling', 'size': 'System Size'}
+    
+    for row, kind in zip(axes, SERIES_KINDS):
+        for ax, bench in zip(row, benchmarks):
+            series = size_series[(size_series['benchmark'] == bench) & (size_series['kind'] == kind)]
+            if series.empty:
+                ax.set_visible(False)
+                continue
+            plot_series(ax, series, kind)
+            ax.set_title(f'{bench} - {titles[kind]}', fontsize=12, fontweight='bold')
+    
+    plt.suptitle('Official Benchmarks Scaled from 32k Atoms (CPU: parallel efficiency, GPU: throughput)\n'
+                 '(Median Loop Time per Point)', fontsize=14, fontweight='bold')
+    plt.tight_layout(rect=[0, 0, 1, 0.96])
+    
+    plt.savefig(output_dir / 'benchmark3_size_scaling.png', dpi=150,
+                bbox_inches='tight', facecolor='white')
+    plt.close()
+    print(f"Saved: benchmark3_size_scaling.png")
+
+
 def generate_command_reference() -> str:
     """Generate command reference table in markdown."""
     
@@ -519,7 +641,7 @@ def generate_command_reference() -> str:
     ]
     
     # Sort by group
-    for group in ["lmp_gpu (MPI)", "lmp_gpu (CUDA)", "lmp_kokkos (MPI)", "lmp_kokkos (KOKKOS)"]:
+    for group in GROUP_ORDER:
         for config_id, info in COMMAND_ALIASES.items():
             if info['group'] == group:
                 lines.append(f"| {group} | {info['alias']} | `{info['command']}` |")
@@ -527,185 +649,361 @@ def generate_command_reference() -> str:
     return "\n".join(lines)
 
 
-def generate_benchmark1_tables(cuda_data: dict, kokkos_data: dict) -> str:
+def generate_benchmark1_tables(official: pd.DataFrame) -> str:
     """Generate Benchmark 1 result tables in markdown."""
     
-    benchmarks = ['LJ', 'EAM', 'CHAIN', 'RHODO', 'REAXFF']
     lines = ["## Benchmark 1: Parsed Results (for README)", ""]
+    by_bench = dict(tuple(official.groupby('benchmark', sort=False)))
     
-    for bench in benchmarks:
-        cuda_bench = cuda_data.get(bench, [])
-        kokkos_bench = kokkos_data.get(bench, [])
-        
-        # Get CPU-1 baseline (from cuda image)
-        baseline = None
-        for item in cuda_bench:
-            if item['config'] == 'GPU-CPU-1':
-                baseline = item['loop_time']
-                break
-        
-        if baseline is None:
+    for bench in BENCHMARKS:
+        # Speedups are relative to CPU-1 (cuda image)
+        bench_rows = by_bench.get(bench)
+        if bench_rows is None or bench_rows['baseline_time'].isna().all():
             continue
-        
+    
         lines.append(f"### {bench}")
         lines.append("")
         lines.append("| Group | Config | Loop Time (s) | Speedup |")
         lines.append("|-------|--------|---------------|---------|")
-        
-        # Combine and sort by group
-        all_items = []
-        for item in cuda_bench:
-            config_info = COMMAND_ALIASES.get(item['config'])
-            if config_info:
-                speedup = baseline / item['loop_time']
-                all_items.append({
-                    'group': config_info['group'],
-                    'alias': config_info['alias'],
-                    'loop_time': item['loop_time'],
-                    'speedup': speedup,
-                    'cores': config_info['cores']
-                })
-        
-        for item in kokkos_bench:
-            config_info = COMMAND_ALIASES.get(item['config'])
-            if config_info:
-                speedup = baseline / item['loop_time']
-                all_items.append({
-                    'group': config_info['group'],
-                    'alias': config_info['alias'],
-                    'loop_time': item['loop_time'],
-                    'speedup': speedup,
-                    'cores': config_info['cores']
-                })
-        
-        # Sort by group order then cores
-        group_order = ["lmp_gpu (MPI)", "lmp_gpu (CUDA)", "lmp_kokkos (MPI)", "lmp_kokkos (KOKKOS)"]
-        all_items.sort(key=lambda x: (group_order.index(x['group']), x['cores']))
-        
-        for item in all_items:
+    
+        for item in ordered(bench_rows).to_dict('records'):
             lines.append(f"| {item['group']} | {item['alias']} | {item['loop_time']:.4f} | {item['speedup']:.2f}x |")
-        
+    
         lines.append("")
     
     return "\n".join(lines)
 
 
-def generate_scaling_table(cuda_scaling: pd.DataFrame, kokkos_scaling: pd.DataFrame) -> str:
+def generate_scaling_table(scaling: pd.DataFrame) -> str:
     """Generate Benchmark 2 scaling result tables in markdown."""
     
     lines = ["## Benchmark 2: ReaxFF Scaling Parsed Results", ""]
     
-    # Combine data
-    all_data = pd.concat([cuda_scaling, kokkos_scaling], ignore_index=True)
-    
-    replicates = ['3x3x3', '4x4x4', '5x5x5', '6x6x6']
-    
-    # Get baselines
-    baselines = {}
-    for rep in replicates:
-        cpu1_data = all_data[(all_data['replicate'] == rep) & 
-                             (all_data['config'] == 'GPU-CPU-1')]
-        if not cpu1_data.empty:
-            baselines[rep] = cpu1_data['loop_time'].values[0]
+    index = indexed(scaling)
+    by_rep = dict(tuple(scaling.groupby('replicate', sort=False)))
     
     lines.append("### Summary Table (GPU Speedup)")
     lines.append("")
     lines.append("| Replicate | Atoms | CPU-1 (s) | CUDA GPU-1 (s) | CUDA Speedup | KOKKOS GPU-1 (s) | KOKKOS Speedup |")
     lines.append("|-----------|-------|-----------|----------------|--------------|------------------|----------------|")
     
-    for rep in replicates:
-        atoms = all_data[all_data['replicate'] == rep]['atoms'].values[0] if not all_data[all_data['replicate'] == rep].empty else 0
-        
-        # CPU-1 baseline
-        cpu1_time = baselines.get(rep, 0)
-        
-        # CUDA GPU-1
-        cuda_gpu = all_data[(all_data['replicate'] == rep) & (all_data['config'] == 'GPU-CUDA-1')]
-        cuda_time = cuda_gpu['loop_time'].values[0] if not cuda_gpu.empty else 0
+    for rep in REPLICATES:
+        atoms = by_rep[rep]['atoms'].iloc[0] if rep in by_rep else 0
+    
+        # CPU-1 baseline, CUDA GPU-1 and KOKKOS GPU-1
+        times = {}
+        for config in ['GPU-CPU-1', 'GPU-CUDA-1', 'KK-GPU-1']:
+            row = lookup(index, ('scaling', 'REAXFF', rep, config))
+            times[config] = row['loop_time'] if row else 0
+        cpu1_time = times['GPU-CPU-1']
+        cuda_time = times['GPU-CUDA-1']
         cuda_speedup = cpu1_time / cuda_time if cuda_time > 0 else 0
-        
-        # KOKKOS GPU-1
-        kokkos_gpu = all_data[(all_data['replicate'] == rep) & (all_data['config'] == 'KK-GPU-1')]
-        kokkos_time = kokkos_gpu['loop_time'].values[0] if not kokkos_gpu.empty else 0
+        kokkos_time = times['KK-GPU-1']
         kokkos_speedup = cpu1_time / kokkos_time if kokkos_time > 0 else 0
-        
-        lines.append(f"| {rep} | {atoms:,} | {cpu1_time:.2f} | {cuda_time:.2f} | {cuda_speedup:.2f}x | {kokkos_time:.2f} | {kokkos_speedup:.2f}x |")
+    
+        lines.append(f"| {rep} | {atoms:,.0f} | {cpu1_time:.2f} | {cuda_time:.2f} | {cuda_speedup:.2f}x | {kokkos_time:.2f} | {kokkos_speedup:.2f}x |")
     
     lines.append("")
     
-    # Detailed tables per replicate
-    for rep in replicates:
-        rep_data = all_data[all_data['replicate'] == rep]
-        baseline = baselines.get(rep, 1)
-        
+    # Detailed tables per replicate (configurations without an alias included)
+    for rep in REPLICATES:
         lines.append(f"### {rep} Details")
         lines.append("")
         lines.append("| Group | Config | Loop Time (s) | Speedup |")
         lines.append("|-------|--------|---------------|---------|")
-        
-        for _, row in rep_data.iterrows():
-            config_info = COMMAND_ALIASES.get(row['config'], {})
-            alias = config_info.get('alias', row['config'])
-            group = row.get('group', 'Unknown')
+    
+        rep_rows = by_rep[rep].to_dict('records') if rep in by_rep else []
+        for row in rep_rows:
+            baseline = 1 if np.isnan(row['baseline_time']) else row['baseline_time']
             speedup = baseline / row['loop_time'] if row['loop_time'] > 0 else 0
-            lines.append(f"| {group} | {alias} | {row['loop_time']:.2f} | {speedup:.2f}x |")
-        
+            lines.append(f"| {row['group']} | {row['alias']} | {row['loop_time']:.2f} | {speedup:.2f}x |")
+    
         lines.append("")
     
     return "\n".join(lines)
 
 
+def generate_trial_statistics_table(results: pd.DataFrame) -> str:
+    """Generate median / IQR / bootstrap CI table of loop time and speedup in markdown."""
+    
+    lines = [
+        "## Trial Statistics (median, IQR and 95% bootstrap CI)",
+        "",
+        "| Benchmark | Config | Trials | Median (s) | IQR (s) | 95% CI (s) | Speedup | 95% CI |",
+        "|-----------|--------|--------|------------|---------|------------|---------|--------|"
+    ]
+    
+    # Official benchmarks per benchmark, scaling runs per replicate
+    known = results[results['config'].isin(COMMAND_ALIASES)]
+    by_suite = dict(tuple(known.groupby('suite', sort=False)))
+    by_bench = dict(tuple(by_suite['official'].groupby('benchmark', sort=False))) if 'official' in by_suite else {}
+    by_rep = dict(tuple(by_suite['scaling'].groupby('replicate', sort=False))) if 'scaling' in by_suite else {}
+    sections = [(bench, by_bench[bench]) for bench in BENCHMARKS if bench in by_bench]
+    sections += [(f"REAXFF {rep}", by_rep[rep]) for rep in REPLICATES if rep in by_rep]
+    
+    overlaps = []
+    for name, items in sections:
+        items = items.to_dict('records')
+    
+        # Speedup vs CPU-1 (cuda image); † marks a fastest config whose CI overlaps a runner-up
+        best, ties = best_with_overlap(items)
+        if ties:
+            overlaps.append(f"{name} {best['alias']} ≈ " + ", ".join(item['alias'] for item in ties))
+    
+        for item in items:
+            alias = f"{item['group']} {item['alias']}"
+            if item is best:
+                alias = f"**{alias}**" + ("†" if ties else "")
+            if isinstance(item['baseline_trials'], tuple):
+                speedup_cols = f"{item['speedup']:.2f}x | {format_interval(item['speedup_low'], item['speedup_high'], 2)}"
+            else:
+                speedup_cols = "- | -"
+            iqr = item['loop_time_q3'] - item['loop_time_q1']
+            ci = format_interval(item['loop_time_ci_low'], item['loop_time_ci_high'], 4)
+            lines.append(f"| {name} | {alias} | {item['trials']} | {item['loop_time']:.4f} | {iqr:.4f} | {ci} | {speedup_cols} |")
+    
+    lines.append("")
+    lines.append("**Bold**: fastest configuration.")
+    if overlaps:
+        lines.append("")
+        lines.append("† 95% CI of the fastest configuration overlaps: " + "; ".join(overlaps))
+    min_trials = min((items['trials'].min() for _, items in sections), default=None)
+    if min_trials is not None and min_trials < MIN_TRIALS:
+        lines.append("")
+        lines.append(f"Some configurations have fewer than {MIN_TRIALS} trials; their intervals are "
+                     f"not meaningful (rerun with TRIALS={MIN_TRIALS} or more).")
+    
+    return "\n".join(lines)
+
+
+def generate_phase_table(official: pd.DataFrame) -> str:
+    """Generate timing breakdown table in markdown, flagging Comm- or Modify-dominated configurations."""
+    
+    rows = [(bench, f"{item['group']} {item['alias']}", item)
+            for bench in BENCHMARKS for item in phase_records(official, bench)]
+    if not rows:
+        return ""
+    
+    lines = ["## Timing Breakdown (% of loop time, median over trials)", ""]
+    lines += phase_table(rows)
+    return "\n".join(lines)
+
+
+def generate_startup_table(results: pd.DataFrame) -> str:
+    """Generate launch / setup vs loop time table in markdown, flagging high fixed overhead."""
+    
+    rows = [(bench, f"{item['group']} {item['alias']}", item)
+            for bench in BENCHMARKS for item in startup_records(results, 'official', bench)]
+    rows += [(f"REAXFF {rep}", f"{item['group']} {item['alias']}", item)
+             for rep in REPLICATES for item in startup_records(results, 'scaling', 'REAXFF', rep)]
+    if not rows:
+        return ""
+    
+    lines = ["## Startup Cost (launch + setup vs loop, median over trials)", ""]
+    lines += startup_table(rows)
+    return "\n".join(lines)
+
+
+def generate_telemetry_table(results: pd.DataFrame) -> str:
+    """Generate run telemetry table in markdown, flagging oversubscribed, idle, throttled or NUMA-remote runs."""
+    
+    rows = [(bench, f"{item['group']} {item['alias']}", item)
+            for bench in BENCHMARKS for item in telemetry_records(results, 'official', bench)]
+    rows += [(f"REAXFF {rep}", f"{item['group']} {item['alias']}", item)
+             for rep in REPLICATES for item in telemetry_records(results, 'scaling', 'REAXFF', rep)]
+    if not rows:
+        return ""
+    
+    lines = ["## Run Telemetry (median over trials, peak rank RSS)", ""]
+    lines += telemetry_table(rows)
+    return "\n".join(lines)
+
+
+def generate_binding_table(bindings: list[dict]) -> str:
+    """Generate the best binding policy of every configuration against its unbound run in markdown."""
+    
+    rows = []
+    for item in bindings:
+        bench, replicate, config = item['key']
+        info = COMMAND_ALIASES.get(config, {})
+        label = f"{info['group']} {info['alias']}" if info else config
+        rows.append((f"{bench} {replicate}".strip(), label, item))
+    if not rows:
+        return ""
+    
+    lines = ["## Best Binding per Configuration (median over trials)", ""]
+    lines += binding_table(rows)
+    return "\n".join(lines)
+
+
+def generate_size_scaling_table(size_series: pd.DataFrame) -> str:
+    """Generate strong, weak and system-size scaling of the scaled official benchmarks in markdown."""
+    
+    if size_series.empty:
+        return ""
+    
+    lines = ["## Weak and Strong Scaling of the Official Benchmarks (median over trials)", ""]
+    lines += size_scaling_table(size_series)
+    return "\n".join(lines)
+
+
+def generate_ensemble_table(ensemble: pd.DataFrame) -> str:
+    """Generate aggregate throughput and per-job latency of the ensemble packings in markdown."""
+    
+    if ensemble.empty:
+        return ""
+    
+    lines = ["## Ensemble Throughput: K Concurrent Copies vs One Wide Run (median over trials)", ""]
+    lines += ensemble_table(ensemble)
+    return "\n".join(lines)
+
+
+def generate_accuracy_table(accuracy: pd.DataFrame) -> str:
+    """Generate thermo deviations from the reference run and the speed-vs-accuracy Pareto front in markdown."""
+    
+    if accuracy.empty:
+        return ""
+    
+    lines = ["## Speed vs Accuracy: Deviation from the Reference Run (median over trials)", ""]
+    lines += accuracy_table(accuracy)
+    return "\n".join(lines)
+
+
 # ============================================================================
 # Main
 # ============================================================================
 
+def apply_style():
+    """Non-interactive backend and figure style (also run by every figure worker)."""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    plt.style.use(PLOT_STYLE)
+    plt.rcParams['font.family'] = FONT_FAMILY
+
+
+def load_data(cache: AnalysisCache, store_path: Path) -> dict:
+    """Runs of the store and every frame the figures and tables are views of."""
+    runs = cache.memoize('runs', [store_signature(store_path), SOURCES], lambda: load_runs(store_path))
+    
+    # Build the tidy results frame every figure and table is a view of
+    results = cache.memoize('results', [runs, SOURCES], lambda: build_results(runs))
+    bindings = cache.memoize('bindings', [runs, SOURCES], lambda: binding_records(runs))
+    ensemble = cache.memoize('ensemble', [runs, SOURCES], lambda: ensemble_points(runs))
+    accuracy = cache.memoize('accuracy', [runs, SOURCES], lambda: accuracy_points(runs))
+    size_series = cache.memoize('size_scaling', [runs, SOURCES], lambda: scaling_series(runs))
+    return {'runs': runs, 'results': results, 'bindings': bindings, 'ensemble': ensemble,
+            'accuracy': accuracy, 'size_series': size_series}
+
+
+def plot_params() -> list:
+    """Everything the figures depend on besides their data (part of their cache keys)."""
+    return [SOURCES]
+
+
+def figure_list(data: dict) -> list[tuple]:
+    """(file name, plot function, data) of every figure with data in the store."""
+    results = data['results']
+    official = results[results['suite'] == 'official']
+    scaling = results[results['suite'] == 'scaling']
+    figures = [
+        ('benchmark1_speedup.png', plot_benchmark_speedup, official),
+        ('benchmark2_scaling.png', plot_scaling_speedup, scaling),
+    ]
+    # Markdown-only results carry no timing breakdown
+    if any(phase_records(official, bench) for bench in BENCHMARKS):
+        figures.append(('benchmark1_phases.png', plot_phase_breakdown, official))
+    else:
+        print("Skipped: benchmark1_phases.png (no timing breakdown in the store)")
+    if any(records for _, records in startup_panels(results)):
+        figures.append(('benchmark_startup.png', plot_startup_costs, results))
+    else:
+        print("Skipped: benchmark_startup.png (no wall times in the store)")
+    if not data['ensemble'].empty:
+        figures.append(('benchmark1_ensemble.png', plot_ensemble_throughput, data['ensemble']))
+    else:
+        print("Skipped: benchmark1_ensemble.png (no ensemble runs in the store)")
+    if not data['accuracy'].empty:
+        figures.append(('benchmark1_accuracy.png', plot_accuracy_pareto, data['accuracy']))
+    else:
+        print("Skipped: benchmark1_accuracy.png (no thermo output with a reference run in the store)")
+    if not data['size_series'].empty:
+        figures.append(('benchmark3_size_scaling.png', plot_size_scaling, data['size_series']))
+    else:
+        print("Skipped: benchmark3_size_scaling.png (no size-scaling runs in the store)")
+    return figures
+
+
+def summary_tables(data: dict, cache: AnalysisCache) -> str:
+    """Printed summary tables (the README sections)."""
+    results, bindings = data['results'], data['bindings']
+    size_series, ensemble, accuracy = data['size_series'], data['ensemble'], data['accuracy']
+    official = results[results['suite'] == 'official']
+    scaling = results[results['suite'] == 'scaling']
+    tables = cache.memoize(
+        'tables', [results, bindings, size_series, ensemble, accuracy, SOURCES],
+        lambda: [generate_benchmark1_tables(official),
+                 generate_scaling_table(scaling),
+                 generate_trial_statistics_table(results),
+                 generate_phase_table(official),
+                 generate_startup_table(results),
+                 generate_telemetry_table(results),
+                 generate_binding_table(bindings),
+                 generate_size_scaling_table(size_series),
+                 generate_ensemble_table(ensemble),
+                 generate_accuracy_table(accuracy),
+                 generate_command_reference()])
+    return "".join(f"\n{table}\n" for table in filter(None, tables))
+
+
 def main():
     base_dir = Path(__file__).parent.parent
     output_dir = base_dir / 'figures'
     output_dir.mkdir(exist_ok=True)
     
-    plt.style.use('seaborn-v0_8-whitegrid')
-    plt.rcParams['font.family'] = 'DejaVu Sans'
+    apply_style()
     
     print("=" * 60)
     print("LAMMPS Benchmark Results Analyzer")
     print("=" * 60)
     
-    # Parse benchmark 1 data
-    print("\n[1/4] Parsing CUDA image benchmark...")
-    cuda_bench_path = base_dir / 'lammps_cuda_image' / 'official+reaxff_bench' / 'benchmark_results.md'
-    cuda_data = parse_benchmark_file(cuda_bench_path, "cuda")
-    print(f"  Found: {list(cuda_data.keys())}")
-    
-    print("\n[2/4] Parsing KOKKOS image benchmark...")
-    kokkos_bench_path = base_dir / 'lammps_kokkos_image' / 'official+reaxff_bench' / 'benchmark_results.md'
-    kokkos_data = parse_benchmark_file(kokkos_bench_path, "kokkos")
-    print(f"  Found: {list(kokkos_data.keys())}")
-    
-    # Parse benchmark 2 data
-    print("\n[3/4] Parsing scaling benchmarks...")
-    cuda_scaling_path = base_dir / 'lammps_cuda_image' / 'reaxff_scaling_bench' / 'reaxff_scaling_results.md'
-    cuda_scaling = parse_scaling_file(cuda_scaling_path, "cuda")
-    print(f"  CUDA scaling: {len(cuda_scaling)} rows")
-    
-    kokkos_scaling_path = base_dir / 'lammps_kokkos_image' / 'reaxff_scaling' / 'reaxff_scaling_results.md'
-    kokkos_scaling = parse_scaling_file(kokkos_scaling_path, "kokkos")
-    print(f"  KOKKOS scaling: {len(kokkos_scaling)} rows")
-    
-    # Generate figures
+    # Load result store (markdown results and LAMMPS logs next to them are
+    # ingested once per content change)
+    print("\n[1/4] Loading result store...")
+    ingest_results('local')
+    
+    # Parsed data, tables and figures are reused while their inputs are unchanged
+    cache = AnalysisCache(base_dir / CACHE_DIR_NAME)
+    data = load_data(cache, base_dir / 'results.db')
+    print(f"  Store: {len(data['runs'])} runs")
+    official = data['results'][data['results']['suite'] == 'official']
+    scaling = data['results'][data['results']['suite'] == 'scaling']
+    
+    # Select benchmark 1 data
+    print("\n[2/4] Selecting official+reaxff benchmark data...")
+    images = official.groupby('image', sort=False)['benchmark'].agg(set)
+    for image_type in IMAGE_BINARIES:
+        present = images.get(image_type, set())
+        print(f"  {image_type.upper()}: {[bench for bench in BENCHMARKS if bench in present]}")
+    
+    # Select benchmark 2 data
+    print("\n[3/4] Selecting scaling benchmark data...")
+    counts = scaling['image'].value_counts()
+    for image_type in IMAGE_BINARIES:
+        print(f"  {image_type.upper()} scaling: {counts.get(image_type, 0)} rows")
+    
+    # Generate figures (changed ones in parallel worker processes)
     print("\n[4/4] Generating figures...")
-    plot_benchmark_speedup(cuda_data, kokkos_data, output_dir)
-    plot_scaling_speedup(cuda_scaling, kokkos_scaling, output_dir)
+    render_figures(cache, 'local', figure_list(data), plot_params(), output_dir)
     
     # Print parsed data tables
     print("\n" + "=" * 60)
     print("PARSED DATA TABLES (Copy to README)")
     print("=" * 60)
+    print(summary_tables(data, cache), end='')
     
-    print("\n" + generate_benchmark1_tables(cuda_data, kokkos_data))
-    print("\n" + generate_scaling_table(cuda_scaling, kokkos_scaling))
-    print("\n" + generate_command_reference())
-    
+    print(f"\nCache: {cache.summary()}")
     print("\n" + "=" * 60)
     print(f"Figures saved to: {output_dir}")
     print("=" * 60)
@@ -713,4 +1011,3 @@ def main():
 
 if __name__ == '__main__':
     main()
-
@@ -17,7 +17,89 @@ echo ""
 # Configuration
 BENCH_DIR="lammps_benchmarks"
 RESULT_FILE="benchmark_results.md"
-LAMMPS_BENCH_URL="https://raw.githubusercontent.com/lammps/lammps/stable/bench"
+
+# Benchmark inputs (scripts/input_cache.py): pinned to LAMMPS_TAG and verified by SHA-256 in a
+# content-addressed INPUT_CACHE that can be pre-filled once and shared read-only by all nodes;
+# OFFLINE=1 never touches the network (missing inputs are an error)
+LAMMPS_TAG="${LAMMPS_TAG:-stable_29Aug2024_update1}"
+INPUT_CACHE="${INPUT_CACHE:-$HOME/.cache/lammps_bench_inputs}"
+OFFLINE="${OFFLINE:-0}"
+
+# Result store (SQLite, one row per run) and the shared Python tools
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+TOOLS_DIR="${TOOLS_DIR:-$SCRIPT_DIR/../../scripts}"
+RESULT_STORE="${RESULT_STORE:-$SCRIPT_DIR/../results.db}"
+
+# Repeated trials: WARMUP untimed runs, then TRIALS measured runs per configuration
+# (the median trial is reported, every trial is recorded in the result store)
+TRIALS="${TRIALS:-1}"
+WARMUP="${WARMUP:-0}"
+
+# Adaptive run length (scripts/adaptive_run.py): ADAPTIVE=1 extends runs shorter than
+# MIN_TIME seconds and ends long runs once the per-step time is steady within STEADY_TOL
+ADAPTIVE="${ADAPTIVE:-0}"
+MIN_TIME="${MIN_TIME:-5}"
+STEADY_TOL="${STEADY_TOL:-0.02}"
+
+# Hardware telemetry (scripts/telemetry.py): TELEMETRY=1 samples core utilization, frequency,
+# context switches, rank RSS and NUMA placement every TELEMETRY_INTERVAL seconds of each trial
+TELEMETRY="${TELEMETRY:-1}"
+TELEMETRY_INTERVAL="${TELEMETRY_INTERVAL:-1}"
+
+# Binding policies (scripts/binding.py): every configuration runs once per policy in BINDINGS
+# (none core compact spread socket numa pcore); policies that do not fit the machine or the
+# decomposition are skipped, bound runs log to log.<name>.bind-<policy>
+BINDINGS="${BINDINGS:-none}"
+
+# Concurrent sweep (scripts/sweep.py): SWEEP_PARALLEL=1 packs runs onto disjoint,
+# pinned core sets; SWEEP_ISOLATE=none|benchmark|all controls co-scheduling
+SWEEP_PARALLEL="${SWEEP_PARALLEL:-0}"
+SWEEP_ISOLATE="${SWEEP_ISOLATE:-none}"
+
+# Resumable sweeps (scripts/checkpoint.py): every point is checkpointed in CHECKPOINT as soon
+# as it finishes, so a restarted job reruns only missing or failed points (RESUME=0 starts over)
+RESUME="${RESUME:-1}"
+CHECKPOINT="${CHECKPOINT:-$PWD/.sweep_checkpoint.jsonl}"
+
+# Size scaling (scripts/size_scaling.py): SIZE_SCALING=1 runs LJ, EAM, CHAIN and RHODO scaled by
+# SIZE_REPLICATES (32,000 atoms each at 1x1x1) as pure MPI on every SIZE_CORES count of each
+# SIZE_BINARIES binary, plus SIZE_PER_CORE copies of the 32k input per core (weak scaling), instead
+# of the official suite (suite "size", logs log.size_*); -c configurations are added to the sweep
+SIZE_SCALING="${SIZE_SCALING:-0}"
+SIZE_REPLICATES="${SIZE_REPLICATES:-1x1x1 2x2x2 4x4x4 6x6x6}"
+SIZE_CORES="${SIZE_CORES:-1 2 4 8 16 24 48}"
+SIZE_PER_CORE="${SIZE_PER_CORE:-1 4}"
+SIZE_BINARIES="${SIZE_BINARIES:-opt=lmp conda=lmp_mpi_conda}"
+SIZE_ACCEL="${SIZE_ACCEL:-omp}"
+SIZE_MAX_ATOMS_PER_CORE="${SIZE_MAX_ATOMS_PER_CORE:-500000}"
+SIZE_RESULT_FILE="size_scaling_results.md"
+
+# Ensemble throughput (scripts/ensemble.py): ENSEMBLE=1 runs every -c configuration as K concurrent,
+# pinned copies of each benchmark instead of one job (K = cores // cores per copy, e.g. 48 x serial;
+# ENSEMBLE_COPIES fixes K, GPU configurations run ENSEMBLE_GPU_COPIES copies sharing the GPU) and
+# reports aggregate atom-steps/s and per-job loop time (suite "ensemble", logs log.ensemble_*)
+ENSEMBLE="${ENSEMBLE:-0}"
+ENSEMBLE_COPIES="${ENSEMBLE_COPIES:-}"
+ENSEMBLE_GPU_COPIES="${ENSEMBLE_GPU_COPIES:-1 2 4}"
+ENSEMBLE_RESULT_FILE="ensemble_results.md"
+
+# In-process driver (scripts/lammps_driver.py): INPROCESS=1 runs every -c configuration through the
+# LAMMPS Python module (mpi4py for several ranks), setting each input up once and timing TRIALS
+# repeated run segments after WARMUP untimed ones (suite "inprocess"; INPROCESS_BACKEND=mock runs
+# the driver's timing model without LAMMPS)
+INPROCESS="${INPROCESS:-0}"
+INPROCESS_BACKEND="${INPROCESS_BACKEND:-lammps}"
+INPROCESS_RESULT_FILE="inprocess_results.md"
+
+# Speed vs accuracy (scripts/accuracy.py): after the sweep the final thermo values of every configuration
+# are compared with a double-precision serial reference run of the same benchmark, and the loop time vs
+# error Pareto front is written to ACCURACY_RESULT_FILE. ACCURACY_REFERENCE runs that reference as the
+# first configuration (e.g. the stock conda build without -fp-model fast=2: "ref-serial|1|lmp_mpi_conda -in");
+# without it a serial CPU configuration among -c is the reference. ACCURACY_TOLERANCE is the largest
+# acceptable relative energy deviation or drift
+ACCURACY_REFERENCE="${ACCURACY_REFERENCE:-}"
+ACCURACY_TOLERANCE="${ACCURACY_TOLERANCE:-1e-3}"
+ACCURACY_RESULT_FILE="accuracy_results.md"
 
 # Benchmark configurations to test
 # Format: "name|command"
@@ -56,7 +138,7 @@ EOF
 
 # Parse command line arguments
 parse_arguments() {
-    if [ $# -eq 0 ]; then
+    if [ $# -eq 0 ] && [ "$SIZE_SCALING" != "1" ]; then
         echo "Error: No benchmark configurations specified"
         echo ""
         show_usage
@@ -81,7 +163,7 @@ parse_arguments() {
         esac
     done
     
-    if [ ${#BENCHMARK_CONFIGS[@]} -eq 0 ]; then
+    if [ ${#BENCHMARK_CONFIGS[@]} -eq 0 ] && [ "$SIZE_SCALING" != "1" ]; then
         echo "Error: No benchmark configurations specified"
         echo ""
         show_usage
@@ -89,19 +171,28 @@ parse_arguments() {
     fi
 }
 
+# Copy the pinned inputs of a suite from the input cache into BENCH_DIR (downloading
+# uncached ones unless OFFLINE=1); exits if any input is unavailable
+fetch_inputs() {
+    local suite=$1
+    local offline=()
+    [ "$OFFLINE" = "1" ] && offline=(--offline)
+    
+    echo "LAMMPS inputs: $LAMMPS_TAG (cache: $INPUT_CACHE)"
+    if ! python3 "$TOOLS_DIR/input_cache.py" materialize "$BENCH_DIR" --suite "$suite" \
+            --tag "$LAMMPS_TAG" --cache "$INPUT_CACHE" "${offline[@]}"; then
+        exit 1
+    fi
+}
+
 # Download benchmarks
 download_benchmarks() {
     echo "=========================================="
-    echo "Downloading LAMMPS Official Benchmarks"
+    echo "Preparing LAMMPS Official Benchmarks"
     echo "=========================================="
     echo ""
     
-    if ! command -v wget &> /dev/null; then
-        echo "Error: wget is required but not found"
-        exit 1
-    fi
-    
-    mkdir -p "$BENCH_DIR"
+    fetch_inputs official
     
     # Use pushd/popd for safe directory handling
     if ! pushd "$BENCH_DIR" > /dev/null 2>&1; then
@@ -109,51 +200,6 @@ download_benchmarks() {
         exit 1
     fi
     
-    # Benchmark files to download
-    local files=(
-        "in.lj"
-        "in.chain"
-        "in.eam"
-        "in.rhodo"
-        "Cu_u3.eam"
-        "data.chain"
-        "data.rhodo"
-    )
-    
-    # ReaxFF files from examples directory (different URL)
-    local reaxff_files=(
-        "in.reaxff.hns"
-        "data.hns-equil"
-        "ffield.reax.hns"
-    )
-    local LAMMPS_REAXFF_URL="https://raw.githubusercontent.com/lammps/lammps/stable/examples/reaxff/HNS"
-    
-    echo "Downloading benchmark files..."
-    local downloaded=0
-    
-    for file in "${files[@]}"; do
-        echo -n "  $file ... "
-        if wget -q "${LAMMPS_BENCH_URL}/${file}" -O "$file" 2>/dev/null; then
-            echo "✓"
-            ((downloaded++)) || true  # Prevent exit on arithmetic
-        else
-            echo "✗ (skipped)"
-        fi
-    done
-    
-    # Download ReaxFF files from examples directory
-    echo ""
-    echo "Downloading ReaxFF benchmark files..."
-    for file in "${reaxff_files[@]}"; do
-        echo -n "  $file ... "
-        if wget -q "${LAMMPS_REAXFF_URL}/${file}" -O "$file" 2>/dev/null; then
-            echo "✓"
-            ((downloaded++)) || true
-        else
-            echo "✗ (skipped)"
-        fi
-    done
-    
     # Create ReaxFF benchmark input file (optimized for benchmarking)
     if [ -f "data.hns-equil" ] && [ -f "ffield.reax.hns" ]; then
         cat > "in.reaxff" << 'REAXFF_EOF'
@@ -198,70 +244,198 @@ REAXFF_EOF
     popd > /dev/null 2>&1
     
     echo ""
-    echo "✓ Downloaded $downloaded files"
+    echo "✓ Benchmark inputs ready"
     echo ""
 }
 
-# Extract performance metrics from LAMMPS log
+# Extract performance metrics from LAMMPS trial logs (shared parser: scripts/lammps_log.py)
+# Extra arguments tag the run; every run block of every log is appended to the result store
 extract_metrics() {
-    local logfile=$1
-    
-    # Check if log file exists and has content
-    if [ ! -f "$logfile" ]; then
-        echo "ERROR=Log file not found"
+    if ! command -v python3 &> /dev/null || [ ! -f "$TOOLS_DIR/lammps_log.py" ]; then
+        echo "ERROR=python3 and $TOOLS_DIR/lammps_log.py are required"
         return
     fi
     
-    # Check for successful completion
-    if ! grep -q "Loop time of" "$logfile"; then
-        echo "ERROR=No timing data found"
-        return
-    fi
+    # Prints LOOP_TIME, TIMESTEPS, ATOMS, TIMESTEP_PER_SEC, NS_PER_DAY, HOURS_PER_NS,
+    # ATOM_STEPS_SEC and RUNS for the last completed run of the median trial, plus
+    # MEASURED_TRIALS, LOOP_TIME_MIN and LOOP_TIME_MAX, or ERROR=<reason>. For adaptive
+    # runs LOOP_TIME is extrapolated to the nominal length (STEPS_RUN, LOOP_TIME_MEASURED)
+    python3 "$TOOLS_DIR/lammps_log.py" metrics "$@" --store "$RESULT_STORE"
+}
+
+# Log of each trial: trial 0 writes <log>, trial N writes <log>.tN
+trial_logs() {
+    local logfile=$1
+    local n
+    echo "$logfile"
+    for ((n = 1; n < TRIALS; n++)); do
+        echo "$logfile.t$n"
+    done
+}
+
+# Look up a point in the sweep checkpoint: sets CHECKPOINT_KEY (its fingerprint) and, if it
+# finished in an earlier interrupted run, CHECKPOINT_DATA (its result line)
+# Usage: checkpoint_lookup <input_path> <config_name> <omp_threads> <command> [replicate] [binding]
+checkpoint_lookup() {
+    local adaptive=()
+    [ "$ADAPTIVE" = "1" ] && adaptive=(--adaptive)
+    CHECKPOINT_KEY=""
+    CHECKPOINT_DATA=""
+    eval "$(python3 "$TOOLS_DIR/checkpoint.py" lookup "$CHECKPOINT" --input "$1" --config "$2" \
+        --omp "$3" --command "$4" --replicate "${5:-}" --binding "${6:-none}" --trials "$TRIALS" \
+        --warmup "$WARMUP" "${adaptive[@]}" 2>/dev/null)"
+}
+
+# Record the outcome of the looked-up point right away
+# Usage: checkpoint_record <ok|failed> <label> [result line]
+checkpoint_record() {
+    [ -n "$CHECKPOINT_KEY" ] || return 0
+    python3 "$TOOLS_DIR/checkpoint.py" record "$CHECKPOINT" "$CHECKPOINT_KEY" --status "$1" \
+        --label "$2" --data "${3:-}"
+}
+
+# Check a binding policy against a configuration: sets BINDING_SKIP to the reason it cannot
+# be applied on this machine ('' if it can)
+# Usage: binding_check <policy> <omp_threads> <command>
+binding_check() {
+    BINDING_SKIP=""
+    [ "$1" = "none" ] && return 0
+    eval "$(python3 "$TOOLS_DIR/binding.py" check --policy "$1" --omp "$2" -- $3 2>/dev/null)"
+}
+
+# Run a command WARMUP times (log discarded), then once per trial (length-controlled
+# by adaptive_run.py when ADAPTIVE=1)
+# Usage: run_trials <log_path> <command...>
+run_trials() {
+    local log_path=$1
+    shift
+    local n rc trial_log
+    # Trials record their wall and launch time (startup_cost.py) for the setup vs loop split
+    local wrapper=(python3 "$TOOLS_DIR/startup_cost.py" run --)
+    [ "$ADAPTIVE" = "1" ] && wrapper+=(python3 "$TOOLS_DIR/adaptive_run.py" \
+        --min-time "$MIN_TIME" --tolerance "$STEADY_TOL" --)
+    [ "$TELEMETRY" = "1" ] && wrapper=(python3 "$TOOLS_DIR/telemetry.py" run \
+        --interval "$TELEMETRY_INTERVAL" -- "${wrapper[@]}")
+    
+    rm -f "$log_path".t[0-9]*
+    for ((n = 0; n < WARMUP; n++)); do
+        "$@" -log "$log_path.warmup" > /dev/null 2>&1 || { rc=$?; rm -f "$log_path.warmup"; return $rc; }
+    done
+    rm -f "$log_path.warmup"
     
-    # Extract loop time info
-    # Format: "Loop time of 0.178921 on 1 procs for 100 steps with 32000 atoms"
-    #          $1   $2   $3    $4      $5 $6  $7    $8  $9   $10   $11   $12   $13
-    local loop_line=$(grep "Loop time of" "$logfile" | head -1)
-    local loop_time=$(echo "$loop_line" | awk '{print $4}')
-    local timesteps=$(echo "$loop_line" | awk '{for(i=1;i<=NF;i++) if($i=="steps") print $(i-1)}')
-    local atoms=$(echo "$loop_line" | awk '{for(i=1;i<=NF;i++) if($i=="atoms") print $(i-1)}')
-    
-    # Extract performance metrics
-    # Format: "Performance: 558.985 tau/day, 64.7437 timesteps/s, 2.072 Matom-step/s"
-    # OR:     "Performance: 64.7437 timesteps/s, 2.072 Matom-step/s" (without tau/day)
-    local perf_line=$(grep "Performance:" "$logfile" | head -1)
-    
-    if [ -n "$perf_line" ]; then
-        # Extract timesteps/s by finding the field before "timesteps/s"
-        local timestep_per_sec=$(echo "$perf_line" | awk -F'[, ]+' '{for(i=1;i<=NF;i++) if($i~/timesteps/) print $(i-1)}')
-        # Extract ns/day if present
-        local ns_per_day=$(echo "$perf_line" | awk -F'[, ]+' '{for(i=1;i<=NF;i++) if($i~/ns\/day/) print $(i-1)}')
-        # Extract hours/ns if present  
-        local hours_per_ns=$(echo "$perf_line" | awk -F'[, ]+' '{for(i=1;i<=NF;i++) if($i~/hours\/ns/) print $(i-1)}')
-        
-        # Default to "-" if not found
-        [ -z "$timestep_per_sec" ] && timestep_per_sec="-"
-        [ -z "$ns_per_day" ] && ns_per_day="-"
-        [ -z "$hours_per_ns" ] && hours_per_ns="-"
-    else
-        local timestep_per_sec="-"
-        local ns_per_day="-"
-        local hours_per_ns="-"
-    fi
+    for trial_log in $(trial_logs "$log_path"); do
+        "${wrapper[@]}" "$@" -log "$trial_log" > /dev/null 2>&1 || return $?
+    done
+}
+
+# Run every (benchmark × configuration) job concurrently; run_benchmark then
+# only collects the logs
+run_sweep() {
+    local sweep_args=()
+    local i
+    for i in "${!bench_types[@]}"; do
+        [ -f "$BENCH_DIR/${bench_inputs[$i]}" ] && sweep_args+=(-i "${bench_types[$i]}=${bench_inputs[$i]}")
+    done
+    for config in "${BENCHMARK_CONFIGS[@]}"; do
+        sweep_args+=(-c "$config")
+    done
     
-    # Calculate atom-steps per second
-    local atom_steps_sec="-"
-    if [ ! -z "$atoms" ] && [ "$timestep_per_sec" != "-" ]; then
-        atom_steps_sec=$(echo "scale=0; $atoms * $timestep_per_sec / 1" | bc 2>/dev/null || echo "-")
-    fi
+    [ "$ADAPTIVE" = "1" ] && sweep_args+=(--adaptive --min-time "$MIN_TIME" --tolerance "$STEADY_TOL")
+    [ "$TELEMETRY" = "1" ] && sweep_args+=(--telemetry "$TELEMETRY_INTERVAL")
+    for binding in $BINDINGS; do
+        sweep_args+=(--binding "$binding")
+    done
     
-    echo "LOOP_TIME=$loop_time"
-    echo "TIMESTEPS=$timesteps"
-    echo "ATOMS=$atoms"
-    echo "TIMESTEP_PER_SEC=$timestep_per_sec"
-    echo "NS_PER_DAY=$ns_per_day"
-    echo "HOURS_PER_NS=$hours_per_ns"
-    echo "ATOM_STEPS_SEC=$atom_steps_sec"
+    echo "=== Concurrent sweep (isolate=$SWEEP_ISOLATE) ==="
+    echo ""
+    python3 "$TOOLS_DIR/sweep.py" --bench-dir "$BENCH_DIR" --log-dir "$PWD" \
+        --store "$RESULT_STORE" --suite official --isolate "$SWEEP_ISOLATE" \
+        --trials "$TRIALS" --warmup "$WARMUP" --checkpoint "$CHECKPOINT" "${sweep_args[@]}"
+    echo ""
+}
+
+# Weak and strong scaling of the official inputs over sizes and core counts (SIZE_SCALING=1)
+run_size_scaling() {
+    local size_args=()
+    local binary config
+    for binary in $SIZE_BINARIES; do
+        size_args+=(--binary "$binary")
+    done
+    for config in "${BENCHMARK_CONFIGS[@]}"; do
+        size_args+=(-c "$config")
+    done
+    
+    # Timings of one size at several core counts must not share the node (unless concurrent)
+    local isolate=all
+    [ "$SWEEP_PARALLEL" = "1" ] && isolate=$SWEEP_ISOLATE
+    local sweep_args=(--trials "$TRIALS" --warmup "$WARMUP" --checkpoint "$CHECKPOINT" --isolate "$isolate")
+    [ "$ADAPTIVE" = "1" ] && sweep_args+=(--adaptive --min-time "$MIN_TIME" --tolerance "$STEADY_TOL")
+    [ "$TELEMETRY" = "1" ] && sweep_args+=(--telemetry "$TELEMETRY_INTERVAL")
+    for binding in $BINDINGS; do
+        sweep_args+=(--binding "$binding")
+    done
+    
+    echo "=== Size scaling (${SIZE_REPLICATES// /, }; cores ${SIZE_CORES// /, }) ==="
+    echo ""
+    python3 "$TOOLS_DIR/size_scaling.py" run --bench-dir "$BENCH_DIR" --log-dir "$PWD" \
+        --store "$RESULT_STORE" --replicates "$SIZE_REPLICATES" --cores "$SIZE_CORES" \
+        --per-core "$SIZE_PER_CORE" --accel "$SIZE_ACCEL" \
+        --max-atoms-per-core "$SIZE_MAX_ATOMS_PER_CORE" "${size_args[@]}" -- "${sweep_args[@]}"
+    echo ""
+    
+    python3 "$TOOLS_DIR/size_scaling.py" report --store "$RESULT_STORE" --output "$SIZE_RESULT_FILE"
+    python3 "$TOOLS_DIR/checkpoint.py" finish "$CHECKPOINT"
+}
+
+# Aggregate throughput of K concurrent copies per configuration (ENSEMBLE=1)
+run_ensemble() {
+    local ensemble_args=()
+    local bench_type config
+    for bench_type in lj eam chain rhodo reaxff; do
+        [ -f "$BENCH_DIR/in.$bench_type" ] && ensemble_args+=(-i "$bench_type=in.$bench_type")
+    done
+    for config in "${BENCHMARK_CONFIGS[@]}"; do
+        ensemble_args+=(-c "$config")
+    done
+    [ -n "$ENSEMBLE_COPIES" ] && ensemble_args+=(--copies "$ENSEMBLE_COPIES")
+    [ "$TELEMETRY" = "1" ] && ensemble_args+=(--telemetry "$TELEMETRY_INTERVAL")
+    
+    echo "=== Ensemble throughput ==="
+    echo ""
+    python3 "$TOOLS_DIR/ensemble.py" run --bench-dir "$BENCH_DIR" --log-dir "$PWD" \
+        --store "$RESULT_STORE" --trials "$TRIALS" --warmup "$WARMUP" \
+        --gpu-copies "$ENSEMBLE_GPU_COPIES" "${ensemble_args[@]}"
+    echo ""
+    
+    python3 "$TOOLS_DIR/ensemble.py" report --store "$RESULT_STORE" --output "$ENSEMBLE_RESULT_FILE"
+}
+
+# Repeated run segments on one set-up system per input and configuration (INPROCESS=1)
+run_inprocess() {
+    local driver_args=()
+    local bench_type config
+    for bench_type in lj eam chain rhodo reaxff; do
+        [ -f "$BENCH_DIR/in.$bench_type" ] && driver_args+=(-i "$bench_type=in.$bench_type")
+    done
+    for config in "${BENCHMARK_CONFIGS[@]}"; do
+        driver_args+=(-c "$config")
+    done
+    
+    echo "=== In-process driver ($INPROCESS_BACKEND) ==="
+    echo ""
+    python3 "$TOOLS_DIR/lammps_driver.py" run --backend "$INPROCESS_BACKEND" --bench-dir "$BENCH_DIR" \
+        --store "$RESULT_STORE" --trials "$TRIALS" --warmup "$WARMUP" "${driver_args[@]}"
+    echo ""
+    
+    python3 "$TOOLS_DIR/lammps_driver.py" report --store "$RESULT_STORE" --output "$INPROCESS_RESULT_FILE"
+}
+
+# Thermo deviations from the reference run and the speed-vs-accuracy Pareto front
+add_accuracy_report() {
+    local accuracy_args=(--tolerance "$ACCURACY_TOLERANCE")
+    [ -n "$ACCURACY_REFERENCE" ] && accuracy_args+=(--reference "${ACCURACY_REFERENCE%%|*}")
+    python3 "$TOOLS_DIR/accuracy.py" report --store "$RESULT_STORE" --output "$ACCURACY_RESULT_FILE" \
+        "${accuracy_args[@]}"
 }
 
 # Run a single benchmark
@@ -271,10 +445,17 @@ run_benchmark() {
     local omp_threads=$3     # e.g., "4"
     local command=$4         # e.g., "mpirun -np 20 lmp_serial -in"
     local input_file=$5      # e.g., "in.lj"
+    local binding=${6:-none} # e.g., "core" (scripts/binding.py)
     
     local full_name="${bench_type}_${config_name}"
     local logfile="log.${full_name}"
     local description="${bench_type^^} - ${config_name}"
+    local bound=()
+    if [ "$binding" != "none" ]; then
+        logfile+=".bind-$binding"
+        description+=" [$binding]"
+        bound=(python3 "$TOOLS_DIR/binding.py" run --policy "$binding" --omp "$omp_threads" --)
+    fi
     
     echo "----------------------------------------"
     echo "Running: $description (OMP=$omp_threads)"
@@ -289,43 +470,69 @@ run_benchmark() {
         return 1
     fi
     
-    # Run benchmark with safe directory handling
-    if ! pushd "$BENCH_DIR" > /dev/null 2>&1; then
-        echo "❌ Failed (cannot change to $BENCH_DIR)"
+    binding_check "$binding" "$omp_threads" "$command"
+    if [ -n "$BINDING_SKIP" ]; then
+        echo "⚠ Skipping binding $binding: $BINDING_SKIP"
         echo ""
-        return 0  # Return 0 to continue with other benchmarks
+        return 1
     fi
     
-    # Execute command with input file (avoiding eval for security)
-    # Split command into array for safer execution
-    local log_path="../$logfile"
-    local exit_code=0
+    # Finished in an earlier, interrupted run: reuse its result line
+    checkpoint_lookup "$BENCH_DIR/$input_file" "$config_name" "$omp_threads" "$command" "" "$binding"
+    if [ -n "$CHECKPOINT_DATA" ]; then
+        echo "✓ Completed in an earlier run (checkpointed, not rerun)"
+        echo ""
+        echo "$CHECKPOINT_DATA" >> .benchmark_data.tmp
+        return 0
+    fi
     
-    # Set OMP_NUM_THREADS and execute command
-    export OMP_NUM_THREADS=$omp_threads
-    $command $input_file -log "$log_path" > /dev/null 2>&1 || exit_code=$?
+    local exit_code=0
     
-    popd > /dev/null 2>&1
+    # In a concurrent sweep the run has already finished; only its log is collected
+    if [ "$SWEEP_PARALLEL" != "1" ]; then
+        # Run benchmark with safe directory handling
+        if ! pushd "$BENCH_DIR" > /dev/null 2>&1; then
+            echo "❌ Failed (cannot change to $BENCH_DIR)"
+            checkpoint_record failed "$description"
+            echo ""
+            return 0  # Return 0 to continue with other benchmarks
+        fi
+        
+        # Execute command with input file (avoiding eval for security)
+        # Split command into array for safer execution
+        local log_path="../$logfile"
+        
+        # Set OMP_NUM_THREADS and execute command
+        export OMP_NUM_THREADS=$omp_threads
+        run_trials "$log_path" "${bound[@]}" $command $input_file || exit_code=$?
+        
+        popd > /dev/null 2>&1
+    fi
     
     # Check for errors
     if [ $exit_code -ne 0 ]; then
         echo "❌ Failed (exit code: $exit_code)"
+        checkpoint_record failed "$description"
         echo ""
         return 0  # Return 0 to continue with other benchmarks
     fi
     
     if [ ! -f "$logfile" ]; then
         echo "❌ Failed (no log file created)"
+        checkpoint_record failed "$description"
         echo ""
         return 0  # Return 0 to continue with other benchmarks
     fi
     
     # Extract metrics
-    local metrics=$(extract_metrics "$logfile")
+    local metrics=$(extract_metrics $(trial_logs "$logfile") --suite official --benchmark "$bench_type" \
+        --config "$config_name" --omp "$omp_threads" --command "$command" \
+        --binding "$binding")
     
     if echo "$metrics" | grep -q "ERROR="; then
         local error_msg=$(echo "$metrics" | grep "ERROR=" | cut -d= -f2)
         echo "❌ Failed: $error_msg"
+        checkpoint_record failed "$description"
         echo ""
         return 0  # Return 0 to continue with other benchmarks
     fi
@@ -344,10 +551,15 @@ run_benchmark() {
     [ ! -z "$NS_PER_DAY" ] && [ "$NS_PER_DAY" != "-" ] && echo "    ns/day:           $NS_PER_DAY"
     [ ! -z "$HOURS_PER_NS" ] && [ "$HOURS_PER_NS" != "-" ] && echo "    hours/ns:         $HOURS_PER_NS"
     [ ! -z "$ATOM_STEPS_SEC" ] && [ "$ATOM_STEPS_SEC" != "-" ] && echo "    atom-steps/sec:   $ATOM_STEPS_SEC"
+    [ -n "$STEPS_RUN" ] && [ "$STEPS_RUN" != "-" ] && echo "    Adaptive run:     $STEPS_RUN steps in $LOOP_TIME_MEASURED s (loop time extrapolated to the nominal length)"
+    [ -n "$RUNS" ] && [ "$RUNS" -gt 1 ] && echo "    Run blocks:       $RUNS (last one reported)"
+    [ -n "$MEASURED_TRIALS" ] && [ "$MEASURED_TRIALS" -gt 1 ] && echo "    Trials:           $MEASURED_TRIALS (median reported, loop time $LOOP_TIME_MIN-$LOOP_TIME_MAX s)"
     echo ""
     
     # Store for markdown (format: bench_type|config_name|metrics...)
-    echo "${bench_type}|${description}|$LOOP_TIME|$TIMESTEP_PER_SEC|$NS_PER_DAY|$HOURS_PER_NS|$ATOM_STEPS_SEC|$ATOMS" >> .benchmark_data.tmp
+    local line="${bench_type}|${description}|$LOOP_TIME|$TIMESTEP_PER_SEC|$NS_PER_DAY|$HOURS_PER_NS|$ATOM_STEPS_SEC|$ATOMS"
+    echo "$line" >> .benchmark_data.tmp
+    checkpoint_record ok "$description" "$line"
     
     return 0
 }
@@ -553,7 +765,26 @@ main() {
     # Download benchmarks
     download_benchmarks
     
+    if [ "$SIZE_SCALING" = "1" ]; then
+        [ "$RESUME" = "1" ] || rm -f "$CHECKPOINT"
+        run_size_scaling
+        exit 0
+    fi
+    if [ "$ENSEMBLE" = "1" ]; then
+        run_ensemble
+        exit 0
+    fi
+    if [ "$INPROCESS" = "1" ]; then
+        run_inprocess
+        exit 0
+    fi
+    
+    # The accuracy reference runs first, so every configuration can be compared with it
+    [ -n "$ACCURACY_REFERENCE" ] && BENCHMARK_CONFIGS=("$ACCURACY_REFERENCE" "${BENCHMARK_CONFIGS[@]}")
+    
     # Initialize results (clean temp file BEFORE init to avoid stale data)
+    # Finished points of an interrupted run are re-emitted from the checkpoint (RESUME=0 discards it)
+    [ "$RESUME" = "1" ] || rm -f "$CHECKPOINT"
     rm -f .benchmark_data.tmp
     init_markdown
     
@@ -562,11 +793,15 @@ main() {
     echo "Running Benchmarks"
     echo "=========================================="
     echo ""
+    echo "Trials per configuration: $TRIALS (warm-up runs: $WARMUP)"
+    echo ""
     
     # Available benchmark types
     local bench_types=("lj" "eam" "chain" "rhodo" "reaxff")
     local bench_inputs=("in.lj" "in.eam" "in.chain" "in.rhodo" "in.reaxff")
     
+    [ "$SWEEP_PARALLEL" = "1" ] && run_sweep
+    
     for i in "${!bench_types[@]}"; do
         local bench_type="${bench_types[$i]}"
         local input_file="${bench_inputs[$i]}"
@@ -583,7 +818,9 @@ main() {
         # Run with each configuration
         for config in "${BENCHMARK_CONFIGS[@]}"; do
             IFS='|' read -r name omp_threads command <<< "$config"
-            run_benchmark "$bench_type" "$name" "$omp_threads" "$command" "$input_file"
+            for binding in $BINDINGS; do
+                run_benchmark "$bench_type" "$name" "$omp_threads" "$command" "$input_file" "$binding"
+            done
         done
         
         echo ""
@@ -598,9 +835,11 @@ main() {
     add_results_to_markdown
     add_speedup_analysis
     add_benchmark_info
+    add_accuracy_report
     
     # Cleanup
     rm -f .benchmark_data.tmp
+    python3 "$TOOLS_DIR/checkpoint.py" finish "$CHECKPOINT"
     
     echo "✓ Results saved to: $RESULT_FILE"
     echo ""
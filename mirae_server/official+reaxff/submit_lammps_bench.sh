@@ -5,6 +5,7 @@
 #$ -S /bin/bash
 #$ -V
 #$ -cwd
+#$ -r y
 #$ -l hostname=n06
 
 echo "=========================================="
@@ -17,6 +18,10 @@ module load gcc/11.3.0
 
 cd $SGE_O_WORKDIR
 
+# Resumable: finished points are checkpointed (.sweep_checkpoint.jsonl), so a job
+# requeued after preemption (-r y) or resubmitted after hitting h_rt runs only the
+# missing or failed points
+
 ./lammps_bench.sh \
   -c "conda-serial|1|lmp_mpi_conda -in" \
   -c "opt-serial|1|lmp -in" \
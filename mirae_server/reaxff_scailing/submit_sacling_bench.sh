@@ -5,6 +5,7 @@
 #$ -S /bin/bash
 #$ -V
 #$ -cwd
+#$ -r y
 #$ -l hostname=n06
 
 echo "=========================================="
@@ -18,6 +19,10 @@ module load gcc/11.3.0
 export OMP_NUM_THREADS=1
 cd $SGE_O_WORKDIR
 
+# Resumable: finished points are checkpointed (.sweep_checkpoint.jsonl), so a job
+# requeued after preemption (-r y) or resubmitted after hitting h_rt runs only the
+# missing or failed points
+
 ./reaxff_scaling_bench.sh
 
 echo "=========================================="
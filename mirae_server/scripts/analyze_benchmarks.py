@@ -6,12 +6,31 @@ Compares conda LAMMPS (lmp_mpi_conda) vs optimized LAMMPS (lmp) performance
 across different MPI × OpenMP configurations on 48-core CPU system.
 """
 
-import re
+import sys
 import pandas as pd
-import matplotlib.pyplot as plt
 import numpy as np
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'scripts'))
+from accuracy import accuracy_points, accuracy_table, plot_pareto  # noqa: E402
+from analysis_cache import CACHE_DIR_NAME, AnalysisCache, capture_output, source_digest  # noqa: E402
+from analyze import ingest_results, render_figures  # noqa: E402
+from binding import binding_comparison, binding_table  # noqa: E402
+from ensemble import ensemble_points, ensemble_table, plot_ensemble_bars  # noqa: E402
+from fanout import node_scaling, node_scaling_table  # noqa: E402
+from phase_breakdown import (FRACTION_COLUMNS, has_phases, phase_fractions,  # noqa: E402
+                             phase_table, plot_phase_bars)
+from result_store import load_runs, store_signature  # noqa: E402
+from size_scaling import SERIES_KINDS, plot_series, scaling_series, size_scaling_table  # noqa: E402
+from startup_cost import (STARTUP_COLUMNS, TIME_COLUMNS, has_startup, plot_startup_bars,  # noqa: E402
+                          startup_costs, startup_table)
+from telemetry import (RUN_TELEMETRY_COLUMNS, TELEMETRY_COLUMNS, has_telemetry,  # noqa: E402
+                       telemetry_summary, telemetry_table)
+from results_frame import (DERIVED_COLUMNS, ROW_KEYS, add_baseline, add_metrics,  # noqa: E402
+                           indexed, interval_errors, lookup)
+from trial_stats import (MIN_TRIALS, best_with_overlap, format_interval,  # noqa: E402
+                         latest_trials, nominal_loop_times, speedup_ci, summarize_trials)
+
 
 # ============================================================================
 # Configuration
@@ -34,169 +53,123 @@ CONFIG_ORDER = [
 
 BENCHMARKS = ['LJ', 'EAM', 'CHAIN', 'RHODO', 'REAXFF']
 
+REPLICATES = ['3x3x3', '4x4x4', '5x5x5', '6x6x6']
+
+VALID_CONFIGS = [f"{binary}-{cfg}" for binary in BINARY_COLORS for cfg in CONFIG_ORDER]
+
+# Configurations by increasing MPI rank count (phase breakdown figure and table)
+RANK_ORDER = ["serial", "mpi1-omp48", "mpi6-omp8", "mpi12-omp4", "mpi24-omp2", "mpi48-omp1"]
+
+# Per-configuration trial summary columns (see trial_stats.summarize_trials)
+TRIAL_COLUMNS = ['loop_time', 'loop_time_q1', 'loop_time_q3', 'loop_time_ci_low',
+                 'loop_time_ci_high', 'trials', 'loop_time_trials']
+
+# Figure style (applied in every figure worker process)
+PLOT_STYLE = 'seaborn-v0_8-whitegrid'
+FONT_FAMILY = 'DejaVu Sans'
+
+# Cache entries are keyed on this analyzer and every shared script
+SOURCES = source_digest(Path(__file__))
+
 
 # ============================================================================
-# Parsing Functions
+# Loading Functions
 # ============================================================================
 
-def parse_benchmark_file(filepath: Path) -> dict:
-    """Parse benchmark results from markdown file."""
-    content = filepath.read_text(encoding='utf-8')
-    
-    results = {}
-    
-    for bench in BENCHMARKS:
-        pattern = rf'### {bench} Benchmark'
-        match = re.search(pattern, content, re.IGNORECASE)
-        
-        if match:
-            # Find the table after the header
-            section = content[match.start():match.start() + 3000]
-            
-            # Parse table rows
-            rows = []
-            for line in section.split('\n'):
-                if '|' in line and 'Configuration' not in line and '---' not in line:
-                    parts = [p.strip() for p in line.split('|') if p.strip()]
-                    if len(parts) >= 2 and parts[0] in [
-                        'conda-serial', 'opt-serial',
-                        'conda-mpi48-omp1', 'conda-mpi24-omp2', 'conda-mpi12-omp4', 
-                        'conda-mpi6-omp8', 'conda-mpi1-omp48',
-                        'opt-mpi48-omp1', 'opt-mpi24-omp2', 'opt-mpi12-omp4',
-                        'opt-mpi6-omp8', 'opt-mpi1-omp48'
-                    ]:
-                        try:
-                            config = parts[0]
-                            loop_time = float(parts[1])
-                            
-                            # Parse binary and config type
-                            if config.startswith('conda-'):
-                                binary = 'conda'
-                                cfg = config.replace('conda-', '')
-                            else:
-                                binary = 'opt'
-                                cfg = config.replace('opt-', '')
-                            
-                            rows.append({
-                                'config': config,
-                                'binary': binary,
-                                'cfg_type': cfg,
-                                'loop_time': loop_time
-                            })
-                        except (ValueError, IndexError):
-                            pass
-            
-            if rows:
-                results[bench] = rows
-    
-    return results
-
-
-def parse_scaling_file(filepath: Path) -> pd.DataFrame:
-    """Parse ReaxFF scaling benchmark results."""
-    content = filepath.read_text(encoding='utf-8')
-    
-    all_data = []
-    replicates = ['3x3x3', '4x4x4', '5x5x5', '6x6x6']
-    atoms_map = {'3x3x3': 8208, '4x4x4': 19456, '5x5x5': 38000, '6x6x6': 65664}
-    
-    for rep in replicates:
-        pattern = rf'### Replicate {rep}'
-        match = re.search(pattern, content)
-        
-        if match:
-            section = content[match.start():match.start() + 1500]
-            
-            for line in section.split('\n'):
-                if '|' in line and 'Config' not in line and '---' not in line:
-                    parts = [p.strip() for p in line.split('|') if p.strip()]
-                    if len(parts) >= 3:
-                        try:
-                            config = parts[0]
-                            loop_time = float(parts[1])
-                            
-                            if config.startswith('conda-'):
-                                binary = 'conda'
-                                cfg = config.replace('conda-', '')
-                            elif config.startswith('opt-'):
-                                binary = 'opt'
-                                cfg = config.replace('opt-', '')
-                            else:
-                                continue
-                            
-                            all_data.append({
-                                'replicate': rep,
-                                'atoms': atoms_map.get(rep, 0),
-                                'config': config,
-                                'binary': binary,
-                                'cfg_type': cfg,
-                                'loop_time': loop_time
-                            })
-                        except (ValueError, IndexError):
-                            pass
-    
-    return pd.DataFrame(all_data)
+def latest_runs(runs: pd.DataFrame, suite: str) -> pd.DataFrame:
+    """Select one suite, keeping the most recent trial set of each unbound configuration."""
+    # Runs under a binding policy (binding.py) are compared separately, see binding_records()
+    unbound = runs['binding'].isna() | (runs['binding'] == 'none')
+    suite_runs = nominal_loop_times(runs[(runs['suite'] == suite) & unbound])
+    suite_runs = latest_trials(suite_runs, ['benchmark', 'replicate', 'config'])
+    suite_runs = suite_runs[suite_runs['config'].isin(VALID_CONFIGS)].copy()
+
+    # Split "conda-mpi6-omp8" into binary and config type
+    parts = suite_runs['config'].str.split('-', n=1)
+    suite_runs['binary'] = parts.str[0]
+    suite_runs['cfg_type'] = parts.str[1]
+    return suite_runs.sort_index()
+
+
+def build_results(runs: pd.DataFrame) -> pd.DataFrame:
+    """Build the tidy results frame: one row per configuration of both suites.
+
+    Rows carry the median loop time over trials, phase fractions, launch /
+    setup costs, run telemetry, the baseline of their binary (serial for the official suite, 48 MPI × 1 OMP
+    for scaling) and the derived speedup, efficiency and per-core throughput.
+    """
+    parts = []
+    for suite in ['official', 'scaling']:
+        selected = latest_runs(runs, suite)
+        if suite == 'scaling':
+            selected = selected[selected['replicate'].isin(REPLICATES)]
+        summary = summarize_trials(selected, ROW_KEYS).drop(columns=[*TIME_COLUMNS, *RUN_TELEMETRY_COLUMNS])
+        summary = summary.merge(phase_fractions(selected, ROW_KEYS), on=ROW_KEYS, how='left')
+        summary = summary.merge(startup_costs(selected, ROW_KEYS), on=ROW_KEYS, how='left')
+        parts.append(summary.merge(telemetry_summary(selected, ROW_KEYS), on=ROW_KEYS, how='left'))
+    results = pd.concat(parts, ignore_index=True).astype({key: str for key in ROW_KEYS})
+    results['cores'] = results['mpi_ranks'] * results['omp_threads']
+
+    baseline_cfg = np.where(results['suite'] == 'official', 'serial', 'mpi48-omp1')
+    results = add_baseline(results, ['suite', 'benchmark', 'replicate', 'binary'],
+                           results['cfg_type'] == baseline_cfg)
+    results = add_metrics(results)
+
+    columns = [*ROW_KEYS, 'atoms', 'timesteps', 'binary', 'cfg_type', 'cores', *TRIAL_COLUMNS,
+               *FRACTION_COLUMNS, *STARTUP_COLUMNS, *TELEMETRY_COLUMNS, *DERIVED_COLUMNS]
+    return results[columns]
+
+
+def binding_records(runs: pd.DataFrame) -> list[dict]:
+    """Best binding of every configuration that was run under more than one binding policy."""
+    comparison = []
+    for suite in ['official', 'scaling']:
+        selected = runs[(runs['suite'] == suite) & runs['config'].isin(VALID_CONFIGS)]
+        for item in binding_comparison(nominal_loop_times(selected), ['benchmark', 'replicate', 'config']):
+            comparison.append(dict(item, suite=suite))
+    return comparison
 
 
 # ============================================================================
 # Plotting Functions
 # ============================================================================
 
-def plot_benchmark_speedup(data: dict, output_dir: Path):
+def plot_benchmark_speedup(official: pd.DataFrame, output_dir: Path):
     """Create speedup plot for official benchmarks."""
+    import matplotlib.pyplot as plt
     
     fig, axes = plt.subplots(2, 3, figsize=(16, 10))
     axes = axes.flatten()
+    index = indexed(official)
     
     for idx, bench in enumerate(BENCHMARKS):
         ax = axes[idx]
-        bench_data = data.get(bench, [])
-        
-        if not bench_data:
-            ax.set_visible(False)
-            continue
-        
-        # Get serial baselines
-        conda_serial = next((d['loop_time'] for d in bench_data 
-                            if d['config'] == 'conda-serial'), None)
-        opt_serial = next((d['loop_time'] for d in bench_data 
-                          if d['config'] == 'opt-serial'), None)
         
-        if not conda_serial or not opt_serial:
+        # Speedups are relative to the binary's own serial run
+        serials = [lookup(index, ('official', bench, '', f'{binary}-serial')) for binary in ['conda', 'opt']]
+        if not all(serials):
             ax.set_visible(False)
             continue
-        
-        # Calculate speedups relative to own serial
+
         config_order = ['mpi48-omp1', 'mpi24-omp2', 'mpi12-omp4', 'mpi6-omp8', 'mpi1-omp48']
         x = np.arange(len(config_order))
         width = 0.35
-        
-        conda_speedups = []
-        opt_speedups = []
-        
-        for cfg in config_order:
-            conda_time = next((d['loop_time'] for d in bench_data 
-                              if d['config'] == f'conda-{cfg}'), None)
-            opt_time = next((d['loop_time'] for d in bench_data 
-                            if d['config'] == f'opt-{cfg}'), None)
-            
-            conda_speedups.append(conda_serial / conda_time if conda_time else 0)
-            opt_speedups.append(opt_serial / opt_time if opt_time else 0)
-        
-        bars1 = ax.bar(x - width/2, conda_speedups, width, label='conda (lmp_mpi_conda)', 
-                      color=BINARY_COLORS['conda'], edgecolor='black')
-        bars2 = ax.bar(x + width/2, opt_speedups, width, label='opt (lmp)', 
-                      color=BINARY_COLORS['opt'], edgecolor='black')
-        
-        # Add value labels
-        for bar, speedup in zip(bars1, conda_speedups):
-            if speedup > 0:
-                ax.annotate(f'{speedup:.1f}x', xy=(bar.get_x() + bar.get_width()/2, bar.get_height()),
-                           xytext=(0, 3), textcoords="offset points", ha='center', fontsize=7)
-        for bar, speedup in zip(bars2, opt_speedups):
-            if speedup > 0:
-                ax.annotate(f'{speedup:.1f}x', xy=(bar.get_x() + bar.get_width()/2, bar.get_height()),
-                           xytext=(0, 3), textcoords="offset points", ha='center', fontsize=7)
+
+        labels = {'conda': 'conda (lmp_mpi_conda)', 'opt': 'opt (lmp)'}
+        for offset, binary in [(-width/2, 'conda'), (width/2, 'opt')]:
+            rows = [lookup(index, ('official', bench, '', f'{binary}-{cfg}')) for cfg in config_order]
+            speedups = [row['speedup'] if row else 0 for row in rows]
+            errors = interval_errors(rows, 'speedup', 'speedup_low', 'speedup_high')
+            yerr = errors if np.any(errors) else None
+            bars = ax.bar(x + offset, speedups, width, label=labels[binary],
+                          color=BINARY_COLORS[binary], edgecolor='black',
+                          yerr=yerr, capsize=2, error_kw={'elinewidth': 0.8})
+
+            # Add value labels (above the error bar)
+            for bar, speedup, upper in zip(bars, speedups, errors[1]):
+                if speedup > 0:
+                    ax.annotate(f'{speedup:.1f}x', xy=(bar.get_x() + bar.get_width()/2, speedup + upper),
+                               xytext=(0, 3), textcoords="offset points", ha='center', fontsize=7)
         
         ax.set_xticks(x)
         ax.set_xticklabels(['48×1', '24×2', '12×4', '6×8', '1×48'], fontsize=9)
@@ -219,10 +192,12 @@ def plot_benchmark_speedup(data: dict, output_dir: Path):
     print(f"Saved: benchmark1_speedup.png")
 
 
-def plot_scaling_results(scaling_data: pd.DataFrame, output_dir: Path):
+def plot_scaling_results(scaling: pd.DataFrame, output_dir: Path):
     """Create ReaxFF scaling plot."""
+    import matplotlib.pyplot as plt
     
     fig, axes = plt.subplots(1, 2, figsize=(14, 6))
+    index = indexed(scaling)
     
     replicates = ['3x3x3', '4x4x4', '5x5x5', '6x6x6']
     atoms = [8208, 19456, 38000, 65664]
@@ -232,19 +207,13 @@ def plot_scaling_results(scaling_data: pd.DataFrame, output_dir: Path):
     
     for binary, color in BINARY_COLORS.items():
         # Use 6×8 config (best for opt, good for conda)
-        times = []
-        for rep in replicates:
-            cfg = 'mpi6-omp8'
-            rep_data = scaling_data[(scaling_data['replicate'] == rep) & 
-                                   (scaling_data['binary'] == binary) &
-                                   (scaling_data['cfg_type'] == cfg)]
-            if not rep_data.empty:
-                times.append(rep_data['loop_time'].values[0])
-            else:
-                times.append(np.nan)
-        
+        rows = [lookup(index, ('scaling', 'REAXFF', rep, f'{binary}-mpi6-omp8')) for rep in replicates]
+        times = [row['loop_time'] if row else np.nan for row in rows]
+        errors = interval_errors(rows, 'loop_time', 'loop_time_ci_low', 'loop_time_ci_high')
+
         label = 'conda (lmp_mpi_conda)' if binary == 'conda' else 'opt (lmp)'
-        ax1.plot(atoms, times, 'o-', color=color, linewidth=2, markersize=8, label=label)
+        ax1.errorbar(atoms, times, yerr=errors if np.any(errors) else None, fmt='o-', color=color,
+                     linewidth=2, markersize=8, capsize=3, label=label)
     
     ax1.set_xlabel('Number of Atoms', fontsize=12)
     ax1.set_ylabel('Loop Time (s)', fontsize=12)
@@ -261,23 +230,25 @@ def plot_scaling_results(scaling_data: pd.DataFrame, output_dir: Path):
     width = 0.5
     
     speedups = []
+    errors = [[], []]
     for rep in replicates:
-        conda_data = scaling_data[(scaling_data['replicate'] == rep) & 
-                                  (scaling_data['config'] == 'conda-mpi48-omp1')]
-        opt_data = scaling_data[(scaling_data['replicate'] == rep) & 
-                               (scaling_data['config'] == 'opt-mpi6-omp8')]
-        
-        if not conda_data.empty and not opt_data.empty:
-            speedup = conda_data['loop_time'].values[0] / opt_data['loop_time'].values[0]
-            speedups.append(speedup)
+        conda_row = lookup(index, ('scaling', 'REAXFF', rep, 'conda-mpi48-omp1'))
+        opt_row = lookup(index, ('scaling', 'REAXFF', rep, 'opt-mpi6-omp8'))
+
+        if conda_row and opt_row:
+            speedup, low, high = speedup_ci(conda_row['loop_time_trials'], opt_row['loop_time_trials'])
         else:
-            speedups.append(0)
-    
-    bars = ax2.bar(x, speedups, width, color=BINARY_COLORS['opt'], edgecolor='black')
-    
-    for bar, speedup in zip(bars, speedups):
+            speedup, low, high = 0, 0, 0
+        speedups.append(speedup)
+        errors[0].append(speedup - low)
+        errors[1].append(high - speedup)
+
+    bars = ax2.bar(x, speedups, width, color=BINARY_COLORS['opt'], edgecolor='black',
+                   yerr=errors if np.any(errors) else None, capsize=4)
+
+    for bar, speedup, upper in zip(bars, speedups, errors[1]):
         if speedup > 0:
-            ax2.annotate(f'{speedup:.1f}x', xy=(bar.get_x() + bar.get_width()/2, bar.get_height()),
+            ax2.annotate(f'{speedup:.1f}x', xy=(bar.get_x() + bar.get_width()/2, speedup + upper),
                         xytext=(0, 3), textcoords="offset points", ha='center', fontsize=10, fontweight='bold')
     
     ax2.set_xticks(x)
@@ -296,13 +267,201 @@ def plot_scaling_results(scaling_data: pd.DataFrame, output_dir: Path):
     print(f"Saved: benchmark2_scaling.png")
 
 
+def phase_records(official: pd.DataFrame, bench: str) -> list[dict]:
+    """Configurations of a benchmark with a timing breakdown, by binary and increasing rank count."""
+    rows = official[official['benchmark'] == bench].to_dict('records')
+    records = [d for d in rows if has_phases(d)]
+    return sorted(records, key=lambda d: (list(BINARY_COLORS).index(d['binary']), RANK_ORDER.index(d['cfg_type'])))
+
+
+def config_label(record: dict) -> str:
+    """Short label such as 'opt 6×8' (ranks × threads)."""
+    layout = record['cfg_type'].replace('mpi', '').replace('-omp', '×')
+    return f"{record['binary']} {layout}"
+
+
+def plot_phase_breakdown(official: pd.DataFrame, output_dir: Path):
+    """Create stacked-bar plot of timing breakdown phase fractions vs rank count."""
+    import matplotlib.pyplot as plt
+    
+    fig, axes = plt.subplots(2, 3, figsize=(16, 10))
+    axes = axes.flatten()
+    legend = True
+    
+    for idx, bench in enumerate(BENCHMARKS):
+        ax = axes[idx]
+        records = phase_records(official, bench)
+        
+        if not records:
+            ax.set_visible(False)
+            continue
+        
+        # Legend on the first visible subplot only
+        plot_phase_bars(ax, [config_label(d) for d in records], records, legend=legend)
+        legend = False
+        ax.set_title(f'{bench}', fontsize=12, fontweight='bold')
+    
+    # Hide 6th subplot
+    axes[5].set_visible(False)
+    
+    plt.suptitle('Benchmark 1: Timing Breakdown by MPI × OMP Layout\n(Share of Loop Time per Phase, Comm/Modify-Dominated Marked)', 
+                 fontsize=14, fontweight='bold')
+    plt.tight_layout(rect=[0, 0, 1, 0.96])
+    
+    plt.savefig(output_dir / 'benchmark1_phases.png', dpi=150, bbox_inches='tight', facecolor='white')
+    plt.close()
+    print(f"Saved: benchmark1_phases.png")
+
+
+def startup_records(results: pd.DataFrame, suite: str, bench: str, replicate: str = '') -> list[dict]:
+    """Configurations of a benchmark with launch / setup costs, by binary and increasing rank count."""
+    selected = results[(results['suite'] == suite) & (results['benchmark'] == bench)
+                       & (results['replicate'] == replicate)]
+    records = [d for d in selected.to_dict('records') if has_startup(d)]
+    return sorted(records, key=lambda d: (list(BINARY_COLORS).index(d['binary']), RANK_ORDER.index(d['cfg_type'])))
+
+
+def telemetry_records(results: pd.DataFrame, suite: str, bench: str, replicate: str = '') -> list[dict]:
+    """Configurations of a benchmark with run telemetry, by binary and increasing rank count."""
+    selected = results[(results['suite'] == suite) & (results['benchmark'] == bench)
+                       & (results['replicate'] == replicate)]
+    records = [d for d in selected.to_dict('records') if has_telemetry(d)]
+    return sorted(records, key=lambda d: (list(BINARY_COLORS).index(d['binary']), RANK_ORDER.index(d['cfg_type'])))
+
+
+def startup_panels(results: pd.DataFrame) -> list[tuple]:
+    """(title, records) of each official benchmark and of the largest replicated ReaxFF system."""
+    panels = [(bench, startup_records(results, 'official', bench)) for bench in BENCHMARKS]
+    replicated = [(f'REAXFF {rep} (scaling)', startup_records(results, 'scaling', 'REAXFF', rep))
+                  for rep in REPLICATES]
+    panels.append(next((panel for panel in reversed(replicated) if panel[1]), ('REAXFF (scaling)', [])))
+    return panels
+
+
+def plot_startup_costs(results: pd.DataFrame, output_dir: Path):
+    """Create stacked-bar plot of launch, setup and loop time per configuration."""
+    import matplotlib.pyplot as plt
+    
+    fig, axes = plt.subplots(2, 3, figsize=(16, 10))
+    axes = axes.flatten()
+    legend = True
+    
+    for ax, (title, records) in zip(axes, startup_panels(results)):
+        if not records:
+            ax.set_visible(False)
+            continue
+        
+        # Legend on the first visible subplot only
+        plot_startup_bars(ax, [config_label(d) for d in records], records, legend=legend)
+        legend = False
+        ax.set_title(title, fontsize=12, fontweight='bold')
+    
+    plt.suptitle('Startup Cost: Launch + Setup vs Loop Time\n(Median Wall Time per Run, High Fixed Overhead Marked)', 
+                 fontsize=14, fontweight='bold')
+    plt.tight_layout(rect=[0, 0, 1, 0.96])
+    
+    plt.savefig(output_dir / 'benchmark_startup.png', dpi=150, bbox_inches='tight', facecolor='white')
+    plt.close()
+    print(f"Saved: benchmark_startup.png")
+
+
+def plot_ensemble_throughput(ensemble: pd.DataFrame, output_dir: Path):
+    """Create aggregate-throughput plot of every ensemble packing against the best single job."""
+    import matplotlib.pyplot as plt
+    
+    fig, axes = plt.subplots(2, 3, figsize=(16, 10))
+    axes = axes.flatten()
+    legend = True
+    
+    for ax, bench in zip(axes, BENCHMARKS):
+        points = ensemble[ensemble['benchmark'] == bench]
+        if points.empty:
+            ax.set_visible(False)
+            continue
+        
+        # Legend on the first visible subplot only
+        plot_ensemble_bars(ax, points, legend=legend)
+        legend = False
+        ax.set_title(f'{bench}', fontsize=12, fontweight='bold')
+    axes[-1].set_visible(False)
+    
+    plt.suptitle('Ensemble Throughput: K Concurrent Copies vs One Wide Run\n'
+                 '(Median Aggregate Atom-Steps/s, Per-Job Loop Time on Bars)', fontsize=14, fontweight='bold')
+    plt.tight_layout(rect=[0, 0, 1, 0.96])
+    
+    plt.savefig(output_dir / 'benchmark1_ensemble.png', dpi=150, bbox_inches='tight', facecolor='white')
+    plt.close()
+    print(f"Saved: benchmark1_ensemble.png")
+
+
+def plot_accuracy_pareto(accuracy: pd.DataFrame, output_dir: Path):
+    """Create loop time vs thermo error plots against the reference run, with the Pareto front."""
+    import matplotlib.pyplot as plt
+    
+    fig, axes = plt.subplots(2, 3, figsize=(16, 10))
+    axes = axes.flatten()
+    legend = True
+    
+    for ax, bench in zip(axes, BENCHMARKS):
+        points = accuracy[accuracy['benchmark'] == bench]
+        if points.empty:
+            ax.set_visible(False)
+            continue
+        
+        # Legend on the first visible subplot only
+        plot_pareto(ax, points, legend=legend)
+        legend = False
+        ax.set_title(f"{bench} (reference: {points['reference'].iloc[0]})", fontsize=12, fontweight='bold')
+    axes[-1].set_visible(False)
+    
+    plt.suptitle('Speed vs Accuracy: Loop Time vs Deviation from the Reference Run\n'
+                 '(Largest Relative Energy Deviation or Energy Drift)', fontsize=14, fontweight='bold')
+    plt.tight_layout(rect=[0, 0, 1, 0.96])
+    
+    plt.savefig(output_dir / 'benchmark1_accuracy.png', dpi=150, bbox_inches='tight', facecolor='white')
+    plt.close()
+    print(f"Saved: benchmark1_accuracy.png")
+
+
+def plot_size_scaling(size_series: pd.DataFrame, output_dir: Path):
+    """Create strong, weak and system-size scaling plots of the scaled official benchmarks."""
+    import matplotlib.pyplot as plt
+    
+    benchmarks = [bench for bench in BENCHMARKS if bench in set(size_series['benchmark'])]
+    fig, axes = plt.subplots(len(SERIES_KINDS), len(benchmarks), figsize=(4.5 * len(benchmarks), 12),
+                             squeeze=False)
+    titles = {'strong': 'Strong Scaling', 'weak': 'Weak Scaling', 'size': 'System Size'}
+    
+    for row, kind in zip(axes, SERIES_KINDS):
+        for ax, bench in zip(row, benchmarks):
+            series = size_series[(size_series['benchmark'] == bench) & (size_series['kind'] == kind)]
+            if series.empty:
+                ax.set_visible(False)
+                continue
+            plot_series(ax, series, kind)
+            ax.set_title(f'{bench} - {titles[kind]}', fontsize=12, fontweight='bold')
+    
+    plt.suptitle('Official Benchmarks Scaled from 32k Atoms\n(Median Loop Time per Point)',
+                 fontsize=14, fontweight='bold')
+    plt.tight_layout(rect=[0, 0, 1, 0.96])
+    
+    plt.savefig(output_dir / 'benchmark3_size_scaling.png', dpi=150, bbox_inches='tight', facecolor='white')
+    plt.close()
+    print(f"Saved: benchmark3_size_scaling.png")
+
+
 # ============================================================================
 # Summary Generation
 # ============================================================================
 
-def generate_summary_tables(bench_data: dict, scaling_data: pd.DataFrame):
+def generate_summary_tables(results: pd.DataFrame, bindings: list[dict] = (), node_series: list[dict] = (),
+                            size_series: pd.DataFrame = None, ensemble: pd.DataFrame = None,
+                            accuracy: pd.DataFrame = None):
     """Generate verified summary tables for README."""
     
+    official = results[results['suite'] == 'official']
+    scaling = indexed(results[results['suite'] == 'scaling'])
+    
     print("\n" + "=" * 60)
     print("VERIFIED SUMMARY DATA FOR README")
     print("=" * 60)
@@ -312,35 +471,42 @@ def generate_summary_tables(bench_data: dict, scaling_data: pd.DataFrame):
     print("| Benchmark | Best conda | Speedup | Best opt | Speedup | opt vs conda |")
     print("|-----------|------------|---------|----------|---------|--------------|")
     
+    by_bench = dict(tuple(official.groupby('benchmark', sort=False)))
+    overlaps = []
     for bench in BENCHMARKS:
-        bench_results = bench_data.get(bench, [])
-        if not bench_results:
+        if bench not in by_bench:
             continue
         
-        # Get serial baselines
-        conda_serial = next((d['loop_time'] for d in bench_results if d['config'] == 'conda-serial'), None)
-        opt_serial = next((d['loop_time'] for d in bench_results if d['config'] == 'opt-serial'), None)
-        
-        if not conda_serial or not opt_serial:
+        # Both serial baselines are needed
+        parallel = by_bench[bench][by_bench[bench]['cfg_type'] != 'serial']
+        by_binary = dict(tuple(parallel.groupby('binary', sort=False)))
+        if any(binary not in by_binary or by_binary[binary]['baseline_time'].isna().all()
+               for binary in ['conda', 'opt']):
             continue
         
-        # Find best conda config
-        conda_configs = [d for d in bench_results if d['binary'] == 'conda' and d['cfg_type'] != 'serial']
-        best_conda = min(conda_configs, key=lambda x: x['loop_time'])
-        conda_speedup = conda_serial / best_conda['loop_time']
-        conda_cfg = best_conda['cfg_type'].replace('mpi', '').replace('omp', '×')
+        # Find best conda / opt config; † marks a pick whose CI overlaps a runner-up
+        picks = {}
+        for binary in ['conda', 'opt']:
+            best, ties = best_with_overlap(by_binary[binary].to_dict('records'))
+            label = best['cfg_type'].replace('mpi', '').replace('omp', '×')
+            if ties:
+                label += '†'
+                overlaps.append(f"{bench} {best['config']} ≈ {', '.join(d['config'] for d in ties)}")
+            picks[binary] = (best, label)
         
-        # Find best opt config
-        opt_configs = [d for d in bench_results if d['binary'] == 'opt' and d['cfg_type'] != 'serial']
-        best_opt = min(opt_configs, key=lambda x: x['loop_time'])
-        opt_speedup = opt_serial / best_opt['loop_time']
-        opt_cfg = best_opt['cfg_type'].replace('mpi', '').replace('omp', '×')
+        best_conda, conda_cfg = picks['conda']
+        best_opt, opt_cfg = picks['opt']
+        conda_speedup = best_conda['baseline_time'] / best_conda['loop_time']
+        opt_speedup = best_opt['baseline_time'] / best_opt['loop_time']
         
         # opt vs conda (best vs best time comparison)
         opt_vs_conda = best_conda['loop_time'] / best_opt['loop_time']
         
         print(f"| **{bench}** | {conda_cfg} | {conda_speedup:.1f}x | {opt_cfg} | {opt_speedup:.1f}x | **{opt_vs_conda:.1f}x faster** |")
     
+    if overlaps:
+        print("\n† 95% CI of the best configuration overlaps: " + "; ".join(overlaps))
+    
     # Benchmark 2: Scaling
     print("\n### Benchmark 2: ReaxFF Scaling (Best Configs)\n")
     print("| System | Atoms | conda 1×48 (s) | opt 6×8 (s) | opt Speedup |")
@@ -350,61 +516,264 @@ def generate_summary_tables(bench_data: dict, scaling_data: pd.DataFrame):
     atoms_map = {'3x3x3': 8208, '4x4x4': 19456, '5x5x5': 38000, '6x6x6': 65664}
     
     for rep in replicates:
-        conda_data = scaling_data[(scaling_data['replicate'] == rep) & 
-                                  (scaling_data['config'] == 'conda-mpi1-omp48')]
-        opt_data = scaling_data[(scaling_data['replicate'] == rep) & 
-                               (scaling_data['config'] == 'opt-mpi6-omp8')]
+        conda_row = lookup(scaling, ('scaling', 'REAXFF', rep, 'conda-mpi1-omp48'))
+        opt_row = lookup(scaling, ('scaling', 'REAXFF', rep, 'opt-mpi6-omp8'))
         
-        if not conda_data.empty and not opt_data.empty:
-            conda_time = conda_data['loop_time'].values[0]
-            opt_time = opt_data['loop_time'].values[0]
+        if conda_row and opt_row:
+            conda_time = conda_row['loop_time']
+            opt_time = opt_row['loop_time']
             speedup = conda_time / opt_time
             atoms = atoms_map[rep]
             print(f"| {rep} | {atoms:,} | {conda_time:.2f} | {opt_time:.2f} | **{speedup:.1f}x** |")
     
+    print_trial_statistics(results)
+    print_phase_breakdown(official)
+    print_startup_costs(results)
+    print_telemetry(results)
+    print_bindings(bindings)
+    print_node_scaling(node_series)
+    print_size_scaling(size_series)
+    print_ensemble(ensemble)
+    print_accuracy(accuracy)
+    
     print("\n" + "=" * 60)
 
 
+def print_trial_statistics(results: pd.DataFrame):
+    """Print median, IQR and bootstrap CIs of loop time and speedup, and the efficiency of every configuration."""
+    
+    print("\n### Trial Statistics (median, IQR and 95% bootstrap CI)\n")
+    print("| Benchmark | Config | Trials | Median (s) | IQR (s) | 95% CI (s) | Speedup | 95% CI | Efficiency |")
+    print("|-----------|--------|--------|------------|---------|------------|---------|--------|------------|")
+    
+    # Official: speedup vs the binary's serial run; scaling: vs its 48 MPI × 1 OMP run
+    official = results[results['suite'] == 'official']
+    by_bench = dict(tuple(official.groupby('benchmark', sort=False)))
+    rows = [(bench, d) for bench in BENCHMARKS if bench in by_bench for d in by_bench[bench].to_dict('records')]
+    rows += [(f"REAXFF {d['replicate']}", d) for d in results[results['suite'] == 'scaling'].to_dict('records')]
+    
+    for group, d in rows:
+        if isinstance(d['baseline_trials'], tuple):
+            speedup_cols = (f"{d['speedup']:.2f}x | {format_interval(d['speedup_low'], d['speedup_high'], 2)} | "
+                            f"{d['efficiency']:.0%}")
+        else:
+            speedup_cols = "- | - | -"
+        iqr = d['loop_time_q3'] - d['loop_time_q1']
+        ci = format_interval(d['loop_time_ci_low'], d['loop_time_ci_high'], 4)
+        print(f"| {group} | {d['config']} | {d['trials']} | {d['loop_time']:.4f} | {iqr:.4f} | {ci} | {speedup_cols} |")
+    
+    print("\nEfficiency = speedup × baseline cores / cores (MPI ranks × OMP threads).")
+    min_trials = min((d['trials'] for _, d in rows), default=None)
+    if min_trials is not None and min_trials < MIN_TRIALS:
+        print(f"\nSome configurations have fewer than {MIN_TRIALS} trials; their intervals are "
+              f"not meaningful (rerun with TRIALS={MIN_TRIALS} or more).")
+
+
+def print_phase_breakdown(official: pd.DataFrame):
+    """Print timing breakdown phase fractions, flagging Comm- or Modify-dominated configurations."""
+    
+    rows = [(bench, config_label(d), d) for bench in BENCHMARKS for d in phase_records(official, bench)]
+    if not rows:
+        return
+    
+    print("\n### Timing Breakdown (% of loop time, median over trials)\n")
+    print("\n".join(phase_table(rows)))
+
+
+def print_startup_costs(results: pd.DataFrame):
+    """Print launch / setup vs loop time, flagging configurations with high fixed overhead."""
+    
+    rows = [(bench, config_label(d), d) for bench in BENCHMARKS
+            for d in startup_records(results, 'official', bench)]
+    rows += [(f"REAXFF {rep}", config_label(d), d) for rep in REPLICATES
+             for d in startup_records(results, 'scaling', 'REAXFF', rep)]
+    if not rows:
+        return
+    
+    print("\n### Startup Cost (launch + setup vs loop, median over trials)\n")
+    print("\n".join(startup_table(rows)))
+
+
+def print_telemetry(results: pd.DataFrame):
+    """Print run telemetry, flagging oversubscribed, idle, throttled or NUMA-remote configurations."""
+    
+    rows = [(bench, config_label(d), d) for bench in BENCHMARKS
+            for d in telemetry_records(results, 'official', bench)]
+    rows += [(f"REAXFF {rep}", config_label(d), d) for rep in REPLICATES
+             for d in telemetry_records(results, 'scaling', 'REAXFF', rep)]
+    if not rows:
+        return
+    
+    print("\n### Run Telemetry (median over trials, peak rank RSS)\n")
+    print("\n".join(telemetry_table(rows)))
+
+
+def print_bindings(bindings: list[dict]):
+    """Print the best binding policy of every decomposition against its unbound run."""
+    
+    if not bindings:
+        return
+    
+    rows = [(f"{item['key'][0]} {item['key'][1]}".strip(), item['key'][2], item) for item in bindings]
+    print("\n### Best Binding per Decomposition (median over trials)\n")
+    print("\n".join(binding_table(rows)))
+
+
+def print_node_scaling(node_series: list[dict]):
+    """Print strong scaling across nodes of the multi-node fan-out runs (fanout.py)."""
+    
+    if not node_series:
+        return
+    
+    print("\n### Strong Scaling Across Nodes (median over trials)\n")
+    print("\n".join(node_scaling_table(node_series)))
+
+
+def print_size_scaling(size_series: pd.DataFrame):
+    """Print strong, weak and system-size scaling of the scaled official benchmarks (size_scaling.py)."""
+    
+    if size_series is None or size_series.empty:
+        return
+    
+    print("\n### Weak and Strong Scaling of the Official Benchmarks (median over trials)\n")
+    print("\n".join(size_scaling_table(size_series)))
+
+
+def print_ensemble(ensemble: pd.DataFrame):
+    """Print aggregate throughput and per-job latency of the ensemble packings (ensemble.py)."""
+    
+    if ensemble is None or ensemble.empty:
+        return
+    
+    print("\n### Ensemble Throughput: K Concurrent Copies vs One Wide Run (median over trials)\n")
+    print("\n".join(ensemble_table(ensemble)))
+
+
+def print_accuracy(accuracy: pd.DataFrame):
+    """Print thermo deviations from the reference run and the speed-vs-accuracy Pareto front (accuracy.py)."""
+    
+    if accuracy is None or accuracy.empty:
+        return
+    
+    print("\n### Speed vs Accuracy: Deviation from the Reference Run (median over trials)\n")
+    print("\n".join(accuracy_table(accuracy)))
+
+
 # ============================================================================
 # Main
 # ============================================================================
 
+def apply_style():
+    """Non-interactive backend and figure style (also run by every figure worker)."""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    plt.style.use(PLOT_STYLE)
+    plt.rcParams['font.family'] = FONT_FAMILY
+
+
+def load_data(cache: AnalysisCache, store_path: Path) -> dict:
+    """Runs of the store and every frame the figures and tables are views of."""
+    runs = cache.memoize('runs', [store_signature(store_path), SOURCES], lambda: load_runs(store_path))
+    
+    # Build the tidy results frame every figure and table is a view of
+    results = cache.memoize('results', [runs, SOURCES], lambda: build_results(runs))
+    bindings = cache.memoize('bindings', [runs, SOURCES], lambda: binding_records(runs))
+    node_series = cache.memoize('node_scaling', [runs, SOURCES], lambda: node_scaling(nominal_loop_times(runs)))
+    ensemble = cache.memoize('ensemble', [runs, SOURCES], lambda: ensemble_points(runs))
+    accuracy = cache.memoize('accuracy', [runs, SOURCES], lambda: accuracy_points(runs))
+    size_series = cache.memoize('size_scaling', [runs, SOURCES], lambda: scaling_series(runs))
+    return {'runs': runs, 'results': results, 'bindings': bindings, 'node_series': node_series,
+            'ensemble': ensemble, 'accuracy': accuracy, 'size_series': size_series}
+
+
+def plot_params() -> list:
+    """Everything the figures depend on besides their data (part of their cache keys)."""
+    return [SOURCES]
+
+
+def figure_list(data: dict) -> list[tuple]:
+    """(file name, plot function, data) of every figure with data in the store."""
+    results = data['results']
+    official = results[results['suite'] == 'official']
+    scaling = results[results['suite'] == 'scaling']
+    figures = [
+        ('benchmark1_speedup.png', plot_benchmark_speedup, official),
+        ('benchmark2_scaling.png', plot_scaling_results, scaling),
+    ]
+    # Markdown-only results carry no timing breakdown
+    if any(phase_records(official, bench) for bench in BENCHMARKS):
+        figures.append(('benchmark1_phases.png', plot_phase_breakdown, official))
+    else:
+        print("Skipped: benchmark1_phases.png (no timing breakdown in the store)")
+    if any(records for _, records in startup_panels(results)):
+        figures.append(('benchmark_startup.png', plot_startup_costs, results))
+    else:
+        print("Skipped: benchmark_startup.png (no wall times in the store)")
+    if not data['ensemble'].empty:
+        figures.append(('benchmark1_ensemble.png', plot_ensemble_throughput, data['ensemble']))
+    else:
+        print("Skipped: benchmark1_ensemble.png (no ensemble runs in the store)")
+    if not data['accuracy'].empty:
+        figures.append(('benchmark1_accuracy.png', plot_accuracy_pareto, data['accuracy']))
+    else:
+        print("Skipped: benchmark1_accuracy.png (no thermo output with a reference run in the store)")
+    if not data['size_series'].empty:
+        figures.append(('benchmark3_size_scaling.png', plot_size_scaling, data['size_series']))
+    else:
+        print("Skipped: benchmark3_size_scaling.png (no size-scaling runs in the store)")
+    return figures
+
+
+def summary_tables(data: dict, cache: AnalysisCache) -> str:
+    """Printed summary tables (the README sections)."""
+    results, bindings, node_series = data['results'], data['bindings'], data['node_series']
+    size_series, ensemble, accuracy = data['size_series'], data['ensemble'], data['accuracy']
+    return cache.memoize('summary_tables',
+                         [results, bindings, node_series, size_series, ensemble, accuracy, SOURCES],
+                         lambda: capture_output(generate_summary_tables, results, bindings, node_series,
+                                                size_series, ensemble, accuracy))
+
+
 def main():
     base_dir = Path(__file__).parent.parent
     output_dir = base_dir / 'figures'
     output_dir.mkdir(exist_ok=True)
     
-    plt.style.use('seaborn-v0_8-whitegrid')
-    plt.rcParams['font.family'] = 'DejaVu Sans'
+    apply_style()
     
     print("=" * 60)
     print("LAMMPS Benchmark Results Analyzer - Mirae Server")
     print("=" * 60)
     
-    # Parse benchmark 1 data
-    print("\n[1/2] Parsing official+reaxff benchmark...")
-    bench_path = base_dir / 'official+reaxff' / 'benchmark_results.md'
-    bench_data = parse_benchmark_file(bench_path)
-    print(f"  Found: {list(bench_data.keys())}")
+    # Load result store (markdown results and LAMMPS logs next to them are
+    # ingested once per content change)
+    print("\n[1/3] Loading result store...")
+    ingest_results('mirae')
     
-    # Parse benchmark 2 data
-    print("\n[2/2] Parsing ReaxFF scaling benchmark...")
-    scaling_path = base_dir / 'reaxff_scailing' / 'reaxff_scaling_results.md'
-    scaling_data = parse_scaling_file(scaling_path)
-    print(f"  Scaling data: {len(scaling_data)} rows")
+    # Parsed data, tables and figures are reused while their inputs are unchanged
+    cache = AnalysisCache(base_dir / CACHE_DIR_NAME)
+    data = load_data(cache, base_dir / 'results.db')
+    print(f"  Store: {len(data['runs'])} runs")
     
-    # Generate figures
+    print("\n[2/3] Selecting benchmark data...")
+    official = data['results'][data['results']['suite'] == 'official']
+    scaling = data['results'][data['results']['suite'] == 'scaling']
+    print(f"  Found: {[bench for bench in BENCHMARKS if bench in set(official['benchmark'])]}")
+    print(f"  Scaling data: {len(scaling)} rows")
+    
+    # Generate figures (changed ones in parallel worker processes)
     print("\n[3/3] Generating figures...")
-    plot_benchmark_speedup(bench_data, output_dir)
-    plot_scaling_results(scaling_data, output_dir)
+    render_figures(cache, 'mirae', figure_list(data), plot_params(), output_dir)
     
     # Generate summary tables
-    generate_summary_tables(bench_data, scaling_data)
+    print(summary_tables(data, cache), end='')
     
+    print(f"\nCache: {cache.summary()}")
     print(f"\nFigures saved to: {output_dir}")
     print("=" * 60)
 
 
 if __name__ == '__main__':
     main()
-
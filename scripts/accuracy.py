@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Speed vs Accuracy: Deviation from a Reference Run
+
+The optimized Mirae build compiles with `-fp-model fast=2`, the GPU package
+runs in mixed precision by default and KOKKOS reorders reductions, so a
+faster configuration does not necessarily produce the same physics.
+lammps_log.py stores the final thermo values of every run (temp, pe,
+etotal, press, evdwl, ecoul, as printed) and the relative total-energy
+drift over the run. Each configuration is compared with a reference
+double-precision serial run of the same benchmark:
+
+  deviation  |x - x_ref| / |x_ref| of each final thermo value
+  error      the largest energy deviation (pe, etotal, evdwl, ecoul), or the
+             configuration's own |energy drift| if that is larger
+
+Final values and drift depend on the run length, so only runs of as many
+steps as the reference are compared: adaptive runs (adaptive_run.py) that
+stopped at a different step count are left out.
+
+The Pareto front of loop time vs error holds the configurations no other
+configuration beats on both; the fastest one within --tolerance is the one
+to adopt. The reference is --reference CONFIG, else a serial CPU run (one
+rank, one thread, no GPU or KOKKOS package), preferring the names in
+REFERENCE_CONFIGS (ref-serial, then the stock conda-serial build on Mirae).
+
+Usage:
+  accuracy.py report --store mirae_server/results.db --tolerance 1e-4
+  accuracy.py report --store local_desktop/results.db --reference ref-serial --output accuracy_results.md
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from result_store import BENCHMARKS
+from trial_stats import latest_trials, nominal_loop_times, summarize_trials
+
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+# Thermo quantity -> result-store column of its final value
+THERMO_QUANTITIES = {
+    'pe': 'thermo_pe',
+    'etotal': 'thermo_etotal',
+    'evdwl': 'thermo_evdwl',
+    'ecoul': 'thermo_ecoul',
+    'press': 'thermo_press',
+    'temp': 'thermo_temp',
+}
+
+# Quantities whose deviation counts as error (pressure and temperature fluctuate by nature)
+ENERGY_QUANTITIES = ['pe', 'etotal', 'evdwl', 'ecoul']
+
+THERMO_LABELS = {
+    'pe': 'ΔPE',
+    'etotal': 'ΔTotEng',
+    'evdwl': 'ΔE_vdwl',
+    'ecoul': 'ΔE_coul',
+    'press': 'ΔPress',
+    'temp': 'ΔTemp',
+}
+
+# Preferred reference configurations, in order
+REFERENCE_CONFIGS = ['ref-serial', 'conda-serial']
+
+# Accelerators that keep the serial CPU code path in double precision
+REFERENCE_ACCELERATORS = ('none', 'opt', 'omp')
+
+DEFAULT_TOLERANCE = 1e-3
+
+# Error axis floor for bit-identical results (log scale)
+ERROR_FLOOR = 1e-16
+
+FRONT_COLOR = '#2c3e50'
+WITHIN_COLOR = '#27ae60'
+OUTSIDE_COLOR = '#e74c3c'
+
+
+# ============================================================================
+# Deviations
+# ============================================================================
+
+def pick_reference(group: pd.DataFrame, reference: str = None):
+    """Reference configuration of one benchmark, or None."""
+    if reference is not None:
+        return reference if reference in set(group['config']) else None
+    serial = group[(group['mpi_ranks'].fillna(0) == 1) & (group['omp_threads'].fillna(1) == 1)
+                   & group['accelerator'].astype(str).isin(REFERENCE_ACCELERATORS)]
+    for name in REFERENCE_CONFIGS:
+        if name in set(serial['config']):
+            return name
+    return serial['config'].sort_values().iloc[0] if not serial.empty else None
+
+
+def same_length(runs: pd.DataFrame, reference: str = None) -> pd.DataFrame:
+    """Runs as long as their benchmark's reference run (the reference's most common length; unknown lengths kept)."""
+    parts = []
+    for _, group in runs.groupby(['benchmark', 'replicate'], sort=False, observed=True):
+        name = pick_reference(group, reference)
+        steps = group.loc[group['config'] == name, 'timesteps'].mode() if name is not None else []
+        if len(steps):
+            group = group[group['timesteps'].isna() | (group['timesteps'] == steps.iloc[0])]
+        parts.append(group)
+    return pd.concat(parts) if parts else runs
+
+
+def pareto_front(loop_times: pd.Series, errors: pd.Series) -> pd.Series:
+    """Whether each point is on the loop time vs error Pareto front (no point faster and more accurate)."""
+    front = pd.Series(False, index=loop_times.index)
+    best = np.inf
+    for idx in loop_times[errors.notna()].sort_values(kind='stable').index:
+        if errors[idx] < best:
+            front[idx] = True
+            best = errors[idx]
+    return front
+
+
+def accuracy_points(runs: pd.DataFrame, reference: str = None, tolerance: float = DEFAULT_TOLERANCE,
+                    suite: str = 'official') -> pd.DataFrame:
+    """Loop time, thermo deviations and error of every configuration against its benchmark's reference.
+
+    One row per (benchmark, replicate, config) with median loop time and
+    thermo values over the latest trials, `dev_<quantity>` deviations,
+    `error`, `reference`, `pareto`, `within` (error ≤ tolerance) and `best`
+    (the fastest configuration within tolerance). Benchmarks without a
+    reference run, and runs of another length than the reference, are left out.
+    """
+    columns = ['benchmark', 'replicate', 'config', 'reference', 'loop_time', 'energy_drift',
+               *[f'dev_{quantity}' for quantity in THERMO_QUANTITIES], 'error', 'pareto', 'within', 'best']
+    keys = ['benchmark', 'replicate', 'config']
+    thermo = list(THERMO_QUANTITIES.values())
+    unbound = runs['binding'].isna() | (runs['binding'] == 'none')
+    selected = nominal_loop_times(runs[(runs['suite'] == suite) & unbound])
+    selected = selected.dropna(subset=thermo, how='all')
+    if selected.empty:
+        return pd.DataFrame(columns=columns)
+
+    latest = same_length(latest_trials(selected, keys), reference)
+    summary = summarize_trials(latest, keys)
+    values = latest.groupby(keys, sort=False, observed=True)[[*thermo, 'energy_drift']].median().reset_index()
+    summary = summary.drop(columns=[*thermo, 'energy_drift']).merge(values, on=keys)
+
+    points = []
+    for _, group in summary.groupby(['benchmark', 'replicate'], sort=False, observed=True):
+        name = pick_reference(group, reference)
+        if name is None:
+            continue
+        ref = group[group['config'] == name].iloc[0]
+        group = group.assign(reference=name)
+        energy = []
+        for quantity, column in THERMO_QUANTITIES.items():
+            scale = max(abs(ref[column]), np.finfo(float).tiny) if pd.notna(ref[column]) else np.nan
+            group[f'dev_{quantity}'] = (group[column] - ref[column]).abs() / scale
+            if quantity in ENERGY_QUANTITIES:
+                energy.append(group[f'dev_{quantity}'])
+        deviation = pd.concat(energy, axis=1).max(axis=1, skipna=True)
+        group['error'] = pd.concat([deviation, group['energy_drift'].abs()], axis=1).max(axis=1, skipna=True)
+        group['pareto'] = pareto_front(group['loop_time'], group['error'])
+        group['within'] = group['error'] <= tolerance
+        fastest = group.loc[group['within'], 'loop_time']
+        group['best'] = group.index.isin(fastest.index[fastest == fastest.min()][:1])
+        points.append(group)
+    if not points:
+        return pd.DataFrame(columns=columns)
+
+    points = pd.concat(points)
+    order = points['benchmark'].astype(str).map({bench: idx for idx, bench in enumerate(BENCHMARKS)})
+    points = points.assign(order=order).sort_values(['order', 'replicate', 'loop_time'], kind='stable')
+    return points[columns].reset_index(drop=True)
+
+
+# ============================================================================
+# Output
+# ============================================================================
+
+def format_deviation(value: float) -> str:
+    return '-' if pd.isna(value) else f"{value:.1e}"
+
+
+def accuracy_table(points: pd.DataFrame, tolerance: float = DEFAULT_TOLERANCE) -> list[str]:
+    """Markdown table of loop time and deviations, fastest configuration within tolerance in bold."""
+    shown = [quantity for quantity in THERMO_QUANTITIES if points[f'dev_{quantity}'].notna().any()]
+    header = " | ".join(THERMO_LABELS[quantity] for quantity in shown)
+    lines = [f"| Benchmark | Config | Loop (s) | {header} | Drift | Error | Pareto |",
+             "|-----------|--------|----------|" + "".join("-" * (len(THERMO_LABELS[q]) + 2) + "|" for q in shown)
+             + "-------|-------|--------|"]
+    adopted = []
+    for record in points.to_dict('records'):
+        bench = f"{record['benchmark']} {record['replicate']}".strip()
+        config = f"{record['config']} (ref)" if record['config'] == record['reference'] else record['config']
+        error = format_deviation(record['error'])
+        if not record['within'] and pd.notna(record['error']):
+            error += " ⚠"
+        if record['best']:
+            config, error = f"**{config}**", f"**{error}**"
+            adopted.append(f"{bench} {record['config']}")
+        deviations = " | ".join(format_deviation(record[f'dev_{quantity}']) for quantity in shown)
+        lines.append(f"| {bench} | {config} | {record['loop_time']:.3f} | {deviations} | "
+                     f"{format_deviation(record['energy_drift'])} | {error} | {'✓' if record['pareto'] else ''} |")
+
+    lines += ["", f"Δ = |final value - reference| / |reference|; Drift = relative total-energy change over the run; "
+              f"Error = largest energy Δ or |drift|. **Bold**: fastest configuration with error ≤ {tolerance:g}; "
+              f"⚠: outside the tolerance."]
+    if adopted:
+        lines.append("Fastest within tolerance: " + "; ".join(adopted))
+    return lines
+
+
+def plot_pareto(ax, points: pd.DataFrame, tolerance: float = DEFAULT_TOLERANCE, legend: bool = True):
+    """Loop time vs error of one benchmark's configurations, with the Pareto front and the tolerance."""
+    measured = points.dropna(subset=['error'])
+    errors = measured['error'].clip(lower=ERROR_FLOOR)
+    colors = [WITHIN_COLOR if within else OUTSIDE_COLOR for within in measured['within']]
+    ax.scatter(measured['loop_time'], errors, c=colors, s=40, edgecolor='black', linewidth=0.5, zorder=3)
+
+    front = measured[measured['pareto']].sort_values('loop_time')
+    ax.step(front['loop_time'], front['error'].clip(lower=ERROR_FLOOR), where='post', color=FRONT_COLOR,
+            linewidth=1.2, label='Pareto front', zorder=2)
+    ax.axhline(tolerance, color='gray', linestyle='--', linewidth=1, label=f'Tolerance {tolerance:g}')
+
+    for record, error in zip(measured.to_dict('records'), errors):
+        marker = ' (ref)' if record['config'] == record['reference'] else ''
+        ax.annotate(record['config'] + marker, xy=(record['loop_time'], error), xytext=(4, 3),
+                    textcoords='offset points', fontsize=7,
+                    fontweight='bold' if record['best'] else 'normal')
+
+    ax.set_xscale('log')
+    ax.set_yscale('log')
+    ax.set_xlabel('Loop Time (s)', fontsize=10)
+    ax.set_ylabel('Error vs Reference', fontsize=10)
+    ax.grid(True, which='major', alpha=0.3)
+    if legend:
+        from matplotlib.lines import Line2D
+
+        handles = [Line2D([], [], marker='o', linestyle='', color=WITHIN_COLOR, markeredgecolor='black',
+                          label='Within tolerance'),
+                   Line2D([], [], marker='o', linestyle='', color=OUTSIDE_COLOR, markeredgecolor='black',
+                          label='Outside tolerance')]
+        handles += ax.get_legend_handles_labels()[0]
+        ax.legend(handles=handles, fontsize=7, loc='best')
+
+
+# ============================================================================
+# Main
+# ============================================================================
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Speed vs accuracy of configurations against a reference run")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    report = sub.add_parser('report', help="thermo deviations and the time-vs-error Pareto front")
+    report.add_argument('--store', type=Path, required=True)
+    report.add_argument('--suite', default='official')
+    report.add_argument('--reference', help="reference config (default: a serial double-precision CPU run)")
+    report.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help="largest acceptable error (relative energy deviation or drift)")
+    report.add_argument('--output', type=Path, help="write a results file (with its configurations) instead")
+
+    args = parser.parse_args(argv)
+
+    from result_store import load_runs, results_header
+
+    runs = load_runs(args.store, suite=args.suite)
+    points = accuracy_points(runs, args.reference, args.tolerance, args.suite)
+    if points.empty:
+        print("No thermo output with a reference run in the store (run a serial reference config, "
+              "e.g. ACCURACY_REFERENCE in the runners)")
+        return 1
+    lines = ["### Speed vs Accuracy (median over trials)", "", *accuracy_table(points, args.tolerance)]
+    if args.output:
+        header = results_header("LAMMPS Speed vs Accuracy Results", runs[runs['config'].isin(points['config'])])
+        args.output.write_text("\n".join(header + lines) + "\n", encoding='utf-8')
+        print(f"✓ Results saved to: {args.output}")
+    else:
+        print("\n" + "\n".join(lines))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
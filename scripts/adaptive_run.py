@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Adaptive Run-Length Controller
+
+Wraps one LAMMPS run and sizes it by measurement time instead of a fixed
+step count. The last `run` of the input is rewritten to a long upper bound
+with per-step timing in the thermo output (`cpu` keyword, flushed every
+thermo step) and a `fix halt` that fires once a stop file appears. While the
+run progresses the controller reads the log, and creates the stop file as
+soon as the run has lasted at least --min-time seconds and the per-step
+time of the last --window thermo intervals varies by no more than
+--tolerance (coefficient of variation). Fast runs are thereby extended until
+launch jitter no longer matters and slow runs end once throughput is steady.
+
+When the run ends, a summary line is appended to the log (parsed by
+lammps_log.py):
+
+  Adaptive run: nominal 100 steps, ran 2400 steps, 1.2e-05 s/step (cv 0.8%, steady),
+  extrapolated loop time 0.0012
+
+The extrapolated loop time is the steady per-step time × the nominal step
+count, so adaptive runs stay comparable with fixed-length ones.
+
+Usage:
+  adaptive_run.py [--min-time 5] [--tolerance 0.02] -- mpirun -np 48 lmp -in in.lj -log log.lj_opt-mpi48-omp1
+"""
+
+import argparse
+import math
+import re
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from lammps_log import parse_log
+
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+DEFAULT_MIN_TIME = 5.0
+DEFAULT_MAX_TIME = 3600.0
+DEFAULT_TOLERANCE = 0.02
+DEFAULT_WINDOW = 5
+
+# Upper bound of the rewritten run, as a multiple of the nominal step count
+DEFAULT_MAX_FACTOR = 1000
+
+# Thermo intervals per nominal run (steady state needs --window + 1 of them)
+THERMO_INTERVALS = 25
+
+POLL_INTERVAL = 0.5
+
+# Columns of the default `thermo_style one`
+DEFAULT_THERMO_COLUMNS = 'step temp epair emol etotal press'
+
+RUN_RE = re.compile(r'^(\s*run\s+)(\d+)(.*)$', re.MULTILINE)
+
+
+# ============================================================================
+# Input Rewriting
+# ============================================================================
+
+def adaptive_input(text: str, stop_file: str, max_factor: int = DEFAULT_MAX_FACTOR) -> tuple:
+    """Rewrite the last `run` for adaptive length. Returns (text, nominal steps, thermo interval)."""
+    runs = list(RUN_RE.finditer(text))
+    if not runs:
+        raise ValueError("input has no run command")
+    last = runs[-1]
+    nominal = int(last.group(2))
+    interval = max(1, nominal // THERMO_INTERVALS)
+
+    # Keep the input's thermo columns and settings; thermo_style resets thermo_modify
+    columns = DEFAULT_THERMO_COLUMNS
+    modify = []
+    for line in text[:last.start()].splitlines():
+        words = line.split('#')[0].split()
+        if words[:2] == ['thermo_style', 'custom']:
+            columns = ' '.join(words[2:])
+        elif words[:1] == ['thermo_style']:
+            columns = DEFAULT_THERMO_COLUMNS
+        elif words[:1] == ['thermo_modify']:
+            modify.append(' '.join(words))
+    if 'cpu' not in columns.split():
+        columns += ' cpu'
+
+    control = [
+        "# adaptive_run.py: per-step timing and stop file",
+        f"thermo_style custom {columns}",
+        *modify,
+        "thermo_modify flush yes",
+        f"thermo {interval}",
+        f'variable adaptive_stop equal is_file("{stop_file}")',
+        f"fix adaptive_halt all halt {interval} v_adaptive_stop > 0 error continue",
+        f"{last.group(1)}{nominal * max_factor}{last.group(3)}",
+    ]
+    text = text[:last.start()] + '\n'.join(control) + text[last.end():]
+    return text, nominal, interval
+
+
+# ============================================================================
+# Steady-State Detection
+# ============================================================================
+
+def step_times(rows: list[list], columns: list[str]) -> list[tuple]:
+    """(steps, seconds per step) of each thermo interval; the first (setup-heavy) one is dropped."""
+    step_col, cpu_col = columns.index('Step'), columns.index('CPU')
+    intervals = []
+    for prev, row in zip(rows, rows[1:]):
+        steps = row[step_col] - prev[step_col]
+        if steps > 0:
+            intervals.append((steps, (row[cpu_col] - prev[cpu_col]) / steps))
+    return intervals[1:]
+
+
+def steady_rate(intervals: list[tuple], window: int) -> tuple:
+    """Per-step time and coefficient of variation over the last `window` intervals."""
+    if len(intervals) < window:
+        return None, math.inf
+    recent = intervals[-window:]
+    times = [per_step for _, per_step in recent]
+    mean = statistics.fmean(times)
+    cv = statistics.pstdev(times) / mean if mean > 0 else math.inf
+    per_step = sum(steps * per_step for steps, per_step in recent) / sum(steps for steps, _ in recent)
+    return per_step, cv
+
+
+def measured_run(log_path: Path) -> dict:
+    """The run block carrying the CPU thermo column, from the complete lines written so far."""
+    try:
+        text = log_path.read_text(errors='replace')
+    except OSError:
+        return None
+    text = text[:text.rfind('\n') + 1]
+    runs = [run for run in parse_log(text.splitlines(True))['runs'] if 'CPU' in run['thermo']['columns']]
+    return runs[-1] if runs else None
+
+
+# ============================================================================
+# Controller
+# ============================================================================
+
+def run_adaptive(command: list[str], min_time: float, max_time: float, tolerance: float,
+                 window: int, max_factor: int) -> int:
+    """Run a LAMMPS command with adaptive length. Returns its exit code."""
+    in_idx = command.index('-in') + 1
+    input_path = Path(command[in_idx])
+    log_path = Path(command[command.index('-log') + 1]) if '-log' in command else Path('log.lammps')
+    stop_file = log_path.with_name(log_path.name + '.stop')
+    # Named after the log so concurrent trials of one input each rewrite their own copy
+    # (not log.*, which ingest_logs.py would take for a runner log)
+    adaptive_path = log_path.with_name('in.' + log_path.name.removeprefix('log.') + '.adaptive')
+
+    text, nominal, _ = adaptive_input(input_path.read_text(), str(stop_file.resolve()), max_factor)
+    adaptive_path.write_text(text)
+    stop_file.unlink(missing_ok=True)
+    command = command[:in_idx] + [str(adaptive_path)] + command[in_idx + 1:]
+
+    try:
+        process = subprocess.Popen(command)
+        while process.poll() is None:
+            time.sleep(POLL_INTERVAL)
+            run = measured_run(log_path)
+            if run is None or run['complete'] or len(run['thermo']['rows']) < 2:
+                continue
+            columns = run['thermo']['columns']
+            elapsed = run['thermo']['rows'][-1][columns.index('CPU')]
+            _, cv = steady_rate(step_times(run['thermo']['rows'], columns), window)
+            if elapsed >= max_time or (elapsed >= min_time and cv <= tolerance):
+                stop_file.touch()
+        exit_code = process.returncode
+    finally:
+        adaptive_path.unlink(missing_ok=True)
+        stop_file.unlink(missing_ok=True)
+
+    # Final per-step time from the complete thermo record
+    run = measured_run(log_path)
+    if exit_code == 0 and run is not None and run['complete']:
+        intervals = step_times(run['thermo']['rows'], run['thermo']['columns'])
+        per_step, cv = steady_rate(intervals, min(window, len(intervals)) or 1)
+        if per_step is None:
+            per_step = run['loop_time'] / run['steps']
+        state = 'steady' if cv <= tolerance else 'not steady'
+        with open(log_path, 'a') as handle:
+            handle.write(f"Adaptive run: nominal {nominal} steps, ran {run['steps']} steps, "
+                         f"{per_step:.6g} s/step (cv {cv:.1%}, {state}), "
+                         f"extrapolated loop time {per_step * nominal:.6g}\n")
+    return exit_code
+
+
+# ============================================================================
+# Main
+# ============================================================================
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Adaptive run-length controller for one LAMMPS run")
+    parser.add_argument('--min-time', type=float, default=DEFAULT_MIN_TIME,
+                        help="extend runs until they have lasted this many seconds")
+    parser.add_argument('--max-time', type=float, default=DEFAULT_MAX_TIME,
+                        help="stop runs after this many seconds even if not steady")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help="steady when the per-step time CV of the window is below this")
+    parser.add_argument('--window', type=int, default=DEFAULT_WINDOW, help="thermo intervals in the window")
+    parser.add_argument('--max-factor', type=int, default=DEFAULT_MAX_FACTOR,
+                        help="upper bound of the run as a multiple of its nominal length")
+    parser.add_argument('command', nargs=argparse.REMAINDER, help="-- LAMMPS command with -in <input>")
+    args = parser.parse_args(argv)
+
+    command = args.command[1:] if args.command[:1] == ['--'] else args.command
+    if '-in' not in command or command.index('-in') + 1 >= len(command):
+        parser.error("the command needs -in <input>")
+
+    return run_adaptive(command, args.min_time, args.max_time, args.tolerance,
+                        args.window, args.max_factor)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Analysis Cache
+
+Content-addressed cache for the analyzers. Entries are keyed on a digest of
+their inputs (result store contents, selected DataFrames, the source of the
+analyzer and all shared scripts), so parsed data, summary tables and rendered figures are
+only recomputed when something they depend on changed. The least recently
+used entries are evicted once the cache holds more than `max_entries`.
+Figures whose inputs changed can be rendered in a process pool (outputs()).
+
+Usage:
+  analysis_cache.py info mirae_server/.analysis_cache
+  analysis_cache.py clear mirae_server/.analysis_cache
+"""
+
+import argparse
+import hashlib
+import inspect
+import io
+import json
+import os
+import pickle
+import shutil
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from pathlib import Path
+
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+DEFAULT_MAX_ENTRIES = 64
+
+CACHE_DIR_NAME = '.analysis_cache'
+
+
+# ============================================================================
+# Key Functions
+# ============================================================================
+
+def update_digest(digest, value):
+    """Feed a value into a hash in a type-aware, deterministic way."""
+    digest.update(type(value).__name__.encode())
+
+    if isinstance(value, Path):
+        digest.update(str(value).encode())
+        if value.is_file():
+            with open(value, 'rb') as handle:
+                for block in iter(lambda: handle.read(1 << 20), b''):
+                    digest.update(block)
+    elif callable(value):
+        try:
+            digest.update(inspect.getsource(value).encode())
+        except (OSError, TypeError):
+            digest.update(getattr(value, '__qualname__', repr(value)).encode())
+    elif hasattr(value, 'to_numpy') and hasattr(value, 'columns'):
+        import pandas as pd
+
+        digest.update(json.dumps([str(c) for c in value.columns]).encode())
+        digest.update(json.dumps([str(t) for t in value.dtypes]).encode())
+        digest.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            update_digest(digest, item)
+    elif isinstance(value, dict):
+        for key in sorted(value, key=str):
+            update_digest(digest, key)
+            update_digest(digest, value[key])
+    else:
+        digest.update(repr(value).encode())
+
+
+def cache_key(*parts) -> str:
+    """Digest of everything an analysis step depends on."""
+    digest = hashlib.sha256()
+    for part in parts:
+        update_digest(digest, part)
+    return digest.hexdigest()
+
+
+def source_digest(analyzer_file: Path) -> str:
+    """Digest of an analyzer and every shared script, so any code change invalidates its entries."""
+    scripts = sorted(Path(__file__).resolve().parent.glob('*.py'))
+    return cache_key(Path(analyzer_file).resolve(), *scripts)
+
+
+def capture_output(func, *args, **kwargs) -> str:
+    """Run a function that prints, returning what it printed."""
+    buffer = io.StringIO()
+    with redirect_stdout(buffer):
+        func(*args, **kwargs)
+    return buffer.getvalue()
+
+
+# ============================================================================
+# Cache
+# ============================================================================
+
+class AnalysisCache:
+    """On-disk LRU cache of pickled analysis results and rendered files."""
+
+    def __init__(self, cache_dir: Path, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.cache_dir = Path(cache_dir)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _entry(self, name: str, key: str, suffix: str) -> Path:
+        return self.cache_dir / f"{name}-{key[:16]}{suffix}"
+
+    def _touch(self, path: Path):
+        # Entry mtime doubles as the LRU timestamp
+        os.utime(path)
+
+    def _evict(self):
+        entries = sorted(self.cache_dir.glob('*-*.*'), key=lambda p: p.stat().st_mtime)
+        for path in entries[:max(0, len(entries) - self.max_entries)]:
+            path.unlink(missing_ok=True)
+
+    def _store(self, path: Path, write):
+        tmp = path.with_name(path.name + '.tmp')
+        write(tmp)
+        os.replace(tmp, path)
+        self._evict()
+
+    def memoize(self, name: str, parts: list, compute):
+        """Return compute(), reusing the stored result if `parts` are unchanged."""
+        path = self._entry(name, cache_key(name, *parts), '.pkl')
+        if path.exists():
+            try:
+                with open(path, 'rb') as handle:
+                    value = pickle.load(handle)
+                self._touch(path)
+                self.hits += 1
+                return value
+            except (OSError, pickle.UnpicklingError, EOFError):
+                path.unlink(missing_ok=True)
+
+        self.misses += 1
+        value = compute()
+
+        def write(tmp):
+            with open(tmp, 'wb') as handle:
+                pickle.dump(value, handle, protocol=pickle.HIGHEST_PROTOCOL)
+
+        self._store(path, write)
+        return value
+
+    def _restore(self, output_path: Path, parts: list) -> tuple:
+        """Cache entry of an output, copied to `output_path` if present. Returns (entry, hit)."""
+        path = self._entry(output_path.stem, cache_key(output_path.name, *parts), output_path.suffix)
+        if not path.exists():
+            self.misses += 1
+            return path, False
+        if not output_path.exists() or output_path.read_bytes() != path.read_bytes():
+            shutil.copyfile(path, output_path)
+        self._touch(path)
+        self.hits += 1
+        return path, True
+
+    def output(self, output_path: Path, parts: list, render) -> bool:
+        """Produce `output_path` with render() unless `parts` are unchanged.
+
+        Returns True if the file was rendered, False if it came from the cache.
+        """
+        output_path = Path(output_path)
+        path, hit = self._restore(output_path, parts)
+        if hit:
+            return False
+        render()
+        self._store(path, lambda tmp: shutil.copyfile(output_path, tmp))
+        return True
+
+    def outputs(self, jobs: list[tuple], workers: int = None) -> list[bool]:
+        """output() for several (output_path, parts, render) jobs, rendering the changed ones in parallel.
+
+        render must be picklable (a module-level function or a partial of
+        one); a single changed output is rendered in this process.
+        """
+        pending = []
+        for output_path, parts, render in jobs:
+            path, hit = self._restore(Path(output_path), parts)
+            if not hit:
+                pending.append((Path(output_path), path, render))
+
+        workers = min(workers or os.cpu_count() or 1, len(pending))
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                for future in [pool.submit(render) for _, _, render in pending]:
+                    future.result()
+        else:
+            for _, _, render in pending:
+                render()
+        for output_path, path, _ in pending:
+            self._store(path, lambda tmp, source=output_path: shutil.copyfile(source, tmp))
+
+        rendered = {output_path for output_path, _, _ in pending}
+        return [Path(output_path) in rendered for output_path, _, _ in jobs]
+
+    def summary(self) -> str:
+        return f"{self.hits} cached, {self.misses} recomputed"
+
+
+# ============================================================================
+# Main
+# ============================================================================
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Analyzer cache maintenance")
+    parser.add_argument('action', choices=['info', 'clear'])
+    parser.add_argument('cache_dir', type=Path)
+    args = parser.parse_args(argv)
+
+    entries = sorted(args.cache_dir.glob('*-*.*'), key=lambda p: p.stat().st_mtime)
+    if args.action == 'clear':
+        for path in entries:
+            path.unlink()
+        print(f"Removed {len(entries)} entries from {args.cache_dir}")
+    else:
+        total = sum(path.stat().st_size for path in entries)
+        print(f"{args.cache_dir}: {len(entries)} entries, {total / 1e6:.1f} MB")
+        for path in reversed(entries):
+            print(f"  {path.name}  {path.stat().st_size / 1e3:.0f} kB")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
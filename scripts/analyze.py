@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Analyzer Command Line
+
+One entry point for both analyzers, with subcommands that load only what
+they need:
+
+  ingest   ingest the markdown results and runner logs into <env>/results.db
+  tables   print the summary tables (the README sections)
+  figures  render the figures
+  compare  regression gate of the store against a baseline (compare_runs.py):
+           --baseline, or the same store split by date with --baseline-until
+
+The analyzers import pandas, numpy and the shared analysis modules at load,
+so this module imports an analyzer only when a subcommand computes something.
+The tables are cached on the store contents and the analyzer and script
+sources: with an unchanged store they are printed from .analysis_cache
+without loading an analyzer. Figures are rendered with the non-interactive
+Agg backend; figures whose inputs changed are rendered in worker processes
+(--jobs, default one per core), each loading the analyzer once. Running an
+analyze_benchmarks.py script directly still does everything in one go.
+
+Usage:
+  analyze.py tables --env mirae
+  analyze.py figures --jobs 4
+  analyze.py ingest --env local
+  analyze.py compare --env mirae --baseline-until 2026-01-05 --new-since 2026-03-01
+"""
+
+import argparse
+import importlib.util
+import sys
+from functools import partial
+from pathlib import Path
+
+from analysis_cache import CACHE_DIR_NAME, AnalysisCache, source_digest
+
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+REPO_DIR = SCRIPTS_DIR.parent
+
+# Analyzer environments: directory and the markdown result files ingested into its store
+ENVIRONMENTS = {
+    'mirae': {
+        'dir': 'mirae_server',
+        'result_files': [
+            Path('official+reaxff') / 'benchmark_results.md',
+            Path('reaxff_scailing') / 'reaxff_scaling_results.md',
+        ],
+    },
+    'local': {
+        'dir': 'local_desktop',
+        'result_files': [
+            Path('lammps_cuda_image') / 'official+reaxff_bench' / 'benchmark_results.md',
+            Path('lammps_kokkos_image') / 'official+reaxff_bench' / 'benchmark_results.md',
+            Path('lammps_cuda_image') / 'reaxff_scaling_bench' / 'reaxff_scaling_results.md',
+            Path('lammps_kokkos_image') / 'reaxff_scaling' / 'reaxff_scaling_results.md',
+        ],
+    },
+}
+
+STORE_NAME = 'results.db'
+
+
+# ============================================================================
+# Environments
+# ============================================================================
+
+def env_dir(env: str) -> Path:
+    return REPO_DIR / ENVIRONMENTS[env]['dir']
+
+
+def analyzer_path(env: str) -> Path:
+    return env_dir(env) / 'scripts' / 'analyze_benchmarks.py'
+
+
+def load_analyzer(env: str):
+    """Import an environment's analyze_benchmarks.py (once per process)."""
+    path = analyzer_path(env)
+    # A figure worker forked from the analyzer script reuses its module
+    main = sys.modules.get('__main__')
+    if getattr(main, '__file__', None) and Path(main.__file__).resolve() == path:
+        return main
+    name = f"analyze_benchmarks_{env}"
+    if name not in sys.modules:
+        spec = importlib.util.spec_from_file_location(name, path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        spec.loader.exec_module(module)
+    return sys.modules[name]
+
+
+def ingest_results(env: str) -> int:
+    """Ingest an environment's markdown results and the runner logs next to them (unchanged files skipped)."""
+    from ingest_logs import discover_logs, ingest_logs
+    from result_store import ingest_markdown
+
+    base_dir = env_dir(env)
+    store_path = base_dir / STORE_NAME
+    total = 0
+    for result_file in ENVIRONMENTS[env]['result_files']:
+        added = ingest_markdown(base_dir / result_file, store_path)
+        logs = discover_logs((base_dir / result_file).parent)
+        added += ingest_logs(logs, store_path)[1]
+        if added:
+            print(f"  Ingested {added} rows from {result_file.parent}")
+        total += added
+    return total
+
+
+# ============================================================================
+# Figures
+# ============================================================================
+
+def render_figure(env: str, plot_name: str, data, output_dir: Path):
+    """Render one analyzer figure (runs in a worker process)."""
+    analyzer = load_analyzer(env)
+    analyzer.apply_style()
+    getattr(analyzer, plot_name)(data, output_dir)
+
+
+def render_figures(cache: AnalysisCache, env: str, figures: list[tuple], params: list, output_dir: Path,
+                   jobs: int = None):
+    """Render (name, plot, data) figures whose inputs changed, in parallel; report the unchanged ones."""
+    outputs = [(output_dir / name, [plot, data, params], partial(render_figure, env, plot.__name__, data, output_dir))
+               for name, plot, data in figures]
+    for (name, _, _), rendered in zip(figures, cache.outputs(outputs, jobs)):
+        if not rendered:
+            print(f"Unchanged: {name}")
+
+
+# ============================================================================
+# Subcommands
+# ============================================================================
+
+def tables_text(env: str) -> str:
+    """Summary tables of an environment, computed only when the store or a source changed."""
+    from result_store import store_signature
+
+    base_dir = env_dir(env)
+    store_path = base_dir / STORE_NAME
+    cache = AnalysisCache(base_dir / CACHE_DIR_NAME)
+
+    def compute():
+        analyzer = load_analyzer(env)
+        return analyzer.summary_tables(analyzer.load_data(cache, store_path), cache)
+
+    return cache.memoize('tables_text', [store_signature(store_path), source_digest(analyzer_path(env))], compute)
+
+
+def figures(env: str, jobs: int = None):
+    base_dir = env_dir(env)
+    output_dir = base_dir / 'figures'
+    output_dir.mkdir(exist_ok=True)
+    analyzer = load_analyzer(env)
+    analyzer.apply_style()
+    cache = AnalysisCache(base_dir / CACHE_DIR_NAME)
+    data = analyzer.load_data(cache, base_dir / STORE_NAME)
+    render_figures(cache, env, analyzer.figure_list(data), analyzer.plot_params(), output_dir, jobs)
+    print(f"Cache: {cache.summary()}")
+    print(f"Figures saved to: {output_dir}")
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="LAMMPS benchmark analyzers")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    def add_command(name: str, help: str):
+        command = sub.add_parser(name, help=help)
+        command.add_argument('--env', choices=[*ENVIRONMENTS, 'all'], default='all')
+        return command
+
+    add_command('ingest', "ingest markdown results and runner logs into the store")
+    add_command('tables', "print the summary tables")
+    figs = add_command('figures', "render the figures")
+    figs.add_argument('--jobs', type=int, help="worker processes (default: one per core)")
+    cmp = add_command('compare', "regression gate of the store against a baseline")
+    cmp.add_argument('--baseline', type=Path, help="baseline store, results file or log directory "
+                                                  "(default: the same store up to --baseline-until)")
+    cmp.add_argument('--baseline-until', help="only baseline runs up to this date (YYYY-MM-DD)")
+    cmp.add_argument('--new-since', help="only new runs from this date (YYYY-MM-DD)")
+    cmp.add_argument('--suite', choices=['official', 'scaling'])
+    cmp.add_argument('--history', type=Path, help="append the comparison to this CSV time series")
+
+    args = parser.parse_args(argv)
+    if args.command == 'compare' and not args.baseline:
+        # The latest trials of an unsplit store are the new runs themselves: the gate would always pass
+        if not args.baseline_until:
+            parser.error("compare needs --baseline, or --baseline-until to split the store by date")
+        if args.new_since and args.new_since <= args.baseline_until:
+            parser.error("--new-since must be after --baseline-until when comparing the store with itself")
+    envs = list(ENVIRONMENTS) if args.env == 'all' else [args.env]
+
+    status = 0
+    for env in envs:
+        if len(envs) > 1:
+            print(f"\n{'=' * 60}\n{ENVIRONMENTS[env]['dir']}\n{'=' * 60}")
+        if args.command == 'ingest':
+            added = ingest_results(env)
+            print(f"✓ {env_dir(env) / STORE_NAME}: {added} rows ingested")
+            continue
+
+        ingest_results(env)
+        if args.command == 'tables':
+            print(tables_text(env), end='')
+        elif args.command == 'figures':
+            figures(env, args.jobs)
+        else:
+            from compare_runs import main as compare_main
+
+            store_path = env_dir(env) / STORE_NAME
+            compare_argv = ['compare', str(args.baseline or store_path), str(store_path)]
+            for option, value in [('--baseline-until', args.baseline_until), ('--new-since', args.new_since),
+                                  ('--suite', args.suite), ('--history', args.history)]:
+                if value:
+                    compare_argv += [option, str(value)]
+            status = max(status, compare_main(compare_argv))
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Benchmark Configuration Helpers
+
+Parses the "name|omp|command" / "name|command" configuration strings used by
+the bash runners and derives the run layout (binary, MPI ranks, OpenMP
+threads, accelerator, nodes) from the LAMMPS command line.
+"""
+
+import math
+import re
+import shlex
+from pathlib import Path
+
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+MPI_LAUNCHERS = ('mpirun', 'mpiexec', 'srun')
+
+# Launcher options giving the rank count
+RANK_OPTIONS = ('-np', '-n', '--np', '--ntasks')
+
+# srun options giving the CPUs (OpenMP threads) of each rank; Open MPI's mpirun takes -c as the rank count
+THREAD_OPTIONS = ('-c', '--cpus-per-task')
+
+# Launcher options that take a value (skipped when looking for the binary)
+LAUNCHER_VALUE_OPTIONS = (*RANK_OPTIONS, *THREAD_OPTIONS, '-N', '--nodes', '-npernode', '--npernode', '--ntasks-per-node',
+                          '--map-by', '--rank-by', '--bind-to', '--cpu-set', '--cpu-bind', '-x',
+                          '-H', '--host', '-hostfile', '--hostfile', '-machinefile', '--machinefile')
+
+# Open MPI ranks per node (-N means nodes for srun)
+PER_NODE_OPTIONS = ('-npernode', '--npernode', '--ntasks-per-node', '-N')
+
+# "--map-by ppr:48:node"
+PPR_NODE_RE = re.compile(r'^ppr:(\d+):node')
+
+# Suffix style (-sf) -> accelerator label
+SUFFIX_ACCELERATORS = {
+    'gpu': 'gpu',
+    'kk': 'kokkos',
+    'omp': 'omp',
+    'opt': 'opt',
+    'intel': 'intel',
+}
+
+
+# ============================================================================
+# Parsing Functions
+# ============================================================================
+
+def is_rank_option(launcher: str, option: str) -> bool:
+    """Whether a launcher option gives the rank count (-c is --cpus-per-task for srun, -np for mpirun)."""
+    srun = Path(launcher).name == 'srun'
+    return option in RANK_OPTIONS or (option == '-c' and not srun)
+
+
+def is_thread_option(launcher: str, option: str) -> bool:
+    """Whether a launcher option gives the threads of each rank (srun's -c / --cpus-per-task)."""
+    return Path(launcher).name == 'srun' and option in THREAD_OPTIONS
+
+
+def parse_config_spec(spec: str) -> dict:
+    """Parse a runner config string ("name|omp|command" or "name|command")."""
+    parts = spec.split('|')
+    if len(parts) == 3:
+        name, omp, command = parts
+    elif len(parts) == 2:
+        name, command = parts
+        omp = '1'
+    else:
+        raise ValueError(f"Invalid config spec: {spec!r}")
+
+    return {
+        'name': name.strip(),
+        'omp_threads': int(omp),
+        'command': command.strip(),
+    }
+
+
+def describe_command(command: str, omp_threads: int = 1) -> dict:
+    """Derive binary, MPI ranks, OMP threads, accelerator and nodes from a command."""
+    tokens = shlex.split(command)
+
+    mpi_ranks = 1
+    threads = omp_threads
+    nodes = per_node = None
+    idx = 0
+    if tokens and Path(tokens[0]).name in MPI_LAUNCHERS:
+        srun = Path(tokens[0]).name == 'srun'
+        idx = 1
+        while idx < len(tokens) and tokens[idx].startswith('-'):
+            option, sep, value = tokens[idx].partition('=')
+            idx += 1
+            if not sep and option in LAUNCHER_VALUE_OPTIONS and idx < len(tokens):
+                value = tokens[idx]
+                idx += 1
+            if is_rank_option(tokens[0], option) and value:
+                mpi_ranks = int(value)
+            elif is_thread_option(tokens[0], option) and value:
+                threads = int(value)
+            elif option in ('-N', '--nodes') and srun:
+                nodes = int(value)
+            elif option in PER_NODE_OPTIONS:
+                per_node = int(value)
+            elif option == '--map-by' and PPR_NODE_RE.match(value):
+                per_node = int(PPR_NODE_RE.match(value).group(1))
+
+    binary = Path(tokens[idx]).name if idx < len(tokens) else ''
+    args = tokens[idx + 1:]
+
+    accelerator = 'none'
+    for i, tok in enumerate(args[:-1]):
+        nxt = args[i + 1]
+        if tok in ('-sf', '-suffix'):
+            accelerator = SUFFIX_ACCELERATORS.get(nxt, nxt)
+        elif tok in ('-pk', '-package') and nxt == 'omp' and i + 2 < len(args):
+            threads = int(args[i + 2])
+        elif tok in ('-k', '-kokkos') and nxt == 'on':
+            # "-k on g 1" selects the CUDA backend, "-k on t N" host threads
+            rest = args[i + 2:i + 6]
+            if 'g' in rest:
+                accelerator = 'kokkos-gpu'
+            if 't' in rest:
+                t_idx = rest.index('t')
+                if t_idx + 1 < len(rest):
+                    threads = int(rest[t_idx + 1])
+
+    if accelerator == 'kokkos' and 'g' in args:
+        accelerator = 'kokkos-gpu'
+
+    if nodes is None:
+        nodes = math.ceil(mpi_ranks / per_node) if per_node else 1
+
+    return {
+        'binary': binary,
+        'mpi_ranks': mpi_ranks,
+        'omp_threads': threads,
+        'accelerator': accelerator,
+        'nodes': nodes,
+    }
@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+Process and Thread Binding Policies
+
+Makes rank and thread placement an explicit dimension of the configuration
+matrix instead of whatever the MPI launcher and OpenMP runtime default to.
+A policy rewrites one LAMMPS command (mpirun --map-by / --bind-to, or taskset
+and numactl for launcher-less runs) and sets OMP_PLACES / OMP_PROC_BIND:
+
+  none     nothing is set (the launcher's and runtime's defaults, as before)
+  core     each rank bound to its own block of omp_threads cores, threads
+           free within the block
+  compact  core, with threads pinned one per core next to each other
+  spread   ranks round-robin over the sockets, threads spread over the
+           rank's cores
+  socket   ranks bound to a whole socket (threads float within it)
+  numa     ranks bound to a whole NUMA node (threads float within it)
+  pcore    only the performance cores of a hybrid CPU (e.g. i9-12900)
+
+Policies that cannot be honored on this machine are skipped with a reason:
+socket and numa when a rank's threads do not fit one domain, pcore without
+a hybrid CPU or with more threads than P-cores, and any binding that needs
+more cores than the run may use. The runners put the policy into the log
+name (log.lj_opt-mpi6-omp8.bind-core), lammps_log.py records it in the
+`binding` column, and the report shows the best binding of every
+decomposition against the unbound run.
+
+Usage:
+  binding.py show --omp 8 -- mpirun -np 6 lmp -sf omp -pk omp 8 -in
+  binding.py check --policy numa --omp 48 -- lmp -sf omp -pk omp 48 -in
+  binding.py run --policy compact --omp 8 -- mpirun -np 6 lmp -sf omp -pk omp 8 -in in.lj -log log.lj
+  binding.py report --store mirae_server/results.db --benchmark REAXFF
+"""
+
+import argparse
+import os
+import shlex
+import shutil
+import sys
+from itertools import zip_longest
+from pathlib import Path
+
+import pandas as pd
+
+from bench_config import MPI_LAUNCHERS, describe_command
+from sweep import format_cpus
+from telemetry import cpu_nodes, read_text
+from trial_stats import best_with_overlap, latest_trials, summarize_trials
+
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+BINDING_POLICIES = ['none', 'core', 'compact', 'spread', 'socket', 'numa', 'pcore']
+
+# OpenMP placement of each policy; 'none' leaves the environment alone
+OMP_BINDING = {
+    'core': {'OMP_PROC_BIND': 'false'},
+    'compact': {'OMP_PLACES': 'cores', 'OMP_PROC_BIND': 'close'},
+    'spread': {'OMP_PLACES': 'cores', 'OMP_PROC_BIND': 'spread'},
+    'socket': {'OMP_PROC_BIND': 'false'},
+    'numa': {'OMP_PROC_BIND': 'false'},
+    'pcore': {'OMP_PLACES': 'cores', 'OMP_PROC_BIND': 'close'},
+}
+
+# Log name suffix of a bound run (log.X.bind-core, trials log.X.bind-core.tN)
+LOG_SUFFIX = '.bind-'
+
+# Hybrid CPUs list their performance cores here
+PCORE_CPUS = '/sys/devices/cpu_core/cpus'
+
+# A binding is worth reporting when it beats the unbound run by more than this
+GAIN_THRESHOLD = 1.05
+
+
+# ============================================================================
+# Topology
+# ============================================================================
+
+def parse_cpulist(text: str) -> list[int]:
+    """Expand a sysfs CPU list (0-7,16-23)."""
+    cpus = []
+    for part in text.strip().split(','):
+        if part:
+            lo, _, hi = part.partition('-')
+            cpus.extend(range(int(lo), int(hi or lo) + 1))
+    return cpus
+
+
+def topology() -> dict:
+    """Cores this process may use, grouped by socket and NUMA node, and the P-cores.
+
+    A core is represented by its first hardware thread, so SMT siblings are
+    never handed out as separate cores.
+    """
+    allowed = sorted(os.sched_getaffinity(0))
+    sockets, seen = {}, set()
+    for cpu in allowed:
+        base = f'/sys/devices/system/cpu/cpu{cpu}/topology'
+        package = read_text(f'{base}/physical_package_id').strip() or '0'
+        core = read_text(f'{base}/core_id').strip() or str(cpu)
+        if (package, core) in seen:
+            continue
+        seen.add((package, core))
+        sockets.setdefault(int(package), []).append(cpu)
+
+    cores = sorted(cpu for group in sockets.values() for cpu in group)
+    nodes = {}
+    for cpu, node in cpu_nodes().items():
+        if cpu in cores:
+            nodes.setdefault(node, []).append(cpu)
+    pcores = [cpu for cpu in parse_cpulist(read_text(PCORE_CPUS)) if cpu in cores]
+    return {
+        'cores': cores,
+        'sockets': {key: sorted(value) for key, value in sorted(sockets.items())},
+        'nodes': {key: sorted(value) for key, value in sorted(nodes.items())} or {0: cores},
+        'pcores': pcores,
+    }
+
+
+# ============================================================================
+# Policies
+# ============================================================================
+
+def skip_reason(policy: str, command: list[str], omp_threads: int, topo: dict) -> str:
+    """Why a policy cannot be applied to a command on this machine ('' if it can)."""
+    if policy not in BINDING_POLICIES:
+        return f"unknown binding policy {policy!r}"
+    if policy == 'none':
+        return ''
+    layout = describe_command(shlex.join(command), omp_threads)
+    threads = max(layout['omp_threads'], 1)
+    needed = layout['mpi_ranks'] * threads
+    tokens = command[1:command.index('-in')] if '-in' in command else command[1:]
+    if any(tok.startswith(('--bind-to', '-bind-to', '--map-by', '-map-by', '--cpu-bind', '--cpu-set'))
+           for tok in tokens):
+        return "command already sets its own binding"
+
+    if policy == 'pcore':
+        if not topo['pcores']:
+            return "no hybrid CPU (no P-cores listed)"
+        if needed > len(topo['pcores']):
+            return f"needs {needed} cores, {len(topo['pcores'])} P-cores available"
+    elif needed > len(topo['cores']):
+        return f"needs {needed} cores, {len(topo['cores'])} available"
+
+    domains = {'socket': topo['sockets'], 'numa': topo['nodes']}.get(policy)
+    if domains:
+        smallest = min(len(cpus) for cpus in domains.values())
+        if threads > smallest:
+            return f"{threads} threads per rank do not fit one {policy} domain ({smallest} cores)"
+        if policy == 'numa' and not launcher_of(command) and not shutil.which('numactl'):
+            return "numactl not installed"
+    return ''
+
+
+def launcher_of(command: list[str]) -> str:
+    """MPI launcher of a command ('' for launcher-less runs)."""
+    name = Path(command[0]).name if command else ''
+    return name if name in MPI_LAUNCHERS else ''
+
+
+def mpi_binding_args(policy: str, launcher: str, threads: int, topo: dict) -> list[str]:
+    """Launcher options placing and binding the ranks."""
+    if launcher == 'srun':
+        return {
+            'core': ['--cpu-bind=cores', f'--cpus-per-task={threads}'],
+            'compact': ['--cpu-bind=cores', f'--cpus-per-task={threads}', '--distribution=block:block'],
+            'spread': ['--cpu-bind=cores', f'--cpus-per-task={threads}', '--distribution=block:cyclic'],
+            'socket': ['--cpu-bind=sockets'],
+            'numa': ['--cpu-bind=ldoms'],
+            'pcore': [f'--cpu-bind=map_cpu:{",".join(map(str, topo["pcores"]))}'],
+        }[policy]
+    # Open MPI syntax (PE=n reserves n cores per rank for its threads)
+    per_rank = f':PE={threads}' if threads > 1 else ''
+    return {
+        'core': ['--map-by', f'slot{per_rank}', '--bind-to', 'core'],
+        'compact': ['--map-by', f'slot{per_rank}', '--bind-to', 'core'],
+        'spread': ['--map-by', f'socket{per_rank}', '--bind-to', 'core'],
+        'socket': ['--map-by', 'socket', '--bind-to', 'socket'],
+        'numa': ['--map-by', 'numa', '--bind-to', 'numa'],
+        'pcore': ['--cpu-set', format_cpus(topo['pcores']), '--map-by', f'slot{per_rank}', '--bind-to', 'core'],
+    }[policy]
+
+
+def bind_command(policy: str, command: list[str], omp_threads: int, topo: dict) -> tuple:
+    """Command and environment variables that apply a policy (check skip_reason first)."""
+    if policy == 'none':
+        return list(command), {}
+    env = dict(OMP_BINDING[policy])
+    threads = max(describe_command(shlex.join(command), omp_threads)['omp_threads'], 1)
+
+    launcher = launcher_of(command)
+    if launcher:
+        return command[:1] + mpi_binding_args(policy, launcher, threads, topo) + command[1:], env
+
+    # One process: pin it to the cores its threads will use
+    if policy == 'numa':
+        node = next(iter(topo['nodes']))
+        return ['numactl', f'--cpunodebind={node}', f'--membind={node}', *command], env
+    if policy == 'socket':
+        cpus = next(iter(topo['sockets'].values()))
+    elif policy == 'pcore':
+        cpus = topo['pcores'][:threads]
+    elif policy == 'spread':
+        # Round-robin over the sockets, evenly strided within each
+        per_socket = -(-threads // len(topo['sockets']))
+        picks = [group[::max(len(group) // per_socket, 1)][:per_socket] for group in topo['sockets'].values()]
+        cpus = [cpu for rank in zip_longest(*picks) for cpu in rank if cpu is not None][:threads]
+    else:
+        cpus = topo['cores'][:threads]
+    return ['taskset', '-c', format_cpus(cpus), *command], env
+
+
+def exec_bound(policy: str, command: list[str], omp_threads: int) -> int:
+    """Replace this process by the bound command (so wrappers see LAMMPS directly)."""
+    topo = topology()
+    reason = skip_reason(policy, command, omp_threads, topo)
+    if reason:
+        print(f"binding {policy}: {reason}", file=sys.stderr)
+        return 2
+    bound, env = bind_command(policy, command, omp_threads, topo)
+    try:
+        os.execvpe(bound[0], bound, dict(os.environ, **env))
+    except OSError as exc:
+        print(f"binding {policy}: {exc}", file=sys.stderr)
+        return 127
+
+
+def log_suffix(policy: str) -> str:
+    """Log name suffix of a policy ('' for none, so unbound logs keep their names)."""
+    return '' if policy in (None, '', 'none') else f"{LOG_SUFFIX}{policy}"
+
+
+# ============================================================================
+# Report
+# ============================================================================
+
+def binding_comparison(runs: pd.DataFrame, keys: list[str]) -> list[dict]:
+    """Best binding of every decomposition next to its unbound run.
+
+    Returns one record per group with at least two bindings: the unbound
+    (`none`) summary, the fastest binding and the bindings it cannot be told
+    apart from (overlapping loop time intervals).
+    """
+    runs = runs.dropna(subset=['loop_time'])
+    if runs.empty:
+        return []
+    runs = runs.assign(binding=runs['binding'].astype('string').fillna('none'))
+    runs = latest_trials(runs, [*keys, 'binding'])
+    summary = summarize_trials(runs, [*keys, 'binding'])
+    comparison = []
+    for key, group in summary.groupby(keys, sort=False, observed=True):
+        if group['binding'].nunique() < 2:
+            continue
+        records = group.to_dict('records')
+        best, ties = best_with_overlap(records)
+        baseline = next((rec for rec in records if rec['binding'] == 'none'), None)
+        comparison.append({'key': key, 'best': best, 'ties': ties, 'none': baseline, 'records': records})
+    return comparison
+
+
+def binding_table(rows: list[tuple]) -> list[str]:
+    """Markdown table of the best binding per decomposition; rows are (group, config label, comparison)."""
+    lines = [
+        "| Benchmark | Config | Unbound (s) | Best binding | Best (s) | Gain | Also tested |",
+        "|-----------|--------|-------------|--------------|----------|------|-------------|",
+    ]
+    gains = []
+    for group, label, item in rows:
+        best, baseline = item['best'], item['none']
+        unbound = '-' if baseline is None else f"{baseline['loop_time']:.3f}"
+        gain = '-'
+        if baseline is not None:
+            ratio = baseline['loop_time'] / best['loop_time']
+            gain = f"{ratio:.2f}x"
+            if ratio >= GAIN_THRESHOLD:
+                gain = f"**{gain}**"
+                gains.append(f"{group} {label} ({best['binding']})")
+        name = best['binding'] + (" ≈ " + ", ".join(tie['binding'] for tie in item['ties']) if item['ties'] else "")
+        others = ", ".join(f"{rec['binding']} {rec['loop_time']:.3f}" for rec in item['records']
+                           if rec['binding'] not in (best['binding'], 'none'))
+        lines.append(f"| {group} | {label} | {unbound} | {name} | {best['loop_time']:.3f} | {gain} | "
+                     f"{others or '-'} |")
+
+    lines.append("")
+    lines.append("Gain: unbound loop time / best loop time (median over trials); ≈ marks bindings whose "
+                 "intervals overlap the best.")
+    if gains:
+        lines.append(f"Binding pays off by ≥ {GAIN_THRESHOLD - 1:.0%} for: " + "; ".join(gains))
+    return lines
+
+
+# ============================================================================
+# Main
+# ============================================================================
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Process and thread binding policies")
+    sub = parser.add_subparsers(dest='action', required=True)
+
+    for action, text in (('run', "run a LAMMPS command under a binding policy"),
+                         ('check', "print BINDING_SKIP=<reason> ('' if the policy applies)")):
+        cmd = sub.add_parser(action, help=text)
+        cmd.add_argument('--policy', choices=BINDING_POLICIES, required=True)
+        cmd.add_argument('--omp', type=int, default=1, help="OpenMP threads per rank")
+        cmd.add_argument('command', nargs=argparse.REMAINDER, help="-- LAMMPS command")
+
+    show = sub.add_parser('show', help="topology and the bound command of every policy")
+    show.add_argument('--omp', type=int, default=1, help="OpenMP threads per rank")
+    show.add_argument('command', nargs=argparse.REMAINDER, help="-- LAMMPS command")
+
+    report = sub.add_parser('report', help="best binding per decomposition from the result store")
+    report.add_argument('--store', type=Path, required=True)
+    report.add_argument('--suite', default='official')
+    report.add_argument('--benchmark', help="restrict to one benchmark (LJ, EAM, CHAIN, RHODO, REAXFF)")
+
+    args = parser.parse_args(argv)
+
+    if args.action in ('run', 'check', 'show'):
+        command = args.command[1:] if args.command[:1] == ['--'] else args.command
+        if not command:
+            parser.error("no command given")
+        if args.action == 'run':
+            return exec_bound(args.policy, command, args.omp)
+        topo = topology()
+        if args.action == 'check':
+            print(f"BINDING_SKIP={shlex.quote(skip_reason(args.policy, command, args.omp, topo))}")
+            return 0
+        print(f"Cores: {len(topo['cores'])} ({format_cpus(topo['cores'])}), sockets: "
+              + ", ".join(f"{key}: {format_cpus(cpus)}" for key, cpus in topo['sockets'].items())
+              + ", NUMA nodes: " + ", ".join(f"{key}: {format_cpus(cpus)}" for key, cpus in topo['nodes'].items())
+              + f", P-cores: {format_cpus(topo['pcores']) or '-'}")
+        for policy in BINDING_POLICIES:
+            reason = skip_reason(policy, command, args.omp, topo)
+            if reason:
+                print(f"  {policy:<8} skipped: {reason}")
+                continue
+            bound, env = bind_command(policy, command, args.omp, topo)
+            prefix = ' '.join(f"{name}={value}" for name, value in env.items())
+            print(f"  {policy:<8} {prefix + ' ' if prefix else ''}{shlex.join(bound)}")
+        return 0
+
+    from result_store import load_runs
+
+    filters = {'suite': args.suite}
+    if args.benchmark:
+        filters['benchmark'] = args.benchmark.upper()
+    runs = load_runs(args.store, **filters)
+
+    keys = ['benchmark', 'replicate', 'config']
+    comparison = binding_comparison(runs, keys)
+    if not comparison:
+        print("No configuration was run with more than one binding (set BINDINGS in the runner)")
+        return 1
+    rows = [(f"{item['key'][0]} {item['key'][1]}".strip(), item['key'][2], item) for item in comparison]
+    print("\n".join(binding_table(rows)))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Sweep Checkpoints
+
+Makes the runner sweeps resumable. Every benchmark point is keyed by a
+fingerprint of what determines its result: the input file (name and
+contents), the LAMMPS binary (resolved path, size and mtime, so a rebuild
+counts as a new binary), the command, OpenMP threads, replicate, config name
+and the trial protocol (TRIALS, WARMUP, ADAPTIVE). As soon as a point
+finishes its outcome is appended to a JSON-lines checkpoint file (flushed and
+fsync'ed, so a job killed at h_rt or by preemption loses at most the running
+point). The record keeps the runner's result line, so a restarted sweep
+re-emits finished points into its report without rerunning them and runs
+only missing or failed ones.
+
+The last record of a fingerprint wins. Statuses:
+  ok      finished and collected (result line stored)
+  ran     all trials finished in a concurrent sweep, logs not yet collected
+  failed  a trial failed or its log could not be parsed (rerun on restart)
+
+Usage (from the runners):
+  eval "$(checkpoint.py lookup .sweep_checkpoint.jsonl --input lammps_benchmarks/in.lj \\
+      --command 'mpirun -np 12 lmp -sf omp -pk omp 4 -in' --omp 4 --config opt-mpi12-omp4)"
+  checkpoint.py record .sweep_checkpoint.jsonl "$CHECKPOINT_KEY" --status ok --data "$line" \\
+      --label "LJ - opt-mpi12-omp4"
+  checkpoint.py finish .sweep_checkpoint.jsonl
+  checkpoint.py status .sweep_checkpoint.jsonl
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shlex
+import shutil
+import sys
+from datetime import datetime
+from pathlib import Path
+
+from bench_config import describe_command
+
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+CHECKPOINT_NAME = '.sweep_checkpoint.jsonl'
+
+STATUSES = ['ok', 'ran', 'failed']
+
+# Statuses whose point is not run again
+DONE_STATUSES = ('ok', 'ran')
+
+
+# ============================================================================
+# Fingerprints
+# ============================================================================
+
+def file_digest(path: Path) -> str:
+    """SHA-256 of a file's contents ('missing' if it does not exist)."""
+    try:
+        return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+    except OSError:
+        return 'missing'
+
+
+def binary_identity(command: str) -> str:
+    """Resolved path, size and mtime of the command's LAMMPS binary (its name if not on PATH)."""
+    binary = describe_command(command)['binary']
+    path = shutil.which(binary)
+    if not path:
+        return binary
+    path = os.path.realpath(path)
+    stat = os.stat(path)
+    return f"{path}:{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def fingerprint(input_file: Path, command: str, omp_threads: int, replicate: str = '',
+                config: str = '', trials: int = 1, warmup: int = 0, adaptive: bool = False,
+                binding: str = 'none') -> str:
+    """Key of one benchmark point."""
+    parts = {
+        'input': Path(input_file).name,
+        'input_sha256': file_digest(input_file),
+        'binary': binary_identity(command),
+        'command': ' '.join(command.split()),
+        'omp_threads': int(omp_threads),
+        'replicate': replicate,
+        'config': config,
+        'trials': int(trials),
+        'warmup': int(warmup),
+        'adaptive': bool(adaptive),
+    }
+    # Unbound points keep the keys they had before binding became a dimension
+    if binding and binding != 'none':
+        parts['binding'] = binding
+    return hashlib.sha256(json.dumps(parts, sort_keys=True).encode()).hexdigest()[:16]
+
+
+# ============================================================================
+# Checkpoint File
+# ============================================================================
+
+def load_checkpoint(path: Path) -> dict:
+    """Latest record of every fingerprint (a torn last line from a killed job is ignored)."""
+    records = {}
+    try:
+        with open(path) as handle:
+            for line in handle:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                records[record['key']] = record
+    except FileNotFoundError:
+        pass
+    return records
+
+
+def record_point(path: Path, key: str, status: str, data: str = '', label: str = ''):
+    """Append the outcome of a point and force it to disk."""
+    record = {'key': key, 'status': status, 'label': label, 'data': data,
+              'time': datetime.now().isoformat(timespec='seconds')}
+    with open(path, 'a') as handle:
+        handle.write(json.dumps(record) + '\n')
+        handle.flush()
+        os.fsync(handle.fileno())
+
+
+def is_done(records: dict, key: str) -> bool:
+    """Whether a point finished in an earlier (interrupted) sweep."""
+    return records.get(key, {}).get('status') in DONE_STATUSES
+
+
+# ============================================================================
+# Main
+# ============================================================================
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Checkpoints of resumable benchmark sweeps")
+    sub = parser.add_subparsers(dest='action', required=True)
+
+    lookup = sub.add_parser('lookup', help="print CHECKPOINT_KEY (and CHECKPOINT_STATUS / CHECKPOINT_DATA "
+                                           "of a finished point) for eval")
+    lookup.add_argument('checkpoint', type=Path)
+    lookup.add_argument('--input', type=Path, required=True, help="LAMMPS input file")
+    lookup.add_argument('--command', required=True)
+    lookup.add_argument('--omp', type=int, default=1)
+    lookup.add_argument('--replicate', default='')
+    lookup.add_argument('--config', default='')
+    lookup.add_argument('--trials', type=int, default=1)
+    lookup.add_argument('--warmup', type=int, default=0)
+    lookup.add_argument('--adaptive', action='store_true')
+    lookup.add_argument('--binding', default='none', help="binding policy (binding.py)")
+
+    record = sub.add_parser('record', help="append the outcome of a point")
+    record.add_argument('checkpoint', type=Path)
+    record.add_argument('key')
+    record.add_argument('--status', choices=STATUSES, required=True)
+    record.add_argument('--data', default='', help="runner result line re-emitted on resume")
+    record.add_argument('--label', default='', help="point name shown by `status`")
+
+    finish = sub.add_parser('finish', help="remove the checkpoint once no point is left to retry")
+    finish.add_argument('checkpoint', type=Path)
+
+    status = sub.add_parser('status', help="summarize a checkpoint")
+    status.add_argument('checkpoint', type=Path)
+
+    args = parser.parse_args(argv)
+
+    if args.action == 'lookup':
+        key = fingerprint(args.input, args.command, args.omp, args.replicate, args.config,
+                          args.trials, args.warmup, args.adaptive, args.binding)
+        print(f"CHECKPOINT_KEY={key}")
+        point = load_checkpoint(args.checkpoint).get(key, {})
+        print(f"CHECKPOINT_STATUS={point.get('status', '')}")
+        print(f"CHECKPOINT_DATA={shlex.quote(point.get('data', '') if point.get('status') == 'ok' else '')}")
+        return 0
+
+    if args.action == 'record':
+        record_point(args.checkpoint, args.key, args.status, args.data, args.label)
+        return 0
+
+    records = load_checkpoint(args.checkpoint)
+    failed = [r for r in records.values() if r['status'] == 'failed']
+
+    if args.action == 'finish':
+        if failed:
+            print(f"Checkpoint kept: {len(failed)} failed points are retried when the sweep is rerun "
+                  f"({args.checkpoint})")
+            return 1
+        args.checkpoint.unlink(missing_ok=True)
+        return 0
+
+    counts = {name: sum(1 for r in records.values() if r['status'] == name) for name in STATUSES}
+    print(f"{args.checkpoint}: {len(records)} points ("
+          + ", ".join(f"{count} {name}" for name, count in counts.items()) + ")")
+    for r in failed:
+        print(f"  failed: {r.get('label') or r['key']} ({r['time']})")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Performance Regression Gate
+
+Compares a new sweep against a stored baseline (for example the runs behind
+the README numbers) after a rebuild with build_lammps.sh or a module change.
+Runs are matched on benchmark, system size, decomposition (binary, MPI
+ranks, OpenMP threads, accelerator), binding policy and the number of jobs
+sharing the node; each side is reduced to the median of its latest trial set.
+
+A config counts as significantly slower when the slowdown exceeds a
+noise-aware threshold:
+- if both sides have repeated trials, the bootstrap 95% interval of the
+  slowdown (new / baseline median) must lie entirely above 1 + --min-effect
+- otherwise the point slowdown must exceed --threshold
+
+The exit code is 1 if any config is significantly slower, so the gate can
+fail a nightly job. With --history every compared config is appended to a
+CSV time series, and `history` prints the trend of each config.
+
+A source is a result store (.db), a markdown results file (.md) or a
+directory of runner logs. Baseline and new runs can come from the same store,
+split by date with --baseline-until / --new-since.
+
+Usage:
+  compare_runs.py compare baseline.db mirae_server/official+reaxff --history regressions.csv
+  compare_runs.py compare mirae_server/results.db mirae_server/results.db \\
+      --baseline-until 2026-01-05 --new-since 2026-03-01
+  compare_runs.py history regressions.csv --last 10
+"""
+
+import argparse
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+from trial_stats import latest_trials, nominal_loop_times, speedup_ci, summarize_trials
+
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+# Columns identifying "the same benchmark run" across builds
+MATCH_KEYS = ['suite', 'benchmark', 'atoms', 'binary', 'mpi_ranks', 'omp_threads', 'accelerator',
+              'binding', 'co_runners']
+
+# Relative slowdown flagged when a side has no repeated trials
+DEFAULT_THRESHOLD = 0.05
+
+# Smallest slowdown worth failing on when repeats make the interval meaningful
+DEFAULT_MIN_EFFECT = 0.02
+
+HISTORY_COLUMNS = ['checked', 'new_date', 'host', *MATCH_KEYS, 'config', 'baseline_time',
+                   'new_time', 'slowdown', 'slowdown_low', 'slowdown_high', 'status']
+
+
+# ============================================================================
+# Loading
+# ============================================================================
+
+def load_source(path: Path) -> pd.DataFrame:
+    """Load runs from a result store, a markdown results file or a directory of runner logs."""
+    from result_store import ingest_markdown, load_runs
+
+    path = Path(path)
+    if path.suffix == '.db':
+        return load_runs(path)
+
+    # Other sources are parsed into a throwaway store so rows are normalized the same way
+    with tempfile.TemporaryDirectory(prefix='compare_') as tmp:
+        store_path = Path(tmp) / 'results.db'
+        if path.is_dir():
+            from ingest_logs import discover_logs, ingest_logs
+            ingest_logs(discover_logs(path), store_path, workers=1)
+        else:
+            ingest_markdown(path, store_path)
+        return load_runs(store_path)
+
+
+def select_window(runs: pd.DataFrame, since: str = None, until: str = None) -> pd.DataFrame:
+    """Restrict runs to a date window (ISO dates, inclusive)."""
+    if since:
+        runs = runs[runs['date'] >= pd.Timestamp(since)]
+    if until:
+        runs = runs[runs['date'] < pd.Timestamp(until) + pd.Timedelta(days=1)]
+    return runs
+
+
+def summarize_side(runs: pd.DataFrame) -> pd.DataFrame:
+    """Median loop time of the latest trial set of every matchable configuration."""
+    runs = runs.dropna(subset=['benchmark', 'mpi_ranks'])
+    runs = runs.assign(atoms=runs['atoms'].fillna(0), omp_threads=runs['omp_threads'].fillna(1),
+                       accelerator=runs['accelerator'].astype('string').fillna('none'),
+                       binding=runs['binding'].astype('string').fillna('none'),
+                       co_runners=runs['co_runners'].fillna(0))
+    runs = latest_trials(nominal_loop_times(runs), [*MATCH_KEYS, 'config'])
+    summary = summarize_trials(runs, MATCH_KEYS)
+    return summary[[*MATCH_KEYS, 'config', 'date', 'host', 'loop_time', 'trials', 'loop_time_trials']]
+
+
+def config_label(rec: dict) -> str:
+    """Config name, with the binding policy and co-runners when the run was not unbound and alone."""
+    label = rec['config']
+    if rec['binding'] != 'none':
+        label += f" ({rec['binding']})"
+    if int(rec['co_runners']):
+        label += f" +{int(rec['co_runners'])} co-runners"
+    return label
+
+
+# ============================================================================
+# Comparison
+# ============================================================================
+
+def compare(baseline: pd.DataFrame, new: pd.DataFrame, threshold: float = DEFAULT_THRESHOLD,
+            min_effect: float = DEFAULT_MIN_EFFECT) -> pd.DataFrame:
+    """Match configurations and classify each slowdown as slower, faster or within noise."""
+    matched = baseline.astype({key: str for key in MATCH_KEYS}).merge(
+        new.astype({key: str for key in MATCH_KEYS}), on=MATCH_KEYS, suffixes=('_base', '_new'))
+
+    rows = []
+    for rec in matched.to_dict('records'):
+        base, cand = rec['loop_time_trials_base'], rec['loop_time_trials_new']
+        # speedup_ci gives baseline / new; its inverse is the slowdown
+        speedup, low, high = speedup_ci(base, cand)
+        slowdown, slow_low, slow_high = 1 / speedup, 1 / high, 1 / low
+        if len(base) >= 2 and len(cand) >= 2:
+            mode = 'ci'
+            slower = slow_low > 1 + min_effect
+            faster = slow_high < 1 / (1 + min_effect)
+        else:
+            mode = 'threshold'
+            slower = slowdown > 1 + threshold
+            faster = slowdown < 1 / (1 + threshold)
+        rows.append({
+            **{key: rec[key] for key in MATCH_KEYS},
+            'config': rec['config_new'],
+            'new_date': rec['date_new'],
+            'host': rec['host_new'],
+            'baseline_time': rec['loop_time_base'],
+            'new_time': rec['loop_time_new'],
+            'baseline_trials': len(base),
+            'new_trials': len(cand),
+            'slowdown': slowdown,
+            'slowdown_low': slow_low,
+            'slowdown_high': slow_high,
+            'mode': mode,
+            'status': 'slower' if slower else 'faster' if faster else 'ok',
+        })
+    columns = [*MATCH_KEYS, 'config', 'new_date', 'host', 'baseline_time', 'new_time', 'baseline_trials',
+               'new_trials', 'slowdown', 'slowdown_low', 'slowdown_high', 'mode', 'status']
+    return pd.DataFrame(rows, columns=columns)
+
+
+def delta_table(result: pd.DataFrame) -> list[str]:
+    """Markdown table of per-config deltas, largest slowdown first."""
+    lines = [
+        "| Benchmark | Atoms | Config | Trials | Baseline (s) | New (s) | Delta | 95% CI | Status |",
+        "|-----------|-------|--------|--------|--------------|---------|-------|--------|--------|",
+    ]
+    marks = {'slower': '❌ slower', 'faster': '✅ faster', 'ok': 'ok'}
+    for rec in result.sort_values('slowdown', ascending=False).to_dict('records'):
+        atoms = f"{float(rec['atoms']):,.0f}" if float(rec['atoms']) else '-'
+        interval = (f"{rec['slowdown_low'] - 1:+.1%}…{rec['slowdown_high'] - 1:+.1%}"
+                    if rec['mode'] == 'ci' else '-')
+        lines.append(f"| {rec['benchmark']} | {atoms} | {config_label(rec)} | "
+                     f"{rec['baseline_trials']}/{rec['new_trials']} | {rec['baseline_time']:.4f} | "
+                     f"{rec['new_time']:.4f} | {rec['slowdown'] - 1:+.1%} | {interval} | {marks[rec['status']]} |")
+    return lines
+
+
+def append_history(history_path: Path, result: pd.DataFrame):
+    """Append compared configs to the CSV time series."""
+    history_path = Path(history_path)
+    rows = result.assign(checked=datetime.now().isoformat(timespec='seconds'))[HISTORY_COLUMNS]
+    rows.to_csv(history_path, mode='a', header=not history_path.exists(), index=False)
+
+
+# ============================================================================
+# History
+# ============================================================================
+
+def history_table(history: pd.DataFrame, last: int) -> list[str]:
+    """Trend of each config over its most recent checks."""
+    lines = [
+        f"| Benchmark | Atoms | Config | Checks | Latest delta | Trend (last {last}) | Slower checks |",
+        "|-----------|-------|--------|--------|--------------|--------------|---------------|",
+    ]
+    history = history.sort_values('checked').assign(label=lambda frame: [
+        config_label(rec) for rec in frame.to_dict('records')])
+    for (bench, atoms, config), group in history.groupby(['benchmark', 'atoms', 'label'], sort=True):
+        recent = group.tail(last)
+        trend = ' '.join(f"{value - 1:+.0%}" for value in recent['slowdown'])
+        atoms_label = f"{atoms:,.0f}" if atoms else '-'
+        lines.append(f"| {bench} | {atoms_label} | {config} | {len(group)} | "
+                     f"{recent['slowdown'].iloc[-1] - 1:+.1%} | {trend} | "
+                     f"{int((recent['status'] == 'slower').sum())} |")
+    return lines
+
+
+# ============================================================================
+# Main
+# ============================================================================
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Performance regression gate")
+    sub = parser.add_subparsers(dest='action', required=True)
+
+    cmp = sub.add_parser('compare', help="compare a new sweep against a baseline (exit 1 on slowdowns)")
+    cmp.add_argument('baseline', type=Path, help="result store, markdown results file or log directory")
+    cmp.add_argument('new', type=Path, help="result store, markdown results file or log directory")
+    cmp.add_argument('--baseline-until', help="only baseline runs up to this date (YYYY-MM-DD)")
+    cmp.add_argument('--new-since', help="only new runs from this date (YYYY-MM-DD)")
+    cmp.add_argument('--suite', choices=['official', 'scaling'])
+    cmp.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                     help="slowdown flagged without repeated trials (fraction)")
+    cmp.add_argument('--min-effect', type=float, default=DEFAULT_MIN_EFFECT,
+                     help="smallest slowdown flagged when the CI excludes it (fraction)")
+    cmp.add_argument('--history', type=Path, help="append the comparison to this CSV time series")
+
+    hist = sub.add_parser('history', help="print the regression time series")
+    hist.add_argument('history', type=Path)
+    hist.add_argument('--last', type=int, default=7, help="checks shown per config")
+
+    args = parser.parse_args(argv)
+
+    if args.action == 'history':
+        if not args.history.exists():
+            print(f"No history at {args.history}")
+            return 1
+        print("\n".join(history_table(pd.read_csv(args.history), args.last)))
+        return 0
+
+    baseline = select_window(load_source(args.baseline), until=args.baseline_until)
+    new = select_window(load_source(args.new), since=args.new_since)
+    if args.suite:
+        baseline = baseline[baseline['suite'] == args.suite]
+        new = new[new['suite'] == args.suite]
+
+    result = compare(summarize_side(baseline), summarize_side(new), args.threshold, args.min_effect)
+    if result.empty:
+        print("No configurations match between baseline and new runs")
+        return 2
+
+    print("\n".join(delta_table(result)))
+    counts = result['status'].value_counts()
+    print(f"\n{len(result)} configs compared: {counts.get('slower', 0)} slower, "
+          f"{counts.get('faster', 0)} faster, {counts.get('ok', 0)} within noise "
+          f"(threshold {args.threshold:.0%} without repeats, CI above +{args.min_effect:.0%} with repeats)")
+
+    if args.history:
+        append_history(args.history, result)
+        print(f"Appended {len(result)} rows to {args.history}")
+
+    return 1 if counts.get('slower', 0) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+"""
+Ensemble Throughput: Many Independent Runs vs One Wide Run
+
+Screening work runs hundreds of independent 5-30k atom simulations, where
+the node's aggregate atom-steps/s matters more than one job's loop time.
+An ensemble launches K copies of one benchmark with the same MPI × OpenMP
+footprint at once, each pinned to its own core set (48 × serial, 12 × a
+4-rank job, 4 × a GPU job sharing the GPU, ...), and waits for all of them.
+
+  aggregate throughput  Σ atoms × steps of the K copies / slowest copy's
+                        loop time (the node is busy until the last ends)
+  per-job latency       median and slowest loop time of the copies
+
+By default a CPU config fills the node (K = cores // footprint; K = 1 for a
+whole-node config, the single-job reference) and a GPU config runs with
+--gpu-copies copies sharing the device. Runs are stored as suite
+"ensemble" with `copies` and `copy_index` (logs
+log.ensemble_<bench>_<K>x_<config>.c<copy>[.tN]); the report compares every
+packing with the best single job of the benchmark (official suite or
+1-copy ensemble) and marks the throughput-optimal one.
+
+Usage:
+  ensemble.py run --bench-dir lammps_benchmarks -i lj=in.lj -i chain=in.chain \\
+      -c "opt-serial|1|lmp -in" -c "opt-mpi4-omp1|1|mpirun -np 4 lmp -in" \\
+      -c "opt-mpi48-omp1|1|mpirun -np 48 lmp -in" --store results.db --trials 3
+  ensemble.py run --bench-dir lammps_benchmarks -i lj=in.lj \\
+      -c "GPU-1|lmp_gpu -sf gpu -pk gpu 1 -in" --gpu-copies 1,2,4,8 --store results.db
+  ensemble.py report --store mirae_server/results.db
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from bench_config import describe_command, parse_config_spec
+from result_store import BENCHMARKS
+from sweep import GPU_ACCELERATORS, allocate_cores, format_cpus, job_argv, parse_input_spec, trial_log_name
+from trial_stats import latest_trials, nominal_loop_times, summarize_trials
+
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+SUITE = 'ensemble'
+LOG_PREFIX = 'ensemble_'
+
+DEFAULT_GPU_COPIES = [1, 2, 4]
+
+POLL_INTERVAL = 0.2
+
+CPU_COLOR = '#3498db'
+GPU_COLOR = '#2ecc71'
+
+
+# ============================================================================
+# Ensembles
+# ============================================================================
+
+def footprint(config: dict) -> tuple:
+    """(cores per copy, uses the GPU) of a config."""
+    layout = describe_command(config['command'], config['omp_threads'])
+    return layout['mpi_ranks'] * max(layout['omp_threads'], 1), layout['accelerator'] in GPU_ACCELERATORS
+
+
+def copy_counts(config: dict, cores: int, copies: list[int] = None,
+                gpu_copies: list[int] = DEFAULT_GPU_COPIES) -> list[int]:
+    """Ensemble sizes of a config: the requested counts, else as many copies as fit.
+
+    GPU configs run the --gpu-copies counts whose CPU footprint fits.
+    """
+    need, gpu = footprint(config)
+    if copies:
+        return list(copies)
+    if gpu:
+        return [count for count in gpu_copies if count == 1 or count * need <= cores]
+    return [max(cores // need, 1)]
+
+
+def ensemble_stem(benchmark: str, config: str, copies: int) -> str:
+    return f"{LOG_PREFIX}{benchmark}_{copies}x_{config}"
+
+
+def make_ensembles(inputs: list[dict], configs: list[dict], cores: int, log_dir: Path,
+                   copies: list[int] = None, gpu_copies: list[int] = DEFAULT_GPU_COPIES) -> list[dict]:
+    """One ensemble per (input, config, copy count), in runner order."""
+    ensembles = []
+    for inp in inputs:
+        for config in configs:
+            need, gpu = footprint(config)
+            for count in copy_counts(config, cores, copies, gpu_copies):
+                ensembles.append({
+                    'benchmark': inp['benchmark'],
+                    'input_file': inp['input_file'],
+                    'config': config['name'],
+                    'omp_threads': config['omp_threads'],
+                    'command': config['command'],
+                    'copies': count,
+                    'cores': need,
+                    'gpu': gpu,
+                    'stem': log_dir / ensemble_stem(inp['benchmark'], config['name'], count),
+                })
+    return ensembles
+
+
+def copy_jobs(ensemble: dict, trial, wrapper: list[str]) -> list[dict]:
+    """The K concurrent jobs of one trial (trial None: warm-up) of an ensemble."""
+    jobs = []
+    for copy in range(ensemble['copies']):
+        stem = f"{ensemble['stem'].name}.c{copy}"
+        name = f"log.{stem}.warmup" if trial is None else trial_log_name(stem, trial)
+        jobs.append(dict(ensemble, copy_index=copy, trial=trial, binding='none',
+                         logfile=ensemble['stem'].parent / name,
+                         wrapper=wrapper if trial is not None else []))
+    return jobs
+
+
+def run_copies(jobs: list[dict], cpus: list[int], bench_dir: Path) -> float:
+    """Start all copies at once on disjoint core sets and wait for the last. Returns the wall time."""
+    free = list(cpus)
+    start = time.perf_counter()
+    for job in jobs:
+        # A copy that does not fit (more copies than cores) shares the whole set
+        job['cpus'] = allocate_cores(free, min(job['cores'], len(cpus))) or list(cpus)
+        free = [cpu for cpu in free if cpu not in job['cpus']]
+        # Stored as binding 'none': the copy gets its core set, thread placement is the runtime default
+        env = {key: value for key, value in os.environ.items() if key not in ('OMP_PLACES', 'OMP_PROC_BIND')}
+        env['OMP_NUM_THREADS'] = str(job['omp_threads'])
+        job['logfile'].unlink(missing_ok=True)
+        job['process'] = subprocess.Popen(
+            job_argv(job), cwd=bench_dir, env=env,
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            preexec_fn=lambda cpus=job['cpus']: os.sched_setaffinity(0, cpus))
+
+    while any(job['process'].poll() is None for job in jobs):
+        time.sleep(POLL_INTERVAL)
+    for job in jobs:
+        job['exit_code'] = job.pop('process').returncode
+    return time.perf_counter() - start
+
+
+# ============================================================================
+# Throughput
+# ============================================================================
+
+def packing_label(record: dict) -> str:
+    return f"{record['copies']}× {record['config']}"
+
+
+def ensemble_points(runs: pd.DataFrame) -> pd.DataFrame:
+    """One row per (benchmark, config, copies): median aggregate throughput and per-job latency over trials.
+
+    Trials where not every copy finished are left out. `relative` is the
+    aggregate throughput over the best single job of the benchmark.
+    """
+    columns = ['benchmark', 'config', 'copies', 'cores', 'gpu', 'latency', 'latency_max', 'throughput',
+               'trials', 'relative', 'best']
+    unbound = runs['binding'].isna() | (runs['binding'] == 'none')
+    selected = nominal_loop_times(runs[unbound].dropna(subset=['loop_time', 'atoms', 'timesteps']))
+    ensemble = selected[(selected['suite'] == SUITE) & selected['copies'].notna()]
+    if ensemble.empty:
+        return pd.DataFrame(columns=columns)
+
+    ensemble = latest_trials(ensemble, ['benchmark', 'config', 'copies', 'copy_index'])
+    ensemble = ensemble.assign(work=ensemble['atoms'].astype(float) * ensemble['timesteps'].astype(float),
+                               benchmark=ensemble['benchmark'].astype(str))
+    trials = ensemble.groupby(['benchmark', 'config', 'copies', 'trial'], observed=True).agg(
+        work=('work', 'sum'), latency=('loop_time', 'median'), latency_max=('loop_time', 'max'),
+        finished=('loop_time', 'count'), ranks=('mpi_ranks', 'first'), threads=('omp_threads', 'first'),
+        accelerator=('accelerator', 'first')).reset_index()
+    trials = trials[trials['finished'] == trials['copies']]
+    trials['throughput'] = trials['work'] / trials['latency_max']
+    points = trials.groupby(['benchmark', 'config', 'copies'], sort=False).agg(
+        latency=('latency', 'median'), latency_max=('latency_max', 'median'),
+        throughput=('throughput', 'median'), trials=('trial', 'count'), ranks=('ranks', 'first'),
+        threads=('threads', 'first'), accelerator=('accelerator', 'first')).reset_index()
+    if points.empty:
+        return pd.DataFrame(columns=columns)
+    points['cores'] = points['ranks'].astype(int) * points['threads'].fillna(1).astype(int).clip(lower=1)
+    points['gpu'] = points['accelerator'].astype(str).isin(GPU_ACCELERATORS)
+    points['copies'] = points['copies'].astype(int)
+
+    # Best single job: official-suite configurations and 1-copy ensembles
+    official = selected[selected['suite'] == 'official']
+    single = points.loc[points['copies'] == 1, ['benchmark', 'throughput']]
+    if not official.empty:
+        official = summarize_trials(latest_trials(official, ['benchmark', 'replicate', 'config']),
+                                    ['benchmark', 'config'])
+        official['throughput'] = (official['atoms'].astype(float) * official['timesteps'].astype(float)
+                                  / official['loop_time'])
+        single = pd.concat([single, official[['benchmark', 'throughput']].astype({'benchmark': str})])
+    best_single = single.groupby('benchmark')['throughput'].max()
+    points['relative'] = points['throughput'] / points['benchmark'].map(best_single)
+    points['best'] = points['throughput'] == points.groupby('benchmark')['throughput'].transform('max')
+    order = points['benchmark'].map({bench: idx for idx, bench in enumerate(BENCHMARKS)})
+    points = points.assign(order=order).sort_values(['order', 'gpu', 'copies'], ascending=[True, True, False],
+                                                    kind='stable')
+    return points[columns].reset_index(drop=True)
+
+
+def ensemble_table(points: pd.DataFrame) -> list[str]:
+    """Markdown table of every packing, the throughput-optimal one of each benchmark in bold."""
+    lines = ["| Benchmark | Packing | Cores/job | Per-job loop (s) | Slowest (s) | Aggregate Matom-steps/s | "
+             "vs Best Single Job |",
+             "|-----------|---------|-----------|------------------|-------------|-------------------------|"
+             "--------------------|"]
+    for record in points.to_dict('records'):
+        cores = f"{record['cores']} + GPU" if record['gpu'] else str(record['cores'])
+        throughput = f"{record['throughput'] / 1e6:.2f}"
+        relative = f"{record['relative']:.2f}x" if pd.notna(record['relative']) else "-"
+        if record['best']:
+            throughput, relative = f"**{throughput}**", f"**{relative}**"
+        lines.append(f"| {record['benchmark']} | {packing_label(record)} | {cores} | {record['latency']:.3f} | "
+                     f"{record['latency_max']:.3f} | {throughput} | {relative} |")
+    lines += ["", "Aggregate = atoms × steps of all copies / slowest copy's loop time. "
+              "**Bold**: throughput-optimal packing."]
+    return lines
+
+
+def plot_ensemble_bars(ax, points: pd.DataFrame, legend: bool = True):
+    """Aggregate throughput per packing of one benchmark, per-job latency on the bars."""
+    x = range(len(points))
+    colors = [GPU_COLOR if gpu else CPU_COLOR for gpu in points['gpu']]
+    bars = ax.bar(x, points['throughput'] / 1e6, color=colors, edgecolor='black', linewidth=0.5)
+    for bar, record in zip(bars, points.to_dict('records')):
+        ax.text(bar.get_x() + bar.get_width() / 2, bar.get_height(), f"{record['latency']:.3g}s/job",
+                ha='center', va='bottom', fontsize=7,
+                fontweight='bold' if record['best'] else 'normal')
+    single = (points['throughput'] / points['relative']).dropna()
+    if not single.empty:
+        ax.axhline(single.iloc[0] / 1e6, color='gray', linestyle='--', linewidth=1, label='Best single job')
+    ax.set_xticks(list(x))
+    ax.set_xticklabels([packing_label(record) for record in points.to_dict('records')],
+                       rotation=45, ha='right', fontsize=8)
+    ax.set_ylabel('Aggregate Matom-steps/s', fontsize=10)
+    ax.grid(axis='y', alpha=0.3)
+    if legend:
+        from matplotlib.patches import Patch
+
+        handles = [Patch(color=CPU_COLOR, label='CPU copies'), Patch(color=GPU_COLOR, label='GPU-shared copies')]
+        handles += ax.get_legend_handles_labels()[0]
+        ax.legend(handles=handles, fontsize=7, loc='best')
+
+
+# ============================================================================
+# Main
+# ============================================================================
+
+def parse_counts(value: str) -> list[int]:
+    return [int(item) for item in value.replace(',', ' ').split()]
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Ensemble throughput: K concurrent copies of a benchmark")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    run = sub.add_parser('run', help="run every (input, config, copy count) ensemble")
+    run.add_argument('--bench-dir', type=Path, required=True, help="directory holding the inputs")
+    run.add_argument('-i', '--input', dest='inputs', action='append', default=[], help="benchmark input: name=file")
+    run.add_argument('-c', '--config', dest='configs', action='append', default=[],
+                     help="footprint of one copy: name|omp|command or name|command")
+    run.add_argument('--copies', type=parse_counts, help="copy counts for every config (default: fill the node)")
+    run.add_argument('--gpu-copies', type=parse_counts, default=DEFAULT_GPU_COPIES,
+                     help="copy counts of GPU configs sharing the device")
+    run.add_argument('--cores', type=int, help="cores to use (default: this process's affinity set)")
+    run.add_argument('--log-dir', type=Path, default=Path.cwd(), help="where log.* files are written")
+    run.add_argument('--store', type=Path, help="append finished copies to this result store")
+    run.add_argument('--trials', type=int, default=1, help="measured ensembles per configuration")
+    run.add_argument('--warmup', type=int, default=0, help="untimed ensembles before the trials")
+    run.add_argument('--telemetry', type=float, metavar='INTERVAL',
+                     help="sample copies with telemetry.py every INTERVAL seconds")
+
+    report = sub.add_parser('report', help="aggregate throughput and per-job latency from the result store")
+    report.add_argument('--store', type=Path, required=True)
+    report.add_argument('--output', type=Path, help="write a results file (with its configurations) instead")
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'report':
+        from result_store import load_runs, results_header
+
+        runs = load_runs(args.store, suite=[SUITE, 'official'])
+        points = ensemble_points(runs)
+        if points.empty:
+            print("No ensemble runs in the store (ensemble.py run, or ENSEMBLE=1 in the runners)")
+            return 1
+        lines = ["### Ensemble Throughput (median over trials)", "", *ensemble_table(points)]
+        if args.output:
+            header = results_header("LAMMPS Ensemble Throughput Results", runs[runs['suite'] == SUITE])
+            args.output.write_text("\n".join(header + lines) + "\n", encoding='utf-8')
+            print(f"✓ Results saved to: {args.output}")
+        else:
+            print("\n" + "\n".join(lines))
+        return 0
+
+    configs = [parse_config_spec(spec) for spec in args.configs]
+    inputs = [parse_input_spec(spec) for spec in args.inputs]
+    if not configs or not inputs:
+        parser.error("at least one --input and one --config are required")
+    if args.trials < 1 or args.warmup < 0:
+        parser.error("--trials must be at least 1 and --warmup at least 0")
+
+    cpus = sorted(os.sched_getaffinity(0))
+    if args.cores:
+        cpus = cpus[:args.cores]
+    log_dir = args.log_dir.resolve()
+    ensembles = make_ensembles(inputs, configs, len(cpus), log_dir, args.copies, args.gpu_copies)
+    wrapper = [sys.executable, str(Path(__file__).with_name('startup_cost.py')), 'run', '--']
+    if args.telemetry:
+        wrapper = [sys.executable, str(Path(__file__).with_name('telemetry.py')), 'run',
+                   '--interval', str(args.telemetry), '--', *wrapper]
+
+    print(f"Ensembles: {len(ensembles)} on {len(cpus)} cores (trials={args.trials}, warmup={args.warmup})")
+    failed = 0
+    for ensemble in ensembles:
+        name = f"{ensemble['benchmark']} {packing_label(ensemble)}"
+        if ensemble['copies'] * ensemble['cores'] > len(cpus):
+            print(f"⚠ {name}: needs {ensemble['copies'] * ensemble['cores']} cores, shares {len(cpus)}")
+        for stale in log_dir.glob(f"log.{ensemble['stem'].name}.c*"):
+            stale.unlink()
+
+        for trial in [None] * args.warmup + list(range(args.trials)):
+            jobs = copy_jobs(ensemble, trial, wrapper)
+            wall = run_copies(jobs, cpus, args.bench_dir)
+            errors = [job['exit_code'] for job in jobs if job['exit_code'] != 0]
+            if trial is None:
+                for job in jobs:
+                    job['logfile'].unlink(missing_ok=True)
+                continue
+
+            label = name + (f" #{trial}" if args.trials > 1 else '')
+            if errors:
+                failed += 1
+                print(f"  {label:<36} {len(errors)}/{ensemble['copies']} copies failed (exit: {errors[0]})")
+                continue
+
+            from lammps_log import log_rows
+
+            rows = []
+            for job in jobs:
+                rows += log_rows(job['logfile'], suite=SUITE, benchmark=job['benchmark'], config=job['config'],
+                                 command=job['command'], omp_threads=job['omp_threads'], trial=trial,
+                                 copies=job['copies'], copy_index=job['copy_index'],
+                                 co_runners=job['copies'] - 1)
+            # The measured (last) run block of each copy
+            measured = {row['copy_index']: row for row in rows}
+            if len(measured) < ensemble['copies']:
+                failed += 1
+                print(f"  {label:<36} {ensemble['copies'] - len(measured)} copies without timing data")
+                continue
+            latencies = [row['loop_time'] for row in measured.values()]
+            throughput = sum(row['atoms'] * row['timesteps'] for row in measured.values()) / max(latencies)
+            print(f"  {label:<36} cores {format_cpus([cpu for job in jobs for cpu in job['cpus']]):<12} "
+                  f"per-job {statistics.median(latencies):8.2f}s (slowest {max(latencies):.2f}s)  "
+                  f"{throughput / 1e6:8.2f} Matom-steps/s  wall {wall:.1f}s")
+            if args.store:
+                from result_store import append_runs
+
+                append_runs(args.store, rows)
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
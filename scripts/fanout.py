@@ -0,0 +1,511 @@
+#!/usr/bin/env python3
+"""
+Multi-Node Fan-Out via Scheduler Array Jobs
+
+Splits a sweep (sweep.py inputs × configs) into independent scheduler tasks,
+so it runs on whichever nodes are idle instead of in one job pinned to a
+single node, and adds multi-node jobs for strong scaling across nodes. Every
+task runs sweep.py on its share of the points with its own result store,
+logs and checkpoint under a shared directory (NFS), so tasks never write the
+same SQLite file and a requeued task reruns only its missing points. gather
+merges the task stores back into one dataset.
+
+Tasks are the array tasks of one job script per node count:
+  1 node   the (input, config) points dealt over --tasks array tasks,
+           balanced by the loop times already in the --history store
+  N nodes  with --nodes 2,4,8 every config that fills a node (ranks ×
+           threads = --cores-per-node) is spread over N nodes with the same
+           ranks per node (mpirun -np N·R -npernode R, srun -N N), named
+           <config>-<N>n; one task per node count and input
+
+Schedulers: sge (qsub -t), slurm (sbatch --array) and local, a fake
+scheduler that runs the generated SGE script once per task id on this
+machine with SGE_TASK_ID, NSLOTS and JOB_ID set as qsub would, to test a
+fan-out end to end before spending queue time.
+
+Shared directory:
+  fanout.json             manifest: tasks with their nodes, inputs and configs
+  fanout_<N>node.sh       job script of the tasks on N nodes
+  tasks/<id>/             results.db, log.* and checkpoint of one task
+  tasks/<id>/status.json  host, start, end and exit code of the last attempt
+
+Usage:
+  fanout.py split --shared /shared/fanout --bench-dir lammps_benchmarks \\
+      -i lj=in.lj -i reaxff=in.reaxff --configs-from lammps_bench.sh \\
+      --tasks 8 --nodes 2,4,8 --history results.db -- --trials 3 --warmup 1
+  fanout.py submit --shared /shared/fanout --scheduler sge --pe mpi_48 --setup "module load gcc/11.3.0"
+  fanout.py submit --shared /shared/fanout --scheduler local
+  fanout.py status --shared /shared/fanout
+  fanout.py gather --shared /shared/fanout --store mirae_server/results.db
+  fanout.py report --store mirae_server/results.db --benchmark REAXFF
+"""
+
+import argparse
+import json
+import os
+import re
+import shlex
+import socket
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+from bench_config import (LAUNCHER_VALUE_OPTIONS, MPI_LAUNCHERS, PER_NODE_OPTIONS, describe_command, is_rank_option,
+                          parse_config_spec)
+
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+SCHEDULERS = ['sge', 'slurm', 'local']
+
+MANIFEST_NAME = 'fanout.json'
+
+# Cores of one Mirae node (mpi_48 parallel environment)
+CORES_PER_NODE = 48
+
+# Config name of a multi-node variant: opt-mpi48-omp1-2n
+NODE_SUFFIX_RE = re.compile(r'-(\d+)n$')
+
+# Array task id as set by each scheduler
+TASK_ID_VARS = ('SGE_TASK_ID', 'SLURM_ARRAY_TASK_ID')
+
+# Accelerators bound to the node's GPU; they are not spread over nodes
+GPU_ACCELERATORS = ('gpu', 'kokkos-gpu')
+
+
+# ============================================================================
+# Splitting
+# ============================================================================
+
+def config_spec(config: dict) -> str:
+    """Runner config string of a parsed config."""
+    return f"{config['name']}|{config['omp_threads']}|{config['command']}"
+
+
+def scale_command(command: str, nodes: int) -> str:
+    """Spread a command over `nodes` nodes with the ranks it has on one node.
+
+    Rank and node counts are rewritten; every other launcher option (srun's
+    -c / --cpus-per-task, binding, environment) is kept.
+    """
+    tokens = shlex.split(command)
+    ranks = describe_command(command)['mpi_ranks']
+    launcher, options = ['mpirun'], []
+    if tokens and Path(tokens[0]).name in MPI_LAUNCHERS:
+        launcher, idx = tokens[:1], 1
+        while idx < len(tokens) and tokens[idx].startswith('-'):
+            option = tokens[idx].partition('=')[0]
+            width = 2 if option in LAUNCHER_VALUE_OPTIONS and '=' not in tokens[idx] else 1
+            if not (is_rank_option(tokens[0], option) or option in (*PER_NODE_OPTIONS, '--nodes')):
+                options += tokens[idx:idx + width]
+            idx += width
+        tokens = tokens[idx:]
+    if Path(launcher[0]).name == 'srun':
+        layout = ['-N', str(nodes), '-n', str(ranks * nodes)]
+    else:
+        layout = ['-np', str(ranks * nodes), '-npernode', str(ranks)]
+    return shlex.join([*launcher, *layout, *options, *tokens])
+
+
+def node_configs(configs: list[dict], nodes: int, cores_per_node: int) -> list[dict]:
+    """Multi-node variants of the configs that fill one node."""
+    scaled = []
+    for config in configs:
+        layout = describe_command(config['command'], config['omp_threads'])
+        if layout['accelerator'] in GPU_ACCELERATORS or layout['nodes'] != 1:
+            continue
+        if layout['mpi_ranks'] * max(layout['omp_threads'], 1) != cores_per_node:
+            continue
+        scaled.append(dict(config, name=f"{config['name']}-{nodes}n",
+                           command=scale_command(config['command'], nodes)))
+    return scaled
+
+
+def point_costs(points: list[tuple], history: Path = None) -> list[float]:
+    """Expected loop time of each (input, config) point from earlier runs (median of the known ones if new)."""
+    known = {}
+    if history and history.exists():
+        from result_store import load_runs
+
+        runs = load_runs(history).dropna(subset=['loop_time'])
+        runs['replicate'] = runs['replicate'].fillna('')
+        known = runs.groupby(['benchmark', 'replicate', 'config'], observed=True)['loop_time'].median().to_dict()
+    costs = [known.get((inp['benchmark'].upper(), inp['replicate'], config['name'])) for inp, config in points]
+    fallback = sorted(cost for cost in costs if cost is not None)
+    fallback = fallback[len(fallback) // 2] if fallback else 1.0
+    return [fallback if cost is None else cost for cost in costs]
+
+
+def deal_points(points: list[tuple], costs: list[float], tasks: int) -> list[list[tuple]]:
+    """Longest-first greedy split of the points into `tasks` shares of similar total cost."""
+    shares = [[] for _ in range(min(tasks, len(points)))]
+    loads = [0.0] * len(shares)
+    for point, cost in sorted(zip(points, costs), key=lambda item: -item[1]):
+        target = loads.index(min(loads))
+        shares[target].append(point)
+        loads[target] += cost
+    return shares
+
+
+def make_tasks(inputs: list[dict], configs: list[dict], tasks: int, node_counts: list[int],
+               cores_per_node: int, history: Path = None) -> list[dict]:
+    """Array tasks of a fan-out, numbered from 1 and grouped by node count."""
+    points = [(inp, config) for inp in inputs for config in configs]
+    manifest = []
+    for share in deal_points(points, point_costs(points, history), tasks):
+        manifest.append({'nodes': 1, 'points': [[inp['spec'], config_spec(config)] for inp, config in share]})
+    for nodes in node_counts:
+        scaled = node_configs(configs, nodes, cores_per_node)
+        for inp in inputs if scaled else []:
+            manifest.append({'nodes': nodes, 'points': [[inp['spec'], config_spec(config)] for config in scaled]})
+    for task_id, task in enumerate(manifest, start=1):
+        task['id'] = task_id
+    return manifest
+
+
+def load_manifest(shared: Path) -> dict:
+    """Read the fan-out manifest of a shared directory."""
+    return json.loads((shared / MANIFEST_NAME).read_text())
+
+
+def task_dir(shared: Path, task_id: int) -> Path:
+    """Directory holding one task's store, logs and checkpoint."""
+    return shared / 'tasks' / f"{task_id:03d}"
+
+
+# ============================================================================
+# Job Scripts and Submission
+# ============================================================================
+
+def job_script(manifest: dict, shared: Path, nodes: int, scheduler: str, queue: str = None,
+               pe: str = None, setup: list[str] = (), name: str = 'fanout') -> str:
+    """Array job script running the tasks on `nodes` nodes (local runs the SGE script)."""
+    ids = [task['id'] for task in manifest['tasks'] if task['nodes'] == nodes]
+    slots = nodes * manifest['cores_per_node']
+    job_name = f"{name}_{nodes}node"
+    if scheduler == 'slurm':
+        header = [f"#SBATCH --job-name={job_name}", f"#SBATCH --nodes={nodes}",
+                  f"#SBATCH --ntasks-per-node={manifest['cores_per_node']}", "#SBATCH --exclusive",
+                  "#SBATCH --requeue", f"#SBATCH --array={ids[0]}-{ids[-1]}",
+                  f"#SBATCH --output={shared}/tasks/%x.%a.out"]
+        if queue:
+            header.append(f"#SBATCH --partition={queue}")
+    else:
+        header = [f"#$ -q {queue or 'all.q'}", f"#$ -pe {pe or 'mpi_48'} {slots}", f"#$ -N {job_name}",
+                  "#$ -S /bin/bash", "#$ -V", "#$ -cwd", "#$ -r y", f"#$ -t {ids[0]}-{ids[-1]}",
+                  "#$ -j y", f"#$ -o {shared}/tasks/$JOB_NAME.$TASK_ID.out"]
+    tool = Path(__file__).resolve()
+    return "\n".join([
+        "#!/bin/bash", *header, "",
+        'echo "Fan-out task ${SGE_TASK_ID:-$SLURM_ARRAY_TASK_ID} on $(hostname), ' + f'{nodes} node(s)"',
+        *setup, "",
+        f"python3 {shlex.quote(str(tool))} task --shared {shlex.quote(str(shared))}", ""])
+
+
+def run_local(script: Path, task_ids: list[int], slots: int, parallel: int = 1) -> dict:
+    """Fake scheduler: run the script once per task id as an SGE array task. Returns {id: exit code}."""
+    job_id = str(os.getpid())
+    job_name = script.stem
+
+    def run(task_id):
+        env = dict(os.environ, SGE_TASK_ID=str(task_id), NSLOTS=str(slots), JOB_ID=job_id,
+                   JOB_NAME=job_name, SGE_O_WORKDIR=str(Path.cwd()))
+        with open(script.parent / 'tasks' / f"{job_name}.{task_id}.out", 'w') as output:
+            return subprocess.run(['bash', str(script)], env=env, stdout=output,
+                                  stderr=subprocess.STDOUT).returncode
+
+    (script.parent / 'tasks').mkdir(exist_ok=True)
+    with ThreadPoolExecutor(max_workers=parallel) as pool:
+        return dict(zip(task_ids, pool.map(run, task_ids)))
+
+
+# ============================================================================
+# Tasks
+# ============================================================================
+
+def current_task_id() -> int:
+    """Array task id from the scheduler environment (None outside an array job)."""
+    for name in TASK_ID_VARS:
+        value = os.environ.get(name, '')
+        if value.isdigit():
+            return int(value)
+    return None
+
+
+def write_status(directory: Path, **status):
+    """Replace a task's status file."""
+    path = directory / 'status.json'
+    path.with_suffix('.tmp').write_text(json.dumps(status))
+    path.with_suffix('.tmp').replace(path)
+
+
+def run_task(manifest: dict, shared: Path, task_id: int) -> int:
+    """Run one task's points with sweep.py (one sweep per group of inputs sharing their configs)."""
+    import sweep
+
+    task = next(task for task in manifest['tasks'] if task['id'] == task_id)
+    directory = task_dir(shared, task_id)
+    directory.mkdir(parents=True, exist_ok=True)
+    start = datetime.now().isoformat(timespec='seconds')
+    write_status(directory, task=task_id, state='running', host=socket.gethostname(), start=start)
+
+    exit_code = 0
+    for input_specs, specs in sweep.group_points(task['points']):
+        argv = ['--bench-dir', manifest['bench_dir'], '--log-dir', str(directory),
+                '--store', str(directory / 'results.db'), '--checkpoint', str(directory / 'checkpoint.jsonl'),
+                '--suite', manifest['suite'], *(arg for spec in input_specs for arg in ('-i', spec)),
+                *(arg for spec in specs for arg in ('-c', spec)), *manifest['sweep_args']]
+        if task['nodes'] > 1:
+            # A multi-node run spans the whole allocation
+            argv += ['--isolate', 'all']
+        exit_code = max(exit_code, sweep.main(argv))
+
+    write_status(directory, task=task_id, state='done' if exit_code == 0 else 'failed',
+                 host=socket.gethostname(), start=start, end=datetime.now().isoformat(timespec='seconds'),
+                 exit_code=exit_code)
+    return exit_code
+
+
+def task_states(manifest: dict, shared: Path) -> list[dict]:
+    """Status of every task ('pending' if it never started)."""
+    states = []
+    for task in manifest['tasks']:
+        path = task_dir(shared, task['id']) / 'status.json'
+        status = json.loads(path.read_text()) if path.exists() else {'state': 'pending'}
+        states.append(dict(status, task=task['id'], nodes=task['nodes'], points=len(task['points'])))
+    return states
+
+
+def gather(manifest: dict, shared: Path, store_path: Path) -> dict:
+    """Merge every task store into one result store. Returns {task id: new rows}."""
+    import sqlite3
+
+    from result_store import RUN_COLUMNS, connect, insert_runs
+
+    added = {}
+    conn = connect(store_path)
+    for task in manifest['tasks']:
+        task_store = task_dir(shared, task['id']) / 'results.db'
+        if not task_store.exists():
+            continue
+        source = sqlite3.connect(str(task_store))
+        source.row_factory = sqlite3.Row
+        columns = [row[1] for row in source.execute("PRAGMA table_info(runs)")]
+        names = [name for name in RUN_COLUMNS if name in columns]
+        rows = [dict(row) for row in source.execute(f"SELECT {', '.join(names)} FROM runs ORDER BY id")]
+        source.close()
+        with conn:
+            added[task['id']] = insert_runs(conn, rows)
+    conn.close()
+    return added
+
+
+# ============================================================================
+# Strong Scaling Across Nodes
+# ============================================================================
+
+def node_scaling(runs):
+    """Loop time, speedup and efficiency over node counts of every config run on more than one.
+
+    Multi-node variants (<config>-<N>n) join the series of their one-node
+    config; speedup and efficiency are relative to the smallest node count.
+    """
+    from trial_stats import latest_trials, summarize_trials
+
+    unbound = runs['binding'].isna() | (runs['binding'] == 'none')
+    runs = runs[unbound].dropna(subset=['loop_time', 'mpi_ranks'])
+    if runs.empty:
+        return []
+    runs = runs.assign(series=runs['config'].str.replace(NODE_SUFFIX_RE, '', regex=True),
+                       nodes=runs['nodes'].fillna(1).astype(int),
+                       cores=runs['mpi_ranks'].astype(int) * runs['omp_threads'].fillna(1).astype(int))
+    runs = latest_trials(runs, ['suite', 'benchmark', 'replicate', 'config'])
+    summary = summarize_trials(runs, ['suite', 'benchmark', 'replicate', 'series', 'nodes'])
+
+    records = []
+    for key, group in summary.groupby(['suite', 'benchmark', 'replicate', 'series'], sort=False, observed=True):
+        if group['nodes'].nunique() < 2:
+            continue
+        group = group.sort_values('nodes')
+        base = group.iloc[0]
+        points = []
+        for row in group.to_dict('records'):
+            speedup = base['loop_time'] / row['loop_time']
+            points.append(dict(row, speedup=speedup, efficiency=speedup * base['nodes'] / row['nodes']))
+        records.append({'key': key, 'points': points})
+    return records
+
+
+def node_scaling_table(records: list[dict]) -> list[str]:
+    """Markdown table of strong scaling across nodes."""
+    lines = [
+        "| Benchmark | Config | Nodes | Cores | Loop (s) | 95% CI (s) | Speedup | Efficiency |",
+        "|-----------|--------|-------|-------|----------|------------|---------|------------|",
+    ]
+    for record in records:
+        suite, bench, replicate, series = record['key']
+        for point in record['points']:
+            efficiency = f"{point['efficiency']:.0%}"
+            if point['efficiency'] < 0.5:
+                efficiency = f"**{efficiency}**"
+            lines.append(
+                f"| {bench} {replicate}".rstrip() + f" | {series} | {point['nodes']} | {point['cores']} | "
+                f"{point['loop_time']:.4f} | {point['loop_time_ci_low']:.4f}–{point['loop_time_ci_high']:.4f} | "
+                f"{point['speedup']:.2f}x | {efficiency} |")
+    lines.append("")
+    lines.append("Speedup and efficiency relative to the smallest node count; **bold**: below 50% efficiency.")
+    return lines
+
+
+# ============================================================================
+# Main
+# ============================================================================
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Fan a sweep out over scheduler array and multi-node jobs")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    split = sub.add_parser('split', help="split a sweep into tasks (arguments after -- go to sweep.py)")
+    split.add_argument('--shared', type=Path, required=True, help="directory on storage all nodes see")
+    split.add_argument('--bench-dir', type=Path, required=True)
+    split.add_argument('-i', '--input', dest='inputs', action='append', default=[])
+    split.add_argument('-c', '--config', dest='configs', action='append', default=[])
+    split.add_argument('--configs-from', type=Path, help="runner script with a BENCHMARK_CONFIGS array")
+    split.add_argument('--suite', default='official')
+    split.add_argument('--tasks', type=int, default=1, help="single-node array tasks")
+    split.add_argument('--nodes', default='', help="node counts of the multi-node jobs, e.g. 2,4,8")
+    split.add_argument('--cores-per-node', type=int, default=CORES_PER_NODE)
+    split.add_argument('--history', type=Path, help="result store with earlier loop times to balance tasks")
+    split.add_argument('sweep_args', nargs=argparse.REMAINDER)
+
+    submit = sub.add_parser('submit', help="write the job scripts and submit them")
+    submit.add_argument('--shared', type=Path, required=True)
+    submit.add_argument('--scheduler', choices=SCHEDULERS, default='sge')
+    submit.add_argument('--queue', help="SGE queue or Slurm partition (SGE default all.q)")
+    submit.add_argument('--pe', help="SGE parallel environment (default mpi_48)")
+    submit.add_argument('--setup', action='append', default=[], help="shell line run before the task")
+    submit.add_argument('--name', default='fanout', help="job name prefix")
+    submit.add_argument('--parallel', type=int, default=1, help="local: tasks run at the same time")
+    submit.add_argument('--dry-run', action='store_true', help="write the scripts without submitting")
+
+    task = sub.add_parser('task', help="run one task (inside the array job)")
+    task.add_argument('--shared', type=Path, required=True)
+    task.add_argument('--task', type=int, help="task id (default: SGE_TASK_ID / SLURM_ARRAY_TASK_ID)")
+
+    status = sub.add_parser('status', help="show task progress")
+    status.add_argument('--shared', type=Path, required=True)
+
+    merge = sub.add_parser('gather', help="merge the task stores into one result store")
+    merge.add_argument('--shared', type=Path, required=True)
+    merge.add_argument('--store', type=Path, required=True)
+
+    report = sub.add_parser('report', help="strong scaling across nodes")
+    report.add_argument('--store', type=Path, required=True)
+    report.add_argument('--suite')
+    report.add_argument('--benchmark')
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'split':
+        configs = [parse_config_spec(spec) for spec in args.configs]
+        if args.configs_from:
+            from result_store import parse_runner_configs
+
+            configs.extend(parse_runner_configs(args.configs_from).values())
+        from sweep import parse_input_spec
+
+        inputs = [dict(parse_input_spec(spec), spec=spec) for spec in args.inputs]
+        if not configs or not inputs:
+            parser.error("at least one --input and one --config are required")
+        node_counts = [int(n) for n in args.nodes.split(',') if n]
+        sweep_args = args.sweep_args[1:] if args.sweep_args[:1] == ['--'] else args.sweep_args
+        manifest = {
+            'bench_dir': str(args.bench_dir.resolve()),
+            'suite': args.suite,
+            'cores_per_node': args.cores_per_node,
+            'sweep_args': sweep_args,
+            'tasks': make_tasks(inputs, configs, args.tasks, node_counts, args.cores_per_node, args.history),
+        }
+        args.shared.mkdir(parents=True, exist_ok=True)
+        (args.shared / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2))
+        for nodes in sorted({task['nodes'] for task in manifest['tasks']}):
+            tasks = [task for task in manifest['tasks'] if task['nodes'] == nodes]
+            print(f"{nodes} node(s): tasks {tasks[0]['id']}-{tasks[-1]['id']}, "
+                  f"{sum(len(task['points']) for task in tasks)} points")
+        missing = [n for n in node_counts if not any(task['nodes'] == n for task in manifest['tasks'])]
+        if missing:
+            print(f"⚠ no config fills a {args.cores_per_node}-core node; no jobs on {missing} nodes")
+        return 0
+
+    shared = args.shared.resolve() if 'shared' in args else None
+    manifest = load_manifest(shared) if shared else None
+
+    if args.command == 'submit':
+        failed = 0
+        for nodes in sorted({task['nodes'] for task in manifest['tasks']}):
+            script = shared / f"{args.name}_{nodes}node.sh"
+            script.write_text(job_script(manifest, shared, nodes, args.scheduler, args.queue, args.pe,
+                                         args.setup, args.name))
+            ids = [task['id'] for task in manifest['tasks'] if task['nodes'] == nodes]
+            if args.dry_run:
+                print(f"Wrote {script} (tasks {ids[0]}-{ids[-1]})")
+            elif args.scheduler == 'local':
+                codes = run_local(script, ids, nodes * manifest['cores_per_node'], args.parallel)
+                failed += sum(1 for code in codes.values() if code)
+                print(f"{script.name}: {len(codes)} tasks run, {sum(1 for c in codes.values() if c)} failed")
+            else:
+                submitter = ['sbatch'] if args.scheduler == 'slurm' else ['qsub']
+                result = subprocess.run([*submitter, str(script)], capture_output=True, text=True)
+                print(result.stdout.strip() or result.stderr.strip())
+                failed += result.returncode != 0
+        return 1 if failed else 0
+
+    if args.command == 'task':
+        task_id = args.task or current_task_id()
+        if task_id is None:
+            parser.error("--task is required outside an array job")
+        return run_task(manifest, shared, task_id)
+
+    if args.command == 'status':
+        print("| Task | Nodes | Points | State | Host | Start | End |")
+        print("|------|-------|--------|-------|------|-------|-----|")
+        for state in task_states(manifest, shared):
+            print(f"| {state['task']} | {state['nodes']} | {state['points']} | {state['state']} | "
+                  f"{state.get('host', '-')} | {state.get('start', '-')} | {state.get('end', '-')} |")
+        return 0
+
+    if args.command == 'gather':
+        added = gather(manifest, shared, args.store)
+        states = task_states(manifest, shared)
+        for state in states:
+            print(f"  task {state['task']:3d} ({state['nodes']} node): {state['state']:<8} "
+                  f"{added.get(state['task'], 0)} new rows")
+        unfinished = [state['task'] for state in states if state['state'] != 'done']
+        print(f"Gathered {sum(added.values())} rows into {args.store}")
+        if unfinished:
+            print(f"⚠ tasks not finished: {unfinished} (resubmit; finished points are skipped)")
+        return 1 if unfinished else 0
+
+    from result_store import load_runs
+    from trial_stats import nominal_loop_times
+
+    filters = {}
+    if args.suite:
+        filters['suite'] = args.suite
+    if args.benchmark:
+        filters['benchmark'] = args.benchmark.upper()
+    records = node_scaling(nominal_loop_times(load_runs(args.store, **filters)))
+    if not records:
+        print("No configuration run on more than one node count (fanout.py split --nodes 2,4,8)")
+        return 1
+    print("\n### Strong Scaling Across Nodes (median over trials)\n")
+    print("\n".join(node_scaling_table(records)))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
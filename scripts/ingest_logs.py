@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Bulk LAMMPS Log Ingestion
+
+Discovers runner logs (log.<bench>_<config>, log.reaxff_<rep>_<config>)
+recursively, parses them in parallel with a process pool and writes the run
+blocks into the result store in batched transactions. Files whose size and
+mtime match the previous ingestion are skipped without being read; files
+whose content is already stored (touched, copied, rsynced without -t) only
+have their signature updated, since their runs would be keyed on a new date.
+
+Usage:
+  ingest_logs.py local_desktop mirae_server          # each tree into <tree>/results.db
+  ingest_logs.py --store all.db --workers 16 /scratch/sweeps
+"""
+
+import argparse
+import hashlib
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from lammps_log import iter_raw_lines, parse_log, parse_log_name
+from result_store import (connect, directory_configs, insert_runs, parse_log_file,
+                          record_source, source_digests, source_signatures)
+
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+DEFAULT_BATCH_SIZE = 500
+
+# Per-worker cache of runner configs, keyed by log directory
+_CONFIG_CACHE = {}
+
+
+# ============================================================================
+# Discovery and Parsing
+# ============================================================================
+
+def discover_logs(root: Path) -> list[Path]:
+    """Find runner log files below a directory tree."""
+    return sorted(path.resolve() for path in Path(root).rglob('log.*')
+                  if path.is_file() and parse_log_name(path))
+
+
+def parse_log_task(filepath: Path) -> tuple:
+    """Parse one log in a worker process. Returns (path, sha256, rows)."""
+    digest = hashlib.sha256()
+
+    def lines():
+        for raw in iter_raw_lines(filepath):
+            digest.update(raw)
+            yield raw.decode('utf-8', errors='replace')
+
+    log = parse_log(lines())
+
+    directory = filepath.parent
+    if directory not in _CONFIG_CACHE:
+        _CONFIG_CACHE[directory] = directory_configs(directory)
+
+    rows = parse_log_file(filepath, log, _CONFIG_CACHE[directory])
+    return filepath, digest.hexdigest(), rows
+
+
+def changed_logs(logs: list[Path], store_path: Path) -> list[Path]:
+    """Drop logs whose size and mtime match their previous ingestion."""
+    conn = connect(store_path)
+    known = source_signatures(conn)
+    conn.close()
+
+    changed = []
+    for path in logs:
+        stat = path.stat()
+        if known.get(str(path)) != (stat.st_size, stat.st_mtime):
+            changed.append(path)
+    return changed
+
+
+def ingest_logs(logs: list[Path], store_path: Path, workers: int = None,
+                batch_size: int = DEFAULT_BATCH_SIZE) -> tuple:
+    """Parse logs in parallel and write them in batches. Returns (files, rows)."""
+    workers = workers or os.cpu_count() or 1
+    todo = changed_logs(logs, store_path)
+    if not todo:
+        return 0, 0
+
+    conn = connect(store_path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+
+    added = 0
+    batch = []
+    stored = source_digests(conn)
+
+    def flush():
+        nonlocal added
+        with conn:
+            for filepath, digest, rows in batch:
+                if digest not in stored:
+                    added += insert_runs(conn, rows)
+                    stored.add(digest)
+                record_source(conn, filepath, digest)
+        batch.clear()
+
+    if workers == 1:
+        results = map(parse_log_task, todo)
+        pool = None
+    else:
+        pool = ProcessPoolExecutor(max_workers=workers)
+        chunksize = max(1, len(todo) // (workers * 8))
+        results = pool.map(parse_log_task, todo, chunksize=chunksize)
+
+    try:
+        for result in results:
+            batch.append(result)
+            if len(batch) >= batch_size:
+                flush()
+        flush()
+    finally:
+        if pool is not None:
+            pool.shutdown()
+        conn.close()
+
+    return len(todo), added
+
+
+# ============================================================================
+# Main
+# ============================================================================
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Bulk-ingest LAMMPS logs into the result store")
+    parser.add_argument('roots', type=Path, nargs='+', help="directory trees to search for log.* files")
+    parser.add_argument('--store', type=Path,
+                        help="result store (default: <root>/results.db for each root)")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help="log files per store transaction")
+    args = parser.parse_args(argv)
+
+    for root in args.roots:
+        store_path = args.store or root / 'results.db'
+        start = time.perf_counter()
+        logs = discover_logs(root)
+        parsed, added = ingest_logs(logs, store_path, args.workers, args.batch_size)
+        elapsed = time.perf_counter() - start
+        print(f"{root}: {len(logs)} logs found, {parsed} parsed, {added} rows added "
+              f"-> {store_path} ({elapsed:.2f}s)")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
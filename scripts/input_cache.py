@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Benchmark Input Cache
+
+Content-addressed store of the LAMMPS benchmark inputs (in.lj, data.rhodo,
+ffield.reax.hns, ...) so the runners no longer re-download them on every
+invocation. Files are pinned to a LAMMPS release tag: the first fetch of a
+tag records the SHA-256 of every file in tags/<tag>.json, and every later
+fetch, import or copy is verified against it. Objects are stored once under
+objects/<sha256[:2]>/<sha256> and made read-only, so a cache pre-filled on a
+login node can be shared by all compute nodes (read-only NFS is fine).
+
+The runners call `materialize` to copy the inputs of their suite into their
+benchmark directory. Missing or corrupt inputs are an error, never silently
+skipped. With --offline (OFFLINE=1 in the runners) the network is never
+touched; on air-gapped systems fill the cache with `import` from a LAMMPS
+source checkout of the same tag.
+
+Cache layout:
+  <cache>/objects/ab/abcdef...   file contents, named by SHA-256
+  <cache>/tags/<tag>.json        {file name: SHA-256} pinned for the tag
+
+Usage:
+  input_cache.py fetch --suite all --tag stable_29Aug2024_update1 --cache /shared/lammps_inputs
+  input_cache.py import ~/src/lammps --suite all --tag stable_29Aug2024_update1
+  input_cache.py materialize lammps_benchmarks --suite official --offline
+  input_cache.py status --tag stable_29Aug2024_update1
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import urllib.request
+from pathlib import Path
+
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+LAMMPS_RAW_URL = 'https://raw.githubusercontent.com/lammps/lammps'
+
+DEFAULT_TAG = os.environ.get('LAMMPS_TAG', 'stable_29Aug2024_update1')
+DEFAULT_CACHE = Path(os.environ.get('INPUT_CACHE', '~/.cache/lammps_bench_inputs')).expanduser()
+
+DOWNLOAD_TIMEOUT = 60
+
+# Benchmark inputs and their path in the LAMMPS source tree
+INPUT_FILES = {
+    'in.lj': 'bench/in.lj',
+    'in.chain': 'bench/in.chain',
+    'in.eam': 'bench/in.eam',
+    'in.rhodo': 'bench/in.rhodo',
+    'Cu_u3.eam': 'bench/Cu_u3.eam',
+    'data.chain': 'bench/data.chain',
+    'data.rhodo': 'bench/data.rhodo',
+    'in.reaxff.hns': 'examples/reaxff/HNS/in.reaxff.hns',
+    'data.hns-equil': 'examples/reaxff/HNS/data.hns-equil',
+    'ffield.reax.hns': 'examples/reaxff/HNS/ffield.reax.hns',
+}
+
+# Inputs each runner needs
+SUITES = {
+    'official': list(INPUT_FILES),
+    'scaling': ['data.hns-equil', 'ffield.reax.hns'],
+    'all': list(INPUT_FILES),
+}
+
+
+# ============================================================================
+# Cache
+# ============================================================================
+
+def digest_bytes(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def digest_file(path: Path) -> str:
+    """SHA-256 of a file, None if it cannot be read."""
+    try:
+        return digest_bytes(Path(path).read_bytes())
+    except OSError:
+        return None
+
+
+def object_path(cache: Path, digest: str) -> Path:
+    return Path(cache) / 'objects' / digest[:2] / digest
+
+
+def pin_path(cache: Path, tag: str) -> Path:
+    return Path(cache) / 'tags' / f"{tag}.json"
+
+
+def load_pins(cache: Path, tag: str) -> dict:
+    """{file name: SHA-256} pinned for a tag (empty if the tag was never fetched)."""
+    try:
+        return json.loads(pin_path(cache, tag).read_text())
+    except FileNotFoundError:
+        return {}
+
+
+def write_atomic(path: Path, data: bytes, mode: int = 0o644):
+    """Write via a temporary file and rename, so concurrent readers never see a partial file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix='.tmp_')
+    try:
+        with os.fdopen(fd, 'wb') as handle:
+            handle.write(data)
+        os.chmod(tmp, mode)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def save_pins(cache: Path, tag: str, pins: dict):
+    """Merge new pins into the tag's pin file (pins already recorded are never changed)."""
+    merged = {**pins, **load_pins(cache, tag)}
+    write_atomic(pin_path(cache, tag), (json.dumps(merged, indent=2, sort_keys=True) + '\n').encode())
+
+
+def cached_object(cache: Path, digest: str) -> Path:
+    """Path of a stored object whose contents still match its name, or None."""
+    path = object_path(cache, digest)
+    return path if path.exists() and digest_file(path) == digest else None
+
+
+def store(cache: Path, tag: str, name: str, data: bytes, pins: dict) -> str:
+    """Verify data against the tag's pin (pinning it if new) and store it; returns its digest."""
+    digest = digest_bytes(data)
+    if name in pins and pins[name] != digest:
+        raise ValueError(f"{name}: SHA-256 {digest[:12]} does not match the pin {pins[name][:12]} of {tag}")
+    if not cached_object(cache, digest):
+        write_atomic(object_path(cache, digest), data, mode=0o444)
+    pins[name] = digest
+    return digest
+
+
+def download(tag: str, name: str) -> bytes:
+    """Contents of an input at a LAMMPS tag."""
+    url = f"{LAMMPS_RAW_URL}/{tag}/{INPUT_FILES[name]}"
+    with urllib.request.urlopen(url, timeout=DOWNLOAD_TIMEOUT) as response:
+        return response.read()
+
+
+# ============================================================================
+# Actions
+# ============================================================================
+
+def fill(cache: Path, tag: str, names: list[str], source: Path = None, offline: bool = False) -> list[str]:
+    """Make sure every input is cached: download it (or read it from a LAMMPS source tree).
+
+    Prints one status line per file and returns the names that could not be cached.
+    """
+    pins = load_pins(cache, tag)
+    missing = []
+    for name in names:
+        print(f"  {name} ... ", end='', flush=True)
+        if name in pins and cached_object(cache, pins[name]):
+            print("✓ (cached)")
+            continue
+        if offline and source is None:
+            print("✗ (not cached, offline)")
+            missing.append(name)
+            continue
+        try:
+            data = (Path(source) / INPUT_FILES[name]).read_bytes() if source else download(tag, name)
+            digest = store(cache, tag, name, data, pins)
+        except (OSError, ValueError) as exc:
+            print(f"✗ ({exc})")
+            missing.append(name)
+            continue
+        print(f"✓ ({'imported' if source else 'downloaded'}, {digest[:12]})")
+    if pins != load_pins(cache, tag):
+        save_pins(cache, tag, pins)
+    return missing
+
+
+def materialize(dest: Path, cache: Path, tag: str, names: list[str], offline: bool = False) -> list[str]:
+    """Copy verified inputs from the cache into a benchmark directory, filling the cache first if online.
+
+    Returns the names that are missing (nothing is downloaded with offline=True).
+    """
+    missing = fill(cache, tag, names, offline=offline)
+    pins = load_pins(cache, tag)
+    dest = Path(dest)
+    dest.mkdir(parents=True, exist_ok=True)
+    for name in names:
+        if name in missing:
+            continue
+        target = dest / name
+        if digest_file(target) != pins[name]:
+            target.unlink(missing_ok=True)
+            shutil.copyfile(object_path(cache, pins[name]), target)
+    return missing
+
+
+def status(cache: Path, tag: str) -> list[str]:
+    """Pinned files of a tag and whether each object is present and intact."""
+    pins = load_pins(cache, tag)
+    lines = [f"{tag} ({pin_path(cache, tag)}): {len(pins)}/{len(INPUT_FILES)} files pinned"]
+    for name in INPUT_FILES:
+        if name not in pins:
+            state = 'not pinned'
+        elif cached_object(cache, pins[name]):
+            state = f"ok {pins[name][:12]}"
+        else:
+            state = f"missing or corrupt {pins[name][:12]}"
+        lines.append(f"  {name:<16} {state}")
+    return lines
+
+
+# ============================================================================
+# Main
+# ============================================================================
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Content-addressed cache of LAMMPS benchmark inputs")
+    parser.add_argument('--cache', type=Path, default=DEFAULT_CACHE,
+                        help=f"cache directory (INPUT_CACHE, default {DEFAULT_CACHE})")
+    parser.add_argument('--tag', default=DEFAULT_TAG, help=f"LAMMPS release tag (LAMMPS_TAG, default {DEFAULT_TAG})")
+    sub = parser.add_subparsers(dest='action', required=True)
+
+    fetch = sub.add_parser('fetch', help="download the inputs of a suite into the cache")
+    fetch.add_argument('--suite', choices=SUITES, default='all')
+
+    imp = sub.add_parser('import', help="fill the cache from a LAMMPS source checkout (air-gapped systems)")
+    imp.add_argument('source', type=Path, help="LAMMPS source tree checked out at --tag")
+    imp.add_argument('--suite', choices=SUITES, default='all')
+
+    mat = sub.add_parser('materialize', help="copy the verified inputs of a suite into a benchmark directory")
+    mat.add_argument('dest', type=Path)
+    mat.add_argument('--suite', choices=SUITES, default='all')
+    mat.add_argument('--offline', action='store_true', help="never touch the network")
+
+    stat = sub.add_parser('status', help="list the pinned files of a tag")
+
+    # Options are accepted before or after the action
+    for action in (fetch, imp, mat, stat):
+        action.add_argument('--cache', type=Path, default=argparse.SUPPRESS)
+        action.add_argument('--tag', default=argparse.SUPPRESS)
+
+    args = parser.parse_args(argv)
+
+    if args.action == 'status':
+        print("\n".join(status(args.cache, args.tag)))
+        return 0
+
+    names = SUITES[args.suite]
+    if args.action == 'materialize':
+        missing = materialize(args.dest, args.cache, args.tag, names, args.offline)
+    else:
+        missing = fill(args.cache, args.tag, names, source=getattr(args, 'source', None))
+
+    if missing:
+        print(f"Error: {len(missing)} inputs unavailable for LAMMPS {args.tag} ({', '.join(missing)}); "
+              f"pre-fill {args.cache} with `input_cache.py fetch` or `input_cache.py import`")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
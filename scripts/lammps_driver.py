@@ -0,0 +1,473 @@
+#!/usr/bin/env python3
+"""
+In-Process LAMMPS Driver
+
+Runs benchmarks through the LAMMPS Python module instead of starting one
+`lmp` process per run. Each input is set up once (every command before its
+last `run`: read_data, replicate, pair and fix setup), then measured as
+repeated `run N` segments on the same system. Trials and parameter variants
+thereby no longer pay for mpirun, loading the binary, parsing the input and
+read_data each time. Timings come from the library, not from a log file:
+every segment is bracketed by MPI barriers (as LAMMPS brackets its loop
+time) and atoms, step and timestep are read with get_natoms() and
+extract_global().
+
+The LAMMPS arguments of a config (-sf, -pk, -k) become the instance's
+command line, and its binary selects the shared library (lmp_gpu ->
+liblammps_gpu.so). A config started by mpirun re-runs the driver under that
+launcher, and the ranks share one instance through mpi4py.
+
+The first segment after setup, or after a --variant changed settings, runs
+with `pre yes` (neighbor lists, force setup); later segments run
+`pre no post no`, so --warmup 1 keeps setup out of the trials. Segments are
+stored as suite "inprocess", one trial per segment, with the one-time setup
+as setup_time. --backend mock replaces the library with a timing model, so
+the driver can be exercised without LAMMPS installed.
+
+Usage:
+  lammps_driver.py run --bench-dir lammps_benchmarks -i lj=in.lj -i eam=in.eam \\
+      -c "opt-mpi12-omp4|4|mpirun -np 12 lmp -sf omp -pk omp 4 -in" \\
+      --trials 5 --warmup 1 --store results.db
+  lammps_driver.py run --bench-dir lammps_benchmarks -i lj=in.lj -c "opt-serial|1|lmp -in" \\
+      --variant "skin-0.2|neighbor 0.2 bin" --variant "skin-0.5|neighbor 0.5 bin" --trials 3
+  lammps_driver.py run --backend mock --bench-dir lammps_benchmarks -i lj=in.lj -c "opt-serial|1|lmp -in"
+  lammps_driver.py report --store results.db
+"""
+
+import argparse
+import math
+import os
+import shlex
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+from adaptive_run import RUN_RE
+from bench_config import MPI_LAUNCHERS, describe_command, parse_config_spec
+from result_store import BENCHMARKS
+from sweep import parse_input_spec
+from trial_stats import latest_trials, summarize_trials
+
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+SUITE = 'inprocess'
+
+BACKENDS = ['lammps', 'mock']
+
+# Command-line options handled by the driver itself (input, log and screen files)
+DRIVER_OPTIONS = ('-in', '-i', '-log', '-l', '-screen', '-sc')
+
+# The instance writes neither a log file nor screen output
+QUIET_ARGS = ['-log', 'none', '-screen', 'none', '-nocite']
+
+# Nanoseconds per time unit of the LAMMPS unit styles (lj has no physical time)
+NS_PER_TIME_UNIT = {
+    'real': 1e-6,
+    'metal': 1e-3,
+    'electron': 1e-6,
+}
+
+# Mock backend: LAMMPS' default timesteps and a simple cost model
+MOCK_TIMESTEPS = {'lj': 0.005, 'real': 1.0, 'metal': 0.001, 'electron': 0.001}
+MOCK_ATOMS = 32000              # official inputs at 1 × 1 × 1
+MOCK_ATOM_STEP_TIME = 1e-7      # seconds per atom-step on one core
+MOCK_EFFICIENCY = 0.85          # time ∝ 1 / cores^efficiency
+MOCK_SETUP_TIME = 0.5           # seconds per 32k atoms (read_data, replicate, init)
+MOCK_PRE_TIME = 0.05            # seconds per 32k atoms of a `pre yes` segment
+
+
+# ============================================================================
+# Inputs and Commands
+# ============================================================================
+
+def split_input(text: str) -> tuple:
+    """Split an input at its last `run` command: (setup commands, steps of that run)."""
+    runs = list(RUN_RE.finditer(text))
+    if not runs:
+        raise ValueError("input has no run command")
+    last = runs[-1]
+    return text[:last.start()], int(last.group(2))
+
+
+def split_command(command: str) -> tuple:
+    """Split a config command into (launcher tokens, LAMMPS arguments, binary).
+
+    The input, log and screen options are dropped; the driver sets them.
+    """
+    tokens = shlex.split(command)
+    binary = describe_command(command)['binary']
+    idx = 0
+    if tokens and Path(tokens[0]).name in MPI_LAUNCHERS:
+        idx = next(i for i, token in enumerate(tokens) if i and Path(token).name == binary)
+
+    args = []
+    rest = tokens[idx + 1:]
+    pos = 0
+    while pos < len(rest):
+        if rest[pos] in DRIVER_OPTIONS:
+            pos += 2
+            continue
+        args.append(rest[pos])
+        pos += 1
+    return tokens[:idx], args, binary
+
+
+def library_name(binary: str) -> str:
+    """Shared library suffix of a LAMMPS binary: lmp -> '' (liblammps), lmp_gpu -> 'gpu'."""
+    return binary[len('lmp'):].lstrip('_') if binary.startswith('lmp') else ''
+
+
+def parse_variant(spec: str) -> dict:
+    """Parse "name|command; command" into a variant applied between segments."""
+    name, sep, commands = spec.partition('|')
+    if not sep or not name.strip():
+        raise ValueError(f"Invalid variant spec: {spec!r}")
+    return {'name': name.strip(), 'commands': '\n'.join(cmd.strip() for cmd in commands.split(';'))}
+
+
+# ============================================================================
+# Backends
+# ============================================================================
+
+class LammpsBackend:
+    """An instance of the lammps Python module, shared by the MPI ranks through mpi4py."""
+
+    def __init__(self, args: list[str], name: str = '', ranks: int = 1):
+        from lammps import lammps
+
+        try:
+            from mpi4py import MPI
+            self.comm = MPI.COMM_WORLD
+        except ImportError:
+            self.comm = None
+        options = {'cmdargs': [*QUIET_ARGS, *args]}
+        if self.comm is not None:
+            options['comm'] = self.comm
+        try:
+            self.lmp = lammps(name=name, **options)
+        except OSError:
+            print(f"⚠ liblammps_{name} not found, using liblammps")
+            self.lmp = lammps(**options)
+        self.rank = self.comm.Get_rank() if self.comm is not None else 0
+        self.ranks = self.lmp.extract_setting('world_size')
+        self.threads = self.lmp.extract_setting('nthreads')
+
+    def _timed(self, call) -> float:
+        if self.comm is not None:
+            self.comm.Barrier()
+        start = time.perf_counter()
+        call()
+        if self.comm is not None:
+            self.comm.Barrier()
+        return time.perf_counter() - start
+
+    def setup(self, text: str) -> float:
+        """Execute input commands. Returns their seconds."""
+        return self._timed(lambda: self.lmp.commands_string(text))
+
+    def run(self, steps: int, pre: bool) -> float:
+        """Run `steps` steps. Returns the seconds of the slowest rank."""
+        return self._timed(lambda: self.lmp.command(f"run {steps} pre {'yes' if pre else 'no'} post no"))
+
+    def system(self) -> dict:
+        return {
+            'atoms': int(self.lmp.get_natoms()),
+            'step': self.lmp.extract_global('ntimestep'),
+            'dt': self.lmp.extract_global('dt'),
+            'units': self.lmp.extract_global('units'),
+        }
+
+    def close(self):
+        self.lmp.close()
+
+
+class MockBackend:
+    """Timing model standing in for the LAMMPS library.
+
+    Tracks `units`, `timestep` and the x/y/z index variables of the input
+    (atoms = 32000 × x × y × z, as the official inputs replicate) and keeps
+    every command it was given in `history`.
+    """
+
+    def __init__(self, args: list[str], name: str = '', ranks: int = 1):
+        self.rank = 0
+        self.ranks = ranks
+        self.threads = describe_command(shlex.join(['lmp', *args]))['omp_threads']
+        self.variables = {}
+        self.units = 'lj'
+        self.dt = None
+        self.step = 0
+        self.history = []
+
+    def _atoms(self) -> int:
+        dims = [self.variables.get(axis, '1') for axis in 'xyz']
+        return MOCK_ATOMS * math.prod(int(dim) if dim.isdigit() else 1 for dim in dims)
+
+    def setup(self, text: str) -> float:
+        for line in text.splitlines():
+            words = line.split('#')[0].split()
+            if not words:
+                continue
+            self.history.append(' '.join(words))
+            if words[0] == 'variable' and len(words) > 3 and words[2] == 'index':
+                self.variables.setdefault(words[1], words[3])
+            elif words[0] == 'units' and len(words) > 1:
+                self.units = words[1]
+            elif words[0] == 'timestep' and len(words) > 1:
+                self.dt = float(words[1])
+        return MOCK_SETUP_TIME * self._atoms() / MOCK_ATOMS
+
+    def run(self, steps: int, pre: bool) -> float:
+        self.history.append(f"run {steps} pre {'yes' if pre else 'no'} post no")
+        self.step += steps
+        atoms = self._atoms()
+        cores = self.ranks * self.threads
+        loop = steps * atoms * MOCK_ATOM_STEP_TIME / cores ** MOCK_EFFICIENCY
+        return loop + (MOCK_PRE_TIME * atoms / MOCK_ATOMS if pre else 0.0)
+
+    def system(self) -> dict:
+        dt = self.dt if self.dt is not None else MOCK_TIMESTEPS.get(self.units, 1.0)
+        return {'atoms': self._atoms(), 'step': self.step, 'dt': dt, 'units': self.units}
+
+    def close(self):
+        pass
+
+
+def make_backend(kind: str, args: list[str], binary: str, ranks: int = 1):
+    backend = MockBackend if kind == 'mock' else LammpsBackend
+    return backend(args, library_name(binary), ranks)
+
+
+# ============================================================================
+# Driver
+# ============================================================================
+
+def drive(backend, setup_text: str, steps: int, trials: int = 1, warmup: int = 0,
+          variants: list[dict] = None) -> tuple:
+    """Set the system up once, then run warmup + trials segments per variant.
+
+    Returns the setup seconds and one record per measured segment (variant,
+    trial, loop_time and the system's atoms, step, dt and units).
+    """
+    setup = backend.setup(setup_text)
+    segments = []
+    for variant in variants or [{'name': None, 'commands': ''}]:
+        if variant['commands']:
+            backend.setup(variant['commands'])
+        pre = True
+        for trial in [None] * warmup + list(range(trials)):
+            loop = backend.run(steps, pre)
+            pre = False
+            if trial is not None:
+                segments.append({'variant': variant['name'], 'trial': trial, 'loop_time': loop, **backend.system()})
+    return setup, segments
+
+
+def segment_row(segment: dict, steps: int, **tags) -> dict:
+    """Result-store row of a measured segment."""
+    ts_per_sec = steps / segment['loop_time'] if segment['loop_time'] > 0 else None
+    ns_per_day = None
+    if ts_per_sec and segment['units'] in NS_PER_TIME_UNIT:
+        ns_per_day = ts_per_sec * segment['dt'] * NS_PER_TIME_UNIT[segment['units']] * 86400
+    return dict(tags, trial=segment['trial'], run_index=0, atoms=segment['atoms'], timesteps=steps,
+                loop_time=segment['loop_time'], timesteps_per_sec=ts_per_sec, ns_per_day=ns_per_day,
+                hours_per_ns=24 / ns_per_day if ns_per_day else None)
+
+
+def run_inputs(args, config: dict) -> int:
+    """Drive every input with one config in this process. Returns the number of failed inputs."""
+    _, lammps_args, binary = split_command(config['command'])
+    ranks = describe_command(config['command'], config['omp_threads'])['mpi_ranks']
+    os.environ['OMP_NUM_THREADS'] = str(config['omp_threads'])
+
+    failed = 0
+    for spec in args.inputs:
+        input_path = (args.bench_dir / spec['input_file']).resolve()
+        try:
+            setup_text, steps = split_input(input_path.read_text(encoding='utf-8'))
+        except (OSError, ValueError) as error:
+            print(f"⚠ {spec['benchmark']}: {error}")
+            failed += 1
+            continue
+
+        date = datetime.now().isoformat(timespec='seconds')
+        try:
+            backend = make_backend(args.backend, lammps_args, binary, ranks)
+        except ImportError:
+            print("⚠ The lammps Python module is not installed (--backend mock runs the timing model)")
+            return failed + 1
+        try:
+            setup, segments = drive(backend, setup_text, args.steps or steps, args.trials, args.warmup,
+                                    args.variants)
+        except Exception as error:  # LAMMPS errors surface as generic exceptions
+            if backend.rank == 0:
+                print(f"  {spec['benchmark'].upper()} {config['name']}: {error}")
+            failed += 1
+            continue
+        finally:
+            backend.close()
+        if backend.rank != 0:
+            continue
+
+        rows = [segment_row(segment, args.steps or steps, suite=args.suite, benchmark=spec['benchmark'],
+                            replicate=spec['replicate'],
+                            config=config['name'] + (f"+{segment['variant']}" if segment['variant'] else ''),
+                            command=config['command'], mpi_ranks=backend.ranks, omp_threads=backend.threads,
+                            setup_time=setup, date=date, source=str(input_path))
+                for segment in segments]
+        frame = pd.DataFrame(rows)
+        for name, group in frame.groupby('config', sort=False):
+            loop = group['loop_time'].median()
+            rate = (group['atoms'] * group['timesteps'] / group['loop_time']).median()
+            print(f"  {spec['benchmark'].upper():<7} {name:<28} setup {setup:7.2f}s  segment {loop:8.3f}s "
+                  f"({len(group)} × {args.steps or steps} steps)  {rate / 1e6:8.2f} Matom-steps/s")
+        if args.store:
+            from result_store import append_runs
+
+            append_runs(args.store, rows)
+    return failed
+
+
+def launch_argv(args, spec: str, launcher: list[str]) -> list[str]:
+    """Command re-running the driver for one config under its MPI launcher."""
+    argv = [*launcher, sys.executable, str(Path(__file__).resolve()), 'run', '--launched',
+            '--backend', args.backend, '--bench-dir', str(args.bench_dir), '-c', spec,
+            '--trials', str(args.trials), '--warmup', str(args.warmup), '--suite', args.suite]
+    for item in args.input_specs:
+        argv += ['-i', item]
+    for item in args.variant_specs:
+        argv += ['--variant', item]
+    if args.steps:
+        argv += ['--steps', str(args.steps)]
+    if args.store:
+        argv += ['--store', str(args.store)]
+    return argv
+
+
+# ============================================================================
+# Report
+# ============================================================================
+
+def inprocess_summary(runs: pd.DataFrame) -> pd.DataFrame:
+    """Median segment time per (benchmark, replicate, config), with the process-per-run wall time.
+
+    `process_time` is the median wall time (launch + setup + loop) of the same
+    configuration run as its own process (official suite, startup_cost.py
+    timing); `saving` is process_time / segment time.
+    """
+    keys = ['benchmark', 'replicate', 'config']
+    segments = runs[runs['suite'] == SUITE]
+    if segments.empty:
+        return pd.DataFrame()
+    summary = summarize_trials(latest_trials(segments, keys), keys)
+    summary['throughput'] = summary['atoms'].astype(float) * summary['timesteps'].astype(float) / summary['loop_time']
+
+    official = runs[runs['suite'] == 'official'].dropna(subset=['wall_time'])
+    if not official.empty:
+        process = latest_trials(official, keys).groupby(keys, observed=True)['wall_time'].median()
+        summary = summary.merge(process.rename('process_time').reset_index().astype({'benchmark': str}),
+                                on=keys, how='left')
+    else:
+        summary['process_time'] = float('nan')
+    summary['saving'] = summary['process_time'] / summary['loop_time']
+    order = summary['benchmark'].astype(str).map({bench: idx for idx, bench in enumerate(BENCHMARKS)})
+    return summary.assign(order=order).sort_values(['order', 'replicate', 'config'], kind='stable')
+
+
+def inprocess_table(summary: pd.DataFrame) -> list[str]:
+    """Markdown table of segment times next to the cost of one process per run."""
+    lines = ["| Benchmark | Config | Trials | Setup once (s) | Segment (s) | Matom-steps/s | Process run (s) | "
+             "Saving |",
+             "|-----------|--------|--------|----------------|-------------|---------------|-----------------|"
+             "--------|"]
+    for record in summary.to_dict('records'):
+        bench = f"{record['benchmark']} {record['replicate']}".strip()
+        process = f"{record['process_time']:.2f}" if pd.notna(record['process_time']) else "-"
+        saving = f"{record['saving']:.1f}x" if pd.notna(record['saving']) else "-"
+        lines.append(f"| {bench} | {record['config']} | {record['trials']} | {record['setup_time']:.2f} | "
+                     f"{record['loop_time']:.3f} | {record['throughput'] / 1e6:.2f} | {process} | {saving} |")
+    lines += ["", "Segment = one `run N` on the already set-up system (median over trials). Process run = "
+              "launch + setup + loop of the same config as its own process (startup_cost.py timing)."]
+    return lines
+
+
+# ============================================================================
+# Main
+# ============================================================================
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="In-process LAMMPS benchmark driver (LAMMPS Python module)")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    run = sub.add_parser('run', help="set each input up once and time repeated run segments")
+    run.add_argument('--bench-dir', type=Path, required=True, help="directory holding the inputs")
+    run.add_argument('-i', '--input', dest='input_specs', action='append', default=[],
+                     help="benchmark input: name=file or name:replicate=file")
+    run.add_argument('-c', '--config', dest='configs', action='append', default=[],
+                     help="name|omp|command or name|command (LAMMPS arguments of the command are used)")
+    run.add_argument('--variant', dest='variant_specs', action='append', default=[],
+                     help="name|commands (';'-separated) applied before its segments, e.g. 'skin-0.5|neighbor 0.5 bin'")
+    run.add_argument('--steps', type=int, help="steps per segment (default: the input's last run)")
+    run.add_argument('--trials', type=int, default=1, help="measured segments per variant")
+    run.add_argument('--warmup', type=int, default=1, help="untimed segments before the trials")
+    run.add_argument('--backend', choices=BACKENDS, default='lammps')
+    run.add_argument('--store', type=Path, help="append measured segments to this result store")
+    run.add_argument('--suite', default=SUITE)
+    run.add_argument('--launched', action='store_true', help=argparse.SUPPRESS)
+
+    report = sub.add_parser('report', help="segment times vs one process per run from the result store")
+    report.add_argument('--store', type=Path, required=True)
+    report.add_argument('--output', type=Path, help="write a results file (with its configurations) instead")
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'report':
+        from result_store import load_runs, results_header
+
+        runs = load_runs(args.store, suite=[SUITE, 'official'])
+        summary = inprocess_summary(runs)
+        if summary.empty:
+            print("No in-process runs in the store (lammps_driver.py run, or INPROCESS=1 in the runners)")
+            return 1
+        lines = ["### In-Process Segments (median over trials)", "", *inprocess_table(summary)]
+        if args.output:
+            header = results_header("LAMMPS In-Process Driver Results", runs[runs['suite'] == SUITE])
+            args.output.write_text("\n".join(header + lines) + "\n", encoding='utf-8')
+            print(f"✓ Results saved to: {args.output}")
+        else:
+            print("\n" + "\n".join(lines))
+        return 0
+
+    if not args.configs or not args.input_specs:
+        parser.error("at least one --input and one --config are required")
+    if args.trials < 1 or args.warmup < 0:
+        parser.error("--trials must be at least 1 and --warmup at least 0")
+    args.inputs = [parse_input_spec(spec) for spec in args.input_specs]
+    args.variants = [parse_variant(spec) for spec in args.variant_specs] or None
+    args.bench_dir = args.bench_dir.resolve()
+    if args.store:
+        args.store = args.store.resolve()
+    # Inputs read their data and potential files relative to the benchmark directory
+    os.chdir(args.bench_dir)
+
+    failed = 0
+    for spec in args.configs:
+        config = parse_config_spec(spec)
+        launcher = split_command(config['command'])[0]
+        if launcher and args.backend == 'lammps' and not args.launched:
+            env = dict(os.environ, OMP_NUM_THREADS=str(config['omp_threads']))
+            failed += subprocess.run(launch_argv(args, spec, launcher), env=env).returncode != 0
+        else:
+            failed += run_inputs(args, config)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,570 @@
+#!/usr/bin/env python3
+"""
+LAMMPS Log Parser
+
+Single-pass, streaming parser for LAMMPS log files. Extracts every run block
+(thermo output in column or `thermo_style multi` form, memory per rank, loop
+time, Performance line, CPU use and the MPI task timing breakdown) plus the total wall time, the wall and launch
+times appended by startup_cost.py and the telemetry summary of telemetry.py. Logs of crashed jobs are handled: an
+unfinished run block is returned with complete=False.
+
+Usage:
+  lammps_log.py show log.lj_CPU-1                 # JSON dump of all run blocks
+  lammps_log.py metrics log.lj_CPU-1              # KEY=VALUE lines for bash runners
+  lammps_log.py metrics log.lj_CPU-1 --store results.db --suite official \\
+      --benchmark lj --config CPU-1 --command "lmp_gpu -in"
+  lammps_log.py metrics log.lj_CPU-1 log.lj_CPU-1.t1 log.lj_CPU-1.t2   # median trial
+"""
+
+import argparse
+import json
+import mmap
+import re
+import sys
+from datetime import datetime
+from pathlib import Path
+
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+LOOP_RE = re.compile(
+    r'Loop time of (\S+) on (\d+) procs for (\d+) steps with (\d+) atoms')
+PERF_RE = re.compile(r'([-+\d.eE]+)\s+([^\s,]+)')
+CPU_RE = re.compile(
+    r'([\d.]+)% CPU use with (\d+) MPI tasks x (\d+) OpenMP threads')
+MEMORY_RE = re.compile(
+    r'Per MPI rank memory allocation \(min/avg/max\) = (\S+) \| (\S+) \| (\S+) Mbytes')
+WALL_RE = re.compile(r'Total wall time: (\d+):(\d+):(\d+)')
+OMP_RE = re.compile(r'using (\d+) OpenMP thread\(s\) per MPI task')
+# `thermo_style multi` block header and its "Name = value" fields
+THERMO_MULTI_RE = re.compile(r'^-+ Step\s+(\d+) -+')
+THERMO_FIELD_RE = re.compile(r'(\w+)\s+=\s+(\S+)')
+# Summary appended by adaptive_run.py
+ADAPTIVE_RE = re.compile(
+    r'Adaptive run: nominal (\d+) steps, ran (\d+) steps, .* extrapolated loop time (\S+)')
+# Summary appended by startup_cost.py
+LAUNCH_RE = re.compile(r'Launch timing: wall (\S+) s, launch (\S+) s')
+# Summary appended by telemetry.py ("Telemetry: key=value ...")
+TELEMETRY_PREFIX = 'Telemetry:'
+
+# Telemetry summary keys and their result-store columns
+TELEMETRY_FIELDS = {
+    'busy_cores': 'busy_cores',
+    'runnable': 'runnable_threads',
+    'cpu_mhz': 'cpu_mhz',
+    'cpu_mhz_min': 'cpu_mhz_min',
+    'throttle': 'throttle_events',
+    'ctx_per_sec': 'ctx_switches_per_sec',
+    'involuntary_per_sec': 'involuntary_ctx_per_sec',
+    'rank_rss_mb': 'rank_rss_mb',
+    'rss_mb': 'rss_mb',
+    'gpu_mem_mb': 'gpu_mem_mb',
+    'numa_local': 'numa_local_frac',
+    'series': 'telemetry',
+}
+
+TIMING_FIELDS = ['min', 'avg', 'max', 'varavg', 'total_pct']
+
+# Thermo headers (default, custom and multi styles) and the result-store columns of their final value
+THERMO_COLUMNS = {
+    'Temp': 'thermo_temp',
+    'E_pair': 'thermo_pe',
+    'PotEng': 'thermo_pe',
+    'TotEng': 'thermo_etotal',
+    'Press': 'thermo_press',
+    'E_vdwl': 'thermo_evdwl',
+    'E_coul': 'thermo_ecoul',
+}
+# Older LAMMPS versions print custom keywords as given
+THERMO_COLUMNS.update({'temp': 'thermo_temp', 'pe': 'thermo_pe', 'etotal': 'thermo_etotal',
+                       'press': 'thermo_press', 'evdwl': 'thermo_evdwl', 'ecoul': 'thermo_ecoul'})
+
+# Timing breakdown sections and the result-store columns of their average time
+TIMING_SECTIONS = {
+    'Pair': 'pair_time',
+    'Bond': 'bond_time',
+    'Kspace': 'kspace_time',
+    'Neigh': 'neigh_time',
+    'Comm': 'comm_time',
+    'Output': 'output_time',
+    'Modify': 'modify_time',
+    'Other': 'other_time',
+}
+
+# Logs at least this large are memory-mapped instead of read through a buffer
+MMAP_THRESHOLD = 1 << 20
+
+# Log file names written by the runners
+OFFICIAL_LOG_RE = re.compile(r'^log\.(lj|eam|chain|rhodo|reaxff)_(.+)$')
+SCALING_LOG_RE = re.compile(r'^log\.reaxff_(\d+x\d+x\d+)_(.+)$')
+MEMORY_LOG_RE = re.compile(r'^log\.memory_reaxff_(\d+x\d+x\d+)_(.+)$')
+SIZE_LOG_RE = re.compile(r'^log\.size_(lj|eam|chain|rhodo)_(\d+x\d+x\d+)_(.+)$')
+# Ensemble copies (ensemble.py): log.ensemble_<bench>_<K>x_<config>.c<copy>, binding and trial suffixes after
+ENSEMBLE_LOG_RE = re.compile(r'^log\.ensemble_(lj|eam|chain|rhodo|reaxff)_(\d+)x_(.+)\.c(\d+)$')
+# Repeated trials: trial 0 writes log.X, trial N writes log.X.tN; warm-ups log.X.warmup
+TRIAL_SUFFIX_RE = re.compile(r'^(.+)\.t(\d+)$')
+# Runs under a binding policy (binding.py) append .bind-<policy> before the trial suffix
+BINDING_SUFFIX_RE = re.compile(r'^(.+)\.bind-([a-z]+)$')
+WARMUP_SUFFIX = '.warmup'
+
+
+# ============================================================================
+# Parsing Functions
+# ============================================================================
+
+def to_float(value: str):
+    """Convert a log field to float (blank or malformed fields become None)."""
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def new_run(index: int) -> dict:
+    """Create an empty run block record."""
+    return {
+        'index': index,
+        'complete': False,
+        'memory_mb': None,
+        'thermo': {'columns': [], 'rows': []},
+        'loop_time': None,
+        'procs': None,
+        'steps': None,
+        'atoms': None,
+        'performance': {},
+        'cpu_use': None,
+        'mpi_tasks': None,
+        'omp_threads': None,
+        'timing': {},
+        'nominal_steps': None,
+        'extrapolated_loop_time': None,
+    }
+
+
+def add_thermo_block(run: dict, block: dict):
+    """Append a `thermo_style multi` block as a thermo row (columns from the first block)."""
+    thermo = run['thermo']
+    if not thermo['columns']:
+        thermo['columns'] = list(block)
+    thermo['rows'].append([block.get(column) for column in thermo['columns']])
+
+
+def iter_raw_lines(filepath: Path):
+    """Yield raw byte lines of a file, memory-mapping large files."""
+    with open(filepath, 'rb') as handle:
+        if Path(filepath).stat().st_size >= MMAP_THRESHOLD:
+            with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                yield from iter(mapped.readline, b'')
+        else:
+            yield from handle
+
+
+def iter_lines(source):
+    """Yield lines from a path or an iterable of lines."""
+    if isinstance(source, (str, Path)):
+        for raw in iter_raw_lines(source):
+            yield raw.decode('utf-8', errors='replace')
+    else:
+        yield from source
+
+
+def parse_log(source) -> dict:
+    """Parse a LAMMPS log (path or iterable of lines) in a single pass."""
+    log = {
+        'version': None,
+        'omp_threads': None,
+        'runs': [],
+        'errors': [],
+        'total_wall_time': None,
+        'wall_time': None,
+        'launch_time': None,
+        'telemetry': {},
+        'complete': False,
+    }
+
+    run = None
+    in_thermo = False
+    in_timing = False
+    multi = None
+
+    for line in iter_lines(source):
+        stripped = line.strip()
+
+        if in_timing:
+            if not stripped:
+                in_timing = False
+            elif '|' in stripped and not stripped.startswith(('Section', '-')):
+                cells = [c.strip() for c in stripped.split('|')]
+                run['timing'][cells[0]] = {
+                    name: to_float(value) for name, value in zip(TIMING_FIELDS, cells[1:])
+                }
+            continue
+
+        if in_thermo:
+            values = stripped.split()
+            if len(values) == len(run['thermo']['columns']):
+                row = [to_float(v) for v in values]
+                if None not in row:
+                    run['thermo']['rows'].append(row)
+                    continue
+            if stripped.startswith('WARNING'):
+                continue
+            in_thermo = False
+
+        if stripped.startswith('---'):
+            match = THERMO_MULTI_RE.match(stripped)
+            if match:
+                if run is None or run['complete']:
+                    run = new_run(len(log['runs']))
+                    log['runs'].append(run)
+                if multi:
+                    add_thermo_block(run, multi)
+                multi = {'Step': float(match.group(1))}
+                continue
+
+        if multi is not None:
+            fields = THERMO_FIELD_RE.findall(stripped)
+            if fields:
+                multi.update((name, to_float(value)) for name, value in fields)
+                continue
+            add_thermo_block(run, multi)
+            multi = None
+
+        if stripped.startswith('LAMMPS (') and log['version'] is None:
+            log['version'] = stripped[len('LAMMPS ('):].rstrip(')')
+            continue
+
+        if stripped.startswith('ERROR'):
+            log['errors'].append(stripped)
+            continue
+
+        match = OMP_RE.search(stripped)
+        if match:
+            log['omp_threads'] = int(match.group(1))
+            continue
+
+        match = MEMORY_RE.search(stripped)
+        if match:
+            run = new_run(len(log['runs']))
+            log['runs'].append(run)
+            run['memory_mb'] = dict(zip(['min', 'avg', 'max'], map(float, match.groups())))
+            continue
+
+        if stripped.startswith('Step'):
+            if run is None or run['complete']:
+                run = new_run(len(log['runs']))
+                log['runs'].append(run)
+            run['thermo']['columns'] = stripped.split()
+            in_thermo = True
+            continue
+
+        match = LOOP_RE.search(stripped)
+        if match:
+            if run is None or run['complete']:
+                run = new_run(len(log['runs']))
+                log['runs'].append(run)
+            run['loop_time'] = float(match.group(1))
+            run['procs'] = int(match.group(2))
+            run['steps'] = int(match.group(3))
+            run['atoms'] = int(match.group(4))
+            run['complete'] = True
+            continue
+
+        if stripped.startswith('Performance:') and run is not None:
+            run['performance'] = {
+                unit: float(value)
+                for value, unit in PERF_RE.findall(stripped[len('Performance:'):])
+            }
+            continue
+
+        match = CPU_RE.search(stripped)
+        if match and run is not None:
+            run['cpu_use'] = float(match.group(1))
+            run['mpi_tasks'] = int(match.group(2))
+            run['omp_threads'] = int(match.group(3))
+            continue
+
+        if stripped.startswith('MPI task timing breakdown') and run is not None:
+            in_timing = True
+            continue
+
+        match = ADAPTIVE_RE.search(stripped)
+        if match and run is not None:
+            run['nominal_steps'] = int(match.group(1))
+            run['extrapolated_loop_time'] = float(match.group(3))
+            continue
+
+        match = WALL_RE.search(stripped)
+        if match:
+            hours, minutes, seconds = map(int, match.groups())
+            log['total_wall_time'] = hours * 3600 + minutes * 60 + seconds
+            log['complete'] = True
+            continue
+
+        match = LAUNCH_RE.search(stripped)
+        if match:
+            log['wall_time'] = to_float(match.group(1))
+            log['launch_time'] = to_float(match.group(2))
+            continue
+
+        if stripped.startswith(TELEMETRY_PREFIX):
+            log['telemetry'] = parse_telemetry(stripped)
+
+    return log
+
+
+def parse_telemetry(line: str) -> dict:
+    """Result-store fields of a "Telemetry:" summary line ('-' values are left out)."""
+    fields = {}
+    for token in line[len(TELEMETRY_PREFIX):].split():
+        key, _, value = token.partition('=')
+        column = TELEMETRY_FIELDS.get(key)
+        if column == 'telemetry':
+            fields[column] = value
+        elif column and to_float(value) is not None:
+            fields[column] = to_float(value)
+    return fields
+
+
+# ============================================================================
+# Metrics
+# ============================================================================
+
+def run_metrics(run: dict) -> dict:
+    """Flatten a completed run block into result-store metric fields."""
+    perf = run['performance']
+    ts_per_sec = perf.get('timesteps/s')
+
+    atom_steps = None
+    if ts_per_sec and run['atoms']:
+        atom_steps = ts_per_sec * run['atoms']
+    elif 'Matom-step/s' in perf:
+        atom_steps = perf['Matom-step/s'] * 1e6
+    elif 'katom-step/s' in perf:
+        atom_steps = perf['katom-step/s'] * 1e3
+
+    metrics = {
+        'loop_time': run['loop_time'],
+        'loop_time_extrapolated': run.get('extrapolated_loop_time'),
+        'nominal_steps': run.get('nominal_steps'),
+        'timesteps': run['steps'],
+        'atoms': run['atoms'],
+        'memory_mb': run['memory_mb']['max'] if run['memory_mb'] else None,
+        'timesteps_per_sec': ts_per_sec,
+        'ns_per_day': perf.get('ns/day'),
+        'hours_per_ns': perf.get('hours/ns'),
+        'atom_steps_per_sec': atom_steps,
+        'mpi_ranks': run['mpi_tasks'] or run['procs'],
+        'omp_threads': run['omp_threads'],
+    }
+    # Average time over MPI tasks of each timing breakdown section
+    for section, column in TIMING_SECTIONS.items():
+        metrics[column] = run['timing'].get(section, {}).get('avg')
+    metrics.update(thermo_metrics(run['thermo']))
+    return metrics
+
+
+def thermo_metrics(thermo: dict) -> dict:
+    """Final thermo values of a run block and its relative total-energy drift."""
+    metrics = dict.fromkeys([*dict.fromkeys(THERMO_COLUMNS.values()), 'energy_drift'])
+    if not thermo['rows']:
+        return metrics
+    first, last = thermo['rows'][0], thermo['rows'][-1]
+    for idx, name in enumerate(thermo['columns']):
+        column = THERMO_COLUMNS.get(name)
+        if column is None:
+            continue
+        metrics[column] = last[idx]
+        if column == 'thermo_etotal' and first[idx] and last[idx] is not None:
+            metrics['energy_drift'] = (last[idx] - first[idx]) / abs(first[idx])
+    return metrics
+
+
+def startup_times(log: dict) -> dict:
+    """Wall, launch and setup time of a log: setup is everything outside launch and the run loops.
+
+    Wall and launch times come from startup_cost.py; logs of unwrapped runs
+    fall back to LAMMPS' own "Total wall time" (whole seconds, from LAMMPS
+    start, so without launch time).
+    """
+    loops = sum(run['loop_time'] for run in log['runs'] if run['complete'])
+    wall, launch = log['wall_time'], log['launch_time']
+    if wall is None:
+        wall = log['total_wall_time']
+    setup = None
+    if wall is not None:
+        setup = max(wall - (launch or 0.0) - loops, 0.0)
+    return {'wall_time': wall, 'launch_time': launch, 'setup_time': setup}
+
+
+def parse_log_name(filepath: Path) -> dict:
+    """Derive suite, benchmark, replicate, config, binding and trial from a runner log name."""
+    name = Path(filepath).name
+    if name.endswith(WARMUP_SUFFIX):
+        return {}
+
+    trial = 0
+    match = TRIAL_SUFFIX_RE.match(name)
+    if match:
+        name, trial = match.group(1), int(match.group(2))
+    binding = {}
+    match = BINDING_SUFFIX_RE.match(name)
+    if match:
+        name, binding = match.group(1), {'binding': match.group(2)}
+
+    match = SCALING_LOG_RE.match(name)
+    if match:
+        return {'suite': 'scaling', 'benchmark': 'REAXFF',
+                'replicate': match.group(1), 'config': match.group(2), 'trial': trial, **binding}
+    match = MEMORY_LOG_RE.match(name)
+    if match:
+        return {'suite': 'memory', 'benchmark': 'REAXFF',
+                'replicate': match.group(1), 'config': match.group(2), 'trial': trial, **binding}
+    match = SIZE_LOG_RE.match(name)
+    if match:
+        return {'suite': 'size', 'benchmark': match.group(1).upper(),
+                'replicate': match.group(2), 'config': match.group(3), 'trial': trial, **binding}
+    match = ENSEMBLE_LOG_RE.match(name)
+    if match:
+        return {'suite': 'ensemble', 'benchmark': match.group(1).upper(), 'replicate': '',
+                'config': match.group(3), 'copies': int(match.group(2)), 'copy_index': int(match.group(4)),
+                'co_runners': int(match.group(2)) - 1, 'trial': trial, **binding}
+    match = OFFICIAL_LOG_RE.match(name)
+    if match:
+        return {'suite': 'official', 'benchmark': match.group(1).upper(),
+                'replicate': '', 'config': match.group(2), 'trial': trial, **binding}
+    return {}
+
+
+def log_rows(filepath: Path, log: dict = None, **tags) -> list[dict]:
+    """Build one result-store row per completed run block of a log file."""
+    filepath = Path(filepath).resolve()
+    if log is None:
+        log = parse_log(filepath)
+
+    base = parse_log_name(filepath)
+    base.update({key: value for key, value in tags.items() if value is not None})
+    # The log mtime identifies the run, so re-ingesting a log never duplicates it
+    base.setdefault('date', datetime.fromtimestamp(filepath.stat().st_mtime).isoformat(timespec='seconds'))
+    base.setdefault('source', str(filepath))
+
+    rows = []
+    startup = startup_times(log)
+    for run in log['runs']:
+        if not run['complete']:
+            continue
+        row = dict(base, **startup, **log['telemetry'])
+        metrics = run_metrics(run)
+        if row.get('omp_threads') is not None:
+            metrics.pop('omp_threads')
+        row.update(metrics)
+        row['run_index'] = run['index']
+        rows.append(row)
+    return rows
+
+
+def format_env(logs: list[dict]) -> str:
+    """Format the measured (last completed) run as KEY=VALUE lines for bash.
+
+    With several trial logs the trial with the median loop time is reported,
+    together with the trial count and the loop time range. For adaptive runs
+    LOOP_TIME is the loop time extrapolated to the nominal step count.
+    """
+    measured = []
+    for log in logs:
+        completed = [run for run in log['runs'] if run['complete']]
+        if completed:
+            metrics = run_metrics(completed[-1])
+            metrics['loop_time_measured'] = metrics['loop_time']
+            metrics['rank_rss_mb'] = log['telemetry'].get('rank_rss_mb')
+            if metrics['loop_time_extrapolated'] is not None:
+                metrics['loop_time'] = metrics['loop_time_extrapolated']
+            measured.append((metrics, len(completed)))
+    if not measured:
+        errors = [error for log in logs for error in log['errors']]
+        reason = errors[-1] if errors else "No timing data found"
+        return f"ERROR={reason}"
+
+    measured.sort(key=lambda item: item[0]['loop_time'])
+    metrics, runs = measured[(len(measured) - 1) // 2]
+    atom_steps = metrics['atom_steps_per_sec']
+    values = {
+        'LOOP_TIME': metrics['loop_time'],
+        'TIMESTEPS': metrics['timesteps'],
+        'ATOMS': metrics['atoms'],
+        'TIMESTEP_PER_SEC': metrics['timesteps_per_sec'],
+        'NS_PER_DAY': metrics['ns_per_day'],
+        'HOURS_PER_NS': metrics['hours_per_ns'],
+        'ATOM_STEPS_SEC': int(atom_steps) if atom_steps is not None else None,
+        'RUNS': runs,
+        'STEPS_RUN': metrics['timesteps'] if metrics['nominal_steps'] else None,
+        'LOOP_TIME_MEASURED': metrics['loop_time_measured'] if metrics['nominal_steps'] else None,
+        'MEASURED_TRIALS': len(measured),
+        'LOOP_TIME_MIN': measured[0][0]['loop_time'],
+        'LOOP_TIME_MAX': measured[-1][0]['loop_time'],
+        'MEMORY_MB': metrics['memory_mb'],
+        'RANK_RSS_MB': metrics['rank_rss_mb'],
+    }
+    return '\n'.join(f"{key}={'-' if value is None else value}" for key, value in values.items())
+
+
+# ============================================================================
+# Main
+# ============================================================================
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="LAMMPS log parser")
+    sub = parser.add_subparsers(dest='action', required=True)
+
+    show = sub.add_parser('show', help="print all run blocks as JSON")
+    show.add_argument('logfile', type=Path)
+
+    metrics = sub.add_parser('metrics', help="print KEY=VALUE metrics, optionally record runs")
+    metrics.add_argument('logfiles', type=Path, nargs='+', help="log of each trial")
+    metrics.add_argument('--store', type=Path, help="append every run block to this result store")
+    metrics.add_argument('--suite')
+    metrics.add_argument('--benchmark')
+    metrics.add_argument('--config')
+    metrics.add_argument('--command')
+    metrics.add_argument('--omp', type=int)
+    metrics.add_argument('--replicate')
+    metrics.add_argument('--binding', help="binding policy of the run (binding.py)")
+
+    args = parser.parse_args(argv)
+
+    if args.action == 'show':
+        if not args.logfile.exists():
+            print("ERROR=Log file not found")
+            return 0
+        print(json.dumps(parse_log(args.logfile), indent=2))
+        return 0
+
+    # Trials whose run failed leave no log; the others are still reported
+    logfiles = [path for path in args.logfiles if path.exists()]
+    if not logfiles:
+        print("ERROR=Log file not found")
+        return 0
+
+    logs = [parse_log(path) for path in logfiles]
+    print(format_env(logs))
+
+    if args.store:
+        from result_store import append_runs
+
+        rows = []
+        for path, log in zip(logfiles, logs):
+            rows += log_rows(path, log, suite=args.suite, benchmark=args.benchmark,
+                             config=args.config, command=args.command,
+                             omp_threads=args.omp, replicate=args.replicate, binding=args.binding)
+        try:
+            append_runs(args.store, rows)
+        except Exception as exc:
+            print(f"Could not record result in {args.store}: {exc}", file=sys.stderr)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
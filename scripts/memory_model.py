@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Memory Footprint Model and Max-Atoms Predictor
+
+Fits the memory of a run as a fixed cost per MPI rank plus a cost per atom,
+per potential (benchmark), binary and accelerator:
+
+  M(N, R) = a·R + b·N
+
+M is the node-wide footprint of all ranks (MB), N the atom count and R the
+MPI rank count. a covers the binary, MPI buffers and per-rank tables; b the
+per-atom arrays, neighbor lists and ghost atoms (ReaxFF bond lists and QEq
+matrices grow with N). Three measures are fitted when present:
+
+  rss     peak resident memory of all ranks (telemetry.py); with only the
+          per-rank peak, R × the largest rank (an upper bound)
+  lammps  LAMMPS "Per MPI rank memory allocation" max × R (excludes MPI and
+          library buffers, so it underestimates what the OOM killer sees)
+  gpu     peak memory in use on the GPU (nvidia-smi via telemetry.py)
+
+Inverting the fit gives the largest system that fits a node (or a GPU) for
+every rank count: N_max = (capacity × safety − a·R) / b, and for replicated
+inputs the largest n × n × n replicate. Fits need at least two tested sizes;
+the memory-scaling mode of the scaling runners (MEMORY_SCALING=1) measures
+larger replicates than the timing sweep so the fit does not have to
+extrapolate far.
+
+Usage:
+  memory_model.py --store mirae_server/results.db --benchmark REAXFF
+  memory_model.py --store local_desktop/results.db --gpu-mem 10 --ranks 1,4
+  memory_model.py --store mirae_server/results.db --node-mem 256 --safety 0.8
+"""
+
+import argparse
+import math
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from trial_stats import latest_trials
+
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+MEASURES = ['rss', 'lammps', 'gpu']
+
+# Share of the capacity a production run may plan to use
+SAFETY = 0.9
+
+GROUP_KEYS = ['benchmark', 'binary', 'accelerator']
+
+
+# ============================================================================
+# Points and Fits
+# ============================================================================
+
+def node_memory_mb() -> float:
+    """Physical memory of this machine (MB) from /proc/meminfo, None if unavailable."""
+    try:
+        with open('/proc/meminfo') as handle:
+            for line in handle:
+                if line.startswith('MemTotal:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def memory_points(runs: pd.DataFrame) -> pd.DataFrame:
+    """Latest trial of every configuration with its node-wide footprint under each measure."""
+    keys = ['suite', 'benchmark', 'binary', 'replicate', 'config']
+    runs = latest_trials(runs, keys).dropna(subset=['atoms', 'mpi_ranks'])
+    ranks = runs['mpi_ranks'].astype(float)
+    points = runs[[*keys, 'accelerator', 'atoms', 'mpi_ranks']].copy()
+    points['accelerator'] = points['accelerator'].fillna('none')
+    points['rss'] = runs['rss_mb'].fillna(runs['rank_rss_mb'] * ranks)
+    points['lammps'] = runs['memory_mb'] * ranks
+    points['gpu'] = runs['gpu_mem_mb']
+    # One point per configuration and size: the largest footprint over trials
+    return (points.groupby([*keys, 'accelerator'], observed=True)
+            .agg({'atoms': 'first', 'mpi_ranks': 'first', **{m: 'max' for m in MEASURES}})
+            .reset_index())
+
+
+def fit_memory(points: pd.DataFrame) -> dict:
+    """Fit M = a·R + b·N to one group and measure. Returns None without two tested sizes."""
+    points = points.dropna()
+    if points['atoms'].nunique() < 2:
+        return None
+    ranks, atoms, memory = (points[col].to_numpy(dtype=float) for col in ['mpi_ranks', 'atoms', 'memory'])
+    X = np.column_stack([ranks, atoms])
+    (per_rank, per_atom), *_ = np.linalg.lstsq(X, memory, rcond=None)
+    if per_atom <= 0:
+        return None
+    fitted = X @ np.array([per_rank, per_atom])
+    total = np.sum((memory - memory.mean()) ** 2)
+    return {
+        'per_rank': float(max(per_rank, 0.0)),
+        'per_atom': float(per_atom),
+        'r2': float(1 - np.sum((memory - fitted) ** 2) / total) if total > 0 else math.nan,
+        'points': len(memory),
+        'max_atoms_tested': float(atoms.max()),
+        'ranks': sorted(int(r) for r in np.unique(ranks)),
+    }
+
+
+def memory_fits(points: pd.DataFrame) -> dict:
+    """Fits keyed by (benchmark, binary, accelerator, measure)."""
+    fits = {}
+    for key, group in points.groupby(GROUP_KEYS, observed=True):
+        for measure in MEASURES:
+            fit = fit_memory(group[['mpi_ranks', 'atoms']].assign(memory=group[measure]))
+            if fit is not None:
+                fits[(*key, measure)] = fit
+    return fits
+
+
+def max_atoms(fit: dict, ranks: int, capacity_mb: float, safety: float = SAFETY) -> float:
+    """Largest atom count whose predicted footprint fits the capacity (0 if the ranks alone do not fit)."""
+    return max((capacity_mb * safety - fit['per_rank'] * ranks) / fit['per_atom'], 0.0)
+
+
+def atoms_per_cell(runs: pd.DataFrame, benchmark: str) -> float:
+    """Atoms per replicated unit cell of a benchmark (None if it was never replicated)."""
+    tested = runs[(runs['benchmark'] == benchmark) & runs['replicate'].str.fullmatch(r'\d+x\d+x\d+', na=False)]
+    tested = tested.dropna(subset=['atoms'])
+    if tested.empty:
+        return None
+    cells = tested['replicate'].map(lambda rep: np.prod([int(dim) for dim in rep.split('x')]))
+    return float((tested['atoms'] / cells).median())
+
+
+# ============================================================================
+# Report
+# ============================================================================
+
+def memory_table(fits: dict, capacities: dict, rank_counts: list[int] = None, cell_atoms: dict = None,
+                 safety: float = SAFETY) -> list[str]:
+    """Markdown table of fitted costs and the largest system per rank count.
+
+    capacities maps 'node' and 'gpu' to MB; cell_atoms maps a benchmark to its
+    atoms per replicated cell.
+    """
+    lines = [
+        "| Benchmark | Binary | Accel | Measure | MB/rank | KB/atom | R² | Points | Ranks | Max atoms | "
+        "Largest replicate |",
+        "|-----------|--------|-------|---------|---------|---------|----|--------|-------|-----------|"
+        "-------------------|",
+    ]
+    beyond = False
+    for (bench, binary, accel, measure), fit in fits.items():
+        capacity = capacities.get('gpu' if measure == 'gpu' else 'node')
+        for ranks in rank_counts or fit['ranks']:
+            largest = max_atoms(fit, ranks, capacity, safety) if capacity else None
+            replicate = '-'
+            cell = (cell_atoms or {}).get(bench)
+            if largest and cell:
+                n = int((largest / cell) ** (1 / 3))
+                replicate = f"{n}x{n}x{n}" if n else '-'
+            mark = ''
+            if largest and largest > 4 * fit['max_atoms_tested']:
+                mark, beyond = ' †', True
+            lines.append(
+                f"| {bench} | {binary} | {accel} | {measure} | {fit['per_rank']:.1f} | "
+                f"{fit['per_atom'] * 1024:.2f} | {fit['r2']:.3f} | {fit['points']} | {ranks} | "
+                f"{'-' if largest is None else f'{largest:,.0f}'}{mark} | {replicate} |")
+
+    lines.append("")
+    lines.append(f"Max atoms: largest system whose predicted footprint is ≤ {safety:.0%} of "
+                 + ", ".join(f"{name} memory ({mb / 1024:,.1f} GB)" for name, mb in capacities.items() if mb)
+                 + ".")
+    if beyond:
+        lines.append("† more than 4× the largest tested size; measure closer to it (MEMORY_SCALING=1) "
+                     "before relying on it.")
+    return lines
+
+
+# ============================================================================
+# Main
+# ============================================================================
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Memory footprint fits and max-atoms prediction")
+    parser.add_argument('--store', type=Path, required=True)
+    parser.add_argument('--suite', help="official, scaling or memory (default: all)")
+    parser.add_argument('--benchmark', help="LJ, EAM, CHAIN, RHODO or REAXFF")
+    parser.add_argument('--binary')
+    parser.add_argument('--measure', choices=MEASURES, action='append', help="restrict to a measure (repeatable)")
+    parser.add_argument('--node-mem', type=float, help="node memory in GB (default: this machine's)")
+    parser.add_argument('--gpu-mem', type=float, help="GPU memory in GB, e.g. 10 for an RTX 3080")
+    parser.add_argument('--ranks', help="rank counts to predict for (default: the tested ones)")
+    parser.add_argument('--safety', type=float, default=SAFETY, help="usable share of the capacity")
+    args = parser.parse_args(argv)
+
+    from result_store import load_runs
+
+    filters = {}
+    if args.suite:
+        filters['suite'] = args.suite
+    if args.benchmark:
+        filters['benchmark'] = args.benchmark.upper()
+    if args.binary:
+        filters['binary'] = args.binary
+    runs = load_runs(args.store, **filters)
+
+    fits = memory_fits(memory_points(runs))
+    if args.measure:
+        fits = {key: fit for key, fit in fits.items() if key[-1] in args.measure}
+    if not fits:
+        print("No group with memory data at two or more sizes (run the scaling suite with MEMORY_SCALING=1)")
+        return 1
+
+    capacities = {
+        'node': args.node_mem * 1024 if args.node_mem else node_memory_mb(),
+        'gpu': args.gpu_mem * 1024 if args.gpu_mem else None,
+    }
+    rank_counts = [int(r) for r in args.ranks.split(',')] if args.ranks else None
+    cell_atoms = {bench: atoms_per_cell(runs, bench) for bench in {key[0] for key in fits}}
+
+    print("\n### Memory Footprint (M = MB/rank × ranks + KB/atom × atoms) and Largest System\n")
+    print("\n".join(memory_table(fits, capacities, rank_counts, cell_atoms, args.safety)))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Per-Phase Timing Breakdown
+
+Turns the per-section times of the LAMMPS "MPI task timing breakdown"
+(Pair, Bond, Kspace, Neigh, Comm, Output, Modify, Other; stored per run by
+lammps_log.py) into phase fractions per configuration, draws them as stacked
+bars, and flags configurations where communication or fixes (Modify, e.g.
+ReaxFF QEq) take more time than the force computation itself, i.e. where
+adding ranks stops paying off.
+
+Usage:
+  phase_breakdown.py --store mirae_server/results.db --benchmark RHODO
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from lammps_log import TIMING_SECTIONS
+
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+PHASES = list(TIMING_SECTIONS)
+PHASE_COLUMNS = list(TIMING_SECTIONS.values())
+FRACTION_COLUMNS = [f"{phase.lower()}_frac" for phase in PHASES]
+
+PHASE_COLORS = {
+    'Pair': '#3498db',
+    'Bond': '#1abc9c',
+    'Kspace': '#9b59b6',
+    'Neigh': '#f1c40f',
+    'Comm': '#e74c3c',
+    'Output': '#95a5a6',
+    'Modify': '#e67e22',
+    'Other': '#34495e',
+}
+
+# Phases whose dominance means parallel overhead rather than useful work
+OVERHEAD_PHASES = ['Comm', 'Modify']
+
+# An overhead phase is also flagged above this fraction of the loop
+DOMINANCE_FRACTION = 0.4
+
+
+# ============================================================================
+# Fractions
+# ============================================================================
+
+def phase_fractions(runs: pd.DataFrame, keys: list[str]) -> pd.DataFrame:
+    """Median time of each phase over the trials of a group, as fractions of their sum.
+
+    Groups without a timing breakdown (markdown-only results) are left out.
+    """
+    columns = [column for column in PHASE_COLUMNS if column in runs]
+    timed = runs.dropna(subset=columns, how='all')
+    if timed.empty:
+        return pd.DataFrame(columns=[*keys, *FRACTION_COLUMNS])
+
+    medians = timed.groupby(keys, sort=False, observed=True)[columns].median()
+    medians = medians.reindex(columns=PHASE_COLUMNS).fillna(0.0)
+    totals = medians.sum(axis=1)
+    fractions = medians.div(totals.where(totals > 0), axis=0)
+    fractions.columns = FRACTION_COLUMNS
+    return fractions.dropna(how='all').reset_index()
+
+
+def has_phases(record: dict) -> bool:
+    """Whether a configuration record carries phase fractions."""
+    return all(column in record for column in FRACTION_COLUMNS) and not np.isnan(record[FRACTION_COLUMNS[0]])
+
+
+def dominant_phase(record: dict) -> str:
+    """Phase with the largest fraction."""
+    return max(PHASES, key=lambda phase: record[f"{phase.lower()}_frac"])
+
+
+def overhead_flag(record: dict) -> str:
+    """Overhead phase that dominates the configuration, or '' if none does."""
+    dominant = dominant_phase(record)
+    if dominant in OVERHEAD_PHASES:
+        return dominant
+    for phase in OVERHEAD_PHASES:
+        if record[f"{phase.lower()}_frac"] >= DOMINANCE_FRACTION:
+            return phase
+    return ''
+
+
+# ============================================================================
+# Output
+# ============================================================================
+
+def active_phases(records: list[dict]) -> list[str]:
+    """Phases with time in at least one record."""
+    return [phase for phase in PHASES if any(record[f"{phase.lower()}_frac"] > 0 for record in records)]
+
+
+def plot_phase_bars(ax, labels: list[str], records: list[dict], legend: bool = True):
+    """Stacked bars of the phase fractions of each record."""
+    x = np.arange(len(records))
+    bottom = np.zeros(len(records))
+    for phase in active_phases(records):
+        values = np.array([record[f"{phase.lower()}_frac"] for record in records])
+        ax.bar(x, values * 100, 0.7, bottom=bottom * 100, label=phase,
+               color=PHASE_COLORS[phase], edgecolor='black', linewidth=0.5)
+        bottom += values
+
+    # Mark configurations dominated by communication or fixes
+    for idx, record in enumerate(records):
+        flag = overhead_flag(record)
+        if flag:
+            ax.annotate(flag, xy=(idx, 100), xytext=(0, 3), textcoords="offset points",
+                        ha='center', fontsize=7, fontweight='bold', color=PHASE_COLORS[flag])
+
+    ax.set_xticks(x)
+    ax.set_xticklabels(labels, fontsize=8, rotation=45, ha='right')
+    ax.set_ylim(0, 110)
+    ax.set_ylabel('Share of Loop Time (%)', fontsize=10)
+    ax.grid(axis='y', alpha=0.3)
+    if legend:
+        ax.legend(fontsize=7, loc='lower right', ncol=2, framealpha=0.9)
+
+
+def phase_table(rows: list[tuple]) -> list[str]:
+    """Markdown table of phase fractions; rows are (group, config label, record)."""
+    phases = active_phases([record for _, _, record in rows])
+    lines = [
+        "| Benchmark | Config | " + " | ".join(f"{phase} %" for phase in phases) + " | Dominant |",
+        "|-----------|--------|" + "|".join('-' * (len(phase) + 4) for phase in phases) + "|----------|",
+    ]
+    flagged = []
+    for group, label, record in rows:
+        cells = " | ".join(f"{record[f'{phase.lower()}_frac'] * 100:.1f}" for phase in phases)
+        flag = overhead_flag(record)
+        dominant = f"**{flag}** ⚠" if flag else dominant_phase(record)
+        if flag:
+            flagged.append(f"{group} {label}")
+        lines.append(f"| {group} | {label} | {cells} | {dominant} |")
+
+    lines.append("")
+    if flagged:
+        lines.append(f"⚠ {' / '.join(OVERHEAD_PHASES)} dominates (largest phase or ≥ "
+                     f"{DOMINANCE_FRACTION:.0%} of the loop): " + "; ".join(flagged))
+    else:
+        lines.append(f"No configuration is dominated by {' or '.join(OVERHEAD_PHASES)}.")
+    return lines
+
+
+# ============================================================================
+# Main
+# ============================================================================
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Per-phase timing breakdown from the result store")
+    parser.add_argument('--store', type=Path, required=True)
+    parser.add_argument('--suite', default='official')
+    parser.add_argument('--benchmark', help="restrict to one benchmark (LJ, EAM, CHAIN, RHODO, REAXFF)")
+    args = parser.parse_args(argv)
+
+    from result_store import load_runs
+    from trial_stats import latest_trials
+
+    filters = {'suite': args.suite}
+    if args.benchmark:
+        filters['benchmark'] = args.benchmark.upper()
+    runs = load_runs(args.store, **filters)
+
+    keys = ['benchmark', 'replicate', 'config']
+    runs = latest_trials(runs, keys)
+    fractions = phase_fractions(runs, keys)
+    if fractions.empty:
+        print("No timing breakdown in the store (ingest LAMMPS logs first)")
+        return 1
+
+    ranks = runs.groupby(keys, observed=True)['mpi_ranks'].first()
+    fractions = fractions.join(ranks, on=keys).sort_values(['benchmark', 'replicate', 'mpi_ranks', 'config'])
+    rows = [(f"{rec['benchmark']} {rec['replicate']}".strip(), rec['config'], rec)
+            for rec in fractions.to_dict('records')]
+    print("\n".join(phase_table(rows)))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
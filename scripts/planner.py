@@ -0,0 +1,421 @@
+#!/usr/bin/env python3
+"""
+Production Job Planner: Wall Time and Configuration for a Workload
+
+Answers "how long will 500k atoms of ReaxFF for 1 ns take, and with what
+flags?" from the result store instead of reading the tables by hand. The
+runs of the potential's benchmark (official, scaling, memory and size suites)
+are normalized to time per step and fitted per binary, device, accelerator
+(-sf suffix) and decomposition with the scaling law of scaling_model.py:
+
+  t_step(N, p) = s + w·N / p + k·(p − 1)
+
+Every MPI ranks × OpenMP threads layout of that decomposition family which
+fits the available hardware is a candidate (one node, or whole nodes filled
+the same way as fanout.py's multi-node jobs; GPU binaries only with --gpu
+and on one node). The predicted wall time of a candidate is
+
+  wall = launch + setup + steps × t_step(N, p)
+
+with the fixed overhead measured by startup_cost.py (0 where it was not
+recorded). A family tested at one size only is scaled linearly in atoms, and
+candidates whose predicted footprint exceeds node memory (memory_model.py,
+peak RSS) are left out. The planner prints the fastest and the most
+core-hour-efficient candidate as runner-style command lines with a bootstrap
+prediction interval, and an SGE `h_rt` of the upper bound plus a safety
+margin, rounded up to the next 15 minutes. Candidates predicted to run
+longer than --max-hours (default: a one-week queue limit) are left out, and a
+picked plan whose h_rt would still exceed it gets no submit line.
+
+Usage:
+  planner.py plan --store mirae_server/results.db --potential reaxff --atoms 500000 --ns 1 --cores 48 --nodes 4
+  planner.py plan --store local_desktop/results.db --potential lj --atoms 4000000 --steps 100000 --cores 16 --gpu
+"""
+
+import argparse
+import math
+import shlex
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from bench_config import LAUNCHER_VALUE_OPTIONS, MPI_LAUNCHERS, PER_NODE_OPTIONS, is_rank_option, is_thread_option
+from fanout import CORES_PER_NODE, scale_command
+from memory_model import SAFETY, max_atoms, memory_fits, memory_points, node_memory_mb
+from scaling_model import DEVICE_ACCELERATORS, can_predict, design, fit_series, predict, scaling_series
+from startup_cost import startup_costs
+from trial_stats import CONFIDENCE, nominal_loop_times
+
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+# Potential family -> benchmark that measures it
+POTENTIALS = {
+    'lj': 'LJ',
+    'eam': 'EAM',
+    'chain': 'CHAIN',
+    'rhodo': 'RHODO',
+    'reaxff': 'REAXFF',
+}
+
+# Timestep of each benchmark input in fs (LJ and CHAIN use reduced units: --steps only)
+TIMESTEP_FS = {
+    'EAM': 5.0,
+    'RHODO': 2.0,
+    'REAXFF': 0.1,
+}
+
+BENCHMARK_INPUTS = {
+    'LJ': 'in.lj',
+    'EAM': 'in.eam',
+    'CHAIN': 'in.chain',
+    'RHODO': 'in.rhodo',
+    'REAXFF': 'in.reaxff',
+}
+
+# Suites measuring one job alone on its cores (ensembles share the node, in-process runs skip startup)
+PLAN_SUITES = ['official', 'scaling', 'memory', 'size']
+
+# h_rt: upper bound of the prediction interval times this margin, rounded up to H_RT_ROUND seconds
+H_RT_MARGIN = 1.25
+H_RT_ROUND = 15 * 60
+
+# Longest job the queue accepts, in hours (--max-hours)
+DEFAULT_MAX_HOURS = 7 * 24
+
+# Beyond this multiple of the largest tested size the prediction is flagged
+EXTRAPOLATION_LIMIT = 4
+
+DEFAULT_PE = 'mpi_48'
+
+
+# ============================================================================
+# Cost Models
+# ============================================================================
+
+def workload_steps(benchmark: str, steps: int = None, ns: float = None, timestep_fs: float = None) -> int:
+    """Timestep count of the workload, from --steps or from simulated time and the timestep."""
+    if steps:
+        return steps
+    timestep = timestep_fs or TIMESTEP_FS.get(benchmark)
+    if timestep is None:
+        raise ValueError(f"{benchmark} uses reduced units: give --steps (or --timestep in fs)")
+    return math.ceil(ns * 1e6 / timestep)
+
+
+def per_step_runs(runs: pd.DataFrame) -> pd.DataFrame:
+    """Single-job runs with loop_time replaced by the time per step (adaptive runs at their nominal length)."""
+    alone = runs['suite'].isin(PLAN_SUITES) & (runs['co_runners'].fillna(0) == 0)
+    runs = nominal_loop_times(runs[alone])
+    steps = runs['nominal_steps'].fillna(runs['timesteps']).astype(float)
+    runs = runs.assign(loop_time=runs['loop_time'] / steps.where(steps > 0))
+    # One fit per binary, device, accelerator and decomposition over all suites
+    return runs.drop(columns='loop_time_extrapolated').assign(suite='plan')
+
+
+def family_key(record: dict) -> tuple:
+    """(binary, device, threads, accelerator) of a run, matching the planner's fits."""
+    accelerator = 'none' if pd.isna(record['accelerator']) else record['accelerator']
+    device = 'gpu' if accelerator in DEVICE_ACCELERATORS else 'cpu'
+    threads = 1 if pd.isna(record['omp_threads']) else int(record['omp_threads'])
+    return record['binary'], device, threads, accelerator
+
+
+def family_fits(runs: pd.DataFrame) -> dict:
+    """Scaling fits keyed like scaling_model series plus the accelerator.
+
+    Plain and suffixed (-sf omp, -sf opt) runs of one binary are separate
+    families, so a plan keeps the flags of the runs it was fitted on. The
+    plain serial runs anchor (p = 1) the CPU families of every accelerator.
+    """
+    accelerators = runs['accelerator'].astype('string').fillna('none')
+    serial = (accelerators == 'none') & (runs['mpi_ranks'] == 1) & (runs['omp_threads'].fillna(1) == 1)
+    fits = {}
+    for accelerator in sorted(set(accelerators)):
+        group = runs[(accelerators == accelerator) | (serial & (accelerator not in DEVICE_ACCELERATORS))]
+        for key, points in scaling_series(group).items():
+            fit = fit_series(points)
+            if fit is not None:
+                fit['threads'] = 1 if key[-1] == 'MPI only' else int(key[-1].split()[2])
+                fits[(*key, accelerator)] = fit
+    return fits
+
+
+def family_templates(runs: pd.DataFrame) -> dict:
+    """Most recent command of every (binary, device, threads, accelerator) family."""
+    templates = {}
+    for record in runs.dropna(subset=['command']).sort_values('date', kind='stable').to_dict('records'):
+        templates[family_key(record)] = record['command']
+    return templates
+
+
+def family_overheads(runs: pd.DataFrame) -> dict:
+    """Median launch + setup time over the configurations of every family (tested sizes)."""
+    runs = runs.dropna(subset=['loop_time']).assign(accelerator=runs['accelerator'].fillna('none'),
+                                                    omp_threads=runs['omp_threads'].fillna(1))
+    costs = startup_costs(runs, ['binary', 'config', 'accelerator', 'omp_threads'])
+    overheads = {}
+    for record in costs.to_dict('records'):
+        overheads.setdefault(family_key(record), []).append(record['overhead_time'])
+    return {key: float(np.median(values)) for key, values in overheads.items()}
+
+
+def predict_step(fit: dict, atoms: float, cores: float, interval: bool = False) -> tuple:
+    """Time per step and its prediction interval at (atoms, cores), or None if the fit cannot reach it.
+
+    A fit from a single size is scaled linearly in atoms. Returns
+    (estimate, low, high, linear); low and high are None unless interval is set
+    and the fit has residual degrees of freedom.
+    """
+    linear = atoms not in fit['sizes'] and len(fit['sizes']) < 2
+    size = fit['sizes'][0] if linear else atoms
+    if not can_predict(fit, size, cores):
+        return None
+    scale = atoms / size
+    if interval:
+        estimate, low, high = predict(fit, size, cores)
+    else:
+        coef = np.array([fit['params'][term] for term in fit['terms']])
+        estimate = float(design([size], [cores], fit['terms'])[0] @ coef)
+        low = high = None
+    if estimate <= 0:
+        return None
+    bounds = [None if bound is None else bound * scale for bound in (low, high)]
+    return estimate * scale, *bounds, linear
+
+
+# ============================================================================
+# Candidates
+# ============================================================================
+
+def plan_command(template: str, ranks_per_node: int, threads: int, nodes: int = 1) -> str:
+    """A family's command with another ranks × threads layout, spread over `nodes` nodes, ending in -in."""
+    tokens = shlex.split(template)
+    launcher, idx = ['mpirun'], 0
+    if tokens and Path(tokens[0]).name in MPI_LAUNCHERS:
+        launcher, idx = tokens[:1], 1
+        while idx < len(tokens) and tokens[idx].startswith('-'):
+            option = tokens[idx].partition('=')[0]
+            width = 2 if option in LAUNCHER_VALUE_OPTIONS and '=' not in tokens[idx] else 1
+            if not (is_rank_option(tokens[0], option) or is_thread_option(tokens[0], option)
+                    or option in PER_NODE_OPTIONS):
+                launcher += tokens[idx:idx + width]
+            idx += width
+    lammps = tokens[idx:]
+    for i, tok in enumerate(lammps[:-2]):
+        if tok in ('-pk', '-package') and lammps[i + 1] == 'omp':
+            lammps[i + 2] = str(threads)
+        elif tok in ('-k', '-kokkos') and lammps[i + 1] == 'on' and 't' in lammps[i + 2:i + 5]:
+            t_idx = i + 2 + lammps[i + 2:i + 5].index('t')
+            if t_idx + 1 < len(lammps):
+                lammps[t_idx + 1] = str(threads)
+    if '-in' in lammps:
+        lammps = lammps[:lammps.index('-in')]
+    lammps.append('-in')
+
+    if ranks_per_node == 1 and nodes == 1:
+        return shlex.join(lammps)
+    if Path(launcher[0]).name == 'srun':
+        layout = ['-n', str(ranks_per_node), '-c', str(threads)]
+    else:
+        layout = ['-np', str(ranks_per_node)]
+    command = shlex.join([launcher[0], *layout, *launcher[1:], *lammps])
+    return scale_command(command, nodes) if nodes > 1 else command
+
+
+def candidate_layouts(device: str, threads: int, cores: int, nodes: int, gpu: bool) -> list[tuple]:
+    """(ranks per node, nodes) layouts of one family: any rank count on one node, full nodes beyond it."""
+    if device == 'gpu' and not gpu:
+        return []
+    layouts = [(ranks, 1) for ranks in range(1, cores // threads + 1)]
+    if device == 'cpu' and cores % threads == 0:
+        layouts += [(cores // threads, count) for count in range(2, nodes + 1)]
+    return layouts
+
+
+def plan_candidates(fits: dict, templates: dict, overheads: dict, atoms: float, steps: int,
+                    cores: int, nodes: int = 1, gpu: bool = False, memory: dict = None,
+                    node_mem_mb: float = None) -> pd.DataFrame:
+    """Predicted wall time and core-hours of every layout of every fitted family.
+
+    fits are keyed like family_fits, memory like memory_model fits;
+    candidates predicted not to fit node memory are dropped.
+    """
+    columns = ['binary', 'device', 'threads', 'accelerator', 'ranks', 'nodes', 'cores', 'step_time', 'overhead',
+               'wall_time', 'core_hours', 'linear', 'command']
+    records = []
+    for (_, bench, binary, device, _, accelerator), fit in fits.items():
+        threads = int(fit['threads'])
+        family = (binary, device, threads, accelerator)
+        template = templates.get(family)
+        if template is None:
+            continue
+        memory_fit = (memory or {}).get((bench, binary, accelerator, 'rss'))
+        for ranks_per_node, count in candidate_layouts(device, threads, cores, nodes, gpu):
+            ranks = ranks_per_node * count
+            used = ranks * threads
+            if memory_fit and node_mem_mb and atoms > max_atoms(memory_fit, ranks, node_mem_mb * count, SAFETY):
+                continue
+            step = predict_step(fit, atoms, used)
+            if step is None:
+                continue
+            overhead = overheads.get(family, 0.0)
+            wall = overhead + steps * step[0]
+            records.append({
+                'binary': binary, 'device': device, 'threads': threads, 'accelerator': accelerator,
+                'ranks': ranks, 'nodes': count, 'cores': used, 'step_time': step[0], 'overhead': overhead,
+                'wall_time': wall, 'core_hours': wall * used / 3600, 'linear': step[3],
+                'command': plan_command(template, ranks_per_node, threads, count),
+            })
+    return pd.DataFrame(records, columns=columns)
+
+
+def pick_plans(candidates: pd.DataFrame, max_hours: float = None) -> dict:
+    """Fastest and most core-hour-efficient candidate (within --max-hours when given)."""
+    if max_hours:
+        candidates = candidates[candidates['wall_time'] <= max_hours * 3600]
+    if candidates.empty:
+        return {}
+    fastest = candidates.sort_values(['wall_time', 'cores'], kind='stable').iloc[0]
+    efficient = candidates.sort_values(['core_hours', 'wall_time'], kind='stable').iloc[0]
+    return {'Fastest': fastest.to_dict(), 'Most efficient': efficient.to_dict()}
+
+
+# ============================================================================
+# Output
+# ============================================================================
+
+def format_duration(seconds: float) -> str:
+    """HH:MM:SS, as SGE's h_rt expects."""
+    seconds = int(math.ceil(seconds))
+    return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+def h_rt_seconds(seconds: float) -> int:
+    """Suggested h_rt in seconds: the time with the safety margin, rounded up to the next H_RT_ROUND."""
+    return math.ceil(seconds * H_RT_MARGIN / H_RT_ROUND) * H_RT_ROUND
+
+
+def plan_lines(plans: dict, fits: dict, atoms: float, steps: int, input_file: str,
+               pe: str = DEFAULT_PE, cores_per_node: int = CORES_PER_NODE,
+               max_hours: float = DEFAULT_MAX_HOURS) -> list[str]:
+    """Markdown summary of the picked plans with intervals, runner configs and scheduler settings."""
+    by_family = {(binary, device, fit['threads'], accelerator): fit
+                 for (_, _, binary, device, _, accelerator), fit in fits.items()}
+    lines = [f"| Plan | Command | Cores | Nodes | Wall time | {CONFIDENCE:.0%} PI | Core-hours | h_rt |",
+             "|------|---------|-------|-------|-----------|--------|------------|------|"]
+    submit, notes = [], set()
+    for label, plan in plans.items():
+        fit = by_family[(plan['binary'], plan['device'], plan['threads'], plan['accelerator'])]
+        estimate, low, high, linear = predict_step(fit, atoms, plan['cores'], interval=True)
+        wall = plan['overhead'] + steps * estimate
+        if low is None:
+            interval, upper = "exact fit", wall
+            notes.add("Exact fit: as many points as model terms, so no interval; h_rt uses the estimate.")
+        else:
+            upper = plan['overhead'] + steps * high
+            interval = f"{format_duration(plan['overhead'] + steps * low)}–{format_duration(upper)}"
+        marks = ''
+        if linear:
+            marks += '†'
+            notes.add("† Tested at one size only: time per step scaled linearly in atoms.")
+        largest = max(fit['sizes'])
+        if atoms > EXTRAPOLATION_LIMIT * largest:
+            marks += '‡'
+            notes.add(f"‡ More than {EXTRAPOLATION_LIMIT}× the largest tested size ({largest:,.0f} atoms).")
+        if plan['cores'] > max(fit['core_counts']):
+            marks += '§'
+            notes.add(f"§ More cores than tested ({max(fit['core_counts']):.0f} for this decomposition).")
+        limit = h_rt_seconds(upper)
+        config = f"{label}: runner config `{plan_name(plan)}|{plan['threads']}|{plan['command']}`"
+        if max_hours and limit > max_hours * 3600:
+            h_rt = f"⚠ {format_duration(limit)}"
+            notes.add(f"⚠ h_rt above the {max_hours:g} h queue limit (--max-hours): no submit line.")
+            submit.append(f"{config}, not submittable: h_rt exceeds the {max_hours:g} h queue limit "
+                          "(split the run with restart files or add nodes)")
+        else:
+            h_rt = format_duration(limit)
+            slots = plan['nodes'] * cores_per_node if plan['nodes'] > 1 else plan['cores']
+            submit.append(f"{config}, submit with `-pe {pe} {slots} -l h_rt={h_rt}`")
+        lines.append(f"| {label}{marks} | `{plan['command']} {input_file}` | {plan['cores']} | {plan['nodes']} | "
+                     f"{format_duration(wall)} | {interval} | {plan['core_hours']:,.1f} | {h_rt} |")
+
+    lines += ["", *submit, "",
+              f"Wall time = launch + setup + {steps:,} steps × predicted time per step at {atoms:,.0f} atoms; "
+              f"h_rt = upper bound × {H_RT_MARGIN:g}, rounded up to {H_RT_ROUND // 60} min. Communication "
+              "between nodes is only modeled where multi-node runs were measured."]
+    return lines + sorted(notes)
+
+
+def plan_name(plan: dict) -> str:
+    """Runner-style config name (plan-mpi12-omp4, plan-gpu-mpi4-omp1, plan-mpi96-omp1-2n)."""
+    name = f"plan-{'gpu-' if plan['device'] == 'gpu' else ''}mpi{plan['ranks']}-omp{plan['threads']}"
+    return name + (f"-{plan['nodes']}n" if plan['nodes'] > 1 else '')
+
+
+# ============================================================================
+# Main
+# ============================================================================
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Wall time and best configuration for a production workload")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    plan = sub.add_parser('plan', help="fastest and most core-hour-efficient command for a workload")
+    plan.add_argument('--store', type=Path, required=True)
+    plan.add_argument('--potential', required=True, type=str.lower, choices=list(POTENTIALS))
+    plan.add_argument('--atoms', type=float, required=True)
+    length = plan.add_mutually_exclusive_group(required=True)
+    length.add_argument('--steps', type=int)
+    length.add_argument('--ns', type=float, help="simulated time (with the benchmark's timestep)")
+    plan.add_argument('--timestep', type=float, help="timestep in fs (default: the benchmark input's)")
+    plan.add_argument('--cores', type=int, default=CORES_PER_NODE, help="cores per node")
+    plan.add_argument('--nodes', type=int, default=1)
+    plan.add_argument('--gpu', action='store_true', help="a GPU is available (one node)")
+    plan.add_argument('--node-mem', type=float, help="node memory in GB (default: this machine's)")
+    plan.add_argument('--max-hours', type=float, default=DEFAULT_MAX_HOURS,
+                      help=f"queue limit: longest acceptable wall time in hours (default: {DEFAULT_MAX_HOURS}; 0: none)")
+    plan.add_argument('--pe', default=DEFAULT_PE, help="SGE parallel environment")
+
+    args = parser.parse_args(argv)
+
+    from result_store import load_runs
+
+    benchmark = POTENTIALS[args.potential]
+    try:
+        steps = workload_steps(benchmark, args.steps, args.ns, args.timestep)
+    except ValueError as exc:
+        print(f"⚠ {exc}")
+        return 1
+
+    runs = per_step_runs(load_runs(args.store, benchmark=benchmark))
+    unbound = runs['binding'].isna() | (runs['binding'] == 'none')
+    runs = runs[unbound]
+    fits = family_fits(runs)
+    if not fits:
+        print(f"No {benchmark} runs with atoms and loop time in the store")
+        return 1
+
+    memory = memory_fits(memory_points(runs))
+    node_mem = args.node_mem * 1024 if args.node_mem else node_memory_mb()
+    candidates = plan_candidates(fits, family_templates(runs), family_overheads(runs), args.atoms, steps,
+                                 args.cores, args.nodes, args.gpu, memory, node_mem)
+    plans = pick_plans(candidates, args.max_hours)
+    if not plans:
+        print("No configuration fits the hardware" + (f" within {args.max_hours:g} h" if args.max_hours else "")
+              + " (memory, untested core counts or devices, --max-hours)")
+        return 1
+
+    print(f"\n### Plan: {benchmark}, {args.atoms:,.0f} atoms, {steps:,} steps, "
+          f"{args.nodes} × {args.cores} cores{' + GPU' if args.gpu else ''} ({len(candidates)} candidates)\n")
+    print("\n".join(plan_lines(plans, fits, args.atoms, steps, BENCHMARK_INPUTS[benchmark], args.pe,
+                                max_hours=args.max_hours)))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,595 @@
+#!/usr/bin/env python3
+"""
+LAMMPS Benchmark Result Store
+
+Append-only SQLite store holding one row per benchmark run. The bash runners
+append rows as runs finish, and the existing markdown result files can be
+ingested once so the analyzers load a single typed DataFrame instead of
+re-scraping tables.
+
+Usage:
+  result_store.py add --store results.db --suite official --benchmark lj \\
+      --config opt-mpi48-omp1 --omp 1 --command "mpirun -np 48 lmp -in" \\
+      --loop-time 0.036 --timesteps 100 --atoms 32000
+  result_store.py ingest-md --store results.db benchmark_results.md
+  result_store.py ingest-log --store results.db official+reaxff/log.*
+"""
+
+import argparse
+import hashlib
+import re
+import socket
+import sqlite3
+import sys
+from datetime import datetime
+from pathlib import Path
+
+from bench_config import describe_command, parse_config_spec
+from lammps_log import log_rows
+
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+# Column name -> SQLite type
+RUN_COLUMNS = {
+    'suite': 'TEXT',             # official | scaling | memory | size | ensemble | inprocess
+    'benchmark': 'TEXT',         # LJ, EAM, CHAIN, RHODO, REAXFF
+    'config': 'TEXT',            # runner config name, e.g. opt-mpi6-omp8
+    'binary': 'TEXT',            # lmp, lmp_mpi_conda, lmp_gpu, lmp_kokkos
+    'command': 'TEXT',
+    'mpi_ranks': 'INTEGER',
+    'omp_threads': 'INTEGER',
+    'nodes': 'INTEGER',          # nodes the ranks span (multi-node jobs, fanout.py)
+    'accelerator': 'TEXT',       # none, omp, gpu, kokkos-gpu, ...
+    'co_runners': 'INTEGER',     # other jobs sharing the node during the run (sweep.py)
+    'copies': 'INTEGER',         # ensemble runs (ensemble.py): concurrent copies of the benchmark
+    'copy_index': 'INTEGER',     # ensemble runs: which copy (0 .. copies - 1)
+    'binding': 'TEXT',           # rank/thread binding policy (binding.py); NULL: unbound
+    'replicate': "TEXT NOT NULL DEFAULT ''",  # e.g. 3x3x3 ('' for fixed-size inputs)
+    'trial': 'INTEGER NOT NULL DEFAULT 0',
+    'run_index': 'INTEGER NOT NULL DEFAULT 0',  # run block within the log file
+    'atoms': 'INTEGER',
+    'timesteps': 'INTEGER',
+    'memory_mb': 'REAL',         # LAMMPS per MPI rank memory allocation (max over ranks)
+    'loop_time': 'REAL',
+    'nominal_steps': 'INTEGER',  # adaptive runs (adaptive_run.py): requested run length
+    'loop_time_extrapolated': 'REAL',  # adaptive runs: steady per-step time x nominal_steps
+    'timesteps_per_sec': 'REAL',
+    'ns_per_day': 'REAL',
+    'hours_per_ns': 'REAL',
+    'atom_steps_per_sec': 'REAL',
+    'pair_time': 'REAL',         # MPI task timing breakdown: average seconds per section
+    'bond_time': 'REAL',
+    'kspace_time': 'REAL',
+    'neigh_time': 'REAL',
+    'comm_time': 'REAL',
+    'output_time': 'REAL',
+    'modify_time': 'REAL',       # fixes, e.g. ReaxFF charge equilibration (fix qeq/reaxff)
+    'other_time': 'REAL',
+    'thermo_temp': 'REAL',       # final thermo values of the run block, as printed (per atom with norm yes)
+    'thermo_pe': 'REAL',
+    'thermo_etotal': 'REAL',
+    'thermo_press': 'REAL',
+    'thermo_evdwl': 'REAL',
+    'thermo_ecoul': 'REAL',
+    'energy_drift': 'REAL',      # (final - first) / |first| total energy over the run block
+    'wall_time': 'REAL',         # whole process, launcher included (startup_cost.py)
+    'launch_time': 'REAL',       # launcher start to the LAMMPS log being opened
+    'setup_time': 'REAL',        # wall time outside launch and run loops (read_data, replicate, init)
+    'busy_cores': 'REAL',        # telemetry.py: mean busy cores of the run's CPU set
+    'runnable_threads': 'REAL',  # mean running or runnable threads of the ranks
+    'cpu_mhz': 'REAL',           # mean core frequency
+    'cpu_mhz_min': 'REAL',       # lowest sampled mean core frequency
+    'throttle_events': 'INTEGER',  # thermal throttle events during the run
+    'ctx_switches_per_sec': 'REAL',  # context switches of the run's processes
+    'involuntary_ctx_per_sec': 'REAL',  # of which preemptions
+    'rank_rss_mb': 'REAL',       # peak resident memory of the largest rank
+    'rss_mb': 'REAL',            # peak resident memory of all ranks together
+    'gpu_mem_mb': 'REAL',        # peak memory in use on the fullest GPU (nvidia-smi)
+    'numa_local_frac': 'REAL',   # share of rank pages on the NUMA node the rank runs on
+    'telemetry': 'TEXT',         # time series file next to the log
+    'host': 'TEXT',
+    'date': 'TEXT',              # ISO-8601
+    'source': 'TEXT',            # log file or markdown file the row came from
+}
+
+# pandas dtypes applied by load_runs()
+RUN_DTYPES = {
+    'suite': 'category',
+    'benchmark': 'category',
+    'config': 'string',
+    'binary': 'category',
+    'command': 'string',
+    'mpi_ranks': 'Int64',
+    'omp_threads': 'Int64',
+    'nodes': 'Int64',
+    'accelerator': 'category',
+    'co_runners': 'Int64',
+    'copies': 'Int64',
+    'copy_index': 'Int64',
+    'binding': 'category',
+    'replicate': 'string',
+    'trial': 'Int64',
+    'run_index': 'Int64',
+    'atoms': 'Int64',
+    'timesteps': 'Int64',
+    'memory_mb': 'float64',
+    'loop_time': 'float64',
+    'nominal_steps': 'Int64',
+    'loop_time_extrapolated': 'float64',
+    'timesteps_per_sec': 'float64',
+    'ns_per_day': 'float64',
+    'hours_per_ns': 'float64',
+    'atom_steps_per_sec': 'float64',
+    'pair_time': 'float64',
+    'bond_time': 'float64',
+    'kspace_time': 'float64',
+    'neigh_time': 'float64',
+    'comm_time': 'float64',
+    'output_time': 'float64',
+    'modify_time': 'float64',
+    'other_time': 'float64',
+    'thermo_temp': 'float64',
+    'thermo_pe': 'float64',
+    'thermo_etotal': 'float64',
+    'thermo_press': 'float64',
+    'thermo_evdwl': 'float64',
+    'thermo_ecoul': 'float64',
+    'energy_drift': 'float64',
+    'wall_time': 'float64',
+    'launch_time': 'float64',
+    'setup_time': 'float64',
+    'busy_cores': 'float64',
+    'runnable_threads': 'float64',
+    'cpu_mhz': 'float64',
+    'cpu_mhz_min': 'float64',
+    'throttle_events': 'Int64',
+    'ctx_switches_per_sec': 'float64',
+    'involuntary_ctx_per_sec': 'float64',
+    'rank_rss_mb': 'float64',
+    'rss_mb': 'float64',
+    'gpu_mem_mb': 'float64',
+    'numa_local_frac': 'float64',
+    'telemetry': 'string',
+    'host': 'string',
+    'source': 'string',
+}
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    {', '.join(f'{name} {kind}' for name, kind in RUN_COLUMNS.items())},
+    UNIQUE (source, date, suite, benchmark, config, replicate, trial, run_index)
+);
+CREATE INDEX IF NOT EXISTS idx_runs_benchmark ON runs (suite, benchmark);
+CREATE INDEX IF NOT EXISTS idx_runs_config ON runs (binary, config);
+CREATE INDEX IF NOT EXISTS idx_runs_date ON runs (date);
+CREATE TABLE IF NOT EXISTS sources (
+    path TEXT PRIMARY KEY,
+    sha256 TEXT,
+    ingested TEXT,
+    size INTEGER,
+    mtime REAL
+);
+"""
+
+BENCHMARKS = ['LJ', 'EAM', 'CHAIN', 'RHODO', 'REAXFF']
+
+
+# ============================================================================
+# Store Access
+# ============================================================================
+
+def connect(store_path: Path) -> sqlite3.Connection:
+    """Open (and create or migrate if needed) the result store."""
+    conn = sqlite3.connect(str(store_path))
+    migrate(conn)
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def migrate(conn: sqlite3.Connection):
+    """Bring tables created by older versions up to the current schema."""
+    source_columns = [row[1] for row in conn.execute("PRAGMA table_info(sources)")]
+    if source_columns:
+        for name, kind in [('size', 'INTEGER'), ('mtime', 'REAL')]:
+            if name not in source_columns:
+                conn.execute(f"ALTER TABLE sources ADD COLUMN {name} {kind}")
+
+    # The runs table carries a UNIQUE key, so column changes need a rebuild
+    existing = [row[1] for row in conn.execute("PRAGMA table_info(runs)")]
+    if not existing or existing[1:] == list(RUN_COLUMNS):
+        return
+
+    common = ', '.join(name for name in existing if name in RUN_COLUMNS)
+    conn.execute("ALTER TABLE runs RENAME TO runs_old")
+    conn.executescript(SCHEMA)
+    with conn:
+        conn.execute(f"INSERT OR IGNORE INTO runs ({common}) SELECT {common} FROM runs_old")
+        # Indexes follow the renamed table; connect() recreates them afterwards
+        conn.execute("DROP TABLE runs_old")
+
+
+def normalize_run(row: dict) -> dict:
+    """Fill derived and default fields of a run row."""
+    run = {name: row.get(name) for name in RUN_COLUMNS}
+
+    if run['command']:
+        layout = describe_command(run['command'], run['omp_threads'] or 1)
+        for key, value in layout.items():
+            if run[key] is None:
+                run[key] = value
+
+    run['benchmark'] = (run['benchmark'] or '').upper()
+    run['replicate'] = run['replicate'] or ''
+    run['trial'] = run['trial'] or 0
+    run['run_index'] = run['run_index'] or 0
+    if run['host'] is None:
+        run['host'] = socket.gethostname()
+    run['date'] = run['date'] or datetime.now().isoformat(timespec='seconds')
+
+    if run['atom_steps_per_sec'] is None and run['atoms'] and run['timesteps_per_sec']:
+        run['atom_steps_per_sec'] = run['atoms'] * run['timesteps_per_sec']
+
+    return run
+
+
+def insert_runs(conn: sqlite3.Connection, rows: list[dict]) -> int:
+    """Insert run rows on an open connection. Returns the number of new rows."""
+    runs = [normalize_run(row) for row in rows]
+    names = list(RUN_COLUMNS)
+    sql = (f"INSERT OR IGNORE INTO runs ({', '.join(names)}) "
+           f"VALUES ({', '.join('?' for _ in names)})")
+
+    before = conn.total_changes
+    conn.executemany(sql, [[run[name] for name in names] for run in runs])
+    return conn.total_changes - before
+
+
+def append_runs(store_path: Path, rows: list[dict]) -> int:
+    """Append run rows to the store. Returns the number of new rows."""
+    conn = connect(store_path)
+    with conn:
+        added = insert_runs(conn, rows)
+    conn.close()
+    return added
+
+
+def record_source(conn: sqlite3.Connection, filepath: Path, digest: str):
+    """Remember the content hash and stat signature of an ingested file."""
+    stat = filepath.stat()
+    conn.execute(
+        "INSERT OR REPLACE INTO sources (path, sha256, ingested, size, mtime) VALUES (?, ?, ?, ?, ?)",
+        (str(filepath), digest, datetime.now().isoformat(timespec='seconds'),
+         stat.st_size, stat.st_mtime))
+
+
+def source_signatures(conn: sqlite3.Connection) -> dict:
+    """Return {path: (size, mtime)} for every ingested file."""
+    return {path: (size, mtime)
+            for path, size, mtime in conn.execute("SELECT path, size, mtime FROM sources")}
+
+
+def source_digests(conn: sqlite3.Connection) -> set:
+    """Content hashes of every ingested file."""
+    return {digest for (digest,) in conn.execute("SELECT sha256 FROM sources")}
+
+
+def store_signature(store_path: Path) -> list:
+    """Identify the store contents: ingested file hashes plus the run row range.
+
+    The runs table is append-only, so the row count and highest id change
+    whenever rows are added.
+    """
+    conn = connect(store_path)
+    sources = conn.execute("SELECT path, sha256 FROM sources ORDER BY path").fetchall()
+    rows = conn.execute("SELECT COUNT(*), MAX(id) FROM runs").fetchone()
+    conn.close()
+    return [sources, list(rows)]
+
+
+def load_runs(store_path: Path, **filters):
+    """Load runs as a typed DataFrame, optionally filtered by column values."""
+    import pandas as pd
+
+    where = []
+    params = []
+    for column, value in filters.items():
+        if column not in RUN_COLUMNS:
+            raise ValueError(f"Unknown column: {column}")
+        if isinstance(value, (list, tuple, set)):
+            where.append(f"{column} IN ({', '.join('?' for _ in value)})")
+            params.extend(value)
+        else:
+            where.append(f"{column} = ?")
+            params.append(value)
+
+    sql = f"SELECT {', '.join(RUN_COLUMNS)} FROM runs"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += " ORDER BY id"
+
+    conn = connect(store_path)
+    df = pd.read_sql_query(sql, conn, params=params)
+    conn.close()
+
+    df = df.astype(RUN_DTYPES)
+    df['date'] = pd.to_datetime(df['date'], errors='coerce')
+    return df
+
+
+# ============================================================================
+# Ingestion
+# ============================================================================
+
+def parse_markdown_date(text: str) -> str:
+    """Convert a `date` string (e.g. 'Sun Jan  4 22:24:06 KST 2026') to ISO."""
+    tokens = text.split()
+    # Drop the timezone abbreviation, strptime cannot parse names like KST
+    if len(tokens) == 6:
+        tokens = tokens[:4] + tokens[5:]
+    try:
+        return datetime.strptime(' '.join(tokens), '%a %b %d %H:%M:%S %Y').isoformat()
+    except ValueError:
+        return text.strip()
+
+
+def parse_table_rows(lines: list[str], start: int) -> list[dict]:
+    """Parse the markdown table beginning at or after line index `start`."""
+    idx = start
+    while idx < len(lines) and not lines[idx].lstrip().startswith('|'):
+        if lines[idx].startswith('#'):
+            return []
+        idx += 1
+    if idx >= len(lines):
+        return []
+
+    headers = [h.strip() for h in lines[idx].strip().strip('|').split('|')]
+    rows = []
+    for line in lines[idx + 1:]:
+        line = line.strip()
+        if not line.startswith('|'):
+            break
+        if set(line) <= set('|-: '):
+            continue
+        values = [v.strip() for v in line.strip('|').split('|')]
+        if len(values) == len(headers):
+            rows.append(dict(zip(headers, values)))
+    return rows
+
+
+def parse_runner_configs(script_path: Path) -> dict:
+    """Read the BENCHMARK_CONFIGS array of a runner script (name -> spec)."""
+    if not script_path.exists():
+        return {}
+
+    content = script_path.read_text(encoding='utf-8')
+    match = re.search(r'BENCHMARK_CONFIGS=\((.*?)\n\)', content, re.DOTALL)
+    if not match:
+        return {}
+
+    configs = {}
+    for spec in re.findall(r'^\s*"([^"]+)"', match.group(1), re.MULTILINE):
+        config = parse_config_spec(spec)
+        configs[config['name']] = config
+    return configs
+
+
+def to_number(value: str, kind=float):
+    """Convert a table cell to a number ('-' and blanks become None)."""
+    try:
+        return kind(value.replace(',', ''))
+    except (ValueError, AttributeError):
+        return None
+
+
+def parse_markdown_configs(lines: list[str]) -> dict:
+    """Read the "Benchmark Configurations" list of a results file (name -> spec)."""
+    configs = {}
+    for line in lines:
+        # "1. **name**: `omp|command <input_file>`" or "`command <input_file>`"
+        match = re.match(r'\d+\. \*\*(.+?)\*\*: `(.+?)\s*<input_file>`', line)
+        if match:
+            configs[match.group(1)] = parse_config_spec(f"{match.group(1)}|{match.group(2)}")
+    return configs
+
+
+def results_header(title: str, runs) -> list[str]:
+    """Header of a results file written from stored runs, listing their configurations.
+
+    The list uses the runner format, so parse_markdown_configs() (and
+    ingest_logs.py) can attribute logs of generated configurations.
+    """
+    import pandas as pd
+
+    lines = [f"# {title}", "",
+             f"- **Date**: {datetime.now():%a %b %d %H:%M:%S %Y}", f"- **Hostname**: {socket.gethostname()}", "",
+             "## Benchmark Configurations", ""]
+    configs = runs.dropna(subset=['command']).drop_duplicates('config')
+    for idx, record in enumerate(configs.to_dict('records'), 1):
+        omp = record['omp_threads'] if pd.notna(record['omp_threads']) else 1
+        lines.append(f"{idx}. **{record['config']}**: `{omp}|{record['command']} <input_file>`")
+    return lines + ["", "---", ""]
+
+
+def directory_configs(directory: Path) -> dict:
+    """Collect config specs from the runner scripts and result files in a directory."""
+    configs = {}
+    for script in sorted(directory.glob('*.sh')):
+        configs.update(parse_runner_configs(script))
+    for result_file in sorted(directory.glob('*.md')):
+        configs.update(parse_markdown_configs(result_file.read_text(encoding='utf-8').split('\n')))
+    return configs
+
+
+def parse_results_markdown(filepath: Path) -> list[dict]:
+    """Parse a benchmark_results.md or reaxff_scaling_results.md into run rows."""
+    lines = filepath.read_text(encoding='utf-8').split('\n')
+
+    host = None
+    date = None
+    for line in lines:
+        if line.startswith('- **Date**:'):
+            date = parse_markdown_date(line.split(':', 1)[1])
+        elif line.startswith('- **Hostname**:'):
+            host = line.split(':', 1)[1].strip()
+
+    configs = parse_markdown_configs(lines)
+    if not configs:
+        # Scaling results do not list commands; take them from the runner script
+        configs = directory_configs(filepath.parent)
+
+    rows = []
+    for idx, line in enumerate(lines):
+        bench_match = re.match(r'### (\w+) Benchmark\s*$', line)
+        rep_match = re.match(r'### Replicate (\S+)\s*$', line)
+        if bench_match and bench_match.group(1).upper() in BENCHMARKS:
+            suite, benchmark, replicate = 'official', bench_match.group(1).upper(), ''
+            name_col, ts_col = 'Configuration', 'Timesteps/sec'
+        elif rep_match:
+            suite, benchmark, replicate = 'scaling', 'REAXFF', rep_match.group(1)
+            name_col, ts_col = 'Config', 'Timesteps/s'
+        else:
+            continue
+
+        for table_row in parse_table_rows(lines, idx + 1):
+            name = table_row.get(name_col, '')
+            loop_time = to_number(table_row.get('Loop Time (s)'))
+            if not name or loop_time is None:
+                continue
+
+            config = configs.get(name, {})
+            rows.append({
+                'suite': suite,
+                'benchmark': benchmark,
+                'config': name,
+                'command': config.get('command'),
+                'omp_threads': config.get('omp_threads'),
+                'replicate': replicate,
+                'atoms': to_number(table_row.get('Atoms', ''), int),
+                'timesteps': None,
+                'loop_time': loop_time,
+                'timesteps_per_sec': to_number(table_row.get(ts_col, '')),
+                'ns_per_day': to_number(table_row.get('ns/day', '')),
+                'hours_per_ns': to_number(table_row.get('hours/ns', '')),
+                'atom_steps_per_sec': to_number(table_row.get('atom-steps/sec', '')),
+                'host': host or '',
+                'date': date,
+                'source': str(filepath),
+            })
+
+    # Timesteps are not tabulated; recover them from loop time and rate
+    for row in rows:
+        if row['timesteps_per_sec']:
+            row['timesteps'] = round(row['loop_time'] * row['timesteps_per_sec'])
+
+    return rows
+
+
+def ingest_source(filepath: Path, store_path: Path, parse) -> int:
+    """Ingest rows parsed from a file unless its current content is already stored (under any path)."""
+    filepath = Path(filepath).resolve()
+    digest = hashlib.sha256(filepath.read_bytes()).hexdigest()
+
+    conn = connect(store_path)
+    known = conn.execute("SELECT sha256 FROM sources WHERE path = ?", (str(filepath),)).fetchone()
+    if known and known[0] == digest:
+        conn.close()
+        return 0
+
+    with conn:
+        # Rows are keyed on the file's date, so a touched or copied file would duplicate them
+        added = 0 if digest in source_digests(conn) else insert_runs(conn, parse(filepath))
+        record_source(conn, filepath, digest)
+    conn.close()
+    return added
+
+
+def ingest_markdown(filepath: Path, store_path: Path) -> int:
+    """Ingest a markdown results file (benchmark_results.md / reaxff_scaling_results.md)."""
+    return ingest_source(filepath, store_path, parse_results_markdown)
+
+
+def parse_log_file(filepath: Path, log: dict = None, configs: dict = None) -> list[dict]:
+    """Parse a runner log into run rows, taking commands from the runner directory."""
+    rows = log_rows(filepath, log)
+    if configs is None:
+        configs = directory_configs(filepath.parent)
+    for row in rows:
+        config = configs.get(row.get('config'), {})
+        row.setdefault('command', config.get('command'))
+        if row.get('omp_threads') is None:
+            row['omp_threads'] = config.get('omp_threads')
+    return rows
+
+
+def ingest_log(filepath: Path, store_path: Path) -> int:
+    """Ingest every completed run block of a LAMMPS log file."""
+    return ingest_source(filepath, store_path, parse_log_file)
+
+
+# ============================================================================
+# Main
+# ============================================================================
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="LAMMPS benchmark result store")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    add = sub.add_parser('add', help="append one run")
+    add.add_argument('--store', type=Path, required=True)
+    add.add_argument('--suite', required=True)
+    add.add_argument('--benchmark', required=True)
+    add.add_argument('--config', required=True)
+    add.add_argument('--command', dest='run_command')
+    add.add_argument('--omp', type=int, default=1)
+    add.add_argument('--replicate', default='')
+    add.add_argument('--trial', type=int, default=0)
+    add.add_argument('--atoms', type=int)
+    add.add_argument('--timesteps', type=int)
+    add.add_argument('--loop-time', type=float, required=True)
+    add.add_argument('--timesteps-per-sec', type=float)
+    add.add_argument('--ns-per-day', type=float)
+    add.add_argument('--hours-per-ns', type=float)
+    add.add_argument('--source')
+
+    ingest = sub.add_parser('ingest-md', help="ingest markdown result files")
+    ingest.add_argument('--store', type=Path, required=True)
+    ingest.add_argument('files', type=Path, nargs='+')
+
+    ingest_logs = sub.add_parser('ingest-log', help="ingest LAMMPS log files")
+    ingest_logs.add_argument('--store', type=Path, required=True)
+    ingest_logs.add_argument('files', type=Path, nargs='+')
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'add':
+        append_runs(args.store, [{
+            'suite': args.suite,
+            'benchmark': args.benchmark,
+            'config': args.config,
+            'command': args.run_command,
+            'omp_threads': args.omp,
+            'replicate': args.replicate,
+            'trial': args.trial,
+            'atoms': args.atoms,
+            'timesteps': args.timesteps,
+            'loop_time': args.loop_time,
+            'timesteps_per_sec': args.timesteps_per_sec,
+            'ns_per_day': args.ns_per_day,
+            'hours_per_ns': args.hours_per_ns,
+            'source': args.source,
+        }])
+    else:
+        ingest = ingest_markdown if args.command == 'ingest-md' else ingest_log
+        for filepath in args.files:
+            added = ingest(filepath, args.store)
+            print(f"{filepath}: {added} rows")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
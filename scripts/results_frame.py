@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Tidy Results Frame
+
+Shared analysis core of the analyzers. Per-configuration trial summaries
+(one row per suite / benchmark / replicate / config, see
+trial_stats.summarize_trials) are extended once with the baseline of their
+group (joined, not looked up per row) and the derived metrics every figure
+and table uses: speedup with its bootstrap interval, parallel efficiency and
+per-core throughput. Figures and tables are then thin views: groupby
+iteration and indexed lookups on this frame.
+"""
+
+import numpy as np
+import pandas as pd
+
+from trial_stats import speedup_ci
+
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+# Identity of one row of the frame
+ROW_KEYS = ['suite', 'benchmark', 'replicate', 'config']
+
+DERIVED_COLUMNS = ['baseline_time', 'baseline_trials', 'baseline_cores', 'speedup', 'speedup_low',
+                   'speedup_high', 'efficiency', 'atom_steps_per_core']
+
+
+# ============================================================================
+# Pipeline
+# ============================================================================
+
+def add_baseline(frame: pd.DataFrame, keys: list[str], is_baseline: pd.Series) -> pd.DataFrame:
+    """Join the baseline row of each `keys` group as baseline_time / baseline_trials / baseline_cores."""
+    baseline = (frame.loc[is_baseline, [*keys, 'loop_time', 'loop_time_trials', 'cores']]
+                .drop_duplicates(keys)
+                .rename(columns={'loop_time': 'baseline_time', 'loop_time_trials': 'baseline_trials',
+                                 'cores': 'baseline_cores'}))
+    joined = frame.merge(baseline, on=keys, how='left')
+    joined.index = frame.index
+    return joined
+
+
+def add_metrics(frame: pd.DataFrame) -> pd.DataFrame:
+    """Speedup vs the joined baseline (ratio of medians, bootstrap interval), efficiency and per-core rate."""
+    intervals = [speedup_ci(baseline, trials) if isinstance(baseline, tuple) else (np.nan,) * 3
+                 for baseline, trials in zip(frame['baseline_trials'], frame['loop_time_trials'])]
+    speedup = pd.DataFrame(intervals, index=frame.index, columns=['speedup', 'speedup_low', 'speedup_high'])
+
+    # Efficiency = t₀·p₀ / (t·p): the speedup per core added over the baseline's
+    cores = frame['cores'].astype(float)
+    efficiency = speedup['speedup'] * frame['baseline_cores'].astype(float) / cores
+    atom_steps = frame['atoms'].astype(float) * frame['timesteps'].astype(float) / frame['loop_time']
+    return frame.assign(**speedup, efficiency=efficiency, atom_steps_per_core=atom_steps / cores)
+
+
+def indexed(frame: pd.DataFrame, keys: list[str] = ROW_KEYS) -> pd.DataFrame:
+    """Frame indexed by `keys` for constant-time row lookups in views."""
+    return frame.set_index(keys, drop=False).sort_index()
+
+
+def lookup(index: pd.DataFrame, key: tuple):
+    """Row of an indexed frame as a dict, or None if absent."""
+    try:
+        rows = index.loc[key]
+    except KeyError:
+        return None
+    if isinstance(rows, pd.DataFrame):
+        return rows.iloc[0].to_dict() if len(rows) else None
+    return rows.to_dict()
+
+
+def interval_errors(rows: list, value: str, low: str, high: str) -> list[list]:
+    """Asymmetric error bars [[lower], [upper]] of rows (dicts or None, which give zero bars)."""
+    return [[row[value] - row[low] if row else 0 for row in rows],
+            [row[high] - row[value] if row else 0 for row in rows]]
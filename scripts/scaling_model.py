@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+Scaling-Law Fitting and Extrapolation
+
+Fits one scaling law per benchmark, binary and decomposition (threads per
+MPI rank) to the runs in the result store and predicts loop times for untested
+system sizes and core counts with bootstrap prediction intervals.
+
+The model is the Universal Scalability Law written as loop time in the atom
+count N and the core count p (ranks × threads):
+
+  t(N, p) = s + w·N / p + k·(p − 1)
+
+s is serial time, w·N the perfectly parallel work and k·(p − 1) the
+contention / coherency cost that makes speedup peak at p* = sqrt(w·N / k).
+With T1 = s + w·N this is exactly USL with serial fraction σ = s / T1 and
+contention κ = k / T1; without the k term it is Amdahl's law. Because s is
+fixed while w·N grows, σ shrinks with system size (Gustafson), which is what
+makes extrapolation to larger production systems meaningful.
+
+The fit is linear in (s, w, k) and weighted by 1/t (relative errors).
+Terms the data cannot identify are left out: k needs at least three core
+counts, and a term that fits negative is dropped. Prediction intervals come
+from a residual bootstrap: resample the relative residuals, refit, predict
+and add a resampled residual. Extrapolating in size needs at least two tested
+sizes, and extrapolating in cores needs at least two core counts.
+
+Usage:
+  scaling_model.py --store mirae_server/results.db
+  scaling_model.py --store local_desktop/results.db --suite scaling --replicate 10x10x10 --atoms 300000
+  scaling_model.py --store local_desktop/results.db --benchmark RHODO --cores 16,24
+"""
+
+import argparse
+import math
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from trial_stats import CONFIDENCE, SEED, latest_trials, nominal_loop_times, percentile_interval
+
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+# Model terms: serial time, parallel work per atom, contention per extra core
+TERMS = ['s', 'w', 'k']
+
+BOOTSTRAP_SAMPLES = 1000
+
+# Accelerators whose runs share a device instead of using one core per rank
+DEVICE_ACCELERATORS = {'gpu', 'kokkos-gpu', 'kokkos-cuda'}
+
+
+# ============================================================================
+# Series Selection
+# ============================================================================
+
+def decomposition(threads: int) -> str:
+    """Name of the decomposition family with a given number of threads per rank."""
+    return 'MPI only' if threads == 1 else f"MPI × {threads} OMP"
+
+
+def scaling_series(runs: pd.DataFrame) -> dict:
+    """Group the latest trials into fit series.
+
+    Key: (suite, benchmark, binary, device, decomposition). Each series
+    holds one row per trial with atoms, cores and loop_time. The 1 × 1 run of
+    a binary on the CPU anchors (p = 1) every CPU decomposition family.
+    """
+    # Images share config names (CPU-1, ...), so the binary is part of the key
+    keys = ['suite', 'benchmark', 'binary', 'replicate', 'config']
+    runs = latest_trials(nominal_loop_times(runs), keys)
+    runs = runs.dropna(subset=['loop_time', 'atoms', 'mpi_ranks'])
+    runs = runs.assign(
+        threads=runs['omp_threads'].fillna(1).astype(int),
+        ranks=runs['mpi_ranks'].astype(int),
+        device=np.where(runs['accelerator'].isin(DEVICE_ACCELERATORS), 'gpu', 'cpu'),
+    )
+    runs['cores'] = runs['ranks'] * runs['threads']
+
+    series = {}
+    for (suite, bench, binary, device), group in runs.groupby(
+            ['suite', 'benchmark', 'binary', 'device'], observed=True):
+        anchor = group[group['cores'] == 1] if device == 'cpu' else group.iloc[:0]
+        for threads, members in group.groupby('threads'):
+            if threads > 1:
+                members = pd.concat([anchor, members])
+            points = members[['atoms', 'cores', 'loop_time']].astype(float).reset_index(drop=True)
+            series[(suite, bench, binary, device, decomposition(threads))] = points
+    return series
+
+
+# ============================================================================
+# Fitting
+# ============================================================================
+
+def design(atoms, cores, terms: list[str]) -> np.ndarray:
+    """Design matrix of the model terms."""
+    atoms, cores = np.asarray(atoms, dtype=float), np.asarray(cores, dtype=float)
+    columns = {'s': np.ones_like(atoms), 'w': atoms / cores, 'k': cores - 1}
+    return np.column_stack([columns[term] for term in terms])
+
+
+def solve(atoms, cores, times, terms: list[str]) -> tuple:
+    """Weighted least squares (weights 1/t) dropping terms that fit negative. Returns (terms, coefficients)."""
+    terms = list(terms)
+    while terms:
+        X = design(atoms, cores, terms) / times[:, None]
+        coef = np.linalg.lstsq(X, np.ones_like(times), rcond=None)[0]
+        if (coef >= 0).all():
+            return terms, coef
+        terms.pop(int(np.argmin(coef)))
+    return [], np.array([])
+
+
+def fit_series(points: pd.DataFrame) -> dict:
+    """Fit the scaling model to one series. Returns None when no term can be identified."""
+    atoms, cores, times = (points[col].to_numpy() for col in ['atoms', 'cores', 'loop_time'])
+    sizes, core_counts = np.unique(atoms), np.unique(cores)
+
+    # s and w·N/p are only separable if N/p varies
+    terms = ['s', 'w'] if len(np.unique(atoms / cores)) > 1 else ['w']
+    if len(core_counts) >= 3:
+        terms.append('k')
+    terms, coef = solve(atoms, cores, times, terms)
+    if not terms:
+        return None
+
+    fitted = design(atoms, cores, terms) @ coef
+    residuals = (times - fitted) / fitted
+    dof = len(times) - len(terms)
+    return {
+        'terms': terms,
+        'params': {term: float(coef[terms.index(term)]) if term in terms else 0.0 for term in TERMS},
+        'atoms': atoms, 'cores': cores, 'times': times,
+        'fitted': fitted,
+        'residuals': residuals,
+        'dof': dof,
+        'rms_error': float(np.sqrt(np.mean(residuals ** 2))),
+        'sizes': sizes,
+        'core_counts': core_counts,
+        'model': 'USL' if 'k' in terms else 'Amdahl' if len(core_counts) >= 2 else 'size only',
+    }
+
+
+def usl_parameters(fit: dict, atoms: float) -> dict:
+    """T1, serial fraction σ, contention κ and peak core count p* at a system size.
+
+    From a single core count s only splits fixed from per-atom time, so the
+    core-scaling parameters are undefined (NaN).
+    """
+    s, w, k = (fit['params'][term] for term in TERMS)
+    t1 = s + w * atoms
+    if len(fit['core_counts']) < 2:
+        return {'t1': math.nan, 'sigma': math.nan, 'kappa': math.nan, 'peak_cores': math.nan}
+    return {
+        't1': t1,
+        'sigma': s / t1 if t1 > 0 else math.nan,
+        'kappa': k / t1 if t1 > 0 else math.nan,
+        'peak_cores': math.sqrt(w * atoms / k) if k > 0 else math.inf,
+    }
+
+
+def can_predict(fit: dict, atoms: float, cores: float) -> bool:
+    """Whether (atoms, cores) is tested or extrapolates along a dimension the fit identified."""
+    size_ok = atoms in fit['sizes'] or len(fit['sizes']) >= 2
+    cores_ok = cores in fit['core_counts'] or len(fit['core_counts']) >= 2
+    return size_ok and cores_ok
+
+
+def predict(fit: dict, atoms: float, cores: float, confidence: float = CONFIDENCE,
+            samples: int = BOOTSTRAP_SAMPLES) -> tuple:
+    """Predicted loop time and its bootstrap prediction interval (None bounds for exact fits)."""
+    x0 = design([atoms], [cores], fit['terms'])[0]
+    coef = np.array([fit['params'][term] for term in fit['terms']])
+    estimate = float(x0 @ coef)
+    if fit['dof'] <= 0:
+        return estimate, None, None
+
+    # Residuals inflated for the fitted degrees of freedom
+    residuals = fit['residuals'] * math.sqrt(len(fit['residuals']) / fit['dof'])
+    rng = np.random.default_rng(SEED)
+    draws = np.empty(samples)
+    for idx in range(samples):
+        times = fit['fitted'] * (1 + rng.choice(residuals, size=len(residuals)))
+        terms, coef = solve(fit['atoms'], fit['cores'], times, fit['terms'])
+        boot = float(design([atoms], [cores], terms)[0] @ coef) if terms else estimate
+        draws[idx] = boot * (1 + rng.choice(residuals))
+    low, high = percentile_interval(draws, confidence)
+    return estimate, low, high
+
+
+def replicate_atoms(runs: pd.DataFrame, replicate: str) -> int:
+    """Atom count of an untested replicate (e.g. 10x10x10) from the atoms per cell of tested ones."""
+    cells = int(np.prod([int(dim) for dim in replicate.lower().split('x')]))
+    tested = runs.dropna(subset=['atoms'])
+    tested = tested[tested['replicate'].str.fullmatch(r'\d+x\d+x\d+', na=False)]
+    if tested.empty:
+        raise ValueError("no replicated runs to derive atoms per cell from")
+    tested_cells = tested['replicate'].map(lambda rep: np.prod([int(dim) for dim in rep.split('x')]))
+    return round(float((tested['atoms'] / tested_cells).median()) * cells)
+
+
+# ============================================================================
+# Report
+# ============================================================================
+
+def format_value(value, spec: str = '.4g') -> str:
+    return '-' if value is None or not math.isfinite(value) else f"{value:{spec}}"
+
+
+def fit_table(fits: dict) -> list[str]:
+    """Markdown table of fitted parameters at the largest tested size."""
+    lines = [
+        "| Suite | Benchmark | Binary | Decomposition | Model | Points | Atoms | Cores | "
+        "s (s) | w (µs·core/atom) | k (ms/core) | σ | κ | Peak cores | RMS error |",
+        "|-------|-----------|--------|---------------|-------|--------|-------|-------|"
+        "-------|------------------|-------------|---|---|------------|-----------|",
+    ]
+    for (suite, bench, binary, device, family), fit in fits.items():
+        params = fit['params']
+        usl = usl_parameters(fit, fit['sizes'][-1])
+        sizes = f"{fit['sizes'][0]:,.0f}" + (f"–{fit['sizes'][-1]:,.0f}" if len(fit['sizes']) > 1 else '')
+        cores = ','.join(f"{c:.0f}" for c in fit['core_counts'])
+        label = family if device == 'cpu' else f"{family} ({device})"
+        lines.append(
+            f"| {suite} | {bench} | {binary} | {label} | {fit['model']} | {len(fit['times'])} | {sizes} | {cores} | "
+            f"{params['s']:.4g} | {params['w'] * 1e6:.4g} | {params['k'] * 1e3:.4g} | "
+            f"{format_value(usl['sigma'], '.3g')} | {format_value(usl['kappa'], '.3g')} | "
+            f"{format_value(usl['peak_cores'], '.0f')} | {fit['rms_error']:.1%} |")
+    return lines
+
+
+def prediction_table(fits: dict, atoms: list[float], cores: list[float]) -> list[str]:
+    """Markdown table of predicted loop times with prediction intervals."""
+    lines = [
+        f"| Benchmark | Binary | Decomposition | Atoms | Cores | Predicted (s) | {CONFIDENCE:.0%} PI (s) | σ at size |",
+        "|-----------|--------|---------------|-------|-------|---------------|------------|-----------|",
+    ]
+    for (suite, bench, binary, device, family), fit in fits.items():
+        label = family if device == 'cpu' else f"{family} ({device})"
+        for size in atoms or fit['sizes']:
+            for count in cores or fit['core_counts']:
+                if not can_predict(fit, size, count):
+                    continue
+                estimate, low, high = predict(fit, size, count)
+                interval = f"{format_value(low)}–{format_value(high)}" if low is not None else "exact fit"
+                sigma = format_value(usl_parameters(fit, size)['sigma'], '.3g')
+                lines.append(f"| {bench} | {binary} | {label} | {size:,.0f} | {count:.0f} | "
+                             f"{format_value(estimate)} | {interval} | {sigma} |")
+    return lines
+
+
+# ============================================================================
+# Main
+# ============================================================================
+
+def parse_number_list(value: str) -> list[float]:
+    return [float(item) for item in value.split(',') if item.strip()]
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Scaling-law fitting and extrapolation")
+    parser.add_argument('--store', type=Path, required=True)
+    parser.add_argument('--suite', choices=['official', 'scaling'])
+    parser.add_argument('--benchmark', help="LJ, EAM, CHAIN, RHODO or REAXFF")
+    parser.add_argument('--binary')
+    parser.add_argument('--atoms', type=parse_number_list, default=[], help="system sizes to predict")
+    parser.add_argument('--replicate', action='append', default=[],
+                        help="replicate to predict, e.g. 10x10x10 (repeatable)")
+    parser.add_argument('--cores', type=parse_number_list, default=[], help="core counts to predict")
+    args = parser.parse_args(argv)
+
+    from result_store import load_runs
+
+    filters = {}
+    if args.suite:
+        filters['suite'] = args.suite
+    if args.benchmark:
+        filters['benchmark'] = args.benchmark.upper()
+    if args.binary:
+        filters['binary'] = args.binary
+    runs = load_runs(args.store, **filters)
+
+    atoms = list(args.atoms)
+    for replicate in args.replicate:
+        atoms.append(replicate_atoms(runs, replicate))
+        print(f"{replicate}: {atoms[-1]:,} atoms")
+
+    fits = {}
+    for key, points in scaling_series(runs).items():
+        fit = fit_series(points)
+        if fit is not None:
+            fits[key] = fit
+    if not fits:
+        print("No series with enough runs to fit")
+        return 1
+
+    print("\n### Fitted Scaling Laws (σ, κ and peak cores at the largest tested size)\n")
+    print("\n".join(fit_table(fits)))
+    if atoms or args.cores:
+        print(f"\n### Predicted Loop Time ({CONFIDENCE:.0%} bootstrap prediction intervals)\n")
+        print("\n".join(prediction_table(fits, atoms, args.cores)))
+        print("\nOnly extrapolations along dimensions with at least two tested values are shown.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+"""
+Weak and Strong Scaling of the Official Benchmarks
+
+The official inputs are fixed at 32,000 atoms, where 48 ranks get about 670
+atoms each. This track scales them towards production sizes (1-10M atoms):
+in.lj and in.eam through their x/y/z index variables (a box of 20x × 20y ×
+20z fcc cells), in.chain and in.rhodo with `replicate x y z` after their
+read_data. The scaled inputs are in.size_<bench>_<XxYxZ>; runs are stored as
+suite "size" with logs log.size_<bench>_<XxYxZ>_<config>.
+
+One sweep over sizes × core counts yields three series per benchmark and
+binary / decomposition:
+  strong  fixed size, more cores: efficiency = t₀·p₀ / (t·p) against the
+          fewest cores tested
+  weak    fixed atoms per core (--per-core copies of the 32k input per core,
+          factored into the most cubic x × y × z): efficiency = t₀ / t
+  size    one configuration over sizes: atom-steps/s relative to the
+          smallest size (GPU configs, which only have this series)
+
+Configurations are generated per binary and core count as pure MPI runs
+(<name>-mpi<P>-omp1, named and built as in tune_decomposition.py), and runner
+configs can be added with -c. Strong-scaling points with more than
+--max-atoms-per-core atoms per core are skipped, so a 1-core run of a
+7M-atom system does not hold up the sweep for hours.
+
+Usage:
+  size_scaling.py run --bench-dir lammps_benchmarks --store results.db \\
+      --binary opt=lmp --binary conda=lmp_mpi_conda --cores 1,2,4,8,16,24,48 \\
+      --replicates 1x1x1,2x2x2,4x4x4,6x6x6 --per-core 1,4 -- --trials 3 --isolate all
+  size_scaling.py inputs --bench-dir lammps_benchmarks --replicates 2x2x2,4x4x4
+  size_scaling.py report --store mirae_server/results.db --benchmark LJ
+"""
+
+import argparse
+import math
+import re
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+from bench_config import describe_command, parse_config_spec
+from trial_stats import latest_trials, nominal_loop_times, summarize_trials
+
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+SUITE = 'size'
+LOG_PREFIX = 'size_'
+
+BENCHMARKS = ['lj', 'eam', 'chain', 'rhodo']
+
+# Atoms of every official input at 1 × 1 × 1
+BASE_ATOMS = 32000
+
+DEFAULT_REPLICATES = ['1x1x1', '2x2x2', '4x4x4', '6x6x6']
+DEFAULT_PER_CORE = [1, 4]
+MAX_ATOMS_PER_CORE = 500_000
+
+# Accelerators whose runs share a device instead of using one core per rank
+DEVICE_ACCELERATORS = {'gpu', 'kokkos-gpu'}
+
+SERIES_KINDS = ['strong', 'weak', 'size']
+
+# Efficiency below this is marked in tables
+LOW_EFFICIENCY = 0.5
+
+READ_DATA_RE = re.compile(r'^\s*read_data\s+.*$', re.MULTILINE)
+REPLICATE_RE = re.compile(r'^\s*replicate\s', re.MULTILINE)
+
+
+# ============================================================================
+# Inputs and Points
+# ============================================================================
+
+def parse_replicate(name: str) -> tuple:
+    """(x, y, z) of a replicate name such as 4x4x2."""
+    return tuple(int(dim) for dim in name.split('x'))
+
+
+def cubic_dims(copies: int) -> tuple:
+    """Most cubic x ≥ y ≥ z with x·y·z = copies."""
+    best = (copies, 1, 1)
+    for z in range(1, int(round(copies ** (1 / 3))) + 1):
+        if copies % z:
+            continue
+        for y in range(z, int(math.isqrt(copies // z)) + 1):
+            if (copies // z) % y == 0:
+                dims = (copies // z // y, y, z)
+                if dims[0] - dims[2] < best[0] - best[2]:
+                    best = dims
+    return best
+
+
+def replicate_name(dims: tuple) -> str:
+    return 'x'.join(str(dim) for dim in dims)
+
+
+def scaled_input(text: str, dims: tuple) -> str:
+    """Input text scaled by x × y × z: index variables first, a replicate after read_data."""
+    header = "".join(f"variable        {axis} index {count}\n" for axis, count in zip('xyz', dims))
+    # in.lj / in.eam size their box from x, y and z; data-file inputs are replicated
+    if READ_DATA_RE.search(text) and not REPLICATE_RE.search(text):
+        text = READ_DATA_RE.sub(lambda match: match.group(0) + "\nreplicate       ${x} ${y} ${z}", text, count=1)
+    return f"# Scaled {replicate_name(dims)} by size_scaling.py\n" + header + text
+
+
+def input_name(benchmark: str, replicate: str) -> str:
+    return f"in.{LOG_PREFIX}{benchmark}_{replicate}"
+
+
+def write_inputs(bench_dir: Path, points: list[tuple]) -> list[str]:
+    """Write the scaled input of every (benchmark, replicate) of the points. Returns the names."""
+    names = []
+    for benchmark, replicate in dict.fromkeys((bench, rep) for bench, rep, _ in points):
+        name = input_name(benchmark, replicate)
+        text = (bench_dir / f"in.{benchmark}").read_text()
+        (bench_dir / name).write_text(scaled_input(text, parse_replicate(replicate)))
+        names.append(name)
+    return names
+
+
+def core_configs(binaries: list[str], cores: list[int], accel: str, launcher: str) -> list[dict]:
+    """Pure MPI config of every binary ("name=binary") and core count."""
+    from tune_decomposition import layout_command, layout_name
+
+    configs = []
+    for spec in binaries:
+        prefix, _, binary = spec.partition('=')
+        for count in cores:
+            layout = {'ranks': count, 'threads': 1, 'grid': '* * *'}
+            configs.append({'name': layout_name(layout, prefix), 'omp_threads': 1,
+                            'command': layout_command(layout, binary or prefix, accel, launcher)})
+    return configs
+
+
+def size_points(benchmarks: list[str], replicates: list[str], configs: list[dict],
+                per_core: list[int] = DEFAULT_PER_CORE,
+                max_atoms_per_core: float = MAX_ATOMS_PER_CORE) -> list[tuple]:
+    """(benchmark, replicate, config) of the strong / size series plus the weak-scaling sizes."""
+    points = []
+    for benchmark in benchmarks:
+        for config in configs:
+            layout = describe_command(config['command'], config['omp_threads'])
+            cores = layout['mpi_ranks'] * max(layout['omp_threads'], 1)
+            if layout['accelerator'] in DEVICE_ACCELERATORS:
+                sizes = list(replicates)
+            else:
+                sizes = [rep for rep in replicates
+                         if BASE_ATOMS * math.prod(parse_replicate(rep)) / cores <= max_atoms_per_core]
+                sizes += [replicate_name(cubic_dims(copies * cores)) for copies in per_core]
+            points += [(benchmark, rep, config) for rep in dict.fromkeys(sizes)]
+    return points
+
+
+# ============================================================================
+# Series
+# ============================================================================
+
+def series_label(record: dict) -> str:
+    """Binary, accelerator and threads per rank of a run (what a series holds fixed)."""
+    label = record['binary']
+    if record['accelerator'] not in ('none', None):
+        label += f" {record['accelerator']}"
+    if record['threads'] > 1:
+        label += f" ×{record['threads']} OMP"
+    return label
+
+
+def scaling_series(runs: pd.DataFrame) -> pd.DataFrame:
+    """Strong, weak and size series of the size suite, one row per point.
+
+    Columns: kind, benchmark, series, replicate, config, atoms, cores,
+    atoms_per_core, loop_time (+ CI), throughput (atom-steps/s) and
+    efficiency (relative throughput for the size series).
+    """
+    unbound = runs['binding'].isna() | (runs['binding'] == 'none')
+    runs = runs[(runs['suite'] == SUITE) & unbound].dropna(subset=['loop_time', 'atoms', 'mpi_ranks'])
+    if runs.empty:
+        return pd.DataFrame(columns=['kind', 'benchmark', 'series', 'replicate', 'config', 'atoms', 'cores',
+                                     'atoms_per_core', 'loop_time', 'throughput', 'efficiency'])
+    runs = latest_trials(nominal_loop_times(runs), ['benchmark', 'replicate', 'config'])
+    points = summarize_trials(runs, ['benchmark', 'replicate', 'config'])
+    points['threads'] = points['omp_threads'].fillna(1).astype(int)
+    points['accelerator'] = points['accelerator'].astype(object).fillna('none')
+    points['device'] = points['accelerator'].isin(DEVICE_ACCELERATORS)
+    points['cores'] = points['mpi_ranks'].astype(int) * points['threads']
+    points['atoms'] = points['atoms'].astype(int)
+    points['atoms_per_core'] = (points['atoms'] / points['cores']).round().astype(int)
+    points['throughput'] = points['atoms'] * points['timesteps'].astype(float) / points['loop_time']
+    points['series'] = [series_label(record) for record in points.to_dict('records')]
+
+    cpu = points[~points['device']]
+    groups = [
+        ('strong', cpu, ['benchmark', 'series', 'atoms'], 'cores'),
+        ('weak', cpu, ['benchmark', 'series', 'atoms_per_core'], 'cores'),
+        ('size', points, ['benchmark', 'series', 'cores'], 'atoms'),
+    ]
+    parts = []
+    for kind, frame, keys, axis in groups:
+        for _, group in frame.groupby(keys):
+            if group[axis].nunique() < 2:
+                continue
+            group = group.sort_values(axis)
+            base = group.iloc[0]
+            if kind == 'strong':
+                efficiency = base['loop_time'] * base['cores'] / (group['loop_time'] * group['cores'])
+            elif kind == 'weak':
+                efficiency = base['loop_time'] / group['loop_time']
+            else:
+                efficiency = group['throughput'] / base['throughput']
+            parts.append(group.assign(kind=kind, efficiency=efficiency))
+    if not parts:
+        return scaling_series(runs.iloc[:0])
+    series = pd.concat(parts, ignore_index=True)
+    series['benchmark'] = series['benchmark'].astype(str)
+    # Parts are appended in SERIES_KINDS order
+    return series.sort_values('benchmark', kind='stable').reset_index(drop=True)
+
+
+def curve_label(kind: str, record: dict) -> str:
+    """Legend label of one curve."""
+    if kind == 'strong':
+        return f"{record['series']} {record['atoms']:,} atoms"
+    if kind == 'weak':
+        return f"{record['series']} {record['atoms_per_core']:,}/core"
+    return f"{record['series']} {record['cores']} cores"
+
+
+def plot_series(ax, series: pd.DataFrame, kind: str, legend: bool = True):
+    """Efficiency over cores (strong, weak) or throughput over atoms (size) of one benchmark."""
+    keys = {'strong': ['series', 'atoms'], 'weak': ['series', 'atoms_per_core'], 'size': ['series', 'cores']}[kind]
+    axis = 'atoms' if kind == 'size' else 'cores'
+    for _, curve in series[series['kind'] == kind].groupby(keys):
+        values = curve['throughput'] / 1e6 if kind == 'size' else curve['efficiency'] * 100
+        ax.plot(curve[axis], values, 'o-', linewidth=1.5, markersize=4,
+                label=curve_label(kind, curve.iloc[0]))
+    ax.set_xscale('log', base=2 if axis == 'cores' else 10)
+    if axis == 'cores':
+        ax.set_xlabel('Cores', fontsize=10)
+        ax.set_ylabel('Parallel Efficiency (%)', fontsize=10)
+        ax.axhline(100, color='gray', linestyle='--', linewidth=0.8)
+        ax.set_ylim(0, max(110, ax.get_ylim()[1]))
+    else:
+        from matplotlib.ticker import NullFormatter
+
+        ax.xaxis.set_minor_formatter(NullFormatter())
+        ax.set_xlabel('Atoms', fontsize=10)
+        ax.set_ylabel('Matom-steps/s', fontsize=10)
+    ax.grid(alpha=0.3)
+    if legend:
+        ax.legend(fontsize=6, loc='best', framealpha=0.9)
+
+
+def size_scaling_table(series: pd.DataFrame) -> list[str]:
+    """Markdown tables of the strong, weak and size series."""
+    titles = {
+        'strong': "Strong scaling (fixed size; efficiency = t₀·p₀ / (t·p) against the fewest cores)",
+        'weak': "Weak scaling (fixed atoms per core; efficiency = t₀ / t)",
+        'size': "System size (fixed cores; throughput relative to the smallest size)",
+    }
+    lines = []
+    for kind in SERIES_KINDS:
+        rows = series[series['kind'] == kind]
+        if rows.empty:
+            continue
+        lines += [f"**{titles[kind]}**", "",
+                  "| Benchmark | Series | Cores | Atoms | Atoms/core | Loop (s) | Matom-steps/s | Efficiency |",
+                  "|-----------|--------|-------|-------|------------|----------|---------------|------------|"]
+        for record in rows.to_dict('records'):
+            efficiency = f"{record['efficiency']:.0%}"
+            if kind != 'size' and record['efficiency'] < LOW_EFFICIENCY:
+                efficiency = f"**{efficiency}**"
+            lines.append(f"| {record['benchmark']} | {record['series']} | {record['cores']} | {record['atoms']:,} | "
+                         f"{record['atoms_per_core']:,} | {record['loop_time']:.3f} | "
+                         f"{record['throughput'] / 1e6:.2f} | {efficiency} |")
+        lines.append("")
+    if lines:
+        lines.append(f"**Bold**: parallel efficiency below {LOW_EFFICIENCY:.0%}.")
+    return lines
+
+
+# ============================================================================
+# Main
+# ============================================================================
+
+def parse_list(value: str, kind=str) -> list:
+    """Comma- or space-separated list."""
+    return [kind(item) for item in re.split(r'[,\s]+', value.strip()) if item]
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Weak and strong scaling of the official benchmarks")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    def add_size_args(command):
+        command.add_argument('--bench-dir', type=Path, required=True, help="directory holding in.lj ... in.rhodo")
+        command.add_argument('--benchmark', dest='benchmarks', action='append', choices=BENCHMARKS)
+        command.add_argument('--replicates', type=parse_list, default=DEFAULT_REPLICATES,
+                             help="strong-scaling sizes, e.g. 1x1x1,2x2x2,4x4x4")
+
+    run = sub.add_parser('run', help="write the scaled inputs and run the sweep (arguments after -- go to sweep.py)")
+    add_size_args(run)
+    run.add_argument('-c', '--config', dest='configs', action='append', default=[],
+                     help="extra runner config: name|omp|command")
+    run.add_argument('--binary', dest='binaries', action='append', default=[],
+                     help="name=binary run as pure MPI on every --cores count, e.g. opt=lmp")
+    run.add_argument('--cores', type=lambda value: parse_list(value, int), default=[],
+                     help="core counts of the generated configs")
+    run.add_argument('--accel', default='omp', help="accelerator of the generated configs: omp or none")
+    run.add_argument('--launcher', default='mpirun -np {ranks}')
+    run.add_argument('--per-core', type=lambda value: parse_list(value, int), default=DEFAULT_PER_CORE,
+                     help="weak scaling: copies of the 32k-atom input per core")
+    run.add_argument('--max-atoms-per-core', type=float, default=MAX_ATOMS_PER_CORE,
+                     help="skip strong-scaling points with more atoms per core")
+    run.add_argument('--log-dir', type=Path, default=Path.cwd())
+    run.add_argument('--store', type=Path)
+    run.add_argument('--dry-run', action='store_true', help="write the inputs and list the points only")
+    run.add_argument('sweep_args', nargs=argparse.REMAINDER)
+
+    inputs = sub.add_parser('inputs', help="write the scaled inputs only")
+    add_size_args(inputs)
+
+    report = sub.add_parser('report', help="strong, weak and size series from the result store")
+    report.add_argument('--store', type=Path, required=True)
+    report.add_argument('--benchmark')
+    report.add_argument('--output', type=Path, help="write a results file (with its configurations) instead")
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'report':
+        from result_store import load_runs, results_header
+
+        filters = {'suite': SUITE}
+        if args.benchmark:
+            filters['benchmark'] = args.benchmark.upper()
+        runs = load_runs(args.store, **filters)
+        series = scaling_series(runs)
+        if series.empty:
+            print("No size-scaling series in the store (size_scaling.py run, or SIZE_SCALING=1 in the runners)")
+            return 1
+        lines = ["### Weak and Strong Scaling of the Official Benchmarks (median over trials)", "",
+                 *size_scaling_table(series)]
+        if args.output:
+            args.output.write_text("\n".join(results_header("LAMMPS Size Scaling Results", runs) + lines) + "\n", encoding='utf-8')
+            print(f"✓ Results saved to: {args.output}")
+        else:
+            print("\n" + "\n".join(lines))
+        return 0
+
+    benchmarks = [bench for bench in args.benchmarks or BENCHMARKS if (args.bench_dir / f"in.{bench}").exists()]
+    for missing in sorted(set(args.benchmarks or BENCHMARKS) - set(benchmarks)):
+        print(f"⚠ Skipping {missing.upper()}: {args.bench_dir / f'in.{missing}'} not found")
+
+    if args.command == 'inputs':
+        points = [(bench, rep, None) for bench in benchmarks for rep in args.replicates]
+        for name in write_inputs(args.bench_dir, points):
+            print(f"  {name} ✓")
+        return 0
+
+    configs = [parse_config_spec(spec) for spec in args.configs]
+    configs += core_configs(args.binaries, args.cores, args.accel, args.launcher)
+    if not configs or not benchmarks:
+        parser.error("at least one benchmark input and one -c config or --binary/--cores pair are required")
+    points = size_points(benchmarks, args.replicates, configs, args.per_core, args.max_atoms_per_core)
+    write_inputs(args.bench_dir, points)
+
+    sizes = sorted({rep for _, rep, _ in points}, key=lambda rep: math.prod(parse_replicate(rep)))
+    print(f"Size scaling: {len(points)} points, {len(configs)} configs, "
+          f"{BASE_ATOMS * math.prod(parse_replicate(sizes[0])):,}-{BASE_ATOMS * math.prod(parse_replicate(sizes[-1])):,} atoms")
+    if args.dry_run:
+        for bench, rep, config in points:
+            print(f"  {bench.upper():<6} {rep:<9} {config['name']:<24} {config['command']}")
+        return 0
+
+    import sweep
+
+    sweep_args = args.sweep_args[1:] if args.sweep_args[:1] == ['--'] else args.sweep_args
+    specs = [(f"{bench}:{rep}={input_name(bench, rep)}", f"{config['name']}|{config['omp_threads']}|{config['command']}")
+             for bench, rep, config in points]
+    exit_code = 0
+    for input_specs, config_specs in sweep.group_points(specs):
+        argv = ['--bench-dir', str(args.bench_dir), '--log-dir', str(args.log_dir), '--log-prefix', LOG_PREFIX,
+                '--suite', SUITE, *(arg for spec in input_specs for arg in ('-i', spec)),
+                *(arg for spec in config_specs for arg in ('-c', spec)), *sweep_args]
+        if args.store:
+            argv += ['--store', str(args.store)]
+        exit_code = max(exit_code, sweep.main(argv))
+    return exit_code
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Startup Cost: Launch and Setup vs Loop Time
+
+"Loop time of" covers only the run loop, but a short production job also
+pays for launching the processes (mpirun, MPI_Init, loading the binary),
+reading and replicating the data file, initializing the GPU / KOKKOS device
+and building the first neighbor list. `run` wraps one LAMMPS command and
+appends its wall time and launch time (until LAMMPS opens its log file) to
+the log; lammps_log.py derives the setup time as the wall time outside the
+launch and the run loops and stores all three per run. sweep.py makes it the
+innermost wrapper, inside telemetry.py and adaptive_run.py and around the
+already bound launcher, so the launch time covers only the launcher and LAMMPS.
+
+The report splits each configuration's wall time into launch, setup and loop,
+and flags configurations with a high fixed overhead (e.g. GPU runs with many
+ranks sharing one device, or 1 × 48 OpenMP thread spin-up). The break-even
+length is the number of steps whose loop time equals that overhead: jobs much
+shorter than it are dominated by startup, so configurations should be chosen
+by launch + setup + steps × time per step rather than by loop time alone.
+
+Usage:
+  startup_cost.py run -- mpirun -np 12 lmp -in in.lj -log log.lj_CPU-12
+  startup_cost.py report --store local_desktop/results.db --suite scaling --steps 1000
+"""
+
+import argparse
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+STARTUP_PHASES = ['launch', 'setup', 'loop']
+
+# Per-run result-store columns (one value per log)
+TIME_COLUMNS = ['wall_time', 'launch_time', 'setup_time']
+
+STARTUP_COLUMNS = [*TIME_COLUMNS, 'overhead_time', 'overhead_frac', 'break_even_steps']
+
+STARTUP_COLORS = {
+    'launch': '#95a5a6',
+    'setup': '#e67e22',
+    'loop': '#3498db',
+}
+
+# Launch + setup above this share of the wall time is flagged as high fixed overhead
+HIGH_OVERHEAD_FRACTION = 0.5
+
+# Log file polling while waiting for LAMMPS to start
+LAUNCH_POLL = 0.01
+
+
+# ============================================================================
+# Timed Run
+# ============================================================================
+
+def timed_run(command: list[str]) -> int:
+    """Run a LAMMPS command, appending its wall and launch time to its log. Returns its exit code."""
+    log_path = Path(command[command.index('-log') + 1]) if '-log' in command else Path('log.lammps')
+    log_path.unlink(missing_ok=True)
+
+    start = time.perf_counter()
+    process = subprocess.Popen(command)
+    launch = None
+    while process.poll() is None:
+        if log_path.exists():
+            launch = time.perf_counter() - start
+            process.wait()
+            break
+        time.sleep(LAUNCH_POLL)
+    wall = time.perf_counter() - start
+
+    # A run that finished before the log was seen still records its wall time
+    if process.returncode == 0 and log_path.exists():
+        launched = '-' if launch is None else f"{launch:.4f}"
+        with open(log_path, 'a') as handle:
+            handle.write(f"Launch timing: wall {wall:.4f} s, launch {launched} s (until the log was opened)\n")
+    return process.returncode
+
+
+# ============================================================================
+# Startup Costs
+# ============================================================================
+
+def startup_costs(runs: pd.DataFrame, keys: list[str]) -> pd.DataFrame:
+    """Median launch, setup and wall time over the trials of a group, with the fixed overhead.
+
+    Groups without wall time (markdown-only results) are left out.
+    """
+    timed = runs.dropna(subset=['setup_time'])
+    if timed.empty:
+        return pd.DataFrame(columns=[*keys, *STARTUP_COLUMNS])
+
+    costs = timed.groupby(keys, sort=False, observed=True).agg(
+        wall_time=('wall_time', 'median'), launch_time=('launch_time', 'median'),
+        setup_time=('setup_time', 'median'), loop=('loop_time', 'median'),
+        steps=('timesteps', 'median'))
+    overhead = costs['launch_time'].fillna(0.0) + costs['setup_time']
+    per_step = costs['loop'] / costs['steps'].astype(float)
+    costs['overhead_time'] = overhead
+    costs['overhead_frac'] = overhead / (overhead + costs['loop'])
+    costs['break_even_steps'] = overhead / per_step.where(per_step > 0)
+    return costs[STARTUP_COLUMNS].reset_index()
+
+
+def has_startup(record: dict) -> bool:
+    """Whether a configuration record carries startup costs."""
+    return 'overhead_time' in record and not np.isnan(record['overhead_time'])
+
+
+def short_job_time(record: dict, steps: int) -> float:
+    """Predicted wall time of a job of `steps` steps: fixed overhead plus steps × time per step."""
+    return record['overhead_time'] + steps * record['loop_time'] / record['timesteps']
+
+
+# ============================================================================
+# Output
+# ============================================================================
+
+def plot_startup_bars(ax, labels: list[str], records: list[dict], legend: bool = True):
+    """Horizontal stacked bars of launch, setup and loop seconds of each record."""
+    y = np.arange(len(records))
+    left = np.zeros(len(records))
+    for phase in STARTUP_PHASES:
+        column = 'loop_time' if phase == 'loop' else f"{phase}_time"
+        values = np.array([record[column] if not pd.isna(record[column]) else 0.0 for record in records])
+        ax.barh(y, values, 0.7, left=left, label=phase.capitalize(), color=STARTUP_COLORS[phase],
+                edgecolor='black', linewidth=0.5)
+        left += values
+
+    # Mark configurations dominated by fixed overhead
+    for idx, record in enumerate(records):
+        if record['overhead_frac'] >= HIGH_OVERHEAD_FRACTION:
+            ax.annotate(f"{record['overhead_frac']:.0%}", xy=(left[idx], idx), xytext=(3, 0),
+                        textcoords="offset points", va='center', fontsize=7, fontweight='bold',
+                        color=STARTUP_COLORS['setup'])
+
+    ax.set_yticks(y)
+    ax.set_yticklabels(labels, fontsize=8)
+    ax.invert_yaxis()
+    ax.set_xlim(0, left.max() * 1.15 if len(left) and left.max() > 0 else 1)
+    ax.set_xlabel('Wall Time (s)', fontsize=10)
+    ax.grid(axis='x', alpha=0.3)
+    if legend:
+        ax.legend(fontsize=7, loc='lower right', framealpha=0.9)
+
+
+def startup_table(rows: list[tuple], steps: int = None) -> list[str]:
+    """Markdown table of launch / setup / loop time; rows are (group, config label, record)."""
+    short = f" {steps:,}-step job (s) |" if steps else ""
+    lines = [
+        "| Benchmark | Config | Launch (s) | Setup (s) | Loop (s) | Overhead % | Break-even steps |" + short,
+        "|-----------|--------|------------|-----------|----------|------------|------------------|"
+        + ("-" * (len(short) - 1) + "|" if steps else ""),
+    ]
+    flagged = []
+    for group, label, record in rows:
+        launch = '-' if pd.isna(record['launch_time']) else f"{record['launch_time']:.2f}"
+        overhead = f"{record['overhead_frac'] * 100:.0f}"
+        if record['overhead_frac'] >= HIGH_OVERHEAD_FRACTION:
+            overhead = f"**{overhead}** ⚠"
+            flagged.append(f"{group} {label}")
+        break_even = '-' if pd.isna(record['break_even_steps']) else f"{record['break_even_steps']:,.0f}"
+        line = (f"| {group} | {label} | {launch} | {record['setup_time']:.2f} | {record['loop_time']:.2f} | "
+                f"{overhead} | {break_even} |")
+        if steps:
+            line += f" {short_job_time(record, steps):.2f} |"
+        lines.append(line)
+
+    lines.append("")
+    if flagged:
+        lines.append(f"⚠ Launch + setup is ≥ {HIGH_OVERHEAD_FRACTION:.0%} of the wall time (high fixed "
+                     f"overhead; prefer fewer, longer jobs or another config for short runs): "
+                     + "; ".join(flagged))
+    else:
+        lines.append(f"No configuration spends ≥ {HIGH_OVERHEAD_FRACTION:.0%} of its wall time in launch + setup.")
+    if any(pd.isna(record['launch_time']) for _, _, record in rows):
+        lines.append("Launch '-': not measured (runs without startup_cost.py take setup from LAMMPS' "
+                     "whole-second wall time).")
+    return lines
+
+
+# ============================================================================
+# Main
+# ============================================================================
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Launch and setup cost vs loop time")
+    sub = parser.add_subparsers(dest='action', required=True)
+
+    run = sub.add_parser('run', help="run a LAMMPS command and append its wall and launch time to its log")
+    run.add_argument('command', nargs=argparse.REMAINDER, help="-- LAMMPS command (with -log <file>)")
+
+    report = sub.add_parser('report', help="launch / setup / loop table from the result store")
+    report.add_argument('--store', type=Path, required=True)
+    report.add_argument('--suite', default='official')
+    report.add_argument('--benchmark', help="restrict to one benchmark (LJ, EAM, CHAIN, RHODO, REAXFF)")
+    report.add_argument('--steps', type=int, help="also predict the wall time of a job of this many steps")
+
+    args = parser.parse_args(argv)
+
+    if args.action == 'run':
+        command = args.command[1:] if args.command[:1] == ['--'] else args.command
+        if not command:
+            parser.error("no command given")
+        return timed_run(command)
+
+    from result_store import load_runs
+    from trial_stats import latest_trials, summarize_trials
+
+    filters = {'suite': args.suite}
+    if args.benchmark:
+        filters['benchmark'] = args.benchmark.upper()
+    runs = load_runs(args.store, **filters)
+
+    keys = ['benchmark', 'replicate', 'config']
+    runs = latest_trials(runs, keys)
+    costs = startup_costs(runs, keys)
+    if costs.empty:
+        print("No wall times in the store (ingest LAMMPS logs first)")
+        return 1
+
+    summary = summarize_trials(runs, keys)[[*keys, 'loop_time', 'timesteps', 'mpi_ranks']]
+    costs = costs.merge(summary, on=keys).sort_values(['benchmark', 'replicate', 'mpi_ranks', 'config'])
+    rows = [(f"{rec['benchmark']} {rec['replicate']}".strip(), rec['config'], rec)
+            for rec in costs.to_dict('records')]
+    print("\n".join(startup_table(rows, args.steps)))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+"""
+Concurrent LAMMPS Sweep Scheduler
+
+Runs every (input × config) job of a sweep, packing jobs whose core
+footprints (MPI ranks × OpenMP threads, taken from the "name|omp|command"
+configs) fit side by side onto disjoint, pinned core sets. Four CPU-12 runs
+share a 48-core node instead of running one after another, while a job that
+needs the whole node still runs alone. Finished runs are appended to the
+result store with the number of co-runners they shared the node with.
+
+With --trials N each configuration is measured N times (logs log.X, log.X.t1,
+...), after --warmup untimed runs whose logs are discarded. Trials of one
+configuration never run at the same time. --adaptive sizes each trial with
+adaptive_run.py (minimum measurement time, stop at steady throughput).
+--telemetry S samples every trial with telemetry.py every S seconds.
+
+With --checkpoint the sweep is resumable: configurations whose fingerprint
+(see checkpoint.py) is already recorded as finished are skipped, and each
+configuration is recorded as soon as its last trial ends.
+
+--binding P (repeatable) runs every configuration under each binding policy
+of binding.py (logs log.X.bind-P). A bound job places its ranks over the
+whole node, so it runs alone instead of on a pinned core set.
+
+Isolation policies (--isolate):
+  none       pack any jobs that fit
+  benchmark  never co-schedule two jobs of the same benchmark input
+  all        one job at a time (serial sweep, for peak-scaling numbers)
+
+Usage:
+  sweep.py --bench-dir lammps_benchmarks -i lj=in.lj -i eam=in.eam \\
+      -c "opt-mpi12-omp4|4|mpirun -np 12 lmp -sf omp -pk omp 4 -in" \\
+      -c "opt-serial|1|lmp -in" --store results.db
+  sweep.py --bench-dir lammps_benchmarks -i reaxff:3x3x3=in.reaxff_3x3x3 \\
+      --configs-from reaxff_scaling_bench.sh --suite scaling --isolate benchmark \\
+      --trials 5 --warmup 1 --checkpoint .sweep_checkpoint.jsonl
+"""
+
+import argparse
+import math
+import os
+import shlex
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from bench_config import MPI_LAUNCHERS, describe_command, parse_config_spec
+
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+ISOLATION_POLICIES = ['none', 'benchmark', 'all']
+
+# Keep the launcher from binding ranks itself; ranks inherit the job's core set
+MPI_BIND_ARGS = ['--bind-to', 'none']
+
+# Accelerators that occupy the (single) GPU; such jobs never overlap
+GPU_ACCELERATORS = ('gpu', 'kokkos-gpu')
+
+POLL_INTERVAL = 0.2
+
+
+# ============================================================================
+# Job Construction
+# ============================================================================
+
+def parse_input_spec(spec: str) -> dict:
+    """Parse "name=input" or "name:replicate=input" (e.g. reaxff:3x3x3=in.reaxff_3x3x3)."""
+    name, sep, input_file = spec.partition('=')
+    if not sep or not input_file:
+        raise ValueError(f"Invalid input spec: {spec!r}")
+    benchmark, _, replicate = name.partition(':')
+    return {'benchmark': benchmark, 'replicate': replicate, 'input_file': input_file}
+
+
+def trial_log_name(stem: str, trial: int) -> str:
+    """Log name of a trial: log.X for trial 0, log.X.tN after that (as the runners write them)."""
+    return f"log.{stem}" if trial == 0 else f"log.{stem}.t{trial}"
+
+
+def group_points(points: list[tuple]) -> list[tuple]:
+    """Group (input spec, config spec) points into (inputs, configs) sweeps that add no other pairs.
+
+    Inputs run with the same configs share one sweep.
+    """
+    by_input = {}
+    for input_spec, config_spec in points:
+        by_input.setdefault(input_spec, []).append(config_spec)
+    sweeps = {}
+    for input_spec, config_specs in by_input.items():
+        sweeps.setdefault(tuple(config_specs), []).append(input_spec)
+    return [(input_specs, list(config_specs)) for config_specs, input_specs in sweeps.items()]
+
+
+def make_jobs(inputs: list[dict], configs: list[dict], log_dir: Path, trials: int = 1, warmup: int = 0,
+              bindings: list[str] = None, log_prefix: str = '') -> list[dict]:
+    """Build the warm-up and trial jobs of every (input, config, binding), in runner order."""
+    from binding import log_suffix
+
+    jobs = []
+    for inp in inputs:
+        for config in configs:
+            layout = describe_command(config['command'], config['omp_threads'])
+            base = '_'.join(part for part in (inp['benchmark'], inp['replicate'], config['name']) if part)
+            for binding in bindings or ['none']:
+                stem = log_prefix + base + log_suffix(binding)
+                # Warm-ups (trial None) come first; equal keys never overlap, so they run in order
+                runs = [(None, log_dir / f"log.{stem}.warmup")] * warmup
+                runs += [(trial, log_dir / trial_log_name(stem, trial)) for trial in range(trials)]
+                for trial, logfile in runs:
+                    jobs.append({
+                        'index': len(jobs),
+                        'benchmark': inp['benchmark'],
+                        'replicate': inp['replicate'],
+                        'input_file': inp['input_file'],
+                        'config': config['name'],
+                        'omp_threads': config['omp_threads'],
+                        'command': config['command'],
+                        'binding': binding,
+                        # Share of this node: a multi-node job places only its local ranks here
+                        'cores': math.ceil(layout['mpi_ranks'] / layout['nodes']) * max(layout['omp_threads'], 1),
+                        'gpu': layout['accelerator'] in GPU_ACCELERATORS,
+                        'trial': trial,
+                        'logfile': logfile,
+                    })
+    return jobs
+
+
+def job_argv(job: dict) -> list[str]:
+    """Command line of a job: bound by its policy (see main), else with launcher binding disabled."""
+    tokens = shlex.split(job['command'])
+    if job['binding'] != 'none':
+        tokens = list(job['bound_command'])
+    elif tokens and Path(tokens[0]).name in MPI_LAUNCHERS and tokens[0] != 'srun':
+        tokens = tokens[:1] + MPI_BIND_ARGS + tokens[1:]
+    return job.get('wrapper', []) + tokens + [job['input_file'], '-log', str(job['logfile'])]
+
+
+def format_cpus(cpus: list[int]) -> str:
+    """Compress a core list to taskset syntax (0-11,24-35)."""
+    ranges = []
+    for cpu in sorted(cpus):
+        if ranges and cpu == ranges[-1][1] + 1:
+            ranges[-1][1] = cpu
+        else:
+            ranges.append([cpu, cpu])
+    return ','.join(f"{lo}-{hi}" if lo != hi else str(lo) for lo, hi in ranges)
+
+
+# ============================================================================
+# Scheduling
+# ============================================================================
+
+def allocate_cores(free: list[int], count: int) -> list[int]:
+    """Pick `count` free cores, preferring the lowest contiguous block."""
+    free = sorted(free)
+    for start in range(len(free) - count + 1):
+        block = free[start:start + count]
+        if block[-1] - block[0] == count - 1:
+            return block
+    return free[:count] if len(free) >= count else None
+
+
+def can_start(job: dict, running: list[dict], isolate: str) -> bool:
+    """Check the isolation policy, GPU exclusivity and trial ordering against running jobs."""
+    if isolate == 'all' and running:
+        return False
+    # A binding policy places ranks over the whole node, so bound jobs run alone
+    if running and (job['binding'] != 'none' or any(other['binding'] != 'none' for other in running)):
+        return False
+    key = (job['benchmark'], job['replicate'], job['config'])
+    for other in running:
+        if job['gpu'] and other['gpu']:
+            return False
+        # Trials (and warm-ups) of one configuration run one after another
+        if (other['benchmark'], other['replicate'], other['config']) == key:
+            return False
+        if isolate == 'benchmark' and (other['benchmark'], other['replicate']) == (job['benchmark'], job['replicate']):
+            return False
+    return True
+
+
+def run_sweep(jobs: list[dict], cpus: list[int], bench_dir: Path, isolate: str = 'none',
+              on_finish=None) -> list[dict]:
+    """Run jobs concurrently on disjoint core sets. Returns the finished jobs."""
+    total = len(cpus)
+    # Largest footprint first, first-fit backfill of smaller jobs into the gaps
+    pending = sorted(jobs, key=lambda job: (-min(job['cores'], total), job['index']))
+    free = list(cpus)
+    running = []
+    finished = []
+
+    while pending or running:
+        for job in list(pending):
+            need = min(job['cores'], total) if job['binding'] == 'none' else total
+            if need > len(free) or not can_start(job, running, isolate):
+                continue
+            job['cpus'] = allocate_cores(free, need)
+            free = [cpu for cpu in free if cpu not in job['cpus']]
+
+            env = dict(os.environ, OMP_NUM_THREADS=str(job['omp_threads']),
+                       OMP_PLACES='cores', OMP_PROC_BIND='close')
+            env.update(job.get('bind_env', {}))
+            job['logfile'].unlink(missing_ok=True)
+            job['start'] = time.perf_counter()
+            job['co_runners'] = len(running)
+            job['process'] = subprocess.Popen(
+                job_argv(job), cwd=bench_dir, env=env,
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                preexec_fn=lambda cpus=job['cpus']: os.sched_setaffinity(0, cpus))
+            pending.remove(job)
+            running.append(job)
+            for other in running:
+                other['co_runners'] = max(other['co_runners'], len(running) - 1)
+
+        time.sleep(POLL_INTERVAL)
+
+        for job in list(running):
+            exit_code = job['process'].poll()
+            if exit_code is None:
+                continue
+            job['exit_code'] = exit_code
+            job['elapsed'] = time.perf_counter() - job['start']
+            del job['process']
+            running.remove(job)
+            free.extend(job['cpus'])
+            finished.append(job)
+            if on_finish:
+                on_finish(job, len(finished), len(jobs))
+
+    return finished
+
+
+# ============================================================================
+# Main
+# ============================================================================
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Concurrent LAMMPS sweep scheduler")
+    parser.add_argument('--bench-dir', type=Path, required=True, help="directory holding the inputs")
+    parser.add_argument('-i', '--input', dest='inputs', action='append', default=[],
+                        help="benchmark input: name=file or name:replicate=file")
+    parser.add_argument('-c', '--config', dest='configs', action='append', default=[],
+                        help="config spec: name|omp|command or name|command")
+    parser.add_argument('--configs-from', type=Path, help="runner script with a BENCHMARK_CONFIGS array")
+    parser.add_argument('--log-dir', type=Path, default=Path.cwd(), help="where log.* files are written")
+    parser.add_argument('--log-prefix', default='', help="log name prefix, e.g. size_ (log.size_lj_...)")
+    parser.add_argument('--cores', type=int, help="cores to use (default: this process's affinity set)")
+    parser.add_argument('--isolate', choices=ISOLATION_POLICIES, default='none')
+    parser.add_argument('--store', type=Path, help="append finished runs to this result store")
+    parser.add_argument('--suite', default='official')
+    parser.add_argument('--trials', type=int, default=1, help="measured runs per configuration")
+    parser.add_argument('--warmup', type=int, default=0, help="untimed runs before the trials")
+    parser.add_argument('--adaptive', action='store_true', help="size trials with adaptive_run.py")
+    parser.add_argument('--min-time', type=float, default=5.0, help="adaptive: minimum measurement time (s)")
+    parser.add_argument('--tolerance', type=float, default=0.02, help="adaptive: steady-state CV tolerance")
+    parser.add_argument('--telemetry', type=float, metavar='INTERVAL',
+                        help="sample trials with telemetry.py every INTERVAL seconds")
+    parser.add_argument('--checkpoint', type=Path, help="skip finished configurations, record new ones")
+    parser.add_argument('--binding', dest='bindings', action='append',
+                        help="binding policy (binding.py, repeatable; bound jobs run alone)")
+    args = parser.parse_args(argv)
+
+    configs = [parse_config_spec(spec) for spec in args.configs]
+    if args.configs_from:
+        from result_store import parse_runner_configs
+
+        configs.extend(parse_runner_configs(args.configs_from).values())
+    inputs = [parse_input_spec(spec) for spec in args.inputs]
+    if not configs or not inputs:
+        parser.error("at least one --input and one --config are required")
+    if args.trials < 1 or args.warmup < 0:
+        parser.error("--trials must be at least 1 and --warmup at least 0")
+
+    cpus = sorted(os.sched_getaffinity(0))
+    if args.cores:
+        cpus = cpus[:args.cores]
+
+    log_dir = args.log_dir.resolve()
+    jobs = make_jobs(inputs, configs, log_dir, args.trials, args.warmup, args.bindings, args.log_prefix)
+    if args.bindings and set(args.bindings) != {'none'}:
+        from binding import bind_command, skip_reason, topology
+
+        topo = topology()
+        skipped = {}
+        for job in jobs:
+            key = (job['config'], job['binding'])
+            if key not in skipped:
+                skipped[key] = skip_reason(job['binding'], shlex.split(job['command']), job['omp_threads'], topo)
+                if skipped[key]:
+                    print(f"⚠ {job['config']} binding {job['binding']} skipped: {skipped[key]}")
+        jobs = [job for job in jobs if not skipped[(job['config'], job['binding'])]]
+        # Bound here rather than through `binding.py run`, so no interpreter start sits inside the timed launch
+        for job in jobs:
+            if job['binding'] != 'none':
+                job['bound_command'], job['bind_env'] = bind_command(
+                    job['binding'], shlex.split(job['command']), job['omp_threads'], topo)
+        for idx, job in enumerate(jobs):
+            job['index'] = idx
+    if args.checkpoint:
+        from checkpoint import fingerprint, is_done, load_checkpoint
+
+        records = load_checkpoint(args.checkpoint)
+        for job in jobs:
+            job['checkpoint_key'] = fingerprint(args.bench_dir / job['input_file'], job['command'],
+                                                job['omp_threads'], job['replicate'], job['config'],
+                                                args.trials, args.warmup, args.adaptive, job['binding'])
+        done = {job['checkpoint_key'] for job in jobs if is_done(records, job['checkpoint_key'])}
+        if done:
+            jobs = [job for job in jobs if job['checkpoint_key'] not in done]
+            for idx, job in enumerate(jobs):
+                job['index'] = idx
+            print(f"Resuming: {len(done)} configurations already finished ({args.checkpoint})")
+    # Trials record their wall and launch time (startup_cost.py, innermost so the launch time covers only
+    # the launcher and LAMMPS); adaptive ones run inside adaptive_run.py
+    wrapper = [sys.executable, str(Path(__file__).with_name('startup_cost.py')), 'run', '--']
+    if args.adaptive:
+        wrapper = [sys.executable, str(Path(__file__).with_name('adaptive_run.py')),
+                   '--min-time', str(args.min_time), '--tolerance', str(args.tolerance), '--', *wrapper]
+    if args.telemetry:
+        wrapper = [sys.executable, str(Path(__file__).with_name('telemetry.py')), 'run',
+                   '--interval', str(args.telemetry), '--', *wrapper]
+    for job in jobs:
+        if job['trial'] is not None:
+            job['wrapper'] = wrapper
+        if job['trial'] == 0:
+            # Trial logs of an earlier, longer trial set would be mistaken for this one's
+            for stale in log_dir.glob(f"{job['logfile'].name}.t[0-9]*"):
+                stale.unlink()
+            if job['cores'] > len(cpus):
+                print(f"⚠ {job['benchmark']} {job['config']}: needs {job['cores']} cores, "
+                      f"runs alone on {len(cpus)}")
+
+    print(f"Sweep: {len(jobs)} jobs on {len(cpus)} cores (isolate={args.isolate}, "
+          f"trials={args.trials}, warmup={args.warmup})")
+
+    failed_keys = set()
+
+    def on_finish(job, done, total):
+        status = "✓" if job['exit_code'] == 0 else f"✗ (exit: {job['exit_code']})"
+        name = ' '.join(part for part in (job['benchmark'], job['replicate'], job['config']) if part)
+        if job['binding'] != 'none':
+            name += f" [{job['binding']}]"
+        label = name
+        if job['trial'] is None:
+            label += ' (warm-up)'
+        elif args.trials > 1:
+            label += f" #{job['trial']}"
+        print(f"  [{done:3d}/{total}] {label:<36} cores {format_cpus(job['cpus']):<12} "
+              f"{job['elapsed']:8.2f}s  {status}")
+
+        if job['trial'] is None:
+            job['logfile'].unlink(missing_ok=True)
+        elif args.store and job['exit_code'] == 0 and job['logfile'].exists():
+            from lammps_log import log_rows
+            from result_store import append_runs
+
+            rows = log_rows(job['logfile'], suite=args.suite, benchmark=job['benchmark'],
+                            config=job['config'], command=job['command'],
+                            omp_threads=job['omp_threads'], replicate=job['replicate'],
+                            trial=job['trial'], binding=job['binding'])
+            for row in rows:
+                row['co_runners'] = job['co_runners']
+            append_runs(args.store, rows)
+
+        # A configuration is checkpointed once its last trial ends (or at its first failure)
+        if args.checkpoint and job['checkpoint_key'] not in failed_keys:
+            from checkpoint import record_point
+
+            if job['exit_code'] != 0:
+                failed_keys.add(job['checkpoint_key'])
+                record_point(args.checkpoint, job['checkpoint_key'], 'failed', label=name)
+            elif job['trial'] == args.trials - 1:
+                record_point(args.checkpoint, job['checkpoint_key'], 'ran', label=name)
+
+    start = time.perf_counter()
+    finished = run_sweep(jobs, cpus, args.bench_dir, args.isolate, on_finish)
+    failed = sum(1 for job in finished if job['exit_code'] != 0)
+    serial = sum(job['elapsed'] for job in finished)
+    wall = time.perf_counter() - start
+    print(f"Sweep wall time: {wall:.1f}s (sum of job times {serial:.1f}s), {failed} failed")
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,461 @@
+#!/usr/bin/env python3
+"""
+Run Telemetry Sampler
+
+Samples /proc and /sys around one LAMMPS run: per-core utilization of the
+cores the run may use, CPU frequency and thermal throttle events, running
+threads, context switches, RSS and threads of every rank, GPU memory in use
+(nvidia-smi, when present) and the NUMA placement of each rank's pages
+relative to the node it runs on. `run` wraps
+the command like startup_cost.py, writes the time series next to the log
+(log.lj_CPU-12 -> telemetry.lj_CPU-12.csv) and appends a one-line summary to
+the log, which lammps_log.py stores with the run.
+
+The report explains anomalies the loop time alone cannot: more runnable
+threads than cores (oversubscription, e.g. an OMP suffix spawning threads
+on every rank of a 48 × 1 run), cores left idle, throttling, and ranks whose
+memory sits on a remote NUMA node.
+
+Usage:
+  telemetry.py run --interval 0.5 -- mpirun -np 48 lmp -sf omp -in in.lj -log log.lj_conda-mpi48-omp1
+  telemetry.py report --store mirae_server/results.db --benchmark LJ
+"""
+
+import argparse
+import csv
+import os
+import shutil
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from lammps_log import TELEMETRY_FIELDS, TELEMETRY_PREFIX
+
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+DEFAULT_INTERVAL = 1.0
+
+# Per-run result-store columns, and the numeric ones summarized per configuration
+RUN_TELEMETRY_COLUMNS = list(TELEMETRY_FIELDS.values())
+TELEMETRY_COLUMNS = [column for column in RUN_TELEMETRY_COLUMNS if column != 'telemetry']
+
+SERIES_COLUMNS = ['t', 'busy_cores', 'runnable', 'cpu_mhz', 'ranks', 'threads', 'rss_mb', 'rank_rss_mb',
+                  'gpu_mem_mb', 'ctx_per_sec', 'involuntary_per_sec', 'numa_local']
+
+# Flags: runnable threads above this multiple of the configured cores, busy cores below this share
+OVERSUBSCRIBED_RATIO = 1.1
+IDLE_RATIO = 0.75
+# NUMA-local page share below which a run is flagged
+NUMA_LOCAL_MIN = 0.9
+
+# Scripts that wrap a LAMMPS command (never counted as ranks)
+WRAPPER_SCRIPTS = {'telemetry.py', 'startup_cost.py', 'adaptive_run.py'}
+
+NVIDIA_SMI = shutil.which('nvidia-smi')
+
+PAGE_KB = os.sysconf('SC_PAGE_SIZE') // 1024 if hasattr(os, 'sysconf') else 4
+
+
+# ============================================================================
+# /proc and /sys Readers
+# ============================================================================
+
+def read_text(path: str) -> str:
+    """Contents of a /proc or /sys file ('' if it is missing or the process exited)."""
+    try:
+        with open(path) as handle:
+            return handle.read()
+    except OSError:
+        return ''
+
+
+def cpu_times() -> dict:
+    """{cpu: (busy, total) jiffies} from /proc/stat."""
+    times = {}
+    for line in read_text('/proc/stat').splitlines():
+        fields = line.split()
+        if fields and fields[0].startswith('cpu') and fields[0] != 'cpu':
+            values = list(map(int, fields[1:]))
+            idle = values[3] + (values[4] if len(values) > 4 else 0)
+            times[int(fields[0][3:])] = (sum(values[:8]) - idle, sum(values[:8]))
+    return times
+
+
+def cpu_mhz(cpus: list[int]) -> float:
+    """Mean current frequency of the cores (cpufreq, else /proc/cpuinfo)."""
+    freqs = [read_text(f'/sys/devices/system/cpu/cpu{cpu}/cpufreq/scaling_cur_freq').strip() for cpu in cpus]
+    freqs = [int(freq) / 1000 for freq in freqs if freq]
+    if not freqs:
+        freqs = [float(line.split(':')[1]) for line in read_text('/proc/cpuinfo').splitlines()
+                 if line.startswith('cpu MHz')]
+    return float(np.mean(freqs)) if freqs else None
+
+
+def throttle_count(cpus: list[int]) -> int:
+    """Thermal throttle events of the cores so far (None without thermal_throttle in sysfs)."""
+    counts = [read_text(f'/sys/devices/system/cpu/cpu{cpu}/thermal_throttle/core_throttle_count').strip()
+              for cpu in cpus]
+    counts = [int(count) for count in counts if count]
+    return sum(counts) if counts else None
+
+
+def gpu_memory_mb() -> float:
+    """Memory in use on the fullest GPU (MB), None without nvidia-smi."""
+    if not NVIDIA_SMI:
+        return None
+    try:
+        output = subprocess.run([NVIDIA_SMI, '--query-gpu=memory.used', '--format=csv,noheader,nounits'],
+                                capture_output=True, text=True, timeout=5).stdout
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    used = [float(line) for line in output.split() if line.replace('.', '', 1).isdigit()]
+    return max(used) if used else None
+
+
+def cpu_nodes() -> dict:
+    """NUMA node of every CPU."""
+    nodes = {}
+    for node_dir in Path('/sys/devices/system/node').glob('node[0-9]*'):
+        for part in read_text(str(node_dir / 'cpulist')).strip().split(','):
+            if part:
+                lo, _, hi = part.partition('-')
+                for cpu in range(int(lo), int(hi or lo) + 1):
+                    nodes[cpu] = int(node_dir.name[4:])
+    return nodes
+
+
+def process_tree(root: int) -> tuple:
+    """Pids of a process and all its descendants, and the children of every process."""
+    children = {}
+    for stat_path in Path('/proc').glob('[0-9]*/stat'):
+        stat = read_text(str(stat_path))
+        if stat:
+            # Field 4 (ppid) follows the parenthesized command name
+            fields = stat[stat.rfind(')') + 2:].split()
+            children.setdefault(int(fields[1]), []).append(int(stat_path.parent.name))
+    tree, queue = [], [root]
+    while queue:
+        pid = queue.pop()
+        tree.append(pid)
+        queue.extend(children.get(pid, []))
+    return tree, children
+
+
+def is_wrapper(pid: int) -> bool:
+    """Whether a process runs one of the run wrappers (telemetry.py, startup_cost.py, adaptive_run.py)."""
+    args = read_text(f'/proc/{pid}/cmdline').split('\0')
+    return any(Path(arg).name in WRAPPER_SCRIPTS for arg in args[:3])
+
+
+def process_status(pid: int) -> dict:
+    """RSS (MB), threads and context switches of a process, plus the CPU it last ran on."""
+    status = {}
+    for line in read_text(f'/proc/{pid}/status').splitlines():
+        key, _, value = line.partition(':')
+        if key in ('VmRSS', 'Threads', 'voluntary_ctxt_switches', 'nonvoluntary_ctxt_switches'):
+            status[key] = int(value.split()[0])
+    if not status:
+        return None
+    stat = read_text(f'/proc/{pid}/stat')
+    fields = stat[stat.rfind(')') + 2:].split() if stat else []
+    return {
+        'rss_mb': status.get('VmRSS', 0) / 1024,
+        'threads': status.get('Threads', 1),
+        'voluntary': status.get('voluntary_ctxt_switches', 0),
+        'involuntary': status.get('nonvoluntary_ctxt_switches', 0),
+        # Field 39 (processor) is index 36 after the command name
+        'cpu': int(fields[36]) if len(fields) > 36 else None,
+    }
+
+
+def running_threads(pid: int) -> int:
+    """Threads of a process that are running or runnable (state R)."""
+    running = 0
+    for stat_path in Path(f'/proc/{pid}/task').glob('*/stat'):
+        stat = read_text(str(stat_path))
+        if stat and stat[stat.rfind(')') + 2] == 'R':
+            running += 1
+    return running
+
+
+def numa_pages(pid: int) -> dict:
+    """Resident pages of a process per NUMA node (from numa_maps)."""
+    pages = {}
+    for line in read_text(f'/proc/{pid}/numa_maps').splitlines():
+        for token in line.split():
+            if token[0] == 'N' and '=' in token and token[1].isdigit():
+                node, count = token[1:].split('=')
+                pages[int(node)] = pages.get(int(node), 0) + int(count)
+    return pages
+
+
+# ============================================================================
+# Sampling
+# ============================================================================
+
+def take_sample(root: int, cpus: list[int], nodes: dict, prev: dict, counters: dict) -> dict:
+    """One time-series row; `prev` carries the last CPU times, `counters` the context switches per pid."""
+    now = time.perf_counter()
+    times = cpu_times()
+    utilization = {}
+    for cpu in cpus:
+        if cpu in times and cpu in prev['times']:
+            busy = times[cpu][0] - prev['times'][cpu][0]
+            total = times[cpu][1] - prev['times'][cpu][1]
+            utilization[cpu] = busy / total if total > 0 else 0.0
+
+    tree, children = process_tree(root)
+    # Ranks are the leaves of the process tree (launchers and wrappers have children),
+    # except wrappers that have not started their command yet
+    ranks = [pid for pid in tree if not children.get(pid) and not is_wrapper(pid)]
+    statuses = {pid: process_status(pid) for pid in tree}
+    statuses = {pid: status for pid, status in statuses.items() if status}
+
+    ctx_before = sum(voluntary + involuntary for voluntary, involuntary in counters.values())
+    involuntary_before = sum(involuntary for _, involuntary in counters.values())
+    for pid, status in statuses.items():
+        counters[pid] = (status['voluntary'], status['involuntary'])
+    elapsed = now - prev['time']
+    ctx = sum(voluntary + involuntary for voluntary, involuntary in counters.values()) - ctx_before
+    involuntary = sum(involuntary for _, involuntary in counters.values()) - involuntary_before
+
+    local = remote = 0
+    if len(set(nodes.values())) > 1:
+        for pid in ranks:
+            if pid in statuses and statuses[pid]['cpu'] is not None:
+                pages = numa_pages(pid)
+                home = nodes.get(statuses[pid]['cpu'])
+                local += pages.get(home, 0)
+                remote += sum(count for node, count in pages.items() if node != home)
+    elif ranks:
+        local = 1
+
+    rank_status = [statuses[pid] for pid in ranks if pid in statuses]
+    prev.update(times=times, time=now)
+    return {
+        't': now - prev['start'],
+        'busy_cores': sum(utilization.values()),
+        'runnable': sum(running_threads(pid) for pid in ranks if pid in statuses),
+        'cpu_mhz': cpu_mhz(cpus),
+        'ranks': len(rank_status),
+        'threads': sum(status['threads'] for status in rank_status),
+        'rss_mb': sum(status['rss_mb'] for status in rank_status),
+        'rank_rss_mb': max((status['rss_mb'] for status in rank_status), default=0.0),
+        'gpu_mem_mb': gpu_memory_mb(),
+        'ctx_per_sec': ctx / elapsed if elapsed > 0 else None,
+        'involuntary_per_sec': involuntary / elapsed if elapsed > 0 else None,
+        'numa_local': local / (local + remote) if local + remote else None,
+        'utilization': utilization,
+    }
+
+
+def summarize_samples(samples: list[dict], throttle: int, series: Path) -> dict:
+    """Summary fields of a run's time series."""
+    def column(name):
+        return [sample[name] for sample in samples if sample[name] is not None]
+
+    def mean(name):
+        values = column(name)
+        return float(np.mean(values)) if values else None
+
+    mhz = column('cpu_mhz')
+    return {
+        'busy_cores': mean('busy_cores'),
+        'runnable': mean('runnable'),
+        'cpu_mhz': mean('cpu_mhz'),
+        'cpu_mhz_min': min(mhz) if mhz else None,
+        'throttle': throttle,
+        'ctx_per_sec': mean('ctx_per_sec'),
+        'involuntary_per_sec': mean('involuntary_per_sec'),
+        'rank_rss_mb': max(column('rank_rss_mb'), default=None),
+        'rss_mb': max(column('rss_mb'), default=None),
+        'gpu_mem_mb': max(column('gpu_mem_mb'), default=None),
+        'numa_local': mean('numa_local'),
+        'series': series.name,
+    }
+
+
+def write_series(path: Path, samples: list[dict], cpus: list[int]):
+    """Time series CSV: one row per sample, per-core utilization (%) as u<cpu> columns."""
+    with open(path, 'w', newline='') as handle:
+        writer = csv.writer(handle)
+        writer.writerow([*SERIES_COLUMNS, *(f"u{cpu}" for cpu in cpus)])
+        for sample in samples:
+            row = ['' if sample[name] is None else round(sample[name], 3) for name in SERIES_COLUMNS]
+            row += [round(sample['utilization'][cpu] * 100) if cpu in sample['utilization'] else ''
+                    for cpu in cpus]
+            writer.writerow(row)
+
+
+def series_path(log_path: Path) -> Path:
+    """Time-series file of a log (log.X -> telemetry.X.csv, never picked up as a log)."""
+    name = log_path.name[len('log.'):] if log_path.name.startswith('log.') else log_path.name
+    return log_path.with_name(f"telemetry.{name}.csv")
+
+
+def format_summary(summary: dict) -> str:
+    """The "Telemetry:" line appended to the log."""
+    def fmt(value):
+        if value is None:
+            return '-'
+        return f"{value:.4g}" if isinstance(value, float) else str(value)
+    return f"{TELEMETRY_PREFIX} " + " ".join(f"{key}={fmt(summary[key])}" for key in TELEMETRY_FIELDS)
+
+
+def sampled_run(command: list[str], interval: float) -> int:
+    """Run a command while sampling it; write the time series and append the summary to its log."""
+    log_path = Path(command[command.index('-log') + 1]) if '-log' in command else Path('log.lammps')
+    cpus = sorted(os.sched_getaffinity(0))
+    nodes = cpu_nodes()
+    throttle_start = throttle_count(cpus)
+
+    start = time.perf_counter()
+    prev = {'times': cpu_times(), 'time': start, 'start': start}
+    counters = {}
+    samples = []
+    process = subprocess.Popen(command)
+    while True:
+        try:
+            process.wait(timeout=interval)
+            break
+        except subprocess.TimeoutExpired:
+            samples.append(take_sample(process.pid, cpus, nodes, prev, counters))
+
+    throttle_end = throttle_count(cpus)
+    throttle = throttle_end - throttle_start if throttle_start is not None and throttle_end is not None else None
+    if process.returncode == 0 and log_path.exists():
+        series = series_path(log_path)
+        write_series(series, samples, cpus)
+        with open(log_path, 'a') as handle:
+            handle.write(format_summary(summarize_samples(samples, throttle, series)) + "\n")
+    return process.returncode
+
+
+# ============================================================================
+# Report
+# ============================================================================
+
+def telemetry_summary(runs: pd.DataFrame, keys: list[str]) -> pd.DataFrame:
+    """Median telemetry over the trials of a group (peak rank RSS: maximum).
+
+    Groups without telemetry (runs without telemetry.py) are left out.
+    """
+    sampled = runs.dropna(subset=['busy_cores'])
+    if sampled.empty:
+        return pd.DataFrame(columns=[*keys, *TELEMETRY_COLUMNS])
+    aggregations = {column: 'median' for column in TELEMETRY_COLUMNS}
+    for column in ('rank_rss_mb', 'rss_mb', 'gpu_mem_mb'):
+        aggregations[column] = 'max'
+    aggregations['throttle_events'] = 'max'
+    return sampled.groupby(keys, sort=False, observed=True).agg(aggregations).reset_index()
+
+
+def has_telemetry(record: dict) -> bool:
+    """Whether a configuration record carries telemetry."""
+    return 'busy_cores' in record and not pd.isna(record['busy_cores'])
+
+
+def telemetry_flags(record: dict) -> list[str]:
+    """Anomalies of a configuration: oversubscribed, idle cores, throttled, remote NUMA memory."""
+    flags = []
+    cores = record['cores']
+    if not pd.isna(record['runnable_threads']) and record['runnable_threads'] > OVERSUBSCRIBED_RATIO * cores:
+        flags.append('oversubscribed')
+    if record['busy_cores'] < IDLE_RATIO * cores:
+        flags.append('idle cores')
+    if not pd.isna(record['throttle_events']) and record['throttle_events'] > 0:
+        flags.append('throttled')
+    if not pd.isna(record['numa_local_frac']) and record['numa_local_frac'] < NUMA_LOCAL_MIN:
+        flags.append('remote NUMA')
+    return flags
+
+
+def telemetry_table(rows: list[tuple]) -> list[str]:
+    """Markdown table of run telemetry; rows are (group, config label, record with a `cores` field)."""
+    def cell(value, digits=1):
+        return '-' if pd.isna(value) else f"{value:,.{digits}f}"
+
+    lines = [
+        "| Benchmark | Config | Cores | Busy cores | Runnable | MHz (min) | Ctx/s (invol.) | Rank RSS (MB) "
+        "| NUMA local | Flags |",
+        "|-----------|--------|-------|------------|----------|-----------|----------------|---------------"
+        "|------------|-------|",
+    ]
+    flagged = []
+    for group, label, record in rows:
+        flags = telemetry_flags(record)
+        if flags:
+            flagged.append(f"{group} {label} ({', '.join(flags)})")
+        lines.append(
+            f"| {group} | {label} | {record['cores']:.0f} | {cell(record['busy_cores'])} | "
+            f"{cell(record['runnable_threads'])} | {cell(record['cpu_mhz'], 0)} ({cell(record['cpu_mhz_min'], 0)}) | "
+            f"{cell(record['ctx_switches_per_sec'], 0)} ({cell(record['involuntary_ctx_per_sec'], 0)}) | "
+            f"{cell(record['rank_rss_mb'])} | {cell(record['numa_local_frac'] * 100, 0)}% | "
+            f"{'⚠ ' + ', '.join(flags) if flags else ''} |")
+
+    lines.append("")
+    if flagged:
+        lines.append("⚠ " + "; ".join(flagged))
+    else:
+        lines.append("No configuration is oversubscribed, idle, throttled or on remote NUMA memory.")
+    return lines
+
+
+# ============================================================================
+# Main
+# ============================================================================
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Hardware telemetry of LAMMPS runs")
+    sub = parser.add_subparsers(dest='action', required=True)
+
+    run = sub.add_parser('run', help="run a LAMMPS command while sampling /proc and /sys")
+    run.add_argument('--interval', type=float, default=DEFAULT_INTERVAL, help="seconds between samples")
+    run.add_argument('command', nargs=argparse.REMAINDER, help="-- LAMMPS command (with -log <file>)")
+
+    report = sub.add_parser('report', help="telemetry table from the result store")
+    report.add_argument('--store', type=Path, required=True)
+    report.add_argument('--suite', default='official')
+    report.add_argument('--benchmark', help="restrict to one benchmark (LJ, EAM, CHAIN, RHODO, REAXFF)")
+
+    args = parser.parse_args(argv)
+
+    if args.action == 'run':
+        command = args.command[1:] if args.command[:1] == ['--'] else args.command
+        if not command:
+            parser.error("no command given")
+        return sampled_run(command, args.interval)
+
+    from result_store import load_runs
+    from trial_stats import latest_trials
+
+    filters = {'suite': args.suite}
+    if args.benchmark:
+        filters['benchmark'] = args.benchmark.upper()
+    runs = load_runs(args.store, **filters)
+
+    keys = ['benchmark', 'replicate', 'config']
+    runs = latest_trials(runs, keys)
+    summary = telemetry_summary(runs, keys)
+    if summary.empty:
+        print("No telemetry in the store (run with TELEMETRY=1 and ingest the logs)")
+        return 1
+
+    layout = runs.groupby(keys, observed=True)[['mpi_ranks', 'omp_threads']].first()
+    summary = summary.join(layout, on=keys).sort_values(['benchmark', 'replicate', 'mpi_ranks', 'config'])
+    summary['cores'] = summary['mpi_ranks'].astype(float) * summary['omp_threads'].fillna(1).astype(float)
+    rows = [(f"{rec['benchmark']} {rec['replicate']}".strip(), rec['config'], rec)
+            for rec in summary.to_dict('records')]
+    print("\n".join(telemetry_table(rows)))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
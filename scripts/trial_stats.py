@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Trial Statistics
+
+Robust summaries of repeated benchmark trials: the analyzers report the
+median loop time with its interquartile range and a percentile bootstrap
+confidence interval, derive speedup intervals by resampling both trial sets,
+and flag "best configuration" picks whose interval overlaps the runner-up.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+BOOTSTRAP_SAMPLES = 2000
+CONFIDENCE = 0.95
+SEED = 0
+
+# Fewer trials than this give intervals too wide (or degenerate) to trust
+MIN_TRIALS = 3
+
+
+# ============================================================================
+# Interval Estimates
+# ============================================================================
+
+def bootstrap_medians(values, samples: int = BOOTSTRAP_SAMPLES, seed: int = SEED) -> np.ndarray:
+    """Medians of `samples` bootstrap resamples of the trial values."""
+    values = np.asarray(values, dtype=float)
+    rng = np.random.default_rng(seed)
+    resamples = rng.choice(values, size=(samples, len(values)), replace=True)
+    return np.median(resamples, axis=1)
+
+
+def percentile_interval(estimates: np.ndarray, confidence: float = CONFIDENCE) -> tuple:
+    """Central percentile interval of bootstrap estimates."""
+    tail = (1 - confidence) / 2 * 100
+    low, high = np.percentile(estimates, [tail, 100 - tail])
+    return float(low), float(high)
+
+
+def median_ci(values, confidence: float = CONFIDENCE) -> tuple:
+    """Bootstrap confidence interval of the median."""
+    if len(values) < 2:
+        value = float(np.median(values))
+        return value, value
+    return percentile_interval(bootstrap_medians(values), confidence)
+
+
+def speedup_ci(baseline, values, confidence: float = CONFIDENCE) -> tuple:
+    """Speedup (ratio of medians, baseline / config) and its bootstrap interval."""
+    speedup = float(np.median(baseline) / np.median(values))
+    if len(baseline) < 2 and len(values) < 2:
+        return speedup, speedup, speedup
+    # Independent resampling of both trial sets (different seeds)
+    ratios = bootstrap_medians(baseline, seed=SEED) / bootstrap_medians(values, seed=SEED + 1)
+    low, high = percentile_interval(ratios, confidence)
+    return speedup, min(low, speedup), max(high, speedup)
+
+
+def intervals_overlap(a: tuple, b: tuple) -> bool:
+    """Whether two (low, high) intervals overlap."""
+    return a[0] <= b[1] and b[0] <= a[1]
+
+
+# ============================================================================
+# Trial Selection and Summaries
+# ============================================================================
+
+def nominal_loop_times(runs: pd.DataFrame) -> pd.DataFrame:
+    """Replace the loop time of adaptive runs by its extrapolation to the nominal run length."""
+    if 'loop_time_extrapolated' not in runs:
+        return runs
+    return runs.assign(loop_time=runs['loop_time_extrapolated'].fillna(runs['loop_time']))
+
+
+def latest_trials(runs: pd.DataFrame, keys: list[str]) -> pd.DataFrame:
+    """Keep every trial of the most recent trial set of each group.
+
+    A trial set starts at a trial-0 row; the trials recorded after it belong
+    to the same set. Only the last run block of each log is measured.
+    """
+    measured = runs.drop_duplicates(['source', 'date', *keys, 'trial'], keep='last')
+    ordered = measured.sort_values(['date', 'trial'], kind='stable')
+    groups = [ordered[key] for key in keys]
+    set_id = (ordered['trial'] == 0).astype(int).groupby(groups, observed=True).cumsum()
+    latest = set_id.groupby(groups, observed=True).transform('max')
+    return ordered[set_id == latest].sort_index()
+
+
+def summarize_trials(runs: pd.DataFrame, keys: list[str], value: str = 'loop_time') -> pd.DataFrame:
+    """One row per group: first-row metadata, median `value` and its spread.
+
+    Adds `<value>_q1`, `<value>_q3`, `<value>_ci_low`, `<value>_ci_high`,
+    `trials` (number of trials) and `<value>_trials` (tuple of trial values).
+    """
+    runs = runs.dropna(subset=[value])
+    grouped = runs.groupby(keys, sort=False, observed=True)
+    values = grouped[value]
+
+    summary = grouped.first()
+    summary[value] = values.median()
+    summary[f'{value}_q1'] = values.quantile(0.25)
+    summary[f'{value}_q3'] = values.quantile(0.75)
+    summary['trials'] = values.count()
+    summary[f'{value}_trials'] = values.agg(tuple)
+    intervals = summary[f'{value}_trials'].map(median_ci)
+    summary[f'{value}_ci_low'] = intervals.str[0]
+    summary[f'{value}_ci_high'] = intervals.str[1]
+    return summary.reset_index()
+
+
+def format_interval(low: float, high: float, digits: int) -> str:
+    """Format a confidence interval as 'low–high'."""
+    return f"{low:.{digits}f}–{high:.{digits}f}"
+
+
+def best_with_overlap(candidates: list[dict], value: str = 'loop_time') -> tuple:
+    """Pick the lowest-median candidate; also return the runners-up it cannot be told apart from."""
+    ranked = sorted(candidates, key=lambda item: item[value])
+    best = ranked[0]
+    best_ci = (best[f'{value}_ci_low'], best[f'{value}_ci_high'])
+    ties = [item for item in ranked[1:]
+            if intervals_overlap(best_ci, (item[f'{value}_ci_low'], item[f'{value}_ci_high']))]
+    return best, ties
@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+MPI × OpenMP Decomposition Tuner
+
+Searches the decomposition space of one input and binary instead of a
+hand-picked grid: every MPI ranks × OpenMP threads split of the node and of
+partial core counts (non-divisor splits such as 9 × 5 included), optionally
+crossed with LAMMPS `processors` grids. Candidates are measured with short
+probe runs and pruned by successive halving: each rung keeps the fastest
+1/eta of the candidates and gives the survivors eta times more timesteps,
+so only the finalists run at the full length of the input.
+
+Probes run one at a time on pinned cores (sweep.run_sweep, isolate=all) from
+a temporary copy of the input whose last `run` is shortened and which starts
+with the candidate's `processors` command.
+
+Usage:
+  tune_decomposition.py --bench-dir lammps_benchmarks --input in.reaxff --binary lmp
+  tune_decomposition.py --bench-dir lammps_benchmarks --input in.lj --binary lmp_mpi_conda \\
+      --name conda --core-counts 48,32 --grid "* * *" --grid "* * 1" --min-steps 20 --eta 3
+"""
+
+import argparse
+import math
+import os
+import re
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+from lammps_log import parse_log, run_metrics
+from sweep import format_cpus, make_jobs, run_sweep
+
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+# OpenMP thread counts tried per MPI rank (ranks = cores // threads)
+THREAD_OPTIONS = [1, 2, 3, 4, 5, 6, 8, 10, 12, 16, 24, 48]
+
+# LAMMPS `processors` arguments; "* * *" lets LAMMPS choose the rank grid
+DEFAULT_GRIDS = ['* * *']
+
+# Accelerator command-line arguments per OpenMP backend
+ACCEL_ARGS = {
+    'omp': '-sf omp -pk omp {threads}',
+    'kokkos': '-k on t {threads} -sf kk',
+    'none': '',
+}
+
+DEFAULT_MIN_STEPS = 20
+DEFAULT_ETA = 3
+
+RUN_RE = re.compile(r'^(\s*run\s+)(\d+)(.*)$', re.MULTILINE)
+
+
+# ============================================================================
+# Candidates
+# ============================================================================
+
+def candidate_layouts(core_counts: list[int], threads: list[int] = THREAD_OPTIONS,
+                      grids: list[str] = DEFAULT_GRIDS) -> list[dict]:
+    """Every distinct (ranks, threads, grid) that fits one of the core counts."""
+    seen = set()
+    layouts = []
+    for cores in core_counts:
+        for omp in threads:
+            ranks = cores // omp
+            if ranks < 1 or (ranks, omp) in seen:
+                continue
+            seen.add((ranks, omp))
+            # A single rank has nothing to decompose
+            for grid in (grids if ranks > 1 else DEFAULT_GRIDS):
+                layouts.append({'ranks': ranks, 'threads': omp, 'grid': grid})
+    return layouts
+
+
+def layout_name(layout: dict, prefix: str) -> str:
+    """Runner-style config name (opt-mpi6-omp8), with the grid when it is not the default."""
+    name = f"{prefix}-mpi{layout['ranks']}-omp{layout['threads']}"
+    if layout['grid'] != DEFAULT_GRIDS[0]:
+        name += '-p' + re.sub(r'\W+', '', layout['grid'].replace('*', 'x'))
+    return name
+
+
+def layout_command(layout: dict, binary: str, accel: str, launcher: str) -> str:
+    """Runner-style command ending in -in (no launcher for a single rank)."""
+    parts = []
+    if layout['ranks'] > 1:
+        parts.append(launcher.format(ranks=layout['ranks']))
+    parts.append(binary)
+    accel_args = ACCEL_ARGS[accel].format(threads=layout['threads'])
+    if accel_args:
+        parts.append(accel_args)
+    parts.append('-in')
+    return ' '.join(parts)
+
+
+# ============================================================================
+# Probe Inputs
+# ============================================================================
+
+def input_steps(text: str) -> int:
+    """Step count of the last `run` command of an input."""
+    matches = RUN_RE.findall(text)
+    if not matches:
+        raise ValueError("input has no run command")
+    return int(matches[-1][1])
+
+
+def probe_input(text: str, steps: int, grid: str) -> str:
+    """Input text with the last `run` shortened to `steps` and a `processors` command first."""
+    last = list(RUN_RE.finditer(text))[-1]
+    text = text[:last.start()] + f"{last.group(1)}{steps}{last.group(3)}" + text[last.end():]
+    if grid != DEFAULT_GRIDS[0]:
+        text = f"processors {grid}\n" + text
+    return text
+
+
+# ============================================================================
+# Successive Halving
+# ============================================================================
+
+def rung_budgets(min_steps: int, max_steps: int, eta: int, candidates: int) -> list[int]:
+    """Probe length of each rung: min_steps × eta^r, ending with one rung at the input's own length."""
+    budgets = []
+    while len(budgets) < max(1, math.ceil(math.log(max(candidates, 1), eta))):
+        steps = min_steps * eta ** len(budgets)
+        if steps >= max_steps:
+            break
+        budgets.append(steps)
+    return budgets + [max_steps]
+
+
+def successive_halving(candidates: list[dict], evaluate, budgets: list[int], eta: int,
+                       on_rung=None) -> list[dict]:
+    """Prune candidates rung by rung. Returns the final rung, fastest first.
+
+    evaluate(candidates, steps) sets 'cost' (seconds per step, inf on failure)
+    on every candidate.
+    """
+    survivors = list(candidates)
+    for rung, steps in enumerate(budgets):
+        evaluate(survivors, steps)
+        survivors.sort(key=lambda cand: cand['cost'])
+        if on_rung:
+            on_rung(rung, steps, survivors)
+        if rung == len(budgets) - 1:
+            break
+        # Failed probes never advance
+        finite = [cand for cand in survivors if math.isfinite(cand['cost'])]
+        if len(finite) <= 1:
+            return finite or survivors
+        survivors = finite[:max(1, math.ceil(len(finite) / eta))]
+        if len(survivors) == 1:
+            break
+    return survivors
+
+
+def make_evaluator(bench_dir: Path, input_file: str, cpus: list[int], work_dir: Path):
+    """Evaluator running each probe alone on pinned cores and reading its loop time."""
+    text = (bench_dir / input_file).read_text()
+
+    def evaluate(candidates, steps):
+        jobs = []
+        for cand in candidates:
+            # Probe inputs live next to the original so relative data files resolve
+            probe = bench_dir / f"{input_file}.tune-{cand['name']}"
+            probe.write_text(probe_input(text, steps, cand['layout']['grid']))
+            config = {'name': cand['name'], 'omp_threads': cand['layout']['threads'],
+                      'command': cand['command']}
+            job = make_jobs([{'benchmark': 'tune', 'replicate': '', 'input_file': probe.name}],
+                            [config], work_dir)[0]
+            job['index'] = len(jobs)
+            job['candidate'] = cand
+            jobs.append(job)
+
+        try:
+            finished = run_sweep(jobs, cpus, bench_dir, isolate='all')
+        finally:
+            for job in jobs:
+                (bench_dir / job['input_file']).unlink(missing_ok=True)
+
+        for job in finished:
+            cand = job['candidate']
+            cand['cost'] = math.inf
+            cand['cpus'] = job['cpus']
+            if job['exit_code'] == 0 and job['logfile'].exists():
+                completed = [run for run in parse_log(job['logfile'])['runs'] if run['complete']]
+                if completed and completed[-1]['steps']:
+                    metrics = run_metrics(completed[-1])
+                    cand['cost'] = metrics['loop_time'] / metrics['timesteps']
+            job['logfile'].unlink(missing_ok=True)
+
+    return evaluate
+
+
+# ============================================================================
+# Main
+# ============================================================================
+
+def parse_int_list(value: str) -> list[int]:
+    return [int(item) for item in value.split(',') if item.strip()]
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="MPI × OpenMP decomposition tuner")
+    parser.add_argument('--bench-dir', type=Path, required=True, help="directory holding the input")
+    parser.add_argument('--input', required=True, help="input file inside --bench-dir")
+    parser.add_argument('--binary', required=True, help="LAMMPS binary (lmp, lmp_mpi_conda, ...)")
+    parser.add_argument('--name', help="config name prefix (default: binary name)")
+    parser.add_argument('--accel', choices=list(ACCEL_ARGS), default='omp',
+                        help="how OpenMP threads are requested")
+    parser.add_argument('--launcher', default='mpirun -np {ranks}')
+    parser.add_argument('--cores', type=int, help="cores to use (default: this process's affinity set)")
+    parser.add_argument('--core-counts', type=parse_int_list,
+                        help="core counts to try (default: all, 3/4 and 1/2 of --cores)")
+    parser.add_argument('--threads', type=parse_int_list, default=THREAD_OPTIONS,
+                        help="OpenMP threads per rank to try")
+    parser.add_argument('--grid', dest='grids', action='append',
+                        help="LAMMPS processors arguments to try (repeatable, default '* * *')")
+    parser.add_argument('--min-steps', type=int, default=DEFAULT_MIN_STEPS, help="probe length of the first rung")
+    parser.add_argument('--max-steps', type=int, help="longest probe (default: the input's run length)")
+    parser.add_argument('--eta', type=int, default=DEFAULT_ETA, help="keep 1/eta of the candidates per rung")
+    args = parser.parse_args(argv)
+
+    if args.eta < 2:
+        parser.error("--eta must be at least 2")
+    if not shutil.which(args.binary):
+        parser.error(f"binary not found: {args.binary}")
+    input_path = args.bench_dir / args.input
+    if not input_path.is_file():
+        parser.error(f"input not found: {input_path}")
+
+    cpus = sorted(os.sched_getaffinity(0))
+    if args.cores:
+        cpus = cpus[:args.cores]
+    total = len(cpus)
+    core_counts = args.core_counts or sorted({total, total * 3 // 4, total // 2}, reverse=True)
+    core_counts = [count for count in core_counts if 0 < count <= total]
+    threads = args.threads if args.accel != 'none' else [1]
+    prefix = args.name or Path(args.binary).name
+
+    candidates = []
+    for layout in candidate_layouts(core_counts, threads, args.grids or DEFAULT_GRIDS):
+        candidates.append({
+            'layout': layout,
+            'name': layout_name(layout, prefix),
+            'command': layout_command(layout, args.binary, args.accel, args.launcher),
+            'cost': math.inf,
+        })
+
+    max_steps = args.max_steps or input_steps(input_path.read_text())
+    budgets = rung_budgets(min(args.min_steps, max_steps), max_steps, args.eta, len(candidates))
+    exhaustive = len(candidates) * max_steps
+    print(f"Tuning {args.input} with {args.binary}: {len(candidates)} candidates on {total} cores, "
+          f"rungs of {', '.join(map(str, budgets))} steps")
+
+    def on_rung(rung, steps, ranked):
+        print(f"\nRung {rung + 1}: {len(ranked)} candidates × {steps} steps")
+        print(f"  {'Config':<28} {'Cores':>5} {'Grid':<16} {'ms/step':>10}")
+        for cand in ranked:
+            layout = cand['layout']
+            cost = f"{cand['cost'] * 1e3:10.3f}" if math.isfinite(cand['cost']) else f"{'failed':>10}"
+            print(f"  {cand['name']:<28} {layout['ranks'] * layout['threads']:>5} {layout['grid']:<16} {cost}")
+
+    spent = 0
+
+    with tempfile.TemporaryDirectory(prefix='tune_') as work_dir:
+        evaluate = make_evaluator(args.bench_dir, args.input, cpus, Path(work_dir))
+
+        def counted(cands, steps):
+            nonlocal spent
+            spent += len(cands) * steps
+            evaluate(cands, steps)
+
+        ranked = successive_halving(candidates, counted, budgets, args.eta, on_rung)
+
+    best = ranked[0]
+    if not math.isfinite(best['cost']):
+        print("\n❌ Every probe failed")
+        return 1
+
+    layout = best['layout']
+    print(f"\nProbe cost: {spent} steps ({spent / exhaustive:.0%} of an exhaustive "
+          f"{len(candidates)} × {max_steps}-step sweep)")
+    print(f"Best: {best['name']} ({best['cost'] * 1e3:.3f} ms/step on cores {format_cpus(best['cpus'])})")
+    print(f"  Command: OMP_NUM_THREADS={layout['threads']} {best['command']} {args.input}")
+    if layout['grid'] != DEFAULT_GRIDS[0]:
+        print(f"  Input:   add 'processors {layout['grid']}' before the box is created")
+    print(f"  Config:  \"{best['name']}|{layout['threads']}|{best['command']}\"")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())